@@ -0,0 +1,14 @@
+"""可复现的性能基准测试
+
+在临时 SQLite 数据库上生成合成贷款账本（generator），对订单创建、利息、
+状态变更、报表、收入明细、Excel 导出、修复统计和增量报表等热点路径计时
+（scenarios / runner），输出可比较的 JSON 结果（compare）；
+replay 把 Update 回放进完整配置的 Application，出站请求由本地的
+FakeBotAPI 应答，用于测量端到端吞吐量。完全离线运行，不连接 Telegram。
+
+用法（在 bot3 目录下）：
+    python -m benchmarks run --orders 2000 --output base.json
+    python -m benchmarks run --orders 2000 --scenario report --scenario interest
+    python -m benchmarks compare base.json new.json --threshold 0.2
+    python -m benchmarks replay --updates 1000 --concurrency 8 --latency 0.05
+"""
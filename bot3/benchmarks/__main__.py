@@ -0,0 +1,203 @@
+"""基准测试命令行入口
+
+    python -m benchmarks run [--orders N] [--groups N] [--months N] [--seed N]
+                             [--as-of YYYY-MM-DD] [--iterations N]
+                             [--scenario NAME ...] [--output FILE] [--keep-db]
+    python -m benchmarks replay [--updates N] [--mix amount=6,create=2,report=2]
+                                [--input FILE] [--rate N] [--concurrency N]
+                                [--latency S] [--error-rate P]
+                                [--retry-after-rate P] [--output FILE]
+    python -m benchmarks compare BASE NEW [--threshold 0.2]
+
+compare 发现退化时以退出码 1 结束，可用于 CI。
+"""
+
+# 标准库
+import argparse
+import asyncio
+import json
+import shutil
+import sys
+
+
+def _add_book_arguments(parser: argparse.ArgumentParser) -> None:
+    """账本规模和数据库相关参数"""
+    parser.add_argument("--orders", type=int, default=2000, help="订单数")
+    parser.add_argument("--groups", type=int, default=5, help="归属ID数")
+    parser.add_argument("--months", type=int, default=6, help="历史月数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--as-of", help="数据截止日期 YYYY-MM-DD（默认当前日切日期）")
+    parser.add_argument("--output", help="结果 JSON 文件路径")
+    parser.add_argument("--data-dir", help="数据目录（默认新建临时目录，结束后删除）")
+    parser.add_argument("--keep-db", action="store_true", help="保留生成的数据库")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="生成账本并执行基准测试")
+    _add_book_arguments(run_parser)
+    run_parser.add_argument(
+        "--iterations", type=int, default=20, help="每个场景的计时迭代次数"
+    )
+    run_parser.add_argument("--warmup", type=int, default=2, help="预热次数")
+    run_parser.add_argument(
+        "--scenario", action="append", help="只执行指定场景（可重复）"
+    )
+
+    replay_parser = commands.add_parser("replay", help="回放 Update 压测")
+    _add_book_arguments(replay_parser)
+    replay_parser.add_argument(
+        "--updates", type=int, default=500, help="生成的 Update 数量"
+    )
+    replay_parser.add_argument(
+        "--mix", default="amount=6,create=2,report=2", help="Update 类型比例"
+    )
+    replay_parser.add_argument("--input", help="录制的 Update 文件（JSON Lines）")
+    replay_parser.add_argument("--save-updates", help="保存生成的 Update")
+    replay_parser.add_argument(
+        "--rate", type=float, default=0.0, help="每秒投入的 Update 数（0 为不限速）"
+    )
+    replay_parser.add_argument(
+        "--concurrency", type=int, default=1, help="同时处理的 Update 数"
+    )
+    replay_parser.add_argument(
+        "--latency", type=float, default=0.0, help="出站请求延迟（秒）"
+    )
+    replay_parser.add_argument(
+        "--jitter", type=float, default=0.0, help="出站请求随机附加延迟上限（秒）"
+    )
+    replay_parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="出站请求返回 500 的概率"
+    )
+    replay_parser.add_argument(
+        "--retry-after-rate", type=float, default=0.0, help="出站请求限流的概率"
+    )
+    replay_parser.add_argument(
+        "--retry-after", type=int, default=1, help="限流的 retry_after 秒数"
+    )
+
+    compare_parser = commands.add_parser("compare", help="比较两次结果")
+    compare_parser.add_argument("base", help="基准结果 JSON")
+    compare_parser.add_argument("new", help="新结果 JSON")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.2, help="耗时中位数允许增加的比例"
+    )
+    return parser
+
+
+def _with_database(args, execute, format_results) -> int:
+    """准备环境和账本规模，执行后按参数清理数据库并输出结果"""
+    from benchmarks.environment import prepare_environment
+
+    data_dir = prepare_environment(args.data_dir)
+
+    # 项目模块必须在设置环境变量之后导入
+    from benchmarks.generator import LoanBookSpec
+    from benchmarks.runner import remove_database
+
+    spec = LoanBookSpec(
+        groups=args.groups,
+        orders=args.orders,
+        months=args.months,
+        seed=args.seed,
+        as_of=args.as_of,
+    )
+    try:
+        results = execute(spec)
+    finally:
+        if not args.keep_db:
+            if args.data_dir:
+                remove_database(data_dir)
+            else:
+                shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(format_results(results))
+    if args.keep_db:
+        print(f"数据目录: {data_dir}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存: {args.output}")
+    return 0
+
+
+def _run(args) -> int:
+    def execute(spec):
+        from benchmarks.runner import run
+
+        return run(
+            spec,
+            scenarios=args.scenario,
+            iterations=args.iterations,
+            warmup=args.warmup,
+        )
+
+    def format_results(results):
+        from benchmarks.runner import format_results
+
+        return format_results(results)
+
+    return _with_database(args, execute, format_results)
+
+
+def _replay(args) -> int:
+    def execute(spec):
+        from benchmarks.fake_bot_api import FaultConfig
+        from benchmarks.replay import parse_mix, run_replay
+
+        faults = FaultConfig(
+            latency=args.latency,
+            latency_jitter=args.jitter,
+            error_rate=args.error_rate,
+            retry_after_rate=args.retry_after_rate,
+            retry_after=args.retry_after,
+            seed=args.seed,
+        )
+        return asyncio.run(
+            run_replay(
+                spec,
+                count=args.updates,
+                mix=parse_mix(args.mix),
+                input_path=args.input,
+                save_path=args.save_updates,
+                rate=args.rate,
+                concurrency=args.concurrency,
+                faults=faults,
+            )
+        )
+
+    def format_results(results):
+        from benchmarks.replay import format_replay_results
+
+        return format_replay_results(results)
+
+    return _with_database(args, execute, format_results)
+
+
+def _compare(args) -> int:
+    from benchmarks.compare import compare_results, load_results
+
+    regressions, notes = compare_results(
+        load_results(args.base), load_results(args.new), args.threshold
+    )
+    for note in notes:
+        print(f"  {note}")
+    if regressions:
+        print(f"发现 {len(regressions)} 项退化：")
+        for regression in regressions:
+            print(f"  ✗ {regression}")
+        return 1
+    print("未发现退化")
+    return 0
+
+
+def main(argv=None) -> int:
+    args = _build_parser().parse_args(argv)
+    commands = {"run": _run, "replay": _replay, "compare": _compare}
+    return commands[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
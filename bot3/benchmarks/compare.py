@@ -0,0 +1,83 @@
+"""基准测试结果比较
+
+比较两次运行的 JSON 结果，以下情况视为退化：
+- 每次迭代的 SQL 语句数或数据库调用次数增加（与机器无关，精确比较）
+- 出现新的全表扫描指纹
+- 耗时中位数增加超过阈值（默认 20%，且绝对值超过 1ms，过滤计时噪声）
+"""
+
+# 标准库
+import json
+from typing import Dict, List, Tuple
+
+# 耗时增加低于该绝对值（毫秒）时不视为退化
+MIN_TIME_DELTA_MS = 1.0
+
+
+def load_results(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _compare_scenario(
+    name: str, base: Dict, new: Dict, threshold: float
+) -> Tuple[List[str], List[str]]:
+    """比较一个场景，返回 (退化列表, 说明列表)"""
+    regressions = []
+    notes = []
+
+    for key, label in (
+        ("sql_per_iteration", "SQL/次"),
+        ("db_calls_per_iteration", "数据库调用/次"),
+    ):
+        if new[key] > base[key]:
+            regressions.append(f"{name}: {label} {base[key]} -> {new[key]}")
+        elif new[key] < base[key]:
+            notes.append(f"{name}: {label} {base[key]} -> {new[key]}")
+
+    new_scans = sorted(set(new["full_scans"]) - set(base["full_scans"]))
+    for fingerprint in new_scans:
+        regressions.append(f"{name}: 新增全表扫描 {fingerprint[:160]}")
+
+    base_ms, new_ms = base["p50_ms"], new["p50_ms"]
+    change = (new_ms - base_ms) / base_ms if base_ms else 0.0
+    line = f"{name}: p50 {base_ms:.2f}ms -> {new_ms:.2f}ms ({change:+.1%})"
+    if change > threshold and new_ms - base_ms > MIN_TIME_DELTA_MS:
+        regressions.append(line)
+    else:
+        notes.append(line)
+    return regressions, notes
+
+
+def compare_results(
+    base: Dict, new: Dict, threshold: float = 0.2
+) -> Tuple[List[str], List[str]]:
+    """比较两次结果
+
+    Args:
+        base: 基准结果
+        new: 新结果
+        threshold: 耗时中位数允许增加的比例
+
+    Returns:
+        (退化列表, 说明列表)
+    """
+    if base.get("version") != new.get("version"):
+        raise ValueError("结果格式版本不同，无法比较")
+
+    regressions = []
+    notes = []
+    if base["meta"]["spec"] != new["meta"]["spec"]:
+        notes.append("注意：两次运行的账本规模不同")
+
+    for name, base_item in base["scenarios"].items():
+        new_item = new["scenarios"].get(name)
+        if new_item is None:
+            notes.append(f"{name}: 新结果中没有该场景")
+            continue
+        scenario_regressions, scenario_notes = _compare_scenario(
+            name, base_item, new_item, threshold
+        )
+        regressions += scenario_regressions
+        notes += scenario_notes
+    return regressions, notes
@@ -0,0 +1,51 @@
+"""基准测试运行环境
+
+项目模块在导入时读取环境变量（db.base 的 DATA_DIR、config 的 BOT_TOKEN 等），
+必须在导入任何项目模块之前调用 prepare_environment，把数据库指向临时目录。
+"""
+
+# 标准库
+import logging
+import os
+import sys
+import tempfile
+from typing import Optional
+
+# 项目根目录（bot3）
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 基准测试固定使用的环境变量（不连接 Telegram，不启动定时任务）
+BENCH_ENV = {
+    "BOT_TOKEN": "0:benchmark",
+    "ADMIN_USER_IDS": "1",
+    "SCHEDULER_ENABLED": "0",
+    "CONVERSATION_PERSISTENCE": "0",
+    "DAILY_SUMMARY_VERIFY": "0",
+    "SQL_PROFILE": "0",
+}
+
+
+def prepare_environment(data_dir: Optional[str] = None) -> str:
+    """设置环境变量并返回数据目录
+
+    Args:
+        data_dir: 数据目录，None 表示新建临时目录
+
+    Returns:
+        数据目录路径（数据库文件为其中的 loan_bot.db）
+    """
+    if "db.base" in sys.modules:
+        raise RuntimeError("prepare_environment 必须在导入项目模块之前调用")
+
+    if data_dir is None:
+        data_dir = tempfile.mkdtemp(prefix="loan_bot_bench_")
+    os.makedirs(data_dir, exist_ok=True)
+
+    os.environ.update(BENCH_ENV)
+    os.environ["DATA_DIR"] = data_dir
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+
+    # 业务日志只保留警告，避免日志输出影响计时
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    return data_dir
@@ -0,0 +1,237 @@
+"""本地模拟 Bot API
+
+作为 telegram.request.BaseRequest 传给 ApplicationBuilder.request()，
+所有出站请求在进程内应答，不连接 Telegram：
+- 按方法记录调用次数和耗时，可按聊天统计发送的消息数
+- 可注入固定 / 随机延迟、服务端错误（HTTP 500）和限流（HTTP 429 + retry_after，
+  由 python-telegram-bot 转换为 RetryAfter 异常）
+- 返回的对象（Message、User、ChatMember 等）字段满足 python-telegram-bot 的解析
+
+用法：
+    api = FakeBotAPI(latency=0.05, retry_after_rate=0.01)
+    application = (
+        Application.builder().token("0:replay").request(api)
+        .get_updates_request(FakeBotAPI()).updater(None).build()
+    )
+"""
+
+# 标准库
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+# 第三方库
+from telegram.request import BaseRequest, RequestData
+
+# 模拟机器人账号
+BOT_USER = {
+    "id": 999_000_001,
+    "is_bot": True,
+    "first_name": "ReplayBot",
+    "username": "replay_bot",
+    "can_join_groups": True,
+    "can_read_all_group_messages": True,
+    "supports_inline_queries": False,
+}
+
+# 返回 Message 对象的方法
+_MESSAGE_METHODS = {
+    "sendMessage",
+    "sendDocument",
+    "sendPhoto",
+    "sendAnimation",
+    "sendVideo",
+    "copyMessage",
+    "forwardMessage",
+    "editMessageText",
+    "editMessageReplyMarkup",
+    "editMessageCaption",
+}
+
+# 不注入故障的方法（启动时的 getMe；回放不使用轮询）
+_NO_FAULT_METHODS = {"getMe", "getUpdates"}
+
+
+@dataclass(frozen=True)
+class FaultConfig:
+    """故障注入配置"""
+
+    # 每次请求的延迟（秒），latency_jitter 为随机附加延迟的上限
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # 返回 HTTP 500 的概率
+    error_rate: float = 0.0
+    # 返回 429 限流的概率及 retry_after 秒数
+    retry_after_rate: float = 0.0
+    retry_after: int = 1
+    seed: int = 0
+
+
+class FakeBotAPI(BaseRequest):
+    """记录出站调用并注入延迟和错误的 Bot API 替身"""
+
+    def __init__(self, faults: Optional[FaultConfig] = None, **kwargs):
+        self.faults = faults or FaultConfig(**kwargs)
+        self._rng = random.Random(self.faults.seed)
+        self._message_ids = itertools.count(1)
+        self.calls: Counter = Counter()
+        self.failures: Counter = Counter()
+        self.retry_afters: Counter = Counter()
+        self.messages_per_chat: Counter = Counter()
+        self.call_time: Dict[str, float] = defaultdict(float)
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        """清空调用记录"""
+        self.calls.clear()
+        self.failures.clear()
+        self.retry_afters.clear()
+        self.messages_per_chat.clear()
+        self.call_time.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """调用统计"""
+        return {
+            "total_calls": sum(self.calls.values()),
+            "calls": dict(self.calls.most_common()),
+            "failures": dict(self.failures),
+            "retry_after": dict(self.retry_afters),
+            "chats": len(self.messages_per_chat),
+            "max_messages_per_chat": max(self.messages_per_chat.values(), default=0),
+            "call_time_ms": {
+                name: round(total * 1000, 3)
+                for name, total in sorted(self.call_time.items())
+            },
+        }
+
+    # ----- 请求处理 -----
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout=None,
+        write_timeout=None,
+        connect_timeout=None,
+        pool_timeout=None,
+    ) -> Tuple[int, bytes]:
+        endpoint = url.rsplit("/", 1)[-1]
+        params = request_data.parameters if request_data else {}
+        started = time.perf_counter()
+        self.calls[endpoint] += 1
+
+        faults = self.faults
+        delay = faults.latency + self._rng.random() * faults.latency_jitter
+        if delay:
+            await asyncio.sleep(delay)
+
+        try:
+            if endpoint not in _NO_FAULT_METHODS:
+                roll = self._rng.random()
+                if roll < faults.retry_after_rate:
+                    self.retry_afters[endpoint] += 1
+                    return 429, _error_body(
+                        429,
+                        f"Too Many Requests: retry after {faults.retry_after}",
+                        {"retry_after": faults.retry_after},
+                    )
+                if roll < faults.retry_after_rate + faults.error_rate:
+                    self.failures[endpoint] += 1
+                    return 500, _error_body(500, "Internal Server Error")
+
+            result = self._result(endpoint, params)
+            return 200, json.dumps({"ok": True, "result": result}).encode()
+        finally:
+            self.call_time[endpoint] += time.perf_counter() - started
+
+    def _result(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """按方法构造应答结果"""
+        if endpoint == "getMe":
+            return BOT_USER
+        if endpoint == "getUpdates":
+            return []
+        if endpoint in _MESSAGE_METHODS:
+            return self._message(params)
+        if endpoint == "getChat":
+            return _chat(params.get("chat_id"))
+        if endpoint == "getChatMember":
+            user_id = int(params.get("user_id", 0))
+            return {"status": "administrator", "user": _user(user_id), **_ADMIN_RIGHTS}
+        if endpoint == "getChatAdministrators":
+            return [{"status": "creator", "user": _user(1), "is_anonymous": False}]
+        if endpoint == "getChatMemberCount":
+            return 3
+        return True
+
+    def _message(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        chat_id = params.get("chat_id")
+        if chat_id is None:
+            # inline 消息的编辑请求没有 chat_id，按私聊处理
+            chat_id = 1
+        self.messages_per_chat[chat_id] += 1
+        message = {
+            "message_id": int(params.get("message_id") or next(self._message_ids)),
+            "date": int(time.time()),
+            "chat": _chat(chat_id),
+            "from": BOT_USER,
+        }
+        if "text" in params:
+            message["text"] = params["text"]
+        if "document" in params:
+            message["document"] = {
+                "file_id": f"doc{message['message_id']}",
+                "file_unique_id": f"doc{message['message_id']}",
+            }
+        return message
+
+
+# getChatMember 管理员权限字段
+_ADMIN_RIGHTS = {
+    "can_be_edited": False,
+    "is_anonymous": False,
+    "can_manage_chat": True,
+    "can_delete_messages": True,
+    "can_manage_video_chats": True,
+    "can_restrict_members": True,
+    "can_promote_members": False,
+    "can_change_info": True,
+    "can_invite_users": True,
+}
+
+
+def _user(user_id: int) -> Dict[str, Any]:
+    return {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"}
+
+
+def _chat(chat_id: Any) -> Dict[str, Any]:
+    """聊天对象（负数ID为群组）"""
+    try:
+        chat_id = int(chat_id)
+    except (TypeError, ValueError):
+        # @username 形式的频道
+        return {"id": -100, "type": "channel", "title": str(chat_id)}
+    if chat_id < 0:
+        return {"id": chat_id, "type": "supergroup", "title": f"group{-chat_id}"}
+    return {"id": chat_id, "type": "private", "first_name": f"user{chat_id}"}
+
+
+def _error_body(code: int, description: str, parameters: Optional[Dict] = None):
+    body: Dict[str, Any] = {
+        "ok": False,
+        "error_code": code,
+        "description": description,
+    }
+    if parameters:
+        body["parameters"] = parameters
+    return json.dumps(body).encode()
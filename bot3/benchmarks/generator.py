@@ -0,0 +1,458 @@
+"""合成贷款账本生成模块
+
+按给定规模生成一份可复现的业务数据库（使用 init_db 的真实表结构）：
+- N 个归属ID，M 个订单，订单日期分布在最近 K 个月，覆盖各状态和星期分组
+- 每个订单按周产生利息收入，完成/违约完成的订单产生对应收入，部分订单归还本金
+- 每天的公司/其他开销，以及最近一段时间的操作历史
+- financial_data / grouped_data / daily_data 按明细汇总，报表和修复命令可直接使用
+
+同一个 seed 和 as_of 生成的数据完全相同。
+"""
+
+# 标准库
+import json
+import random
+import sqlite3
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+# 本地模块
+from constants import WEEKDAY_GROUP
+from utils.money import to_cents
+
+# 订单状态分布（状态, 权重）
+STATE_WEIGHTS = (
+    ("normal", 45),
+    ("overdue", 10),
+    ("breach", 8),
+    ("end", 30),
+    ("breach_end", 7),
+)
+
+# orders 表写入的列
+ORDER_COLUMNS = (
+    "order_id",
+    "group_id",
+    "chat_id",
+    "date",
+    "weekday_group",
+    "customer",
+    "amount",
+    "state",
+    "created_at",
+    "updated_at",
+)
+
+# 基准测试使用的用户ID（写入授权用户和操作历史）
+BENCH_USER_ID = 10001
+
+# 初始流动资金
+INITIAL_LIQUID_FUNDS = 10_000_000.0
+
+
+@dataclass(frozen=True)
+class LoanBookSpec:
+    """账本规模"""
+
+    groups: int = 5
+    orders: int = 2000
+    months: int = 6
+    seed: int = 42
+    # 数据截止日期（YYYY-MM-DD），None 表示当前日切日期
+    as_of: Optional[str] = None
+    # 生成操作历史的最近天数
+    history_days: int = 30
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def group_ids(spec: LoanBookSpec) -> List[str]:
+    """归属ID列表（S01, S02, ...）"""
+    return [f"S{i + 1:02d}" for i in range(spec.groups)]
+
+
+def resolve_as_of(spec: LoanBookSpec) -> date:
+    """数据截止日期"""
+    if spec.as_of:
+        return datetime.strptime(spec.as_of, "%Y-%m-%d").date()
+    from utils.date_helpers import get_daily_period_date
+
+    return datetime.strptime(get_daily_period_date(), "%Y-%m-%d").date()
+
+
+def build_order(
+    rng: random.Random, seq: int, order_date: date, group_id: str, state: str
+) -> Dict:
+    """生成一个订单（字段与创建订单流程一致）"""
+    customer = "A" if rng.random() < 0.35 else "B"
+    amount = float(rng.randrange(5, 200) * 1000)
+    return {
+        "order_id": f"{order_date:%y%m%d}{seq:05d}",
+        "group_id": group_id,
+        "chat_id": -(1_000_000_000 + seq),
+        "date": f"{order_date:%Y-%m-%d} 12:00:00",
+        "weekday_group": WEEKDAY_GROUP[order_date.weekday()],
+        "customer": customer,
+        "amount": amount,
+        "state": state,
+    }
+
+
+def _timestamp(rng: random.Random, day: date) -> str:
+    """当天 09:00-21:59 之间的随机时间"""
+    return f"{day:%Y-%m-%d} {rng.randrange(9, 22):02d}:{rng.randrange(60):02d}:00"
+
+
+def _income_row(order: Dict, day: date, income_type: str, amount: float, ts: str):
+    return (
+        f"{day:%Y-%m-%d}",
+        income_type,
+        round(amount, 2),
+        order["group_id"],
+        order["order_id"],
+        order["date"][:10],
+        order["customer"],
+        order["weekday_group"],
+        None,
+        BENCH_USER_ID,
+        ts,
+    )
+
+
+class LoanBookGenerator:
+    """按规模生成订单、收入、开销和操作历史"""
+
+    def __init__(self, spec: LoanBookSpec):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.as_of = resolve_as_of(spec)
+        self.start = self.as_of - timedelta(days=30 * spec.months)
+        self.orders: List[Dict] = []
+        self.incomes: List[tuple] = []
+        self.expenses: List[tuple] = []
+        self.operations: List[tuple] = []
+
+    def _pick_state(self) -> str:
+        states, weights = zip(*STATE_WEIGHTS)
+        return self.rng.choices(states, weights)[0]
+
+    def _generate_order(self, seq: int, groups: List[str]) -> None:
+        rng = self.rng
+        span_days = (self.as_of - self.start).days
+        order_date = self.start + timedelta(days=rng.randrange(span_days + 1))
+        order = build_order(
+            rng, seq, order_date, rng.choice(groups), self._pick_state()
+        )
+        order["created_at"] = _timestamp(rng, order_date)
+
+        # 结束日期：完成/违约的订单在订单日期之后的某一天变更状态
+        end_date = self.as_of
+        if order["state"] != "normal":
+            end_date = order_date + timedelta(
+                days=rng.randrange((self.as_of - order_date).days + 1)
+            )
+        order["updated_at"] = (
+            _timestamp(rng, end_date)
+            if order["state"] != "normal"
+            else order["created_at"]
+        )
+        self.orders.append(order)
+
+        # 每周利息（违约后不再有利息）
+        interest = order["amount"] * rng.choice((0.03, 0.04, 0.05))
+        day = order_date + timedelta(days=7)
+        while day <= end_date:
+            ts = _timestamp(rng, day)
+            self.incomes.append(_income_row(order, day, "interest", interest, ts))
+            if day > self.as_of - timedelta(days=self.spec.history_days):
+                self._add_operation("interest", order, interest, ts)
+            day += timedelta(days=7)
+
+        # 部分订单归还本金
+        if rng.random() < 0.1 and end_date > order_date:
+            reduction = order["amount"] * 0.2
+            self.incomes.append(
+                _income_row(
+                    order,
+                    end_date,
+                    "principal_reduction",
+                    reduction,
+                    order["updated_at"],
+                )
+            )
+
+        if order["state"] == "end":
+            self.incomes.append(
+                _income_row(
+                    order, end_date, "completed", order["amount"], order["updated_at"]
+                )
+            )
+        elif order["state"] == "breach_end":
+            self.incomes.append(
+                _income_row(
+                    order,
+                    end_date,
+                    "breach_end",
+                    order["amount"] * 0.6,
+                    order["updated_at"],
+                )
+            )
+
+    def _add_operation(self, operation_type: str, order: Dict, amount: float, ts: str):
+        data = {
+            "amount": round(amount, 2),
+            "order_id": order["order_id"],
+            "group_id": order["group_id"],
+        }
+        self.operations.append(
+            (
+                BENCH_USER_ID,
+                order["chat_id"],
+                operation_type,
+                json.dumps(data, ensure_ascii=False),
+                ts,
+            )
+        )
+
+    def _generate_expenses(self) -> None:
+        day = self.start
+        while day <= self.as_of:
+            for expense_type in ("company", "other"):
+                if self.rng.random() < 0.6:
+                    amount = float(self.rng.randrange(100, 5000))
+                    self.expenses.append(
+                        (f"{day:%Y-%m-%d}", expense_type, amount, "bench")
+                    )
+            day += timedelta(days=1)
+
+    def generate(self) -> None:
+        """生成全部数据（只在内存中）"""
+        groups = group_ids(self.spec)
+        for seq in range(1, self.spec.orders + 1):
+            self._generate_order(seq, groups)
+        self._generate_expenses()
+
+    # ----- 写入数据库 -----
+
+    def write(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """写入数据库（一个事务），返回各表行数"""
+        from db.module3_order.orders_basic import (
+            _ensure_classified_table_exists, _get_classified_table_names)
+
+        cursor = conn.cursor()
+        order_columns = ", ".join(ORDER_COLUMNS)
+        order_rows = [
+            tuple(order[column] for column in ORDER_COLUMNS) for order in self.orders
+        ]
+
+        # 主表和分类表（与 create_order_in_classified_tables 写入的表一致）
+        classified = defaultdict(list)
+        for order, row in zip(self.orders, order_rows):
+            for table in _get_classified_table_names(order):
+                classified[table].append(row)
+        # 主表金额以整数分存储，分类表仍为 REAL
+        amount_index = ORDER_COLUMNS.index("amount")
+        cursor.executemany(
+            f"INSERT INTO orders ({order_columns.replace('amount', 'amount_cents')}) "
+            "VALUES (?,?,?,?,?,?,?,?,?,?)",
+            [_with_cents(row, amount_index) for row in order_rows],
+        )
+        for table, rows in classified.items():
+            _ensure_classified_table_exists(cursor, table)
+            cursor.executemany(
+                f"INSERT INTO {table} ({order_columns}) "  # nosec B608
+                "VALUES (?,?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+
+        cursor.executemany(
+            """
+            INSERT INTO income_records (
+                date, type, amount_cents, group_id, order_id, order_date,
+                customer, weekday_group, note, created_by, created_at, is_undone
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+            """,
+            [_with_cents(row, 2) for row in self.incomes],
+        )
+        cursor.executemany(
+            "INSERT INTO expense_records (date, type, amount_cents, note) "
+            "VALUES (?, ?, ?, ?)",
+            [_with_cents(row, 2) for row in self.expenses],
+        )
+        cursor.executemany(
+            """
+            INSERT INTO operation_history
+                (user_id, chat_id, operation_type, operation_data, is_undone,
+                 created_at)
+            VALUES (?, ?, ?, ?, 0, ?)
+            """,
+            self.operations,
+        )
+        cursor.execute(
+            "INSERT OR IGNORE INTO authorized_users (user_id) VALUES (?)",
+            (BENCH_USER_ID,),
+        )
+        _rebuild_aggregates(cursor)
+        conn.commit()
+
+        return {
+            "orders": len(self.orders),
+            "income_records": len(self.incomes),
+            "expense_records": len(self.expenses),
+            "operation_history": len(self.operations),
+        }
+
+
+def _with_cents(row: tuple, index: int) -> tuple:
+    """把行中指定位置的金额转换为整数分"""
+    return row[:index] + (to_cents(row[index]),) + row[index + 1 :]
+
+
+# 统计字段 -> (计数表达式, 金额表达式（整数分）)，基于 orders 表
+_ORDER_AGGREGATES = {
+    "valid": (
+        "SUM(state IN ('normal', 'overdue'))",
+        "SUM(CASE WHEN state IN ('normal', 'overdue') THEN amount_cents ELSE 0 END)",
+    ),
+    "new_clients": (
+        "SUM(customer = 'A')",
+        "SUM(CASE WHEN customer = 'A' THEN amount_cents ELSE 0 END)",
+    ),
+    "old_clients": (
+        "SUM(customer = 'B')",
+        "SUM(CASE WHEN customer = 'B' THEN amount_cents ELSE 0 END)",
+    ),
+    "completed": (
+        "SUM(state = 'end')",
+        "SUM(CASE WHEN state = 'end' THEN amount_cents ELSE 0 END)",
+    ),
+    "breach": (
+        "SUM(state = 'breach')",
+        "SUM(CASE WHEN state = 'breach' THEN amount_cents ELSE 0 END)",
+    ),
+    "breach_end": (
+        "SUM(state = 'breach_end')",
+        "SUM(CASE WHEN state = 'breach_end' THEN amount_cents ELSE 0 END)",
+    ),
+    "overdue": (
+        "SUM(state = 'overdue')",
+        "SUM(CASE WHEN state = 'overdue' THEN amount_cents ELSE 0 END)",
+    ),
+}
+
+
+def _aggregate_columns() -> str:
+    """financial_data / grouped_data 的计数和金额列"""
+    columns = []
+    for field in _ORDER_AGGREGATES:
+        count_column = "valid_orders" if field == "valid" else f"{field}_orders"
+        if field in ("new_clients", "old_clients"):
+            count_column = field
+        columns += [count_column, f"{field}_amount_cents"]
+    return ", ".join(columns)
+
+
+def _aggregate_values() -> str:
+    return ", ".join(
+        f"COALESCE({count}, 0), COALESCE({amount}, 0)"
+        for count, amount in _ORDER_AGGREGATES.values()
+    )
+
+
+def _rebuild_aggregates(cursor: sqlite3.Cursor) -> None:
+    """按明细汇总 financial_data / grouped_data / daily_data"""
+    interest = (
+        "(SELECT COALESCE(SUM(amount_cents), 0) FROM income_records "
+        "WHERE type = 'interest'{group_filter})"
+    )
+    columns = _aggregate_columns()
+    values = _aggregate_values()
+
+    cursor.execute("DELETE FROM financial_data")
+    cursor.execute(
+        f"INSERT INTO financial_data (id, {columns}, interest_cents, "
+        f"liquid_funds_cents) "
+        f"SELECT 1, {values}, {interest.format(group_filter='')}, "
+        f"? - SUM(CASE WHEN state IN ('normal', 'overdue', 'breach') "
+        f"THEN amount_cents ELSE 0 END) + {interest.format(group_filter='')} "
+        f"FROM orders",
+        (to_cents(INITIAL_LIQUID_FUNDS),),
+    )
+
+    cursor.execute("DELETE FROM grouped_data")
+    group_interest = interest.format(
+        group_filter=" AND income_records.group_id = orders.group_id"
+    )
+    cursor.execute(
+        f"INSERT INTO grouped_data (group_id, {columns}, interest_cents) "
+        f"SELECT group_id, {values}, {group_interest} "
+        f"FROM orders GROUP BY group_id"
+    )
+
+    # 日结数据：每个日期一行全局数据（group_id 为 NULL），每个归属ID一行
+    cursor.execute("DELETE FROM daily_data")
+    for group_column in ("NULL", "group_id"):
+        cursor.execute(
+            f"""
+            INSERT INTO daily_data (
+                date, group_id, new_clients, new_clients_amount_cents,
+                old_clients, old_clients_amount_cents, interest_cents,
+                completed_orders, completed_amount_cents,
+                breach_end_orders, breach_end_amount_cents
+            )
+            SELECT day, grp, SUM(nc), SUM(nca), SUM(oc), SUM(oca), SUM(i),
+                   SUM(cc), SUM(ca), SUM(bc), SUM(ba)
+            FROM (
+                SELECT substr(date, 1, 10) AS day, {group_column} AS grp,
+                       customer = 'A' AS nc,
+                       CASE WHEN customer = 'A' THEN amount_cents ELSE 0 END AS nca,
+                       customer = 'B' AS oc,
+                       CASE WHEN customer = 'B' THEN amount_cents ELSE 0 END AS oca,
+                       0 AS i, 0 AS cc, 0 AS ca, 0 AS bc, 0 AS ba
+                FROM orders
+                UNION ALL
+                SELECT date, {group_column}, 0, 0, 0, 0,
+                       CASE WHEN type = 'interest' THEN amount_cents ELSE 0 END,
+                       type = 'completed',
+                       CASE WHEN type = 'completed' THEN amount_cents ELSE 0 END,
+                       type = 'breach_end',
+                       CASE WHEN type = 'breach_end' THEN amount_cents ELSE 0 END
+                FROM income_records
+            )
+            GROUP BY day, grp
+            """  # nosec B608
+        )
+    cursor.execute(
+        """
+        UPDATE daily_data SET
+            company_expenses_cents = (
+                SELECT COALESCE(SUM(amount_cents), 0) FROM expense_records e
+                WHERE e.date = daily_data.date AND e.type = 'company'),
+            other_expenses_cents = (
+                SELECT COALESCE(SUM(amount_cents), 0) FROM expense_records e
+                WHERE e.date = daily_data.date AND e.type = 'other')
+        WHERE group_id IS NULL
+        """
+    )
+
+
+def generate_loan_book(db_path: str, spec: LoanBookSpec) -> Dict[str, int]:
+    """生成账本并写入数据库（表结构需已初始化）
+
+    Args:
+        db_path: 数据库文件路径
+        spec: 账本规模
+
+    Returns:
+        各表写入的行数
+    """
+    generator = LoanBookGenerator(spec)
+    generator.generate()
+    conn = sqlite3.connect(db_path)
+    try:
+        return generator.write(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,401 @@
+"""Update 回放压测
+
+把录制的或生成的 Telegram Update JSON 按指定速率投入 Application 的 update_queue，
+Application 与 main.py 中的配置相同（register_all_handlers），出站请求由
+FakeBotAPI 在本地应答（可注入延迟、错误和 RetryAfter）。报告：
+- 吞吐量（updates/s）和每个 Update 从入队到处理完成的延迟百分位数（按类型）
+- 每个处理器的耗时百分位数（lazy_handler 记录的 handler:函数名）
+- 出站调用次数、注入的错误 / 限流次数、处理器抛出的异常数
+- 数据库函数调用次数
+
+生成的 Update 类型（--mix 指定比例）：
+- amount: 群组内授权用户发送 "+金额"（订单利息）
+- create: 群组内 /create（按群名创建订单，每次使用新群组）
+- report: 管理员私聊点击报表按钮（report_view_today_ALL / report_view_month_ALL）
+
+录制的 Update 每行一个 JSON（与 Bot API getUpdates 返回的 Update 对象相同）。
+"""
+
+# 标准库
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+# 第三方库
+from telegram import Update
+from telegram.ext import Application, ContextTypes, SimpleUpdateProcessor
+
+# 本地模块
+from benchmarks.fake_bot_api import FakeBotAPI, FaultConfig
+from benchmarks.generator import BENCH_USER_ID, LoanBookSpec, resolve_as_of
+from benchmarks.runner import percentile, prepare_database
+from benchmarks.scenarios import load_context
+
+# 报表回调使用的管理员ID（与 environment.BENCH_ENV 的 ADMIN_USER_IDS 一致）
+ADMIN_USER_ID = 1
+
+# 默认的 Update 类型比例
+DEFAULT_MIX = {"amount": 6, "create": 2, "report": 2}
+
+# 报表按钮
+_REPORT_CALLBACKS = ("report_view_today_ALL", "report_view_month_ALL")
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """解析 "amount=6,create=2,report=2" 格式的比例"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"未知的 Update 类型: {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+class UpdateFactory:
+    """生成 Update JSON"""
+
+    def __init__(self, rng: random.Random, as_of: date, order_chat_ids: List[int]):
+        self.rng = rng
+        self.as_of = as_of
+        self.order_chat_ids = order_chat_ids
+        self._message_ids = itertools.count(1)
+        self._create_seq = itertools.count()
+
+    def _message(
+        self, chat: Dict[str, Any], user_id: int, text: str, entities=None
+    ) -> Dict[str, Any]:
+        message = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": chat,
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+            "text": text,
+        }
+        if entities:
+            message["entities"] = entities
+        return message
+
+    def amount(self, update_id: int) -> Dict[str, Any]:
+        chat_id = self.rng.choice(self.order_chat_ids)
+        chat = {"id": chat_id, "type": "supergroup", "title": f"group{-chat_id}"}
+        text = f"+{self.rng.randrange(1, 20) * 100}"
+        return {
+            "update_id": update_id,
+            "message": self._message(chat, BENCH_USER_ID, text),
+        }
+
+    def create(self, update_id: int) -> Dict[str, Any]:
+        # 群名格式 YYMMDDNNKK：每天最多 100 个序号，用完后换前一天
+        seq = next(self._create_seq)
+        order_date = self.as_of - timedelta(days=seq // 100)
+        amount_k = self.rng.randrange(10, 99)
+        title = f"{order_date:%y%m%d}{seq % 100:02d}{amount_k:02d}"
+        chat = {"id": -(2_000_000_000 + seq), "type": "supergroup", "title": title}
+        entities = [{"type": "bot_command", "offset": 0, "length": 7}]
+        return {
+            "update_id": update_id,
+            "message": self._message(chat, BENCH_USER_ID, "/create", entities),
+        }
+
+    def report(self, update_id: int) -> Dict[str, Any]:
+        chat = {"id": ADMIN_USER_ID, "type": "private", "first_name": "admin"}
+        message = self._message(chat, ADMIN_USER_ID, "报表")
+        message["from"] = {"id": 999_000_001, "is_bot": True, "first_name": "bot"}
+        return {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(update_id),
+                "from": {"id": ADMIN_USER_ID, "is_bot": False, "first_name": "admin"},
+                "chat_instance": str(ADMIN_USER_ID),
+                "message": message,
+                "data": self.rng.choice(_REPORT_CALLBACKS),
+            },
+        }
+
+    def build(self, kind: str, update_id: int) -> Dict[str, Any]:
+        return getattr(self, kind)(update_id)
+
+
+def generate_updates(
+    factory: UpdateFactory, count: int, mix: Optional[Dict[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """按比例生成 Update JSON 列表"""
+    kinds, weights = zip(*(mix or DEFAULT_MIX).items())
+    return [
+        factory.build(factory.rng.choices(kinds, weights)[0], update_id)
+        for update_id in range(1, count + 1)
+    ]
+
+
+def load_updates(path: str) -> List[Dict[str, Any]]:
+    """读取录制的 Update（JSON 数组或每行一个 JSON）"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def save_updates(path: str, updates: Iterable[Dict[str, Any]]) -> None:
+    """保存 Update 为每行一个 JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        for update in updates:
+            f.write(json.dumps(update, ensure_ascii=False) + "\n")
+
+
+def update_kind(update: Update) -> str:
+    """Update 的类型标签（用于分组统计）"""
+    if update.callback_query:
+        data = update.callback_query.data or ""
+        return f"callback:{data.rsplit('_', 1)[0]}"
+    message = update.effective_message
+    if message and message.text:
+        if message.text.startswith("/"):
+            return message.text.split()[0].split("@")[0]
+        if message.text.startswith("+"):
+            return "+amount"
+        return "text"
+    return "other"
+
+
+class TimedUpdateProcessor(SimpleUpdateProcessor):
+    """记录每个 Update 从入队到处理完成耗时的处理器"""
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        self.enqueued_at: Dict[int, float] = {}
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.processing: Dict[str, List[float]] = defaultdict(list)
+
+    async def do_process_update(self, update, coroutine) -> None:
+        started = time.perf_counter()
+        try:
+            await coroutine
+        finally:
+            finished = time.perf_counter()
+            if isinstance(update, Update):
+                kind = update_kind(update)
+                enqueued = self.enqueued_at.pop(update.update_id, started)
+                self.latencies[kind].append(finished - enqueued)
+                self.processing[kind].append(finished - started)
+
+
+def _summary(durations: List[float]) -> Dict[str, float]:
+    values = sorted(duration * 1000 for duration in durations)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 3),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3),
+    }
+
+
+def build_application(
+    api: FakeBotAPI, processor: TimedUpdateProcessor
+) -> Application:
+    """按 main.py 的配置创建 Application（出站请求走 FakeBotAPI）"""
+    from main import register_all_handlers
+
+    application = (
+        Application.builder()
+        .token("0:replay")
+        .request(api)
+        .get_updates_request(FakeBotAPI())
+        .concurrent_updates(processor)
+        .updater(None)
+        .build()
+    )
+    register_all_handlers(application)
+    return application
+
+
+async def replay_updates(
+    updates: List[Dict[str, Any]],
+    rate: float = 0.0,
+    concurrency: int = 1,
+    faults: Optional[FaultConfig] = None,
+) -> Dict[str, Any]:
+    """回放 Update 并返回统计结果
+
+    Args:
+        updates: Update JSON 列表
+        rate: 每秒投入的 Update 数，0 表示不限速
+        concurrency: 同时处理的 Update 数（Application.concurrent_updates）
+        faults: 出站请求的故障注入配置
+
+    Returns:
+        统计结果字典
+    """
+    from utils.lazy_handlers import preload_handlers
+    from utils.performance_monitor import (get_performance_stats,
+                                           reset_performance_stats)
+
+    api = FakeBotAPI(faults)
+    processor = TimedUpdateProcessor(concurrency)
+    application = build_application(api, processor)
+
+    handler_errors: Counter = Counter()
+
+    async def _count_error(update: object, context: ContextTypes.DEFAULT_TYPE):
+        kind = update_kind(update) if isinstance(update, Update) else "other"
+        handler_errors[f"{kind}: {type(context.error).__name__}"] += 1
+
+    application.add_error_handler(_count_error)
+
+    # 处理器模块提前导入，避免首个 Update 的导入耗时计入结果
+    preload_handlers(include_heavy=True)
+
+    await application.initialize()
+    await application.start()
+    api.reset()
+    reset_performance_stats()
+
+    started = time.perf_counter()
+    try:
+        for index, data in enumerate(updates):
+            if rate:
+                delay = started + index / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            update = Update.de_json(data, application.bot)
+            processor.enqueued_at[update.update_id] = time.perf_counter()
+            await application.update_queue.put(update)
+        await application.update_queue.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        await application.stop()
+        await application.shutdown()
+
+    stats = get_performance_stats()
+    handlers = {
+        operation[len("handler:") :]: {
+            **_summary_from_monitor(item),
+            "errors": item.get("errors", 0),
+        }
+        for operation, item in sorted(stats.items())
+        if operation.startswith("handler:") and item["count"]
+    }
+    db_calls = sum(
+        item["count"]
+        for operation, item in stats.items()
+        if operation.startswith("db:")
+    )
+
+    return {
+        "updates": len(updates),
+        "elapsed_seconds": round(elapsed, 3),
+        "updates_per_second": round(len(updates) / elapsed, 2) if elapsed else 0.0,
+        "rate": rate,
+        "concurrency": concurrency,
+        "faults": asdict(faults or FaultConfig()),
+        "latency": {
+            kind: _summary(values)
+            for kind, values in sorted(processor.latencies.items())
+        },
+        "processing": {
+            kind: _summary(values)
+            for kind, values in sorted(processor.processing.items())
+        },
+        "handlers": handlers,
+        "handler_errors": dict(handler_errors),
+        "outbound": api.stats(),
+        "db_calls": db_calls,
+    }
+
+
+def _summary_from_monitor(item: Dict[str, Any]) -> Dict[str, float]:
+    """performance_monitor 统计（秒）转为毫秒"""
+    return {
+        "count": item["count"],
+        "mean_ms": round(item["avg_time"] * 1000, 3),
+        "p50_ms": round(item["p50"] * 1000, 3),
+        "p95_ms": round(item["p95"] * 1000, 3),
+        "p99_ms": round(item["p99"] * 1000, 3),
+        "max_ms": round(item["max_time"] * 1000, 3),
+    }
+
+
+async def run_replay(
+    spec: LoanBookSpec,
+    count: int = 500,
+    mix: Optional[Dict[str, int]] = None,
+    input_path: Optional[str] = None,
+    save_path: Optional[str] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """生成账本后回放 Update（录制文件或按比例生成）
+
+    调用前需要先 prepare_environment；其余参数见 replay_updates。
+    """
+    generated, _ = prepare_database(spec)
+    as_of = resolve_as_of(spec)
+
+    if input_path:
+        updates = load_updates(input_path)
+    else:
+        context = await load_context(spec, as_of)
+        factory = UpdateFactory(
+            random.Random(spec.seed + 2), as_of, context.normal_chat_ids
+        )
+        updates = generate_updates(factory, count, mix)
+    if save_path:
+        save_updates(save_path, updates)
+
+    results = await replay_updates(updates, **kwargs)
+    results["meta"] = {
+        "spec": {**spec.to_dict(), "as_of": f"{as_of:%Y-%m-%d}"},
+        "generated": generated,
+        "input": input_path,
+        "mix": None if input_path else (mix or DEFAULT_MIX),
+    }
+    return results
+
+
+def format_replay_results(results: Dict[str, Any]) -> str:
+    """回放结果文本摘要"""
+    outbound = results["outbound"]
+    lines = [
+        f"回放 {results['updates']} 个 Update，耗时 {results['elapsed_seconds']}s，"
+        f"{results['updates_per_second']} updates/s"
+        f"（并发 {results['concurrency']}，速率 {results['rate'] or '不限'}）",
+        f"{'类型':<28}{'数量':>6}{'p50ms':>10}{'p95ms':>10}{'p99ms':>10}",
+    ]
+    for kind, item in results["latency"].items():
+        lines.append(
+            f"{kind:<28}{item['count']:>6}{item['p50_ms']:>10.2f}"
+            f"{item['p95_ms']:>10.2f}{item['p99_ms']:>10.2f}"
+        )
+    lines.append(f"{'处理器':<28}{'次数':>6}{'p50ms':>10}{'p95ms':>10}{'错误':>10}")
+    for name, item in results["handlers"].items():
+        lines.append(
+            f"{name:<28}{item['count']:>6}{item['p50_ms']:>10.2f}"
+            f"{item['p95_ms']:>10.2f}{item['errors']:>10}"
+        )
+    lines.append(
+        f"出站调用 {outbound['total_calls']} 次: "
+        + ", ".join(f"{name}={count}" for name, count in outbound["calls"].items())
+    )
+    if outbound["failures"] or outbound["retry_after"]:
+        lines.append(
+            f"注入错误 {sum(outbound['failures'].values())} 次，"
+            f"限流 {sum(outbound['retry_after'].values())} 次"
+        )
+    if results["handler_errors"]:
+        lines.append(
+            "处理器异常: "
+            + ", ".join(f"{k}={v}" for k, v in results["handler_errors"].items())
+        )
+    lines.append(f"数据库调用 {results['db_calls']} 次")
+    return "\n".join(lines)
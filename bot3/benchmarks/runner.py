@@ -0,0 +1,236 @@
+"""基准测试执行模块
+
+在临时数据库上生成账本并依次执行场景，每个场景先预热再计时，记录：
+- 每次迭代耗时的平均值 / p50 / p95 / 最小 / 最大（毫秒）
+- 每次迭代执行的 SQL 语句数、涉及的语句指纹数和全表扫描的指纹
+- 每次迭代的数据库函数调用次数（db_query / db_transaction）
+
+SQL 语句数和数据库调用次数与机器性能无关，可以精确比较数据访问方式的变化；
+耗时受机器影响，只在同一台机器上的两次运行之间比较。
+"""
+
+# 标准库
+import asyncio
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 本地模块
+from benchmarks.environment import PROJECT_ROOT
+from benchmarks.generator import LoanBookSpec, generate_loan_book, resolve_as_of
+from benchmarks.scenarios import SCENARIOS, BenchContext, load_context
+
+# 结果格式版本（compare 只比较同一版本的结果）
+RESULT_VERSION = 1
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """最近秩百分位数"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _timing_summary(durations: List[float]) -> Dict[str, float]:
+    """耗时汇总（毫秒）"""
+    values = sorted(duration * 1000 for duration in durations)
+    return {
+        "mean_ms": round(sum(values) / len(values), 3),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "min_ms": round(values[0], 3),
+        "max_ms": round(values[-1], 3),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(  # nosec B603 B607
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _db_calls() -> Dict[str, int]:
+    """当前各数据库函数的调用次数"""
+    from utils.performance_monitor import get_performance_stats
+
+    return {
+        operation[3:]: stats["count"]
+        for operation, stats in get_performance_stats().items()
+        if operation.startswith("db:") and stats["count"]
+    }
+
+
+async def _run_scenario(
+    name: str, context: BenchContext, iterations: int, warmup: int
+) -> Dict:
+    """执行一个场景，返回统计结果"""
+    from utils.performance_monitor import reset_performance_stats
+    from utils.sql_profiler import get_sql_profile_report, reset_sql_profile
+
+    scenario = SCENARIOS[name]
+    for _ in range(warmup):
+        await scenario.run(context)
+
+    reset_sql_profile()
+    reset_performance_stats()
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await scenario.run(context)
+        durations.append(time.perf_counter() - started)
+
+    report = get_sql_profile_report("count", limit=20)
+    db_calls = _db_calls()
+    return {
+        "description": scenario.description,
+        "iterations": iterations,
+        **_timing_summary(durations),
+        "sql_per_iteration": round(report["total_count"] / iterations, 2),
+        "fingerprints": report["fingerprint_count"],
+        "full_scans": report["full_scans"],
+        "db_calls_per_iteration": round(sum(db_calls.values()) / iterations, 2),
+        "db_calls": dict(sorted(db_calls.items())),
+        "top_statements": [
+            {
+                "fingerprint": stmt["fingerprint"][:200],
+                "count": stmt["count"],
+                "total_ms": round(stmt["total_time"] * 1000, 3),
+            }
+            for stmt in report["statements"][:5]
+        ],
+    }
+
+
+def _row_counts(db_path: str) -> Dict[str, int]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in (
+                "orders",
+                "income_records",
+                "expense_records",
+                "operation_history",
+                "daily_summary",
+            )
+        }
+    finally:
+        conn.close()
+
+
+def prepare_database(spec: LoanBookSpec) -> Tuple[Dict[str, int], float]:
+    """初始化表结构并生成账本，返回 (各表写入行数, 耗时秒数)"""
+    import init_db
+
+    started = time.perf_counter()
+    init_db.init_database()
+    generated = generate_loan_book(init_db.DB_NAME, spec)
+    return generated, time.perf_counter() - started
+
+
+async def run_benchmarks(
+    spec: LoanBookSpec,
+    scenarios: Optional[Iterable[str]] = None,
+    iterations: int = 20,
+    warmup: int = 2,
+) -> Dict:
+    """生成账本并执行场景
+
+    调用前需要先 prepare_environment（数据库位于 DATA_DIR 下）。
+
+    Args:
+        spec: 账本规模
+        scenarios: 要执行的场景名称，None 表示全部
+        iterations: 每个场景的计时迭代次数（耗时场景为其 1/4，至少 3 次）
+        warmup: 每个场景的预热次数
+
+    Returns:
+        结果字典（meta + scenarios）
+    """
+    import init_db
+    from utils.sql_profiler import enable_sql_profiler
+
+    names = list(scenarios or SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"未知场景: {', '.join(unknown)}")
+
+    # 开启后新建的连接才会被统计，必须在任何数据库访问之前开启
+    enable_sql_profiler()
+
+    generated, generate_seconds = prepare_database(spec)
+
+    as_of = resolve_as_of(spec)
+    context = await load_context(spec, as_of)
+
+    results = {}
+    for name in names:
+        count = iterations
+        if SCENARIOS[name].heavy:
+            count = max(3, iterations // 4)
+        results[name] = await _run_scenario(name, context, count, warmup)
+
+    return {
+        "version": RESULT_VERSION,
+        "meta": {
+            "spec": {**spec.to_dict(), "as_of": f"{as_of:%Y-%m-%d}"},
+            "generated": generated,
+            "rows_after_run": _row_counts(init_db.DB_NAME),
+            "generate_seconds": round(generate_seconds, 3),
+            "iterations": iterations,
+            "warmup": warmup,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "git_commit": _git_commit(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "db_path": init_db.DB_NAME,
+        },
+        "scenarios": results,
+    }
+
+
+def run(spec: LoanBookSpec, **kwargs) -> Dict:
+    """同步执行入口"""
+    return asyncio.run(run_benchmarks(spec, **kwargs))
+
+
+def format_results(results: Dict) -> str:
+    """结果文本摘要"""
+    meta = results["meta"]
+    lines = [
+        f"账本: {meta['generated']['orders']} 订单 / "
+        f"{meta['generated']['income_records']} 收入明细, "
+        f"生成 {meta['generate_seconds']}s, SQLite {meta['sqlite']}",
+        f"{'场景':<22}{'次数':>5}{'平均ms':>10}{'p95ms':>10}"
+        f"{'SQL/次':>9}{'调用/次':>9}{'全表扫描':>8}",
+    ]
+    for name, item in results["scenarios"].items():
+        lines.append(
+            f"{name:<22}{item['iterations']:>5}{item['mean_ms']:>10.2f}"
+            f"{item['p95_ms']:>10.2f}{item['sql_per_iteration']:>9}"
+            f"{item['db_calls_per_iteration']:>9}{len(item['full_scans']):>8}"
+        )
+    return "\n".join(lines)
+
+
+def remove_database(data_dir: str) -> None:
+    """删除临时数据库文件"""
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        path = os.path.join(data_dir, f"loan_bot.db{suffix}")
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,219 @@
+"""基准测试场景
+
+每个场景对应一条热点路径，直接调用命令处理器背后的服务 / 数据库入口
+（不经过 Telegram Update），每次迭代执行一次完整的业务操作：
+
+- create_order: 创建订单（主表 + 分类表 + 统计）
+- interest: 订单利息收入（收入明细 + 统计 + 操作历史）
+- state_change: 订单状态 normal -> overdue -> normal
+- report: /report 全局报表和归属报表文本
+- income_pages: 收入明细查询和前两页报表
+- excel_orders: 日切订单总表 Excel
+- excel_daily_changes: 日切数据变化 Excel
+- fix_statistics: /fix_statistics 全量重算统计
+- incremental_report: 增量订单报表（明细查询 + Excel）
+
+写操作会改变数据库，后续迭代在改变后的数据上执行；同一 seed 的两次运行
+执行完全相同的操作序列，结果可以直接比较。
+"""
+
+# 标准库
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# 本地模块
+from benchmarks.generator import (BENCH_USER_ID, LoanBookSpec, build_order,
+                                  group_ids)
+
+
+@dataclass
+class BenchContext:
+    """场景共享的运行状态"""
+
+    spec: LoanBookSpec
+    as_of: date
+    rng: random.Random
+    # 新建订单的序号（接在生成的订单之后）
+    next_seq: int = 0
+    # 可用于利息 / 状态变更的正常订单（chat_id 列表）
+    normal_chat_ids: List[int] = field(default_factory=list)
+
+    @property
+    def as_of_str(self) -> str:
+        return f"{self.as_of:%Y-%m-%d}"
+
+    @property
+    def month_start(self) -> str:
+        return f"{self.as_of:%Y-%m}-01"
+
+    def pick_chat_id(self) -> int:
+        return self.rng.choice(self.normal_chat_ids)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """一个基准测试场景"""
+
+    name: str
+    description: str
+    run: Callable[[BenchContext], Awaitable[None]]
+    # 是否为耗时场景（迭代次数减少）
+    heavy: bool = False
+
+
+def _remove_file(path: Optional[str]) -> None:
+    """删除场景生成的报表文件"""
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+async def load_context(spec: LoanBookSpec, as_of: date) -> BenchContext:
+    """从数据库加载场景需要的订单池"""
+    import db_operations
+
+    orders = await db_operations.search_orders_by_state("normal")
+    context = BenchContext(
+        spec=spec,
+        as_of=as_of,
+        rng=random.Random(spec.seed + 1),
+        next_seq=spec.orders + 1,
+        normal_chat_ids=sorted(order["chat_id"] for order in orders),
+    )
+    if not context.normal_chat_ids:
+        raise RuntimeError("生成的数据中没有正常状态的订单")
+    return context
+
+
+# ----- 场景 -----
+
+
+async def _create_order(ctx: BenchContext) -> None:
+    import db_operations
+    from utils.order_creation_statistics import update_statistics_for_new_order
+
+    order = build_order(
+        ctx.rng,
+        ctx.next_seq,
+        ctx.as_of,
+        ctx.rng.choice(group_ids(ctx.spec)),
+        "normal",
+    )
+    ctx.next_seq += 1
+    if not await db_operations.create_order_in_classified_tables(order):
+        raise RuntimeError(f"创建订单失败: {order['order_id']}")
+    await update_statistics_for_new_order(
+        "normal", order["amount"], order["group_id"], order["customer"], False
+    )
+
+
+async def _interest(ctx: BenchContext) -> None:
+    import db_operations
+    from services.module3_order.amount_service import AmountService
+
+    order = await db_operations.get_order_by_chat_id(ctx.pick_chat_id())
+    success, error, _ = await AmountService.process_interest(
+        order, 500.0, BENCH_USER_ID
+    )
+    if not success:
+        raise RuntimeError(f"利息收入失败: {error}")
+
+
+async def _state_change(ctx: BenchContext) -> None:
+    from services.module3_order.order_service import OrderService
+
+    chat_id = ctx.pick_chat_id()
+    for new_state, old_state in (("overdue", "normal"), ("normal", "overdue")):
+        success, error, _ = await OrderService.change_order_state(
+            chat_id=chat_id,
+            new_state=new_state,
+            allowed_old_states=(old_state,),
+            user_id=BENCH_USER_ID,
+        )
+        if not success:
+            raise RuntimeError(f"状态变更失败: {error}")
+
+
+async def _report(ctx: BenchContext) -> None:
+    from services.module5_data.report_service import ReportService
+
+    start = f"{ctx.as_of - timedelta(days=30):%Y-%m-%d}"
+    await ReportService.generate_report_text("today", ctx.as_of_str, ctx.as_of_str)
+    await ReportService.generate_report_text("query", start, ctx.as_of_str)
+    await ReportService.generate_report_text(
+        "query", start, ctx.as_of_str, group_ids(ctx.spec)[0]
+    )
+
+
+async def _income_pages(ctx: BenchContext) -> None:
+    import db_operations
+    from handlers.module2_finance.income_handlers import generate_income_report
+
+    records = await db_operations.get_income_records(
+        start_date=ctx.month_start, end_date=ctx.as_of_str
+    )
+    await generate_income_report(records, ctx.month_start, ctx.as_of_str, page=1)
+    await generate_income_report(
+        records, ctx.month_start, ctx.as_of_str, page=2, income_type="interest"
+    )
+
+
+async def _excel_orders(ctx: BenchContext) -> None:
+    from utils.schedule_daily_report_excel import _generate_orders_excel
+
+    path = await _generate_orders_excel(ctx.as_of_str)
+    if not path:
+        raise RuntimeError("生成订单总表失败")
+    _remove_file(path)
+
+
+async def _excel_daily_changes(ctx: BenchContext) -> None:
+    from utils.excel_export import export_daily_changes_to_excel
+
+    _remove_file(await export_daily_changes_to_excel(ctx.as_of_str))
+
+
+async def _fix_statistics(ctx: BenchContext) -> None:
+    import db_operations
+    from handlers.module5_data.command_handlers_stats import (
+        _fix_global_statistics, _fix_group_statistics)
+
+    all_orders = await db_operations.search_orders_advanced_all_states({})
+    await _fix_group_statistics(all_orders)
+    await _fix_global_statistics(all_orders)
+
+
+async def _incremental_report(ctx: BenchContext) -> None:
+    import db_operations
+    from utils.excel_export import export_incremental_orders_report_to_excel
+
+    baseline = f"{ctx.as_of - timedelta(days=30):%Y-%m-%d}"
+    orders = await db_operations.get_incremental_orders_with_details(baseline)
+    expenses = await db_operations.get_expense_records(baseline, ctx.as_of_str)
+    _remove_file(
+        await export_incremental_orders_report_to_excel(
+            baseline, ctx.as_of_str, orders, expenses
+        )
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("create_order", "创建订单", _create_order),
+        Scenario("interest", "订单利息收入", _interest),
+        Scenario("state_change", "订单状态变更（往返）", _state_change),
+        Scenario("report", "报表文本（今日 / 30天 / 归属）", _report),
+        Scenario("income_pages", "本月收入明细分页", _income_pages),
+        Scenario("excel_orders", "订单总表 Excel", _excel_orders, heavy=True),
+        Scenario(
+            "excel_daily_changes", "日切数据变化 Excel", _excel_daily_changes
+        ),
+        Scenario("fix_statistics", "全量修复统计", _fix_statistics, heavy=True),
+        Scenario(
+            "incremental_report", "增量订单报表", _incremental_report, heavy=True
+        ),
+    )
+}
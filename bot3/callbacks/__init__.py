@@ -10,22 +10,36 @@ project_root = Path(__file__).parent.parent.absolute()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-# 群组消息回调
-from .group_message_callbacks import \
-    handle_group_message_callback  # noqa: E402
-# 导入所有回调处理器
-# 主回调（路由）
-from .main_callback import button_callback  # noqa: E402
-# 订单回调
-from .order_callbacks import handle_order_action_callback  # noqa: E402
-# 支付账户回调
-from .payment_callbacks import handle_payment_callback  # noqa: E402
-# 报表回调
-from .report_callbacks import handle_report_callback  # noqa: E402
-# 定时播报回调
-from .schedule_callbacks import handle_schedule_callback  # noqa: E402
-# 搜索回调
-from .search_callbacks import handle_search_callback  # noqa: E402
+# 回调处理器按需导入：访问 callbacks.xxx 时才加载对应子模块
+_LAZY_EXPORTS = {
+    # 主回调（路由）
+    "button_callback": ".main_callback",
+    # 群组消息回调
+    "handle_group_message_callback": ".group_message_callbacks",
+    # 订单回调
+    "handle_order_action_callback": ".order_callbacks",
+    # 支付账户回调
+    "handle_payment_callback": ".payment_callbacks",
+    # 报表回调
+    "handle_report_callback": ".report_callbacks",
+    # 定时播报回调
+    "handle_schedule_callback": ".schedule_callbacks",
+    # 搜索回调
+    "handle_search_callback": ".search_callbacks",
+}
+
+
+def __getattr__(name: str):
+    """首次访问时导入对应的回调子模块"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # 主回调（路由）
@@ -8,9 +8,10 @@ import logging
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
-from handlers.module5_data.daily_operations_handlers import (format_operation_detail,
-                                                show_daily_operations_summary)
-from handlers.data_access import (get_operations_by_date_for_callback,
+from handlers.module5_data.daily_operations_handlers import \
+    show_daily_operations_summary
+from handlers.data_access import (count_operations_by_date_for_callback,
+                                  get_operations_by_date_for_callback,
                                   record_operation_for_callback)
 from handlers.module5_data.restore_handlers import execute_restore_daily_data
 
@@ -25,61 +26,19 @@ async def handle_show_all_operations(
     await query.answer("正在加载完整记录...")
 
     try:
-        operations = await get_operations_by_date_for_callback(date)
-
-        if not operations:
-            await query.edit_message_text(f"📋 完整操作记录 ({date})\n\n暂无操作记录")
-            return
-
-        # 分段发送完整记录
-        max_length = 4000
-        current_message = f"📋 完整操作记录 ({date})\n"
-        current_message += "═══════════════════════════════════════\n"
-        current_message += f"总操作数: {len(operations)}\n\n"
-
-        message_parts = [current_message]
-        current_part = ""
+        from handlers.module5_data.daily_ops_send import (
+            build_full_operations_keyboard, send_full_operations)
+        from utils.report_stream import query_senders
 
-        for i, op in enumerate(operations, 1):
-            op_detail = f"{i}. {format_operation_detail(op)}\n"
+        total = await count_operations_by_date_for_callback(date)
 
-            if len(current_part + op_detail) > max_length:
-                message_parts.append(current_part)
-                current_part = op_detail
-            else:
-                current_part += op_detail
-
-        if current_part:
-            message_parts.append(current_part)
-
-        # 发送第一部分（带按钮）
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    "🔄 还原当天数据", callback_data=f"restore_daily_data_{date}"
-                )
-            ],
-            [
-                InlineKeyboardButton(
-                    "📊 查看汇总", callback_data=f"daily_ops_summary_{date}"
-                )
-            ],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
-        try:
-            await query.edit_message_text(message_parts[0], reply_markup=reply_markup)
-        except Exception as e:
-            logger.error(f"编辑消息失败: {e}", exc_info=True)
-            await query.answer("显示失败", show_alert=True)
+        if not total:
+            await query.edit_message_text(f"📋 完整操作记录 ({date})\n\n暂无操作记录")
             return
 
-        # 发送其余部分
-        for part in message_parts[1:]:
-            try:
-                await query.message.reply_text(part)
-            except Exception as e:
-                logger.error(f"发送消息部分失败: {e}", exc_info=True)
+        # 边读取边分段发送：第一段（带按钮）编辑当前消息，其余分段回复
+        senders = query_senders(query, build_full_operations_keyboard(date))
+        await send_full_operations(senders, date, total)
 
     except Exception as e:
         logger.error(f"显示完整操作记录失败: {e}", exc_info=True)
@@ -34,8 +34,9 @@ async def handle_start_page_private(
         "/ordertable - 订单总表（管理员）\n\n"
         "🔍 订单搜索:\n"
         "/search <类型> <值> - 搜索订单\n"
-        "  类型: order_id/group_id/customer/state/date/group\n"
-        "  示例: /search order_id A241225001\n\n"
+        "  类型: order_id/group_id/customer/state/date/group/text\n"
+        "  示例: /search order_id A241225001\n"
+        "  模糊: /search text 2412（订单号、归属ID或群名的片段）\n\n"
         "📢 定时播报:\n"
         "/schedule - 管理定时播报任务（最多3个）\n\n"
         "💳 支付账户:\n"
@@ -271,8 +272,9 @@ async def handle_start_hide_admin_commands(
         "/ordertable - 查看订单总表（管理员）\n\n"
         "🔍 订单搜索:\n"
         "/search <类型> <值> - 搜索订单\n"
-        "  类型: order_id/group_id/customer/state/date/group\n"
-        "  示例: /search order_id A241225001\n\n"
+        "  类型: order_id/group_id/customer/state/date/group/text\n"
+        "  示例: /search order_id A241225001\n"
+        "  模糊: /search text 2412（订单号、归属ID或群名的片段）\n\n"
         "📢 定时播报:\n"
         "/schedule - 管理定时播报任务（最多3个）\n\n"
         "💳 支付账户:\n"
@@ -16,9 +16,11 @@ from handlers.data_access import (get_all_group_ids_for_callback,
                                   get_income_records_for_callback)
 from constants import INCOME_TYPES
 from handlers.module2_finance.income_handlers import generate_income_report
+from handlers.module2_finance.income_report_stream import send_income_report
 from utils.callback_helpers import safe_edit_message_text
 from utils.date_helpers import get_daily_period_date
 from utils.income_helpers import get_income_type_mapping
+from utils.report_stream import query_senders
 
 logger = logging.getLogger(__name__)
 
@@ -35,54 +37,18 @@ async def handle_income_view_today(
     date = get_daily_period_date()
     records = await get_income_records_for_callback(date, date)
 
-    report, has_more, total_pages, current_type = await generate_income_report(
-        records, date, date, f"今日收入明细 ({date})", page=1, items_per_page=0
-    )
-
-    keyboard = []
-
-    # 如果有分页，添加分页按钮
-    if total_pages > 1:
-        page_buttons = []
-        type_for_callback = "None" if current_type is None else current_type
-        if 1 < total_pages:
-            page_buttons.append(
-                InlineKeyboardButton(
-                    "下一页 ▶️",
-                    callback_data=f"income_page_{type_for_callback}|2|{date}|{date}",
-                )
-            )
-        if page_buttons:
-            keyboard.append(page_buttons)
-
-    keyboard.extend(
-        [
-            [InlineKeyboardButton("📆 日期查询", callback_data="income_view_query")],
-            [
-                InlineKeyboardButton(
-                    "🔙 返回报表", callback_data="report_view_today_ALL"
-                )
-            ],
-        ]
+    keyboard = [
+        [InlineKeyboardButton("📆 日期查询", callback_data="income_view_query")],
+        [InlineKeyboardButton("🔙 返回报表", callback_data="report_view_today_ALL")],
+    ]
+    await send_income_report(
+        query_senders(query, InlineKeyboardMarkup(keyboard)),
+        records,
+        date,
+        date,
+        f"今日收入明细 ({date})",
     )
 
-    try:
-        await safe_edit_message_text(
-            query, report, reply_markup=InlineKeyboardMarkup(keyboard)
-        )
-    except Exception as e:
-        logger.error(f"编辑收入明细消息失败: {e}", exc_info=True)
-        try:
-            if query.message:
-                await query.message.reply_text(
-                    report, reply_markup=InlineKeyboardMarkup(keyboard)
-                )
-            else:
-                await query.answer("❌ 显示失败（消息不存在）", show_alert=True)
-        except Exception as e2:
-            logger.error(f"发送报表消息失败: {e2}", exc_info=True)
-            await query.answer("❌ 显示失败", show_alert=True)
-
 
 async def handle_income_view_month(
     query, user_id: int, context: ContextTypes.DEFAULT_TYPE
@@ -100,62 +66,21 @@ async def handle_income_view_month(
 
     records = await get_income_records_for_callback(start_date, end_date)
 
-    report, has_more, total_pages, current_type = await generate_income_report(
+    keyboard = [
+        [
+            InlineKeyboardButton("📄 今日收入", callback_data="income_view_today"),
+            InlineKeyboardButton("📆 日期查询", callback_data="income_view_query"),
+        ],
+        [InlineKeyboardButton("🔙 返回报表", callback_data="report_view_today_ALL")],
+    ]
+    await send_income_report(
+        query_senders(query, InlineKeyboardMarkup(keyboard)),
         records,
         start_date,
         end_date,
         f"本月收入明细 ({start_date} 至 {end_date})",
-        page=1,
-        items_per_page=0,
-    )
-
-    keyboard = []
-
-    # 如果有分页，添加分页按钮
-    if total_pages > 1:
-        page_buttons = []
-        type_for_callback = "None" if current_type is None else current_type
-        if 1 < total_pages:
-            page_buttons.append(
-                InlineKeyboardButton(
-                    "下一页 ▶️",
-                    callback_data=f"income_page_{type_for_callback}|2|{start_date}|{end_date}",
-                )
-            )
-        if page_buttons:
-            keyboard.append(page_buttons)
-
-    keyboard.extend(
-        [
-            [
-                InlineKeyboardButton("📄 今日收入", callback_data="income_view_today"),
-                InlineKeyboardButton("📆 日期查询", callback_data="income_view_query"),
-            ],
-            [
-                InlineKeyboardButton(
-                    "🔙 返回报表", callback_data="report_view_today_ALL"
-                )
-            ],
-        ]
     )
 
-    try:
-        await safe_edit_message_text(
-            query, report, reply_markup=InlineKeyboardMarkup(keyboard)
-        )
-    except Exception as e:
-        logger.error(f"编辑收入明细消息失败: {e}", exc_info=True)
-        try:
-            if query.message:
-                await query.message.reply_text(
-                    report, reply_markup=InlineKeyboardMarkup(keyboard)
-                )
-            else:
-                await query.answer("❌ 显示失败（消息不存在）", show_alert=True)
-        except Exception as e2:
-            logger.error(f"发送报表消息失败: {e2}", exc_info=True)
-            await query.answer("❌ 显示失败", show_alert=True)
-
 
 async def handle_income_view_query(
     query, user_id: int, context: ContextTypes.DEFAULT_TYPE
@@ -467,54 +392,18 @@ async def handle_income_query_group(
         title += f" ({start_date} 至 {end_date})"
     title += f"\n类型: {type_name} | 归属ID: {group_name}"
 
-    report, has_more, total_pages, current_type = await generate_income_report(
+    keyboard = [
+        [InlineKeyboardButton("🔙 返回高级查询", callback_data="income_advanced_query")]
+    ]
+    await send_income_report(
+        query_senders(query, InlineKeyboardMarkup(keyboard)),
         records,
         start_date,
         end_date,
         title,
-        page=1,
-        items_per_page=0,
         income_type=final_type,
     )
 
-    keyboard = []
-
-    # 如果有分页，添加分页按钮
-    if total_pages > 1:
-        page_data = (
-            f"{final_type or 'all'}|"
-            f"{final_group or 'all' if final_group else 'all'}|"
-            f"{start_date}|{end_date}"
-        )
-        keyboard.append(
-            [
-                InlineKeyboardButton(
-                    "下一页 ▶️", callback_data=f"income_adv_page_{page_data}|2"
-                )
-            ]
-        )
-
-    keyboard.append(
-        [InlineKeyboardButton("🔙 返回高级查询", callback_data="income_advanced_query")]
-    )
-
-    try:
-        await safe_edit_message_text(
-            query, report, reply_markup=InlineKeyboardMarkup(keyboard)
-        )
-    except Exception as e:
-        logger.error(f"编辑收入明细消息失败: {e}", exc_info=True)
-        try:
-            if query.message:
-                await query.message.reply_text(
-                    report, reply_markup=InlineKeyboardMarkup(keyboard)
-                )
-            else:
-                await query.answer("❌ 显示失败（消息不存在）", show_alert=True)
-        except Exception as e2:
-            logger.error(f"发送报表消息失败: {e2}", exc_info=True)
-            await query.answer("❌ 显示失败", show_alert=True)
-
 
 async def handle_income_adv_page(
     query, user_id: int, context: ContextTypes.DEFAULT_TYPE, data: str
@@ -525,7 +414,6 @@ async def handle_income_adv_page(
                                             parse_income_adv_page_params)
     from callbacks.income_adv_query import (build_income_title,
                                             query_income_records)
-    from callbacks.income_adv_send import send_income_adv_page
 
     if not user_id or user_id not in ADMIN_IDS:
         await query.answer("❌ 此功能仅限管理员使用", show_alert=True)
@@ -550,25 +438,19 @@ async def handle_income_adv_page(
     # 构建标题
     title = build_income_title(start_date, end_date, final_type, final_group)
 
-    # 生成报表
-    report, has_more_pages, total_pages, current_type = await generate_income_report(
+    # 高级查询显示全部记录（只有一页），分段发送
+    reply_markup = build_income_page_buttons(
+        page, 1, final_type, final_group, start_date, end_date
+    )
+    await send_income_report(
+        query_senders(query, reply_markup),
         records,
         start_date,
         end_date,
         title,
-        page=page,
-        items_per_page=0,
         income_type=final_type,
     )
 
-    # 构建按钮
-    reply_markup = build_income_page_buttons(
-        page, total_pages, final_type, final_group, start_date, end_date
-    )
-
-    # 发送消息
-    await send_income_adv_page(query, report, reply_markup)
-
 
 async def handle_income_type(
     query, user_id: int, context: ContextTypes.DEFAULT_TYPE, data: str
@@ -585,51 +467,17 @@ async def handle_income_type(
 
     type_mapping = get_income_type_mapping()
     type_name = type_mapping.get(income_type, income_type)
-    report, has_more, total_pages, current_type = await generate_income_report(
+
+    keyboard = [[InlineKeyboardButton("🔙 返回", callback_data="income_view_today")]]
+    await send_income_report(
+        query_senders(query, InlineKeyboardMarkup(keyboard)),
         records,
         date,
         date,
         f"今日{type_name}收入 ({date})",
-        page=1,
-        items_per_page=0,
         income_type=income_type,
     )
 
-    keyboard = []
-
-    # 如果有分页，添加分页按钮
-    if total_pages > 1:
-        page_buttons = []
-        if 1 < total_pages:
-            page_buttons.append(
-                InlineKeyboardButton(
-                    "下一页 ▶️",
-                    callback_data=f"income_page_{income_type}|2|{date}|{date}",
-                )
-            )
-        if page_buttons:
-            keyboard.append(page_buttons)
-
-    keyboard.append(
-        [InlineKeyboardButton("🔙 返回", callback_data="income_view_today")]
-    )
-    try:
-        await safe_edit_message_text(
-            query, report, reply_markup=InlineKeyboardMarkup(keyboard)
-        )
-    except Exception as e:
-        logger.error(f"编辑收入明细消息失败: {e}", exc_info=True)
-        try:
-            if query.message:
-                await query.message.reply_text(
-                    report, reply_markup=InlineKeyboardMarkup(keyboard)
-                )
-            else:
-                await query.answer("❌ 显示失败（消息不存在）", show_alert=True)
-        except Exception as e2:
-            logger.error(f"发送报表消息失败: {e2}", exc_info=True)
-            await query.answer("❌ 显示失败", show_alert=True)
-
 
 async def handle_income_page(
     query, user_id: int, context: ContextTypes.DEFAULT_TYPE, data: str
@@ -666,9 +514,22 @@ async def handle_income_page(
     )
     callback_type = "None" if query_type is None else income_type
 
-    # 如果 page 为 0，表示显示全部（不分页）
-    items_per_page = 0 if page == 0 else 20
-    actual_page = 1 if page == 0 else page
+    # 如果 page 为 0，表示显示全部（不分页），分段发送
+    if page == 0:
+        keyboard = build_pagination_buttons(
+            page, 1, 0, callback_type, start_date, end_date
+        )
+        await send_income_report(
+            query_senders(query, InlineKeyboardMarkup(keyboard)),
+            records,
+            start_date,
+            end_date,
+            title,
+            income_type=query_type,
+        )
+        return
+
+    items_per_page = 20
 
     # 生成报告
     report, has_more, total_pages, current_type = await generate_income_report(
@@ -676,7 +537,7 @@ async def handle_income_page(
         start_date,
         end_date,
         title,
-        page=actual_page,
+        page=page,
         items_per_page=items_per_page,
         income_type=query_type,
     )
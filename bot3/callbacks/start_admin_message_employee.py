@@ -47,8 +47,9 @@ async def build_employee_commands_message() -> str:
         "/ordertable - 查看订单总表（管理员）\n\n"
         "🔍 订单搜索:\n"
         "/search <类型> <值> - 搜索订单\n"
-        "  类型: order_id/group_id/customer/state/date/group\n"
-        "  示例: /search order_id A241225001\n\n"
+        "  类型: order_id/group_id/customer/state/date/group/text\n"
+        "  示例: /search order_id A241225001\n"
+        "  模糊: /search text 2412（订单号、归属ID或群名的片段）\n\n"
         "📢 定时播报:\n"
         "/schedule - 管理定时播报任务（最多3个）\n\n"
         "💳 支付账户:\n"
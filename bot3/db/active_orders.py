@@ -0,0 +1,368 @@
+"""活跃订单内存索引
+
+群内的 +金额、状态命令和 /order 都先按 chat_id 查找订单，/valid_amount 等命令
+需要全部有效订单的金额合计。未完成的订单（state 不是 end / breach_end）常驻内存：
+- chat_id -> 订单（紧凑记录，与 SELECT * FROM orders 的结果一致），
+  查找不经过线程池和 SQLite
+- 有效订单（normal / overdue）的总数、总金额和各归属ID的合计随变化增量维护，
+  读取合计是 O(1) 的
+- 写穿：订单写操作在事务中调用 mark_order_changed(chat_id)，事务提交后
+  （写入线程中、返回结果给调用方之前）从数据库重新读取这些 chat_id 的未完成订单；
+  读取的是已提交的数据，事务回滚时多读一次也不会出错
+- 启动时全量加载；之后由独立的后台任务定期与数据库核对（不依赖定时任务调度器，
+  SCHEDULER_ENABLED=0 时同样核对），不一致（如直接改库）时修复并记录
+- 加载完成前 get_order_by_chat_id 等读取数据库
+- 只在启用单写入线程（DB_WRITER，默认）时使用：刷新在写入线程中紧跟提交执行，
+  顺序与提交顺序一致。DB_WRITER=0 时各线程并发提交，刷新可能乱序（旧数据覆盖
+  新数据），索引不启用，查询读取数据库
+
+环境变量：
+    ACTIVE_ORDER_INDEX           是否启用（默认 1；DB_WRITER=0 时不启用）
+    ACTIVE_ORDER_VERIFY_MINUTES  与数据库核对的间隔（分钟，默认 10；0 不核对）
+"""
+
+# 标准库
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+# 本地模块
+from db.base import db_query, db_transaction
+from db.records import Record, RecordHeader, get_header
+from db.writer import WRITER_ENABLED
+from utils.money import from_cents
+
+# 日志
+logger = logging.getLogger(__name__)
+
+ACTIVE_ORDER_INDEX = os.getenv("ACTIVE_ORDER_INDEX", "1") != "0" and WRITER_ENABLED
+VERIFY_MINUTES = int(os.getenv("ACTIVE_ORDER_VERIFY_MINUTES", "10"))
+# 核对发现差异后，等待多久重新核对（秒）
+VERIFY_RECHECK_DELAY = 1.0
+
+# 定期核对的后台任务
+_verify_task: Optional[asyncio.Task] = None
+
+# 有效订单状态（计入有效金额）
+VALID_STATES = ("normal", "overdue")
+
+# 未完成订单（常驻索引）
+_ACTIVE_ORDERS_SQL = (
+    "SELECT * FROM orders WHERE state NOT IN ('end', 'breach_end') "
+    "ORDER BY chat_id, id"
+)
+
+
+class ActiveOrderIndex:
+    """未完成订单的内存索引（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._header: Optional[RecordHeader] = None
+        # chat_id -> 该群的未完成订单（按 id 排序，通常只有一个）
+        self._by_chat: Dict[int, Tuple[tuple, ...]] = {}
+        # 归属ID -> [有效订单数, 有效金额（分）]
+        self._groups: Dict[str, List[int]] = {}
+        self._valid_count = 0
+        self._valid_cents = 0
+        self.ready = False
+
+    # ----- 读取 -----
+
+    def get_order(self, chat_id: int) -> Optional[Dict]:
+        """chat_id 的未完成订单（与 get_order_by_chat_id 的结果一致）"""
+        with self._lock:
+            rows = self._by_chat.get(chat_id)
+            if not rows:
+                return None
+            return Record(self._header, rows[0]).to_dict()
+
+    def valid_orders(self, group_id: Optional[str] = None) -> List[Record]:
+        """有效订单列表（可按归属ID过滤）"""
+        with self._lock:
+            header = self._header
+            if header is None:
+                return []
+            state, group = header.index["state"], header.index["group_id"]
+            return [
+                Record(header, row)
+                for rows in self._by_chat.values()
+                for row in rows
+                if row[state] in VALID_STATES
+                and (group_id is None or row[group] == group_id)
+            ]
+
+    def valid_totals(self) -> Tuple[int, float]:
+        """(有效订单数, 有效金额)"""
+        with self._lock:
+            return self._valid_count, from_cents(self._valid_cents)
+
+    def group_totals(self) -> Dict[str, Tuple[int, float]]:
+        """归属ID -> (有效订单数, 有效金额)"""
+        with self._lock:
+            return {
+                group_id: (count, from_cents(cents))
+                for group_id, (count, cents) in self._groups.items()
+                if count
+            }
+
+    def contents(self) -> Tuple[Optional[RecordHeader], Dict[int, Tuple[tuple, ...]]]:
+        """当前内容（核对用）"""
+        with self._lock:
+            return self._header, dict(self._by_chat)
+
+    # ----- 维护 -----
+
+    def _contribute(self, row: tuple, sign: int) -> None:
+        index = self._header.index
+        if row[index["state"]] not in VALID_STATES:
+            return
+        cents = row[index["amount_cents"]] or 0
+        totals = self._groups.setdefault(row[index["group_id"]], [0, 0])
+        totals[0] += sign
+        totals[1] += sign * cents
+        self._valid_count += sign
+        self._valid_cents += sign * cents
+
+    def load(self, header: RecordHeader, rows: List[tuple]) -> None:
+        """用全部未完成订单替换索引内容"""
+        by_chat: Dict[int, List[tuple]] = {}
+        chat = header.index["chat_id"]
+        for row in rows:
+            by_chat.setdefault(row[chat], []).append(row)
+        with self._lock:
+            self._header = header
+            self._by_chat = {}
+            self._groups = {}
+            self._valid_count = self._valid_cents = 0
+            for chat_id, chat_rows in by_chat.items():
+                self._by_chat[chat_id] = tuple(chat_rows)
+                for row in chat_rows:
+                    self._contribute(row, 1)
+            self.ready = True
+
+    def replace_chats(
+        self, header: RecordHeader, chat_ids: Set[int], rows: List[tuple]
+    ) -> None:
+        """用数据库中的当前数据替换这些 chat_id 的订单"""
+        with self._lock:
+            if self._header is None or header.names != self._header.names:
+                # 表结构变化，交给全量加载
+                self.ready = False
+                return
+            by_chat: Dict[int, List[tuple]] = {chat_id: [] for chat_id in chat_ids}
+            chat = header.index["chat_id"]
+            for row in rows:
+                by_chat.setdefault(row[chat], []).append(row)
+            for chat_id, chat_rows in by_chat.items():
+                for row in self._by_chat.pop(chat_id, ()):
+                    self._contribute(row, -1)
+                if chat_rows:
+                    self._by_chat[chat_id] = tuple(chat_rows)
+                    for row in chat_rows:
+                        self._contribute(row, 1)
+
+    def reset(self) -> None:
+        """清空（之后的读取走数据库，直到重新加载）"""
+        with self._lock:
+            self.ready = False
+            self._header = None
+            self._by_chat = {}
+            self._groups = {}
+            self._valid_count = self._valid_cents = 0
+
+
+_index = ActiveOrderIndex()
+
+# 本线程事务中变化的 chat_id（None 表示需要全量加载）
+_pending = threading.local()
+
+
+def get_active_order_index() -> Optional[ActiveOrderIndex]:
+    """已加载的索引（未启用或尚未加载时为 None，调用方读取数据库）"""
+    if ACTIVE_ORDER_INDEX and _index.ready:
+        return _index
+    return None
+
+
+def mark_order_changed(*chat_ids: int) -> None:
+    """在订单写操作的事务中调用：记录变化的 chat_id，提交后刷新"""
+    changed = getattr(_pending, "chat_ids", set())
+    if changed is not None:
+        changed.update(chat_id for chat_id in chat_ids if chat_id is not None)
+    _pending.chat_ids = changed
+
+
+def mark_all_orders_changed() -> None:
+    """批量修改订单后调用：提交后全量重新加载"""
+    _pending.chat_ids = None
+
+
+def _fetch_rows(
+    cursor: sqlite3.Cursor, sql: str, params: tuple = ()
+) -> Tuple[RecordHeader, List[tuple]]:
+    cursor.execute(sql, params)
+    header = get_header(cursor.description)
+    return header, [tuple(row) for row in cursor.fetchall()]
+
+
+def fetch_active_orders(cursor: sqlite3.Cursor) -> Tuple[RecordHeader, List[tuple]]:
+    """读取全部未完成订单"""
+    return _fetch_rows(cursor, _ACTIVE_ORDERS_SQL)
+
+
+def fetch_active_orders_of(
+    cursor: sqlite3.Cursor, chat_ids: Set[int]
+) -> Tuple[RecordHeader, List[tuple]]:
+    """读取这些 chat_id 的未完成订单"""
+    return _fetch_rows(
+        cursor,
+        "SELECT * FROM orders WHERE chat_id IN (SELECT value FROM json_each(?)) "
+        "AND state NOT IN ('end', 'breach_end') ORDER BY chat_id, id",
+        (f"[{','.join(str(int(chat_id)) for chat_id in chat_ids)}]",),
+    )
+
+
+def apply_pending_order_changes(cursor: sqlite3.Cursor) -> None:
+    """事务提交后调用：按本线程记录的变化刷新索引"""
+    if not hasattr(_pending, "chat_ids"):
+        return
+    changed = _pending.chat_ids
+    del _pending.chat_ids
+    if not ACTIVE_ORDER_INDEX:
+        return
+    try:
+        if changed is None or not _index.ready:
+            _index.load(*fetch_active_orders(cursor))
+        elif changed:
+            header, rows = fetch_active_orders_of(cursor, changed)
+            _index.replace_chats(header, changed, rows)
+            if not _index.ready:
+                _index.load(*fetch_active_orders(cursor))
+    except sqlite3.Error as e:
+        # 读取失败时停用索引，改为读取数据库，等待下次加载或核对
+        logger.error(f"刷新活跃订单索引失败: {e}", exc_info=True)
+        _index.reset()
+
+
+def diff_active_orders(
+    index: ActiveOrderIndex,
+    header: RecordHeader,
+    rows: List[tuple],
+    chat_ids: Optional[Set[int]] = None,
+) -> Set[int]:
+    """与数据库中的未完成订单不一致的 chat_id
+
+    Args:
+        rows: 数据库中的未完成订单（chat_ids 不为 None 时只含这些 chat_id）
+        chat_ids: 只核对这些 chat_id
+    """
+    expected: Dict[int, List[tuple]] = {}
+    chat = header.index["chat_id"]
+    for row in rows:
+        expected.setdefault(row[chat], []).append(row)
+    index_header, actual = index.contents()
+    if chat_ids is None:
+        chat_ids = set(expected) | set(actual)
+    if index_header is None or index_header.names != header.names:
+        return set(chat_ids)
+    return {
+        chat_id
+        for chat_id in chat_ids
+        if tuple(expected.get(chat_id, ())) != actual.get(chat_id, ())
+    }
+
+
+# ========== 加载和核对 ==========
+
+
+@db_transaction
+def _refresh_active_orders(
+    conn, cursor, chat_ids: Optional[List[int]] = None
+) -> bool:
+    """经写入线程刷新索引（与其他写操作排队，不会用旧数据覆盖新数据）"""
+    if chat_ids is None:
+        mark_all_orders_changed()
+    else:
+        mark_order_changed(*chat_ids)
+    return True
+
+
+@db_query
+def _read_active_orders(
+    conn, cursor, chat_ids: Optional[List[int]] = None
+) -> Tuple[RecordHeader, List[tuple]]:
+    if chat_ids is None:
+        return fetch_active_orders(cursor)
+    return fetch_active_orders_of(cursor, set(chat_ids))
+
+
+async def load_active_orders() -> None:
+    """全量加载索引（启动时调用）"""
+    if not ACTIVE_ORDER_INDEX:
+        return
+    await _refresh_active_orders()
+    if _index.ready:
+        count, amount = _index.valid_totals()
+        logger.info(f"活跃订单索引已加载: 有效订单 {count} 个，有效金额 {amount:,.2f}")
+
+
+async def verify_active_orders() -> Set[int]:
+    """与数据库核对，修复不一致的 chat_id
+
+    Returns:
+        不一致（已刷新）的 chat_id
+    """
+    index = get_active_order_index()
+    if index is None:
+        await load_active_orders()
+        return set()
+
+    mismatched = diff_active_orders(index, *await _read_active_orders())
+    if not mismatched:
+        return set()
+    # 读取期间可能有写操作刚提交、尚未刷新到索引：稍后只重新核对这些 chat_id
+    await asyncio.sleep(VERIFY_RECHECK_DELAY)
+    header, rows = await _read_active_orders(sorted(mismatched))
+    mismatched = diff_active_orders(index, header, rows, mismatched)
+    if mismatched:
+        logger.warning(
+            f"活跃订单索引与数据库不一致（{len(mismatched)} 个群），已刷新: "
+            f"{sorted(mismatched)[:10]}"
+        )
+        await _refresh_active_orders(sorted(mismatched))
+    return mismatched
+
+
+async def _verify_loop() -> None:
+    """每 VERIFY_MINUTES 分钟核对一次"""
+    while True:
+        await asyncio.sleep(VERIFY_MINUTES * 60)
+        try:
+            await verify_active_orders()
+        except Exception as e:
+            logger.error(f"核对活跃订单索引失败: {e}", exc_info=True)
+
+
+def start_active_order_verify() -> None:
+    """启动定期核对的后台任务（索引未启用或 ACTIVE_ORDER_VERIFY_MINUTES=0 时不启动）"""
+    global _verify_task
+    if not ACTIVE_ORDER_INDEX or VERIFY_MINUTES <= 0 or _verify_task is not None:
+        return
+    _verify_task = asyncio.get_running_loop().create_task(_verify_loop())
+
+
+async def stop_active_order_verify() -> None:
+    """停止定期核对的后台任务"""
+    global _verify_task
+    task, _verify_task = _verify_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,530 @@
+"""冷热数据归档
+
+完成时间早于截止日期的已完成订单（end / breach_end）及其收入明细、较早的操作历史，
+定期从主库移到附加（ATTACH）的归档库（默认与主库同目录的 loan_bot_archive.db）：
+- 主库只保留进行中的订单和近期明细，日常查询的数据量和索引都保持较小
+- 移动按批进行，ID 保持不变：先复制到目标库并提交，再从源库删除并提交。主库使用
+  WAL 时跨库事务不是整体原子的，这样中途失败只会在两个库中各留一份，下次归档或
+  恢复时删除归档库中的那份，不会丢失；写入主库期间暂时移除 daily_summary 触发器，
+  历史日切数据不受影响
+- 分类订单表（orders_*）是冗余副本，归档时删除，恢复时按订单重新生成
+- 跨历史的报表（客户贡献、增量报表、导出、日切回填）通过 archive_union
+  同时读取主库和归档库；没有归档库时语句与原来完全一致
+- restore_from_archive 把订单（或全部数据）移回主库
+
+环境变量：
+    ARCHIVE_DB_PATH     归档库路径
+    ARCHIVE_AFTER_DAYS  定时归档完成超过多少天的订单（默认 0，不自动归档）
+    ARCHIVE_BATCH_SIZE  每个事务移动的订单数（默认 500）
+"""
+
+# 标准库
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+# 本地模块
+from db.period_columns import period_column_definition, period_column_expr
+
+# 日志
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))
+BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+# 归档的表（分类订单表不归档，见模块说明）
+ARCHIVED_TABLES = ("orders", "income_records", "operation_history")
+# 可以归档的订单状态
+FINISHED_STATES = ("end", "breach_end")
+
+_KEYS = "SELECT value FROM json_each(?)"
+
+# 移动批次与分析快照的复制互斥，快照不会包含只完成了复制的批次
+move_lock = threading.Lock()
+
+_CREATE_TABLE_RE = re.compile(r"^\s*CREATE\s+TABLE\s+(\"?)(\w+)\1", re.I)
+_CREATE_INDEX_RE = re.compile(
+    r"^\s*CREATE\s+(UNIQUE\s+)?INDEX\s+(IF\s+NOT\s+EXISTS\s+)?(\"?)(\w+)\3", re.I
+)
+
+
+def get_archive_path() -> str:
+    """归档库文件路径"""
+    path = os.getenv("ARCHIVE_DB_PATH")
+    if path:
+        return path
+    import init_db
+
+    root, ext = os.path.splitext(init_db.DB_NAME)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def attach_archive(cursor: sqlite3.Cursor, create: bool = False) -> bool:
+    """把归档库附加到游标所在的连接
+
+    Args:
+        cursor: 数据库游标（连接上不能有未提交的事务）
+        create: 归档库不存在时是否创建
+
+    Returns:
+        归档库是否已附加
+    """
+    cursor.execute("PRAGMA database_list")
+    if any(row[1] == ARCHIVE_SCHEMA for row in cursor.fetchall()):
+        return True
+
+    path = get_archive_path()
+    if not create and not os.path.exists(path):
+        return False
+    try:
+        cursor.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+    except sqlite3.OperationalError as e:
+        # 事务中不能 ATTACH，本次只读取主库
+        logger.warning(f"附加归档库失败，只读取主库: {e}")
+        return False
+    return True
+
+
+def _columns(
+    cursor: sqlite3.Cursor, schema: str, table: str, stored_only: bool = False
+) -> List[str]:
+    """表的列名（stored_only 时不含生成列）"""
+    cursor.execute(f"PRAGMA {schema}.table_xinfo({table})")
+    # hidden: 0 为普通列，2 / 3 为生成列
+    return [row[1] for row in cursor.fetchall() if not stored_only or row[6] == 0]
+
+
+def _missing_column_expr(table: str, column: str) -> str:
+    """归档表中缺少的列在跨库读取时的取值"""
+    return f"{period_column_expr(table, column) or 'NULL'} AS {column}"
+
+
+def archive_union(
+    cursor: sqlite3.Cursor, table: str, alias: Optional[str] = None
+) -> str:
+    """FROM 子句中同时读取主库和归档库的表达式
+
+    有归档库时返回 ``(主库 UNION ALL 归档库) AS 别名``（别名默认为表名，
+    语句中的 ``orders.xxx`` 写法不受影响），否则返回表名本身。
+    归档库中缺少的列读取为 NULL（周期日期列按时间戳计算，见 db.period_columns）。
+    调用时连接上不能有未提交的事务。
+    """
+    alias = alias or table
+    plain = table if alias == table else f"{table} AS {alias}"
+    if not attach_archive(cursor):
+        return plain
+    archived = set(_columns(cursor, ARCHIVE_SCHEMA, table))
+    if not archived:
+        return plain
+
+    columns = _columns(cursor, "main", table)
+    archive_columns = [
+        column if column in archived else _missing_column_expr(table, column)
+        for column in columns
+    ]
+    return (
+        f"(SELECT {', '.join(columns)} FROM main.{table} UNION ALL "
+        f"SELECT {', '.join(archive_columns)} FROM {ARCHIVE_SCHEMA}.{table}) "
+        f"AS {alias}"
+    )
+
+
+def _archive_table_sql(sql: str) -> str:
+    """把主库的建表语句改为在归档库中创建"""
+    return _CREATE_TABLE_RE.sub(
+        lambda m: f"CREATE TABLE {ARCHIVE_SCHEMA}.{m.group(2)}", sql, count=1
+    )
+
+
+def _archive_index_sql(sql: str) -> str:
+    """把主库的建索引语句改为在归档库中创建（索引名加库名前缀）"""
+    return _CREATE_INDEX_RE.sub(
+        lambda m: (
+            f"CREATE {m.group(1) or ''}INDEX {m.group(2) or ''}"
+            f"{ARCHIVE_SCHEMA}.{m.group(4)}"
+        ),
+        sql,
+        count=1,
+    )
+
+
+def _ensure_archive_indexes(cursor: sqlite3.Cursor, table: str) -> None:
+    """在归档库中创建主库上有而归档库中没有的索引"""
+    cursor.execute(
+        f"SELECT name FROM {ARCHIVE_SCHEMA}.sqlite_master "
+        "WHERE type = 'index' AND tbl_name = ?",
+        (table,),
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    cursor.execute(
+        "SELECT name, sql FROM main.sqlite_master "
+        "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,),
+    )
+    for name, index_sql in cursor.fetchall():
+        if name in existing:
+            continue
+        try:
+            cursor.execute(_archive_index_sql(index_sql))
+        except sqlite3.OperationalError as e:
+            # 索引引用了归档表中没有的列
+            logger.warning(f"归档表 {table} 未创建索引 {name}: {e}")
+
+
+def ensure_archive_tables(cursor: sqlite3.Cursor) -> None:
+    """按主库结构创建归档表和索引；主库新增的列和索引同步到归档表"""
+    for table in ARCHIVED_TABLES:
+        cursor.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+            (table,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            continue
+
+        archived = _columns(cursor, ARCHIVE_SCHEMA, table)
+        if not archived:
+            cursor.execute(_archive_table_sql(row[0]))
+            _ensure_archive_indexes(cursor, table)
+            logger.info(f"已创建归档表: {table}")
+            continue
+
+        cursor.execute(f"PRAGMA main.table_xinfo({table})")
+        for _, name, col_type, _, default, _, hidden in cursor.fetchall():
+            if name in archived:
+                continue
+            if hidden:
+                if period_column_expr(table, name) is None:
+                    logger.warning(
+                        f"归档表 {table} 缺少生成列 {name}，跨库读取时为 NULL"
+                    )
+                    continue
+                definition = period_column_definition(table, name)
+            else:
+                definition = f"{name} {col_type}"
+                if default is not None:
+                    definition += f" DEFAULT {default}"
+            cursor.execute(
+                f"ALTER TABLE {ARCHIVE_SCHEMA}.{table} ADD COLUMN {definition}"
+            )
+            logger.info(f"归档表 {table} 已新增列: {name}")
+        _ensure_archive_indexes(cursor, table)
+
+
+def _key_filter(table: str) -> str:
+    key_column = "id" if table == "operation_history" else "order_id"
+    return f"{key_column} IN ({_KEYS})"
+
+
+def _copy_rows(
+    cursor: sqlite3.Cursor, table: str, source: str, target: str, keys: str
+) -> int:
+    """按键（json_each）把行从 source 库复制到 target 库，返回复制的行数"""
+    columns = ", ".join(_columns(cursor, "main", table, stored_only=True))
+    # 表名和列名来自 ARCHIVED_TABLES 及现有表结构
+    cursor.execute(  # nosec B608
+        f"INSERT INTO {target}.{table} ({columns}) "
+        f"SELECT {columns} FROM {source}.{table} WHERE {_key_filter(table)}",
+        (keys,),
+    )
+    return cursor.rowcount
+
+
+def _delete_rows(cursor: sqlite3.Cursor, table: str, schema: str, keys: str) -> None:
+    """按键（json_each）删除 schema 库中的行"""
+    cursor.execute(  # nosec B608
+        f"DELETE FROM {schema}.{table} WHERE {_key_filter(table)}", (keys,)
+    )
+
+
+def _drop_duplicate_copies(cursor: sqlite3.Cursor) -> None:
+    """删除主库中也有的归档行（复制后、删除前中断留下的），保留主库中的一份"""
+    for table in ARCHIVED_TABLES:
+        # ID 为 AUTOINCREMENT，两个库中 ID 相同即为同一行
+        cursor.execute(  # nosec B608
+            f"DELETE FROM {ARCHIVE_SCHEMA}.{table} "
+            f"WHERE id IN (SELECT id FROM main.{table})"
+        )
+        if cursor.rowcount:
+            logger.warning(
+                f"归档表 {table} 中有 {cursor.rowcount} 行在主库中也存在，已删除归档副本"
+            )
+
+
+def _classified_tables(cursor: sqlite3.Cursor) -> List[str]:
+    cursor.execute(
+        "SELECT name FROM main.sqlite_master "
+        "WHERE type = 'table' AND name LIKE 'orders\\_%' ESCAPE '\\'"
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _direction(to_archive: bool):
+    """(源库, 目标库)"""
+    return ("main", ARCHIVE_SCHEMA) if to_archive else (ARCHIVE_SCHEMA, "main")
+
+
+@contextmanager
+def _daily_summary_paused(cursor: sqlite3.Cursor, schema: str):
+    """写入主库期间暂时移除日切触发器（移动不是业务变动，日切数据保持不变）"""
+    if schema != "main":
+        yield
+        return
+    from db.module2_finance.daily_summary import (
+        create_daily_summary_triggers, drop_daily_summary_triggers)
+
+    drop_daily_summary_triggers(cursor)
+    yield
+    create_daily_summary_triggers(cursor)
+
+
+def _orders_mover(to_archive: bool):
+    """移动订单及其收入明细的 (复制, 删除) 两步"""
+    source, target = _direction(to_archive)
+
+    def copy(cursor: sqlite3.Cursor, order_ids: List[str]) -> Dict[str, int]:
+        keys = json.dumps(order_ids, ensure_ascii=False)
+        with _daily_summary_paused(cursor, target):
+            moved = {
+                table: _copy_rows(cursor, table, source, target, keys)
+                for table in ("orders", "income_records")
+            }
+            if not to_archive:
+                moved["classified"] = _restore_classified_copies(cursor, keys)
+        return moved
+
+    def delete(cursor: sqlite3.Cursor, order_ids: List[str]) -> Dict[str, int]:
+        keys = json.dumps(order_ids, ensure_ascii=False)
+        with _daily_summary_paused(cursor, source):
+            for table in ("orders", "income_records"):
+                _delete_rows(cursor, table, source, keys)
+        if not to_archive:
+            return {}
+        classified = 0
+        for table in _classified_tables(cursor):
+            cursor.execute(
+                f"DELETE FROM main.{table} WHERE order_id IN ({_KEYS})", (keys,)
+            )
+            classified += cursor.rowcount
+        return {"classified": classified}
+
+    return copy, delete
+
+
+def _restore_classified_copies(cursor: sqlite3.Cursor, keys: str) -> int:
+    """按恢复的订单重新生成分类表副本"""
+    from db.module3_order.orders_basic import (
+        _get_classified_table_names, _insert_order_to_classified_table_sync)
+
+    cursor.execute(f"SELECT * FROM main.orders WHERE order_id IN ({_KEYS})", (keys,))
+    columns = [col[0] for col in cursor.description]
+    orders = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    inserted = 0
+    for order in orders:
+        for table in _get_classified_table_names(order):
+            inserted += _insert_order_to_classified_table_sync(
+                cursor, table, order, order["created_at"], order["updated_at"]
+            )
+    return inserted
+
+
+def _run_batches(conn: sqlite3.Connection, select_sql: str, params: tuple, mover):
+    """分批执行，选出的键为空时结束
+
+    每批两个 IMMEDIATE 事务：先复制到目标库并提交，再从源库删除并提交。
+
+    Args:
+        mover: (复制, 删除) 两步，各自返回各表的行数
+
+    Returns:
+        各表累计移动的行数
+    """
+    cursor = conn.cursor()
+    totals: Dict[str, int] = {}
+    while True:
+        with move_lock:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute(select_sql, params)
+                keys = [row[0] for row in cursor.fetchall()]
+                if not keys:
+                    conn.rollback()
+                    return totals
+                counts = []
+                for step in mover:
+                    if counts:
+                        cursor.execute("BEGIN IMMEDIATE")
+                    counts.append(step(cursor, keys))
+                    conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        for moved in counts:
+            for table, count in moved.items():
+                totals[table] = totals.get(table, 0) + count
+
+
+def _open_connection() -> sqlite3.Connection:
+    """打开附加了归档库（不存在时创建）且归档表结构最新的连接"""
+    from utils.db_pool import get_sync_connection
+
+    conn = get_sync_connection()
+    cursor = conn.cursor()
+    try:
+        attach_archive(cursor, create=True)
+        cursor.execute("BEGIN IMMEDIATE")
+        ensure_archive_tables(cursor)
+        _drop_duplicate_copies(cursor)
+        conn.commit()
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def archive_finished_orders(
+    before_date: str, batch_size: int = BATCH_SIZE, include_history: bool = True
+) -> Dict[str, int]:
+    """把完成时间早于 before_date 的已完成订单移到归档库
+
+    Args:
+        before_date: 截止日期（YYYY-MM-DD，不含当天）
+        batch_size: 每个事务移动的订单数 / 操作历史行数
+        include_history: 是否同时归档 before_date 之前的操作历史
+
+    Returns:
+        各表移动的行数（classified 为删除的分类表副本数）
+    """
+    states = ", ".join(f"'{state}'" for state in FINISHED_STATES)
+    conn = _open_connection()
+    try:
+        totals = _run_batches(
+            conn,
+            f"SELECT order_id FROM main.orders WHERE state IN ({states}) "
+            "AND updated_at < ? AND order_id NOT IN "
+            f"(SELECT order_id FROM {ARCHIVE_SCHEMA}.orders) "
+            "ORDER BY updated_at LIMIT ?",
+            (before_date, batch_size),
+            _orders_mover(to_archive=True),
+        )
+        if include_history:
+            totals.update(
+                _run_batches(
+                    conn,
+                    "SELECT id FROM main.operation_history "
+                    "WHERE created_at < ? ORDER BY id LIMIT ?",
+                    (before_date, batch_size),
+                    _history_mover(to_archive=True),
+                )
+            )
+    finally:
+        conn.close()
+
+    logger.info(f"归档完成（{before_date} 之前）: {totals}")
+    return totals
+
+
+def _history_mover(to_archive: bool):
+    """移动操作历史的 (复制, 删除) 两步"""
+    source, target = _direction(to_archive)
+    table = "operation_history"
+
+    def copy(cursor: sqlite3.Cursor, ids: List[int]) -> Dict[str, int]:
+        return {table: _copy_rows(cursor, table, source, target, json.dumps(ids))}
+
+    def delete(cursor: sqlite3.Cursor, ids: List[int]) -> Dict[str, int]:
+        _delete_rows(cursor, table, source, json.dumps(ids))
+        return {}
+
+    return copy, delete
+
+
+def restore_from_archive(
+    order_ids: Optional[Iterable[str]] = None,
+    include_history: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, int]:
+    """把归档的订单（及其收入明细）移回主库
+
+    Args:
+        order_ids: 要恢复的订单ID；None 表示全部
+        include_history: 是否同时恢复全部归档的操作历史
+        batch_size: 每个事务移动的订单数 / 操作历史行数
+
+    Returns:
+        各表移回的行数（classified 为重新生成的分类表副本数）
+    """
+    if not os.path.exists(get_archive_path()):
+        return {}
+
+    conn = _open_connection()
+    try:
+        # 主库中已有同一订单号的订单不恢复（避免唯一约束冲突）
+        select_sql = (
+            f"SELECT order_id FROM {ARCHIVE_SCHEMA}.orders "
+            "WHERE order_id NOT IN (SELECT order_id FROM main.orders)"
+        )
+        params: tuple = ()
+        if order_ids is not None:
+            select_sql += f" AND order_id IN ({_KEYS})"
+            params = (json.dumps(sorted(set(order_ids)), ensure_ascii=False),)
+        totals = _run_batches(
+            conn,
+            f"{select_sql} LIMIT ?",
+            (*params, batch_size),
+            _orders_mover(to_archive=False),
+        )
+        if include_history:
+            totals.update(
+                _run_batches(
+                    conn,
+                    f"SELECT id FROM {ARCHIVE_SCHEMA}.operation_history "
+                    "ORDER BY id LIMIT ?",
+                    (batch_size,),
+                    _history_mover(to_archive=False),
+                )
+            )
+    finally:
+        conn.close()
+
+    logger.info(f"已从归档库恢复: {totals}")
+    return totals
+
+
+def get_archive_stats() -> Dict[str, Dict[str, int]]:
+    """主库和归档库中各归档表的行数"""
+    from utils.db_pool import get_sync_connection
+
+    conn = get_sync_connection()
+    try:
+        cursor = conn.cursor()
+        attached = attach_archive(cursor)
+        stats = {}
+        for table in ARCHIVED_TABLES:
+            cursor.execute(f"SELECT COUNT(*) FROM main.{table}")  # nosec B608
+            hot = cursor.fetchone()[0]
+            archived = 0
+            if attached and _columns(cursor, ARCHIVE_SCHEMA, table):
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {ARCHIVE_SCHEMA}.{table}"  # nosec B608
+                )
+                archived = cursor.fetchone()[0]
+            stats[table] = {"hot": hot, "archived": archived}
+        return stats
+    finally:
+        conn.close()
+
+
+def archive_cutoff(days: int, today: Optional[datetime] = None) -> str:
+    """完成超过 days 天的截止日期"""
+    from utils.date_helpers import get_daily_period_date
+
+    today = today or datetime.strptime(get_daily_period_date(), "%Y-%m-%d")
+    return (today - timedelta(days=days)).strftime("%Y-%m-%d")
@@ -8,8 +8,15 @@
 import asyncio
 import logging
 import os
+import time
 from functools import wraps
 
+# 本地模块
+from db.snapshot import get_active_snapshot
+from db.writer import WRITER_ENABLED, get_db_writer
+from utils.performance_monitor import record_operation
+from utils.trace_spans import span
+
 # 日志
 logger = logging.getLogger(__name__)
 
@@ -20,6 +27,9 @@ DATA_DIR = os.getenv(
 os.makedirs(DATA_DIR, exist_ok=True)
 DB_NAME = os.path.join(DATA_DIR, "loan_bot.db")
 
+# 数据库函数慢操作阈值（毫秒）
+DB_SLOW_THRESHOLD_MS = float(os.getenv("DB_SLOW_THRESHOLD_MS", "500"))
+
 
 def get_connection():
     """获取数据库连接（同步，向后兼容）
@@ -33,19 +43,32 @@ def get_connection():
 
 
 def db_transaction(func):
-    """数据库事务装饰器"""
+    """数据库事务装饰器
+
+    启用写入线程（DB_WRITER，默认）时由 db.writer 按顺序执行并组提交，
+    否则在线程池中单独开连接执行、提交。
+    """
+    op_name = f"db:{func.__name__}"
 
     @wraps(func)
     async def wrapper(*args, **kwargs):
         loop = asyncio.get_running_loop()
 
+        async def run():
+            if WRITER_ENABLED:
+                return await get_db_writer().submit(func, *args, **kwargs)
+            return await loop.run_in_executor(None, sync_work)
+
         def sync_work():
+            from db.active_orders import apply_pending_order_changes
+
             conn = get_connection()
             cursor = conn.cursor()
             try:
                 result = func(conn, cursor, *args, **kwargs)
                 if result is not False:
                     conn.commit()
+                    apply_pending_order_changes(cursor)
                 return result
             except ValueError as e:
                 # ValueError是验证错误，应该向上传播，让调用者处理
@@ -59,20 +82,35 @@ def db_transaction(func):
             finally:
                 conn.close()
 
-        return await loop.run_in_executor(None, sync_work)
+        start_time = time.perf_counter()
+        result = False
+        try:
+            with span(op_name):
+                result = await run()
+            return result
+        finally:
+            record_operation(
+                op_name,
+                time.perf_counter() - start_time,
+                error=result is False,
+                threshold_ms=DB_SLOW_THRESHOLD_MS,
+            )
 
     return wrapper
 
 
 def db_query(func):
     """数据库查询装饰器"""
+    op_name = f"db:{func.__name__}"
 
     @wraps(func)
     async def wrapper(*args, **kwargs):
         loop = asyncio.get_running_loop()
+        # 在 analytics_snapshot 范围内读取分析快照（见 db.snapshot）
+        snapshot = get_active_snapshot()
 
         def sync_work():
-            conn = get_connection()
+            conn = get_connection() if snapshot is None else snapshot.acquire()
             cursor = conn.cursor()
             try:
                 return func(conn, cursor, *args, **kwargs)
@@ -82,9 +120,53 @@ def db_query(func):
                 )
                 raise e
             finally:
-                conn.close()
+                if snapshot is None:
+                    conn.close()
+                else:
+                    snapshot.release(conn)
+
+        start_time = time.perf_counter()
+        error = True
+        try:
+            with span(op_name):
+                result = await loop.run_in_executor(None, sync_work)
+            error = False
+            return result
+        finally:
+            record_operation(
+                op_name,
+                time.perf_counter() - start_time,
+                error=error,
+                threshold_ms=DB_SLOW_THRESHOLD_MS,
+            )
+
+    return wrapper
+
+
+def db_timed(func):
+    """记录异步读取函数的耗时（与 db_query 相同的 span 和性能统计）
+
+    用于不一定访问数据库的读取（如先查内存索引、未命中时再调用 db_query 函数），
+    统计名称与 db_query 一致（db:函数名）。
+    """
+    op_name = f"db:{func.__name__}"
 
-        return await loop.run_in_executor(None, sync_work)
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        start_time = time.perf_counter()
+        error = True
+        try:
+            with span(op_name):
+                result = await func(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            record_operation(
+                op_name,
+                time.perf_counter() - start_time,
+                error=error,
+                threshold_ms=DB_SLOW_THRESHOLD_MS,
+            )
 
     return wrapper
 
@@ -112,22 +194,20 @@ async def execute_query(
         查询结果
     """
 
+    from db.records import fetch_dicts, fetch_record
+
     # 使用同步方式（通过装饰器模式）
     def sync_work():
         conn = get_connection()
         cursor = conn.cursor()
-        # 设置row_factory为字典
-        cursor.row_factory = lambda cursor, row: dict(
-            zip([col[0] for col in cursor.description], row)
-        )
         try:
             cursor.execute(query, params)
+            # 列名按 cursor.description 缓存，只计算一次
             if fetch_one:
-                row = cursor.fetchone()
-                return dict(row) if row else None
+                record = fetch_record(cursor)
+                return record.to_dict() if record is not None else None
             elif fetch_all:
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return fetch_dicts(cursor)
             else:
                 return None
         finally:
@@ -0,0 +1,123 @@
+"""
+按键批量加载模块
+
+为 ``WHERE order_id IN (...)`` 一类按大量键查询的场景提供统一的加载方式，
+替代按键数量拼接 ``?`` 占位符：
+
+- 键列表作为一个 JSON 参数传入：``IN (SELECT value FROM json_each(?))``，
+  语句文本固定，无论多少个键都复用同一个预编译语句，也不受参数个数上限限制
+- SQLite 未编译 JSON1 时自动退回按块执行（每块 CHUNK_SIZE 个键）
+- 结果可按键分组流式产出，调用方不需要一次持有全部行
+
+用法：
+    sql = (
+        "SELECT * FROM income_records WHERE order_id IN ({keys}) "
+        "AND date >= ? ORDER BY order_id, date"
+    )
+    for order_id, rows in iter_grouped_rows(cursor, sql, order_ids, (date,)):
+        ...
+
+注意：``{keys}`` 的参数在其他参数之前绑定，语句中 ``{keys}`` 必须出现在
+其他 ``?`` 之前；需要按键分组时语句必须先按该键排序。
+"""
+
+# 标准库
+import itertools
+import json
+import logging
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 本地模块
+from db.records import Record, iter_records
+
+# 日志
+logger = logging.getLogger(__name__)
+
+# 退回分块执行时每块的键数量（低于旧版 SQLite 999 个参数的上限）
+CHUNK_SIZE = 500
+
+_JSON_KEYS = "SELECT value FROM json_each(?)"
+
+# json_each 是否可用（首次使用时检测）
+_json_each_supported: Optional[bool] = None
+
+
+def _supports_json_each(cursor: sqlite3.Cursor) -> bool:
+    """检测当前 SQLite 是否支持 json_each"""
+    global _json_each_supported
+    if _json_each_supported is None:
+        try:
+            cursor.execute("SELECT value FROM json_each('[]')")
+            cursor.fetchall()
+            _json_each_supported = True
+        except sqlite3.OperationalError:
+            logger.info("SQLite 不支持 json_each，批量查询改为分块执行")
+            _json_each_supported = False
+    return _json_each_supported
+
+
+def iter_rows_by_keys(
+    cursor: sqlite3.Cursor,
+    sql: str,
+    keys: Iterable[Any],
+    params: tuple = (),
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Record]:
+    """按键列表执行查询，流式产出结果行
+
+    Args:
+        cursor: 数据库游标
+        sql: 含 ``{keys}`` 占位的语句，如 ``WHERE order_id IN ({keys})``
+        keys: 键列表（重复的键只查询一次）
+        params: 其余参数（在键之后绑定）
+        chunk_size: 分块执行时每块的键数量
+
+    Yields:
+        紧凑记录；语句按键排序时，分块执行的结果同样保持全局有序
+    """
+    unique_keys = sorted(set(keys))
+    if not unique_keys:
+        return
+
+    if _supports_json_each(cursor):
+        cursor.execute(
+            sql.format(keys=_JSON_KEYS),
+            (json.dumps(unique_keys, ensure_ascii=False), *params),
+        )
+        yield from iter_records(cursor)
+        return
+
+    for start in range(0, len(unique_keys), chunk_size):
+        chunk = unique_keys[start : start + chunk_size]
+        cursor.execute(
+            sql.format(keys=",".join("?" * len(chunk))), (*chunk, *params)
+        )
+        yield from iter_records(cursor)
+
+
+def iter_grouped_rows(
+    cursor: sqlite3.Cursor,
+    sql: str,
+    keys: Iterable[Any],
+    params: tuple = (),
+    key: str = "order_id",
+) -> Iterator[Tuple[Any, List[Record]]]:
+    """按键列表执行查询，按键分组流式产出 (键, 该键的所有行)
+
+    语句必须先按 key 排序（ORDER BY key, ...），没有结果的键不会产出。
+    """
+    rows = iter_rows_by_keys(cursor, sql, keys, params)
+    for group_key, group in itertools.groupby(rows, key=lambda row: row[key]):
+        yield group_key, list(group)
+
+
+def load_grouped_rows(
+    cursor: sqlite3.Cursor,
+    sql: str,
+    keys: Iterable[Any],
+    params: tuple = (),
+    key: str = "order_id",
+) -> Dict[Any, List[Record]]:
+    """按键列表执行查询，返回 {键: 行列表}（没有结果的键不在字典中）"""
+    return dict(iter_grouped_rows(cursor, sql, keys, params, key))
@@ -0,0 +1,287 @@
+"""
+数据库结构版本迁移模块
+
+使用 ``PRAGMA user_version`` 记录已应用的结构版本：
+- 启动时只读取一次版本号，数据库已是最新时直接返回（不再执行整套建表/探测语句）
+- 有待执行的迁移时，在同一个事务中按顺序执行并写入新版本号
+- 任一迁移失败则整体回滚，不会留下半初始化的结构
+
+新增结构变更时，在 SCHEMA_MIGRATIONS 末尾追加 (版本号, 说明, 函数)，
+版本号必须递增，已发布的迁移不要修改。
+
+daily_summary 的触发器和回填语句由 daily_summary 模块按最新表结构生成，
+迁移中不要直接调用：需要重建时用 @_refreshes_daily_summary 标记迁移，
+全部迁移执行完后在同一事务中统一重建一次。
+"""
+
+# 标准库
+import logging
+import sqlite3
+from typing import Callable, List, Tuple
+
+# 日志
+logger = logging.getLogger(__name__)
+
+MigrationFunc = Callable[[sqlite3.Cursor, sqlite3.Connection], None]
+
+
+class _TransactionConnection:
+    """迁移期间传给建表函数的连接代理
+
+    旧的建表/加列辅助函数内部会调用 conn.commit()，这里将其变为空操作，
+    由迁移执行器统一提交，保证所有迁移处于同一个事务中。
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def commit(self) -> None:
+        """延迟到迁移结束时统一提交"""
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _refreshes_daily_summary(migrate: MigrationFunc) -> MigrationFunc:
+    """标记迁移需要重建 daily_summary 触发器并回填
+
+    在迁移中途执行时，按最新结构生成的语句可能引用后续迁移才添加的列。
+    """
+    migrate.refreshes_daily_summary = True  # type: ignore[attr-defined]
+    return migrate
+
+
+def _refresh_daily_summary(cursor: sqlite3.Cursor) -> None:
+    """按最新表结构重建 daily_summary 触发器，并用现有明细回填"""
+    from db.module2_finance.daily_summary import (create_daily_summary_triggers,
+                                                  rebuild_daily_summary_sync)
+
+    create_daily_summary_triggers(cursor)
+    rebuild_daily_summary_sync(cursor)
+
+
+def _migration_0001_baseline(cursor: sqlite3.Cursor, conn: sqlite3.Connection) -> None:
+    """基础结构：创建所有表、索引，并补齐历史版本缺失的列"""
+    from db.init_tables_customer import create_customer_tables
+    from db.init_tables_finance import create_finance_tables
+    from db.init_tables_messages import create_message_tables
+    from db.init_tables_orders import (create_classified_tables,
+                                       create_orders_tables)
+    from db.init_tables_payment import create_payment_tables
+    from db.init_tables_records import create_record_tables
+    from db.init_tables_reports import create_report_tables
+    from db.init_tables_users import create_user_tables
+
+    # 创建订单相关表
+    create_orders_tables(cursor)
+    create_classified_tables(cursor)
+
+    # 创建财务数据表
+    create_finance_tables(cursor, conn)
+
+    # 创建用户和权限表
+    create_user_tables(cursor)
+
+    # 创建支付相关表
+    create_payment_tables(cursor, conn)
+
+    # 创建消息和自动化表
+    create_message_tables(cursor)
+
+    # 创建财务记录表
+    create_record_tables(cursor)
+
+    # 创建报表相关表
+    create_report_tables(cursor, conn)
+
+    # 创建客户信用系统表
+    create_customer_tables(cursor)
+
+
+def _migration_0002_conversation_state(
+    cursor: sqlite3.Cursor, conn: sqlite3.Connection
+) -> None:
+    """会话状态表：保存进行中的多步操作（user_data），重启后恢复"""
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS conversation_state (
+            user_id INTEGER PRIMARY KEY,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conversation_state_updated_at "
+        "ON conversation_state(updated_at)"
+    )
+
+
+def _migration_0003_scheduler_jobs(
+    cursor: sqlite3.Cursor, conn: sqlite3.Connection
+) -> None:
+    """定时任务持久化表和任务运行记录表"""
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scheduler_jobs (
+            id TEXT PRIMARY KEY,
+            next_run_time REAL,
+            job_state BLOB NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_scheduler_jobs_next_run_time "
+        "ON scheduler_jobs(next_run_time)"
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scheduler_job_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL,
+            job_name TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            duration REAL,
+            status TEXT NOT NULL,
+            error TEXT
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_scheduler_job_runs_name_started "
+        "ON scheduler_job_runs(job_name, started_at)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_scheduler_job_runs_started "
+        "ON scheduler_job_runs(started_at)"
+    )
+
+
+@_refreshes_daily_summary
+def _migration_0004_daily_summary_triggers(
+    cursor: sqlite3.Cursor, conn: sqlite3.Connection
+) -> None:
+    """日切数据增量维护：创建触发器，并用现有明细回填 daily_summary"""
+
+
+@_refreshes_daily_summary
+def _migration_0005_money_cents(
+    cursor: sqlite3.Cursor, conn: sqlite3.Connection
+) -> None:
+    """金额列改为整数分存储（daily_summary 触发器按新结构重建）"""
+    from db.money_columns import convert_money_columns
+
+    convert_money_columns(cursor)
+
+
+def _migration_0006_search_index(
+    cursor: sqlite3.Cursor, conn: sqlite3.Connection
+) -> None:
+    """模糊搜索索引：订单号/归属ID、群名、客户档案的 FTS5 trigram 索引和触发器"""
+    from db.search_index import create_search_index
+
+    create_search_index(cursor)
+
+
+@_refreshes_daily_summary
+def _migration_0007_period_dates(
+    cursor: sqlite3.Cursor, conn: sqlite3.Connection
+) -> None:
+    """日结周期日期列：操作历史、订单的周期日期生成列和索引，按新口径重算日切数据
+
+    周期日期按北京时间计算，按 UTC 写入的订单 updated_at 同时修正为北京时间。
+    """
+    from db.archive import ARCHIVE_SCHEMA, attach_archive, ensure_archive_tables
+    from db.period_columns import add_period_columns, fix_utc_updated_at
+
+    add_period_columns(cursor)
+    # 被 operation_history(period_date) 上的索引取代
+    cursor.execute("DROP INDEX IF EXISTS main.idx_operation_date")
+    if attach_archive(cursor):
+        ensure_archive_tables(cursor)
+        cursor.execute(f"DROP INDEX IF EXISTS {ARCHIVE_SCHEMA}.idx_operation_date")
+    fixed = fix_utc_updated_at(cursor)
+    logger.info(f"已把 {fixed} 个订单的 updated_at 从 UTC 改为北京时间")
+
+
+# 迁移列表：(版本号, 说明, 迁移函数)，版本号严格递增
+SCHEMA_MIGRATIONS: List[Tuple[int, str, MigrationFunc]] = [
+    (1, "基础表结构", _migration_0001_baseline),
+    (2, "会话状态表", _migration_0002_conversation_state),
+    (3, "定时任务持久化和运行记录", _migration_0003_scheduler_jobs),
+    (4, "日切数据增量维护", _migration_0004_daily_summary_triggers),
+    (5, "金额整数分存储", _migration_0005_money_cents),
+    (6, "模糊搜索索引", _migration_0006_search_index),
+    (7, "日结周期日期列", _migration_0007_period_dates),
+]
+
+CURRENT_SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """读取数据库当前结构版本（PRAGMA user_version）"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def get_pending_migrations(version: int) -> List[Tuple[int, str, MigrationFunc]]:
+    """获取高于指定版本的待执行迁移"""
+    return [m for m in SCHEMA_MIGRATIONS if m[0] > version]
+
+
+def run_migrations(db_path: str) -> int:
+    """执行所有待执行的迁移
+
+    Args:
+        db_path: 数据库文件路径
+
+    Returns:
+        本次应用的迁移数量（数据库已是最新时为 0）
+
+    Raises:
+        Exception: 迁移失败时回滚并向上抛出
+    """
+    # isolation_level=None：由这里显式控制事务边界
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        # 日志模式不能在事务中切换，且对已是最新版本的库同样需要
+        from utils.db_pool import enable_wal
+
+        enable_wal(conn)
+        version = get_schema_version(conn)
+        if version >= CURRENT_SCHEMA_VERSION:
+            return 0
+
+        cursor = conn.cursor()
+        # 迁移可能需要读写归档库，附加须在事务开始之前
+        from db.archive import attach_archive
+
+        attach_archive(cursor)
+        # IMMEDIATE：防止多个进程同时启动时重复执行迁移
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # 拿到写锁后重新读取版本，可能已被其他进程迁移
+            version = get_schema_version(conn)
+            pending = get_pending_migrations(version)
+            tx_conn = _TransactionConnection(conn)
+            for migration_version, description, migrate in pending:
+                logger.info(f"执行数据库迁移 v{migration_version}: {description}")
+                migrate(cursor, tx_conn)
+                # PRAGMA 不支持参数绑定，版本号为内部整数常量
+                cursor.execute(f"PRAGMA user_version = {int(migration_version)}")
+            if any(getattr(m[2], "refreshes_daily_summary", False) for m in pending):
+                logger.info("重建 daily_summary 触发器并回填")
+                _refresh_daily_summary(cursor)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            logger.error(f"数据库迁移失败，已回滚到 v{version}", exc_info=True)
+            raise
+
+        if pending:
+            logger.info(
+                f"数据库结构已从 v{version} 升级到 v{pending[-1][0]}"
+                f"（{len(pending)} 个迁移）"
+            )
+        return len(pending)
+    finally:
+        conn.close()
@@ -74,11 +74,10 @@ def update_daily_data(
     Note:
         - 此函数会自动提交事务（通过 @db_transaction 装饰器）
         - 如果日结数据不存在，会自动创建
-        - 使用增量更新（current_value + amount）
+        - 使用增量更新（field = field + amount，金额列按整数分累加）
     """
     from db.module2_finance.daily_init import init_daily_data_if_needed
-    from db.module2_finance.daily_update import (get_current_daily_value,
-                                                 update_daily_field)
+    from db.module2_finance.daily_update import increment_daily_field
     from db.module2_finance.daily_validate import (validate_daily_field,
                                                    validate_date_format)
 
@@ -92,22 +91,10 @@ def update_daily_data(
     # 初始化日结数据（如果需要）
     init_daily_data_if_needed(cursor, date, group_id)
 
-    # 获取当前值
-    current_value = get_current_daily_value(cursor, date, field, group_id)
+    # 在数据库中累加（金额列按整数分）
+    return increment_daily_field(cursor, date, field, amount, group_id)
 
-    # 计算新值并更新
-    new_value = current_value + amount
-    success = update_daily_field(cursor, date, field, new_value, group_id)
 
-    if success:
-        logger.debug(
-            f"日结数据已更新: {date} {group_id or '全局'} {field} = {current_value} + {amount} = {new_value}"
-        )
-
-    return success
-
-
-@db_query
 def _build_date_range_where_clause(
     start_date: str, end_date: str, group_id: Optional[str]
 ) -> Tuple[str, List]:
@@ -173,6 +160,7 @@ def _build_stats_result(row, keys: List[str]) -> Dict:
     return result
 
 
+@db_query
 def get_stats_by_date_range(
     conn, cursor, start_date: str, end_date: str, group_id: Optional[str] = None
 ) -> Dict:
@@ -185,19 +173,19 @@ def get_stats_by_date_range(
         f"""
     SELECT
         SUM(new_clients) as new_clients,
-        SUM(new_clients_amount) as new_clients_amount,
+        SUM(new_clients_amount_cents) / 100.0 as new_clients_amount,
         SUM(old_clients) as old_clients,
-        SUM(old_clients_amount) as old_clients_amount,
-        SUM(interest) as interest,
+        SUM(old_clients_amount_cents) / 100.0 as old_clients_amount,
+        SUM(interest_cents) / 100.0 as interest,
         SUM(completed_orders) as completed_orders,
-        SUM(completed_amount) as completed_amount,
+        SUM(completed_amount_cents) / 100.0 as completed_amount,
         SUM(breach_orders) as breach_orders,
-        SUM(breach_amount) as breach_amount,
+        SUM(breach_amount_cents) / 100.0 as breach_amount,
         SUM(breach_end_orders) as breach_end_orders,
-        SUM(breach_end_amount) as breach_end_amount,
-        SUM(liquid_flow) as liquid_flow,
-        SUM(company_expenses) as company_expenses,
-        SUM(other_expenses) as other_expenses
+        SUM(breach_end_amount_cents) / 100.0 as breach_end_amount,
+        SUM(liquid_flow_cents) / 100.0 as liquid_flow,
+        SUM(company_expenses_cents) / 100.0 as company_expenses,
+        SUM(other_expenses_cents) / 100.0 as other_expenses
     FROM daily_data
     WHERE {where_clause}
     """,
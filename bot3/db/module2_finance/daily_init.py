@@ -29,16 +29,7 @@ def init_daily_data_if_needed(
     row = cursor.fetchone()
 
     if not row:
+        # 其余统计列默认为 0
         cursor.execute(
-            """
-        INSERT INTO daily_data (
-            date, group_id, new_clients, new_clients_amount,
-            old_clients, old_clients_amount,
-            interest, completed_orders, completed_amount,
-            breach_orders, breach_amount,
-            breach_end_orders, breach_end_amount,
-            liquid_flow, company_expenses, other_expenses
-        ) VALUES (?, ?, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        """,
-            (date, group_id),
+            "INSERT INTO daily_data (date, group_id) VALUES (?, ?)", (date, group_id)
         )
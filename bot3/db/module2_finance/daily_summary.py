@@ -0,0 +1,281 @@
+"""日切数据增量维护模块
+
+daily_summary 表由 orders / income_records / expense_records 上的触发器增量维护：
+每次写入时，在同一事务中从旧行所属日期扣除旧行的贡献，再把新行的贡献加到新日期，
+日切报表和 /daily_changes 只需读取一行，不再每次扫描当天的全部订单和明细。
+
+统计口径与 income_query 中按日期的查询完全一致，日期均为日结周期日期（23:00 日切）：
+- 新客户/老客户订单：按 created_at 所属周期（created_period_date），customer 为 A / B
+- 完成、违约、违约完成：按 updated_at 所属周期（updated_period_date）和当前状态
+- 利息收入：income_records.date，type = 'interest' 且未撤销
+- 公司/其他开销：expense_records.date
+
+rebuild_daily_summary 用 SQL 全量重算（迁移时回填、核对发现差异时修复），
+按明细重算的校验见 utils.daily_report_generator.verify_daily_summary，
+带差异报告和并行模式的历史回填见 daily_summary_backfill。
+"""
+
+# 标准库
+import logging
+import sqlite3
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# 本地模块
+from db.base import db_transaction
+from db.money_columns import MONEY_COLUMNS, cents_column
+
+# 日志
+logger = logging.getLogger(__name__)
+
+# 金额列（以整数分存储在 <列>_cents，增减都是精确的整数运算）
+AMOUNT_COLUMNS = MONEY_COLUMNS["daily_summary"]
+
+
+class SummarySource(NamedTuple):
+    """一类明细对 daily_summary 的贡献
+
+    表达式中的 {r} 在触发器中替换为 NEW / OLD，全量重算时替换为表名。
+    """
+
+    name: str
+    table: str
+    # 归属日期列（日结周期日期，见 db.period_columns）
+    date_column: str
+    # 计入统计的条件
+    condition: str
+    # 触发器监听的列（这些列变化时才需要调整）
+    watch_columns: tuple
+    # daily_summary 列 -> 贡献值表达式
+    columns: Dict[str, str]
+
+
+# 明细金额（整数分）
+_AMOUNT = "COALESCE({r}.amount_cents, 0)"
+
+SUMMARY_SOURCES: List[SummarySource] = [
+    SummarySource(
+        name="orders_new",
+        table="orders",
+        date_column="created_period_date",
+        condition="{r}.customer IN ('A', 'B')",
+        watch_columns=("created_at", "customer", "amount_cents"),
+        columns={
+            "new_clients_count": "({r}.customer = 'A')",
+            "new_clients_amount": f"({{r}}.customer = 'A') * {_AMOUNT}",
+            "old_clients_count": "({r}.customer = 'B')",
+            "old_clients_amount": f"({{r}}.customer = 'B') * {_AMOUNT}",
+        },
+    ),
+    SummarySource(
+        name="orders_state",
+        table="orders",
+        date_column="updated_period_date",
+        condition="{r}.state IN ('end', 'breach', 'breach_end')",
+        watch_columns=("updated_at", "state", "amount_cents"),
+        columns={
+            "completed_orders_count": "({r}.state = 'end')",
+            "completed_amount": f"({{r}}.state = 'end') * {_AMOUNT}",
+            "breach_orders_count": "({r}.state = 'breach')",
+            "breach_amount": f"({{r}}.state = 'breach') * {_AMOUNT}",
+            "breach_end_orders_count": "({r}.state = 'breach_end')",
+            "breach_end_amount": f"({{r}}.state = 'breach_end') * {_AMOUNT}",
+        },
+    ),
+    SummarySource(
+        name="income",
+        table="income_records",
+        date_column="date",
+        condition="{r}.type = 'interest' AND COALESCE({r}.is_undone, 0) = 0",
+        watch_columns=("date", "type", "amount_cents", "is_undone"),
+        columns={"daily_interest": _AMOUNT},
+    ),
+    SummarySource(
+        name="expense",
+        table="expense_records",
+        date_column="date",
+        condition="{r}.type IN ('company', 'other')",
+        watch_columns=("date", "type", "amount_cents"),
+        columns={
+            "company_expenses": f"({{r}}.type = 'company') * {_AMOUNT}",
+            "other_expenses": f"({{r}}.type = 'other') * {_AMOUNT}",
+        },
+    ),
+]
+
+
+def _date_expr(source: SummarySource, ref: str) -> str:
+    """明细行归属日期的表达式（不属于任何日期时为 NULL）"""
+    return f"{ref}.{source.date_column}"
+
+
+def storage_columns(columns) -> List[str]:
+    """daily_summary 中实际写入的列（金额列为 <列>_cents）"""
+    return [
+        cents_column(column) if column in AMOUNT_COLUMNS else column
+        for column in columns
+    ]
+
+
+def _upsert_clause(columns) -> str:
+    """与已有行累加的 ON CONFLICT 子句"""
+    assignments = [
+        f"{column} = {column} + excluded.{column}"
+        for column in storage_columns(columns)
+    ]
+    return "ON CONFLICT(date) DO UPDATE SET " + ", ".join(assignments)
+
+
+def _delta_statement(source: SummarySource, ref: str, sign: str) -> str:
+    """触发器语句：把 NEW / OLD 行的贡献（sign 为 + / -）累加到所属日期"""
+    columns = list(source.columns)
+    values = ", ".join(
+        f"{sign}({source.columns[column].format(r=ref)})" for column in columns
+    )
+    date_expr = _date_expr(source, ref)
+    return (
+        f"INSERT INTO daily_summary (date, {', '.join(storage_columns(columns))}) "
+        f"SELECT {date_expr}, {values} "
+        f"WHERE {source.condition.format(r=ref)} AND ({date_expr}) IS NOT NULL "
+        f"{_upsert_clause(columns)};"
+    )
+
+
+def _trigger_statements(source: SummarySource) -> Dict[str, str]:
+    """生成一类明细的 INSERT / UPDATE / DELETE 触发器"""
+    prefix = f"trg_daily_summary_{source.name}"
+    changed = " OR ".join(
+        f"OLD.{column} IS NOT NEW.{column}" for column in source.watch_columns
+    )
+    return {
+        f"{prefix}_insert": (
+            f"CREATE TRIGGER {prefix}_insert AFTER INSERT ON {source.table} "
+            f"BEGIN {_delta_statement(source, 'NEW', '+')} END"
+        ),
+        f"{prefix}_update": (
+            f"CREATE TRIGGER {prefix}_update "
+            f"AFTER UPDATE OF {', '.join(source.watch_columns)} ON {source.table} "
+            f"WHEN {changed} BEGIN "
+            f"{_delta_statement(source, 'OLD', '-')} "
+            f"{_delta_statement(source, 'NEW', '+')} END"
+        ),
+        f"{prefix}_delete": (
+            f"CREATE TRIGGER {prefix}_delete AFTER DELETE ON {source.table} "
+            f"BEGIN {_delta_statement(source, 'OLD', '-')} END"
+        ),
+    }
+
+
+def create_daily_summary_triggers(cursor: sqlite3.Cursor) -> None:
+    """创建（或重建）维护 daily_summary 的触发器"""
+    for source in SUMMARY_SOURCES:
+        for name, sql in _trigger_statements(source).items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(sql)
+
+
+def drop_daily_summary_triggers(cursor: sqlite3.Cursor) -> None:
+    """移除维护 daily_summary 的触发器（批量搬移明细而不改变日切数据时使用）"""
+    for source in SUMMARY_SOURCES:
+        for name in _trigger_statements(source):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def source_summary_query(
+    source: SummarySource,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    from_clause: Optional[str] = None,
+) -> Tuple[str, tuple]:
+    """按日期分组汇总一类明细的查询（可限定日期范围）
+
+    结果列依次为 summary_date 和 source.columns 各列的合计（金额为整数分）。
+    from_clause 为读取的表达式（默认为表名，见 db.archive.archive_union）。
+
+    Returns:
+        (SQL, 参数)
+    """
+    table = source.table
+    sums = [f"SUM({expr.format(r=table)})" for expr in source.columns.values()]
+    date_expr = _date_expr(source, table)
+
+    where = f"{source.condition.format(r=table)} AND ({date_expr}) IS NOT NULL"
+    params: list = []
+    # 按日期列范围过滤，可以使用周期日期列 / date 上的索引
+    if start_date is not None:
+        where += f" AND {table}.{source.date_column} >= ?"
+        params.append(start_date)
+    if end_date is not None:
+        where += f" AND {table}.{source.date_column} <= ?"
+        params.append(end_date)
+
+    # 表名、列名和表达式均为本模块内的常量
+    sql = (  # nosec B608
+        f"SELECT {date_expr} AS summary_date, {', '.join(sums)} "
+        f"FROM {from_clause or table} WHERE {where} GROUP BY summary_date"
+    )
+    return sql, tuple(params)
+
+
+def _rebuild_source(
+    cursor: sqlite3.Cursor,
+    source: SummarySource,
+    date: Optional[str],
+    from_clause: Optional[str] = None,
+) -> None:
+    """按日期分组汇总一类明细，累加到 daily_summary"""
+    columns = list(source.columns)
+    select_sql, params = source_summary_query(source, date, date, from_clause)
+    cursor.execute(  # nosec B608
+        f"INSERT INTO daily_summary (date, {', '.join(storage_columns(columns))}) "
+        f"{select_sql} {_upsert_clause(columns)}",
+        params,
+    )
+
+
+def rebuild_daily_summary_sync(
+    cursor: sqlite3.Cursor, date: Optional[str] = None
+) -> int:
+    """用明细全量重算 daily_summary（在调用方的事务中执行）
+
+    Args:
+        cursor: 数据库游标
+        date: 只重算该日期；None 表示重算所有日期
+
+    Returns:
+        重算后的行数
+    """
+    from db.archive import archive_union
+
+    # 包含归档库中的明细（附加归档库须在本事务的第一条写入之前）
+    sources = {
+        source.table: archive_union(cursor, source.table)
+        for source in SUMMARY_SOURCES
+    }
+    if date is None:
+        cursor.execute("DELETE FROM daily_summary")
+    else:
+        cursor.execute("DELETE FROM daily_summary WHERE date = ?", (date,))
+
+    for source in SUMMARY_SOURCES:
+        _rebuild_source(cursor, source, date, sources[source.table])
+
+    if date is None:
+        cursor.execute("SELECT COUNT(*) FROM daily_summary")
+    else:
+        cursor.execute("SELECT COUNT(*) FROM daily_summary WHERE date = ?", (date,))
+    return cursor.fetchone()[0]
+
+
+@db_transaction
+def rebuild_daily_summary(conn, cursor, date: Optional[str] = None) -> int:
+    """用明细全量重算 daily_summary
+
+    Args:
+        date: 只重算该日期；None 表示重算所有日期
+
+    Returns:
+        重算后的行数
+    """
+    count = rebuild_daily_summary_sync(cursor, date)
+    logger.info(f"已重算日切数据: {date or '全部日期'}（{count} 行）")
+    return count
@@ -0,0 +1,373 @@
+"""日切数据历史回填
+
+按明细一次性重算一段日期（默认全部历史）的 daily_summary：
+- 每类明细（见 daily_summary.SUMMARY_SOURCES）只执行一条按日期 GROUP BY 的查询，
+  不再逐日调用 calculate_daily_summary（每天六条查询）
+- 在一个事务中删除范围内的旧行并批量写入新结果
+- 写入前与已有行逐字段对比，生成差异报告；dry_run 只报告不写入
+- workers > 1 时把日期范围切分为多段，用多个只读连接并行汇总
+
+汇总在持有写锁（BEGIN IMMEDIATE）之后进行：其他连接仍可读，但不能提交写入，
+汇总结果与写入时的明细一致，期间由触发器产生的增量不会丢失。
+"""
+
+# 标准库
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# 本地模块
+from db.module2_finance.daily_summary import (AMOUNT_COLUMNS, SUMMARY_SOURCES,
+                                              source_summary_query,
+                                              storage_columns)
+from utils.money import from_cents
+
+# 日志
+logger = logging.getLogger(__name__)
+
+# daily_summary 中由明细汇总得到的列：存储列（金额为 <列>_cents） -> 列名
+_DISPLAY_COLUMNS: Dict[str, str] = {
+    storage: column
+    for source in SUMMARY_SOURCES
+    for storage, column in zip(storage_columns(source.columns), source.columns)
+}
+SUMMARY_COLUMNS: Tuple[str, ...] = tuple(_DISPLAY_COLUMNS)
+
+# 明细日期范围：订单按 created_at / updated_at，收支按 date
+_DATE_RANGE_SQL = """
+    SELECT MIN(d), MAX(d) FROM (
+        SELECT MIN(created_period_date) AS d FROM {orders}
+        UNION ALL SELECT MAX(created_period_date) FROM {orders}
+        UNION ALL SELECT MIN(updated_period_date) FROM {orders}
+        UNION ALL SELECT MAX(updated_period_date) FROM {orders}
+        UNION ALL SELECT MIN(date) FROM {income_records}
+        UNION ALL SELECT MAX(date) FROM {income_records}
+        UNION ALL SELECT MIN(date) FROM expense_records
+        UNION ALL SELECT MAX(date) FROM expense_records
+    ) WHERE d IS NOT NULL
+"""
+
+# 日期 -> {存储列: 值}
+Summaries = Dict[str, Dict[str, int]]
+
+
+class SummaryDiff(NamedTuple):
+    """已有行与重算结果不一致的字段（金额为元）"""
+
+    date: str
+    column: str
+    stored: Any
+    expected: Any
+
+
+@dataclass
+class BackfillReport:
+    """回填结果"""
+
+    start_date: Optional[str]
+    end_date: Optional[str]
+    workers: int
+    dry_run: bool
+    # 重算得到的日期数、写入前已有的行数
+    days: int = 0
+    existing_rows: int = 0
+    written_rows: int = 0
+    diffs: List[SummaryDiff] = field(default_factory=list)
+    # 只在重算结果 / 已有行中出现的日期
+    missing_dates: List[str] = field(default_factory=list)
+    extra_dates: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def changed_dates(self) -> List[str]:
+        dates = {diff.date for diff in self.diffs}
+        return sorted(dates.union(self.missing_dates, self.extra_dates))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "workers": self.workers,
+            "dry_run": self.dry_run,
+            "days": self.days,
+            "existing_rows": self.existing_rows,
+            "written_rows": self.written_rows,
+            "changed_dates": self.changed_dates,
+            "missing_dates": self.missing_dates,
+            "extra_dates": self.extra_dates,
+            "diffs": [diff._asdict() for diff in self.diffs],
+            "elapsed": round(self.elapsed, 3),
+        }
+
+    def format(self, max_diffs: int = 50) -> str:
+        """文本格式的差异报告"""
+        scope = f"{self.start_date or '最早'} 至 {self.end_date or '最新'}"
+        lines = [
+            f"日切数据回填: {scope}"
+            f"{'（仅对比，未写入）' if self.dry_run else ''}",
+            f"  重算日期: {self.days} 天，已有行: {self.existing_rows}，"
+            f"写入: {self.written_rows} 行，并行: {self.workers}，"
+            f"耗时: {self.elapsed:.2f} 秒",
+            f"  有差异的日期: {len(self.changed_dates)} 天"
+            f"（缺失 {len(self.missing_dates)}，多余 {len(self.extra_dates)}，"
+            f"字段差异 {len(self.diffs)} 处）",
+        ]
+        for diff in self.diffs[:max_diffs]:
+            lines.append(
+                f"  {diff.date} {diff.column}: {diff.stored} -> {diff.expected}"
+            )
+        if len(self.diffs) > max_diffs:
+            lines.append(f"  ... 另有 {len(self.diffs) - max_diffs} 处差异")
+        return "\n".join(lines)
+
+
+def _empty_summary() -> Dict[str, int]:
+    return dict.fromkeys(SUMMARY_COLUMNS, 0)
+
+
+def compute_daily_summaries(
+    cursor: sqlite3.Cursor,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Summaries:
+    """按明细汇总日期范围内每天的日切数据（每类明细一条查询，包含归档库）"""
+    from db.archive import archive_union
+
+    sources = {
+        source.table: archive_union(cursor, source.table)
+        for source in SUMMARY_SOURCES
+    }
+    summaries: Summaries = {}
+    for source in SUMMARY_SOURCES:
+        sql, params = source_summary_query(
+            source, start_date, end_date, sources[source.table]
+        )
+        columns = storage_columns(source.columns)
+        for row in cursor.execute(sql, params):
+            summary = summaries.get(row[0])
+            if summary is None:
+                summary = summaries[row[0]] = _empty_summary()
+            for column, value in zip(columns, row[1:]):
+                summary[column] += value or 0
+    return summaries
+
+
+def load_daily_summaries(
+    cursor: sqlite3.Cursor,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Summaries:
+    """读取 daily_summary 中已有的行"""
+    where, params = _date_filter(start_date, end_date)
+    cursor.execute(
+        f"SELECT date, {', '.join(SUMMARY_COLUMNS)} "  # nosec B608
+        f"FROM daily_summary {where}",
+        params,
+    )
+    return {
+        row[0]: {
+            column: value or 0 for column, value in zip(SUMMARY_COLUMNS, row[1:])
+        }
+        for row in cursor.fetchall()
+    }
+
+
+def diff_daily_summaries(
+    stored: Summaries, expected: Summaries
+) -> Tuple[List[SummaryDiff], List[str], List[str]]:
+    """对比已有行和重算结果
+
+    Returns:
+        (字段差异, 缺失的日期, 多余的日期)；全为 0 的行视同不存在
+    """
+    diffs = []
+    missing, extra = [], []
+    empty = _empty_summary()
+    for day in sorted(set(stored) | set(expected)):
+        old = stored.get(day)
+        new = expected.get(day, empty)
+        if old is None:
+            if new != empty:
+                missing.append(day)
+            continue
+        if day not in expected and old != empty:
+            extra.append(day)
+            continue
+        for column in SUMMARY_COLUMNS:
+            if old[column] != new[column]:
+                diffs.append(
+                    SummaryDiff(
+                        day,
+                        _DISPLAY_COLUMNS[column],
+                        _display_value(column, old[column]),
+                        _display_value(column, new[column]),
+                    )
+                )
+    return diffs, missing, extra
+
+
+def write_daily_summaries(
+    cursor: sqlite3.Cursor,
+    summaries: Summaries,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> int:
+    """用重算结果替换日期范围内的 daily_summary 行（在调用方的事务中执行）"""
+    where, params = _date_filter(start_date, end_date)
+    cursor.execute(f"DELETE FROM daily_summary {where}", params)  # nosec B608
+    placeholders = ", ".join("?" for _ in range(len(SUMMARY_COLUMNS) + 1))
+    cursor.executemany(
+        f"INSERT INTO daily_summary (date, {', '.join(SUMMARY_COLUMNS)}) "
+        f"VALUES ({placeholders})",
+        [
+            (day, *(summary[column] for column in SUMMARY_COLUMNS))
+            for day, summary in sorted(summaries.items())
+        ],
+    )
+    return len(summaries)
+
+
+def get_detail_date_range(cursor: sqlite3.Cursor) -> Tuple[Optional[str], ...]:
+    """明细数据覆盖的日期范围 (最早, 最晚)，没有明细时为 (None, None)"""
+    from db.archive import archive_union
+
+    cursor.execute(
+        _DATE_RANGE_SQL.format(
+            orders=archive_union(cursor, "orders"),
+            income_records=archive_union(cursor, "income_records"),
+        )
+    )
+    row = cursor.fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def split_date_range(start_date: str, end_date: str, parts: int) -> List[Tuple]:
+    """把日期范围切分为最多 parts 段连续的子范围"""
+    start = date.fromisoformat(start_date)
+    days = (date.fromisoformat(end_date) - start).days + 1
+    if days <= 0:
+        return []
+    size = -(-days // max(1, min(parts, days)))
+    return [
+        (
+            (start + timedelta(days=offset)).isoformat(),
+            (start + timedelta(days=min(offset + size, days) - 1)).isoformat(),
+        )
+        for offset in range(0, days, size)
+    ]
+
+
+def backfill_daily_summary(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    workers: int = 1,
+    dry_run: bool = False,
+) -> BackfillReport:
+    """按明细重算并回填日期范围内的 daily_summary
+
+    Args:
+        start_date: 开始日期（含）；None 表示不限
+        end_date: 结束日期（含）；None 表示不限
+        workers: 并行汇总的连接数（>1 时按日期切分范围）
+        dry_run: 只生成差异报告，不写入
+
+    Returns:
+        回填结果（含差异报告）
+    """
+    from db.archive import attach_archive
+    from utils.db_pool import get_sync_connection
+
+    started = time.perf_counter()
+    report = BackfillReport(start_date, end_date, max(1, workers), dry_run)
+
+    conn = get_sync_connection()
+    try:
+        cursor = conn.cursor()
+        # 归档库须在事务开始前附加
+        attach_archive(cursor)
+        # 持有写锁期间明细不会变化，汇总和写入看到同一份数据
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            expected = _compute(cursor, start_date, end_date, report.workers)
+            stored = load_daily_summaries(cursor, start_date, end_date)
+
+            report.days = len(expected)
+            report.existing_rows = len(stored)
+            report.diffs, report.missing_dates, report.extra_dates = (
+                diff_daily_summaries(stored, expected)
+            )
+            if not dry_run:
+                report.written_rows = write_daily_summaries(
+                    cursor, expected, start_date, end_date
+                )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    finally:
+        conn.close()
+
+    report.elapsed = time.perf_counter() - started
+    logger.info(
+        f"日切数据回填完成: {report.days} 天，差异 {len(report.changed_dates)} 天，"
+        f"写入 {report.written_rows} 行，耗时 {report.elapsed:.2f} 秒"
+    )
+    return report
+
+
+def _compute(
+    cursor: sqlite3.Cursor,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    workers: int,
+) -> Summaries:
+    """汇总日期范围（并行时每段使用独立的只读连接）"""
+    if workers > 1:
+        low, high = get_detail_date_range(cursor)
+        low = max(filter(None, (low, start_date)), default=None)
+        high = min(filter(None, (high, end_date)), default=None)
+        ranges = split_date_range(low, high, workers) if low and high else []
+        if len(ranges) > 1:
+            summaries: Summaries = {}
+            with ThreadPoolExecutor(
+                max_workers=len(ranges), thread_name_prefix="summary-backfill"
+            ) as executor:
+                for part in executor.map(lambda r: _compute_range(*r), ranges):
+                    summaries.update(part)
+            return summaries
+    return compute_daily_summaries(cursor, start_date, end_date)
+
+
+def _compute_range(start_date: str, end_date: str) -> Summaries:
+    from utils.db_pool import get_sync_connection
+
+    conn = get_sync_connection()
+    try:
+        return compute_daily_summaries(conn.cursor(), start_date, end_date)
+    finally:
+        conn.close()
+
+
+def _date_filter(
+    start_date: Optional[str], end_date: Optional[str]
+) -> Tuple[str, tuple]:
+    conditions, params = [], []
+    if start_date is not None:
+        conditions.append("date >= ?")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("date <= ?")
+        params.append(end_date)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, tuple(params)
+
+
+def _display_value(column: str, value: int) -> Any:
+    """存储值 -> 报告中显示的值（金额转换为元）"""
+    if _DISPLAY_COLUMNS[column] in AMOUNT_COLUMNS:
+        return from_cents(value)
+    return value
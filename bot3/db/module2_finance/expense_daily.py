@@ -6,6 +6,8 @@
 import sqlite3
 from typing import Tuple
 
+from utils.money import to_cents
+
 
 def _calculate_expense_amounts(field: str, amount: float) -> Tuple[float, float]:
     """计算开销金额
@@ -41,15 +43,10 @@ def _insert_new_daily_expense_record(
     cursor.execute(
         """
     INSERT INTO daily_data (
-        date, group_id, new_clients, new_clients_amount,
-        old_clients, old_clients_amount,
-        interest, completed_orders, completed_amount,
-        breach_orders, breach_amount,
-        breach_end_orders, breach_end_amount,
-        liquid_flow, company_expenses, other_expenses
-    ) VALUES (?, NULL, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, ?, ?, ?)
+        date, group_id, liquid_flow_cents, company_expenses_cents, other_expenses_cents
+    ) VALUES (?, NULL, ?, ?, ?)
     """,
-        (date, -amount, company_amount, other_amount),
+        (date, -to_cents(amount), to_cents(company_amount), to_cents(other_amount)),
     )
 
 
@@ -68,23 +65,23 @@ def _update_existing_daily_expense(
         cursor.execute(
             """
         UPDATE daily_data
-        SET company_expenses = company_expenses + ?,
-            liquid_flow = liquid_flow - ?,
+        SET company_expenses_cents = company_expenses_cents + ?,
+            liquid_flow_cents = liquid_flow_cents - ?,
             updated_at = CURRENT_TIMESTAMP
         WHERE date = ? AND group_id IS NULL
         """,
-            (amount, amount, date),
+            (to_cents(amount), to_cents(amount), date),
         )
     else:  # other_expenses
         cursor.execute(
             """
         UPDATE daily_data
-        SET other_expenses = other_expenses + ?,
-            liquid_flow = liquid_flow - ?,
+        SET other_expenses_cents = other_expenses_cents + ?,
+            liquid_flow_cents = liquid_flow_cents - ?,
             updated_at = CURRENT_TIMESTAMP
         WHERE date = ? AND group_id IS NULL
         """,
-            (amount, amount, date),
+            (to_cents(amount), to_cents(amount), date),
         )
 
 
@@ -5,6 +5,8 @@
 
 import sqlite3
 
+from utils.money import from_cents, to_cents
+
 
 def update_financial_data_for_expense(cursor: sqlite3.Cursor, amount: float) -> float:
     """更新财务数据（开销）
@@ -16,35 +18,19 @@ def update_financial_data_for_expense(cursor: sqlite3.Cursor, amount: float) ->
     Returns:
         float: 新的流动资金
     """
-    cursor.execute("SELECT * FROM financial_data ORDER BY id DESC LIMIT 1")
-    financial_row = cursor.fetchone()
-
-    if not financial_row:
-        cursor.execute(
-            """
-        INSERT INTO financial_data (
-            valid_orders, valid_amount, liquid_funds,
-            new_clients, new_clients_amount,
-            old_clients, old_clients_amount,
-            interest, completed_orders, completed_amount,
-            breach_orders, breach_amount,
-            breach_end_orders, breach_end_amount
-        ) VALUES (0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        """
-        )
-        current_liquid_funds = 0
-    else:
-        current_liquid_funds = dict(financial_row).get("liquid_funds", 0)
-
-    new_liquid_funds = current_liquid_funds - amount
+    cursor.execute("SELECT 1 FROM financial_data LIMIT 1")
+    if not cursor.fetchone():
+        cursor.execute("INSERT INTO financial_data DEFAULT VALUES")
 
     cursor.execute(
         """
     UPDATE financial_data
-    SET "liquid_funds" = ?, updated_at = CURRENT_TIMESTAMP
+    SET liquid_funds_cents = liquid_funds_cents - ?, updated_at = CURRENT_TIMESTAMP
     WHERE id = (SELECT id FROM financial_data ORDER BY id DESC LIMIT 1)
     """,
-        (new_liquid_funds,),
+        (to_cents(amount),),
     )
-
-    return new_liquid_funds
+    cursor.execute(
+        "SELECT liquid_funds_cents FROM financial_data ORDER BY id DESC LIMIT 1"
+    )
+    return from_cents(cursor.fetchone()[0])
@@ -10,6 +10,7 @@ from typing import Dict, List, Optional
 
 # 本地模块
 from db.base import db_query, db_transaction
+from db.money_columns import storage_column
 from utils.query_builder import QueryBuilder
 
 # 日志
@@ -47,7 +48,6 @@ def get_financial_data(conn, cursor) -> Dict:
     }
 
 
-@db_transaction
 def _check_field_exists(cursor, field: str) -> bool:
     """检查字段是否存在
 
@@ -92,11 +92,10 @@ def update_financial_data(conn, cursor, field: str, amount: float) -> bool:
     Note:
         - 此函数会自动提交事务（通过 @db_transaction 装饰器）
         - 如果字段不存在，会使用默认值 0
-        - 使用增量更新（current_value + amount）
+        - 使用增量更新（field = field + amount，金额列按整数分累加）
     """
     from db.module2_finance.finance_init import init_financial_data_if_needed
-    from db.module2_finance.finance_update import (get_current_field_value,
-                                                   update_financial_field)
+    from db.module2_finance.finance_update import increment_financial_field
     from db.module2_finance.finance_validate import validate_financial_field
 
     if not validate_financial_field(field):
@@ -107,14 +106,8 @@ def update_financial_data(conn, cursor, field: str, amount: float) -> bool:
     if not _check_field_exists(cursor, field):
         return False
 
-    current_value = get_current_field_value(cursor, field)
-    new_value = current_value + amount
-    success = update_financial_field(cursor, field, new_value)
-
+    success = increment_financial_field(cursor, field, amount)
     if success:
-        logger.debug(
-            f"财务数据已更新: {field} = {current_value} + {amount} = {new_value}"
-        )
         _invalidate_financial_cache()
 
     return success
@@ -162,7 +155,6 @@ def get_grouped_data(conn, cursor, group_id: Optional[str] = None) -> Dict:
         return result
 
 
-@db_transaction
 def _validate_grouped_data_field(field: str) -> bool:
     """验证分组数据字段名"""
     valid_fields = [
@@ -189,48 +181,25 @@ def _validate_grouped_data_field(field: str) -> bool:
     return True
 
 
-def _get_or_create_grouped_data(
-    cursor, group_id: str, field: str
-) -> tuple[float, bool]:
-    """获取或创建分组数据，返回(当前值, 是否为新创建)"""
-    query, params = QueryBuilder("grouped_data").where("group_id = ?", group_id).build()
-    cursor.execute(query, params)
-    row = cursor.fetchone()
-
-    if not row:
-        cursor.execute(
-            """
-        INSERT INTO grouped_data (
-            group_id, valid_orders, valid_amount, liquid_funds,
-            new_clients, new_clients_amount,
-            old_clients, old_clients_amount,
-            interest, completed_orders, completed_amount,
-            breach_orders, breach_amount,
-            breach_end_orders, breach_end_amount
-        ) VALUES (?, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        """,
-            (group_id,),
-        )
-        return 0.0, True
-
-    row_dict = dict(row)
-    if field not in row_dict:
-        logger.warning(f"字段 {field} 不存在于 grouped_data 表中（兼容旧数据库）")
-        return 0.0, False
-    return row_dict.get(field, 0), False
+def _ensure_grouped_data(cursor, group_id: str) -> None:
+    """分组数据不存在时创建（各统计列默认为 0）"""
+    cursor.execute(
+        "INSERT OR IGNORE INTO grouped_data (group_id) VALUES (?)", (group_id,)
+    )
 
 
-def _update_grouped_data_field(
-    cursor, group_id: str, field: str, new_value: float
+def _increment_grouped_data_field(
+    cursor, group_id: str, field: str, amount: float
 ) -> bool:
-    """更新分组数据字段值"""
+    """按增量更新分组数据字段（金额列按整数分累加）"""
+    column, delta = storage_column("grouped_data", field, amount)
     cursor.execute(
         f"""
         UPDATE grouped_data
-    SET "{field}" = ?, updated_at = CURRENT_TIMESTAMP
+    SET "{column}" = COALESCE("{column}", 0) + ?, updated_at = CURRENT_TIMESTAMP
     WHERE group_id = ?
     """,
-        (new_value, group_id),
+        (delta, group_id),
     )
     return cursor.rowcount > 0
 
@@ -252,7 +221,7 @@ def update_grouped_data(conn, cursor, group_id: str, field: str, amount: float)
     Note:
         - 此函数会自动提交事务（通过 @db_transaction 装饰器）
         - 如果分组不存在，会自动创建
-        - 使用增量更新（current_value + amount）
+        - 使用增量更新（field = field + amount，金额列按整数分累加）
     """
     if not _validate_grouped_data_field(field):
         return False
@@ -261,20 +230,14 @@ def update_grouped_data(conn, cursor, group_id: str, field: str, amount: float)
         logger.error("group_id 不能为空")
         return False
 
-    current_value, is_new = _get_or_create_grouped_data(cursor, group_id, field)
-    if not is_new and current_value is None:
-        return False
-
-    new_value = current_value + amount
-    if not _update_grouped_data_field(cursor, group_id, field, new_value):
+    _ensure_grouped_data(cursor, group_id)
+    if not _increment_grouped_data_field(cursor, group_id, field, amount):
         logger.warning(
             f"更新分组数据失败: group_id={group_id}, field={field}, amount={amount}, rowcount=0"
         )
         return False
 
-    logger.debug(
-        f"分组数据已更新: {group_id} {field} = {current_value} + {amount} = {new_value}"
-    )
+    logger.debug(f"分组数据已更新: {group_id} {field} += {amount}")
     return True
 
 
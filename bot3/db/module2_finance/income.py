@@ -19,8 +19,7 @@ from db.module2_finance.income_query import (get_all_valid_orders,
                                              get_daily_expenses,
                                              get_daily_interest_total,
                                              get_daily_summary,
-                                             get_new_orders_by_date,
-                                             save_daily_summary)
+                                             get_new_orders_by_date)
 from db.module2_finance.income_statistics import (
     get_customer_orders_summary, get_customer_total_contribution,
     get_income_summary_by_group, get_income_summary_by_type)
@@ -42,7 +41,6 @@ __all__ = [
     "get_daily_interest_total",
     "get_daily_expenses",
     "get_daily_summary",
-    "save_daily_summary",
     # 统计操作
     "get_customer_total_contribution",
     "get_customer_orders_summary",
@@ -12,8 +12,11 @@ import pytz
 
 # 本地模块
 from db.base import db_query, db_transaction
+from db.batch_loader import load_grouped_rows
 from db.module2_finance.income_data import (IncomeInsertParams,
                                             IncomeRecordParams)
+from db.records import fetch_records
+from utils.money import to_cents
 
 # QueryBuilder 使用延迟导入以避免循环导入
 
@@ -44,7 +47,7 @@ def _prepare_income_record_values(
     return (
         params.date,
         params.type,
-        params.amount,
+        to_cents(params.amount),
         params.group_id,
         params.order_id,
         params.order_date,
@@ -85,7 +88,7 @@ def _insert_income_record(
     params.cursor.execute(
         """
     INSERT INTO income_records (
-        date, type, amount, group_id, order_id, order_date,
+        date, type, amount_cents, group_id, order_id, order_date,
         customer, weekday_group, note, created_by, created_at, is_undone
     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
     """,
@@ -240,9 +243,11 @@ def get_income_records(
     )
 
     # 延迟导入以避免循环导入
+    from db.archive import archive_union
     from utils.query_builder import QueryBuilder
 
-    builder = QueryBuilder("income_records")
+    # 按日期范围查询的报表可能覆盖已归档的明细
+    builder = QueryBuilder(archive_union(params.cursor, "income_records"))
 
     # 应用过滤条件
     _apply_date_filters(builder, params)
@@ -251,8 +256,7 @@ def get_income_records(
 
     query, query_params = builder.build()
     params.cursor.execute(query, query_params)
-    rows = params.cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(params.cursor)
 
 
 @db_query
@@ -266,7 +270,7 @@ def get_interest_by_order_id(conn, cursor, order_id: str) -> Dict:
         .select(
             [
                 "COUNT(*) as count",
-                "SUM(amount) as total_amount",
+                "SUM(amount_cents) / 100.0 as total_amount",
                 "MIN(date) as first_date",
                 "MAX(date) as last_date",
             ]
@@ -300,8 +304,7 @@ def get_all_interest_by_order_id(conn, cursor, order_id: str) -> List[Dict]:
         (order_id,),
     )
 
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(cursor)
 
 
 @db_query
@@ -319,12 +322,12 @@ def get_interests_by_order_ids(
     if not order_ids:
         return {}
 
-    # 使用IN查询批量获取（排除已撤销的记录）
-    placeholders = ",".join(["?"] * len(order_ids))
-    cursor.execute(
-        f"""
+    # 键列表作为一个参数传入，订单数量再多也只执行同一个语句（排除已撤销的记录）
+    result = load_grouped_rows(
+        cursor,
+        """
     SELECT * FROM income_records
-    WHERE order_id IN ({placeholders})
+    WHERE order_id IN ({keys})
     AND type = 'interest'
     AND (is_undone IS NULL OR is_undone = 0)
     ORDER BY order_id, date ASC, created_at ASC
@@ -332,16 +335,6 @@ def get_interests_by_order_ids(
         order_ids,
     )
 
-    rows = cursor.fetchall()
-
-    # 按order_id分组
-    result = {}
-    for row in rows:
-        order_id = row["order_id"]
-        if order_id not in result:
-            result[order_id] = []
-        result[order_id].append(dict(row))
-
     # 确保所有order_id都有条目（即使没有利息记录）
     for order_id in order_ids:
         if order_id not in result:
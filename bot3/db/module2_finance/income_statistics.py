@@ -100,7 +100,7 @@ def get_income_summary_by_type(
         type,
         customer,
         COUNT(*) as count,
-        SUM(amount) as total_amount
+        SUM(amount_cents) / 100.0 as total_amount
     FROM income_records
     WHERE date >= ? AND date <= ?
     AND (is_undone IS NULL OR is_undone = 0)
@@ -140,7 +140,7 @@ def get_income_summary_by_group(
     SELECT
         group_id,
         COUNT(*) as count,
-        SUM(amount) as total_amount
+        SUM(amount_cents) / 100.0 as total_amount
     FROM income_records
     WHERE date >= ? AND date <= ?
     AND (is_undone IS NULL OR is_undone = 0)
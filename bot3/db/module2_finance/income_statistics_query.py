@@ -6,6 +6,8 @@
 import sqlite3
 from typing import List, Optional, Tuple
 
+from db.archive import archive_union
+
 
 def build_customer_query_conditions(
     customer: str, start_date: Optional[str] = None, end_date: Optional[str] = None
@@ -62,8 +64,8 @@ def query_income_summary(
     SELECT
         type,
         COUNT(*) as count,
-        SUM(amount) as total_amount
-    FROM income_records
+        SUM(amount_cents) / 100.0 as total_amount
+    FROM {archive_union(cursor, "income_records")}
     WHERE {income_where}
     GROUP BY type
     """,
@@ -92,7 +94,7 @@ def query_order_stats(
         COUNT(*) as order_count,
         MIN(date) as first_date,
         MAX(date) as last_date
-    FROM orders
+    FROM {archive_union(cursor, "orders")}
     WHERE {order_where}
     """,
         order_params,
@@ -4,7 +4,10 @@
 """
 
 import sqlite3
-from typing import Dict, List
+from typing import Dict, Iterable, List
+
+from db.archive import archive_union
+from db.batch_loader import iter_rows_by_keys
 
 
 def query_customer_orders(
@@ -35,10 +38,10 @@ def query_customer_orders(
 
     where_clause = " AND ".join(conditions)
 
-    # 查询所有订单
+    # 查询所有订单（包含归档的订单）
     cursor.execute(
         f"""
-    SELECT * FROM orders
+    SELECT * FROM {archive_union(cursor, "orders")}
     WHERE {where_clause}
     ORDER BY date DESC
     """,
@@ -89,20 +92,20 @@ def _update_income_map_by_type(
     income_map[order_id]["total"] += amount
 
 
-def _build_income_map_from_rows(income_rows: List) -> Dict[str, Dict]:
+def _build_income_map_from_rows(income_rows: Iterable) -> Dict[str, Dict]:
     """从查询结果构建收入映射
 
     Args:
-        income_rows: 查询结果行列表
+        income_rows: 查询结果行
 
     Returns:
         收入映射字典
     """
     income_map = {}
     for row in income_rows:
-        order_id = row[0]
-        income_type = row[1]
-        amount = row[3] or 0.0
+        order_id = row["order_id"]
+        income_type = row["type"]
+        amount = row["total_amount"] or 0.0
 
         if order_id not in income_map:
             income_map[order_id] = _initialize_income_map()
@@ -127,21 +130,18 @@ def query_order_incomes(
     if not order_ids:
         return {}
 
-    placeholders = ",".join(["?"] * len(order_ids))
-
-    cursor.execute(
+    income_rows = iter_rows_by_keys(
+        cursor,
         f"""
         SELECT
             order_id,
             type,
             COUNT(*) as count,
-            SUM(amount) as total_amount
-        FROM income_records
-        WHERE order_id IN ({placeholders})
+            SUM(amount_cents) / 100.0 as total_amount
+        FROM {archive_union(cursor, "income_records")}
+        WHERE order_id IN ({{keys}})
         GROUP BY order_id, type
         """,
         order_ids,
     )
-
-    income_rows = cursor.fetchall()
     return _build_income_map_from_rows(income_rows)
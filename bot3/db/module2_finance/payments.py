@@ -14,6 +14,7 @@ import pytz
 
 # 本地模块
 from db.base import db_query, db_transaction
+from utils.money import to_cents
 from utils.query_builder import QueryBuilder
 
 # 日志
@@ -250,10 +251,10 @@ def record_expense(conn, cursor, date: str, type: str, amount: float, note: str)
     # 插入开销记录
     cursor.execute(
         """
-    INSERT INTO expense_records (date, type, amount, note)
+    INSERT INTO expense_records (date, type, amount_cents, note)
     VALUES (?, ?, ?, ?)
     """,
-        (date, type, amount, note),
+        (date, type, to_cents(amount), note),
     )
     expense_id = cursor.lastrowid
 
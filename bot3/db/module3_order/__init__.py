@@ -20,7 +20,8 @@ from db.module3_order.orders_search import (search_orders_advanced,
                                             search_orders_by_customer,
                                             search_orders_by_date_range,
                                             search_orders_by_group_id,
-                                            search_orders_by_state)
+                                            search_orders_by_state,
+                                            search_orders_fuzzy)
 from db.module3_order.orders_update import (update_order_amount,
                                             update_order_chat_id,
                                             update_order_date,
@@ -63,4 +64,5 @@ __all__ = [
     "search_orders_all",
     "search_orders_advanced",
     "search_orders_advanced_all_states",
+    "search_orders_fuzzy",
 ]
@@ -6,6 +6,7 @@
 - orders_update.py - 更新操作
 - orders_delete.py - 删除操作
 - orders_search.py - 搜索操作
+- orders_weekday.py - 星期分组批量检查/修正
 
 注意：由于循环导入问题，所有导入都使用延迟导入（lazy import）模式。
 """
@@ -58,6 +59,13 @@ def _lazy_import_update():
     return orders_update
 
 
+def _lazy_import_weekday():
+    """延迟导入 orders_weekday 模块"""
+    from db.module3_order import orders_weekday
+
+    return orders_weekday
+
+
 # 使用 __getattr__ 实现延迟导入
 def __getattr__(name: str):
     """延迟导入函数以支持 from orders import *"""
@@ -98,6 +106,7 @@ def __getattr__(name: str):
         "search_orders_by_date_range",
         "search_orders_by_group_id",
         "search_orders_by_state",
+        "search_orders_fuzzy",
     ):
         module = _lazy_import_search()
         return getattr(module, name)
@@ -115,6 +124,11 @@ def __getattr__(name: str):
         module = _lazy_import_update()
         return getattr(module, name)
 
+    # 星期分组批量操作
+    if name in ("check_order_weekday_groups", "regroup_orders_by_weekday"):
+        module = _lazy_import_weekday()
+        return getattr(module, name)
+
     raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
@@ -152,4 +166,8 @@ __all__ = [
     "search_orders_all",
     "search_orders_advanced",
     "search_orders_advanced_all_states",
+    "search_orders_fuzzy",
+    # 星期分组批量操作
+    "check_order_weekday_groups",
+    "regroup_orders_by_weekday",
 ]
@@ -6,12 +6,14 @@
 # 标准库
 import logging
 import sqlite3
-from datetime import datetime
 from typing import Dict, List, Tuple
 
 # 本地模块
+from db.active_orders import mark_order_changed
 from db.base import db_transaction
+from utils.date_helpers import get_now_beijing_str
 from utils.models import OrderCreateModel, validate_amount
+from utils.money import to_cents
 
 # 日志
 logger = logging.getLogger(__name__)
@@ -195,7 +197,7 @@ def create_order(conn, cursor, order_data: Dict) -> bool:
         updated_at = order_data.get("updated_at")
 
         if created_at is None:
-            created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            created_at = get_now_beijing_str()
         if updated_at is None:
             updated_at = created_at  # 新订单的 updated_at 等于 created_at
 
@@ -203,7 +205,7 @@ def create_order(conn, cursor, order_data: Dict) -> bool:
             """
         INSERT INTO orders (
             order_id, group_id, chat_id, date, weekday_group,
-            customer, amount, state, created_at, updated_at
+            customer, amount_cents, state, created_at, updated_at
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
             (
@@ -213,12 +215,13 @@ def create_order(conn, cursor, order_data: Dict) -> bool:
                 order_data["date"],
                 order_data["weekday_group"],
                 order_data["customer"],
-                order_data["amount"],
+                to_cents(order_data["amount"]),
                 order_data["state"],
                 created_at,
                 updated_at,
             ),
         )
+        mark_order_changed(order_data["chat_id"])
         # 清除相关缓存（延迟导入以避免循环导入）
         try:
             from utils.cache import invalidate_cache
@@ -249,7 +252,7 @@ def insert_order_to_classified_table(
         updated_at = order_data.get("updated_at")
 
         if created_at is None:
-            created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            created_at = get_now_beijing_str()
         if updated_at is None:
             updated_at = created_at
 
@@ -282,7 +285,6 @@ def insert_order_to_classified_table(
         return False
 
 
-@db_transaction
 def _validate_order_data(order_data: Dict) -> Dict:
     """验证订单数据
 
@@ -328,7 +330,7 @@ def _prepare_timestamps(order_data: Dict) -> tuple[str, str]:
     updated_at = order_data.get("updated_at")
 
     if created_at is None:
-        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        created_at = get_now_beijing_str()
     if updated_at is None:
         updated_at = created_at
 
@@ -354,7 +356,7 @@ def _insert_order_to_main_table(
             """
             INSERT INTO orders (
                 order_id, group_id, chat_id, date, weekday_group,
-                customer, amount, state, created_at, updated_at
+                customer, amount_cents, state, created_at, updated_at
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
@@ -364,7 +366,7 @@ def _insert_order_to_main_table(
                 order_data["date"],
                 order_data["weekday_group"],
                 order_data["customer"],
-                order_data["amount"],
+                to_cents(order_data["amount"]),
                 order_data["state"],
                 created_at,
                 updated_at,
@@ -394,6 +396,7 @@ def _insert_order_to_classified_tables(
         )
 
 
+@db_transaction
 def create_order_in_classified_tables(conn, cursor, order_data: Dict) -> bool:
     """将订单插入主表和所有相关分类表"""
     try:
@@ -402,6 +405,7 @@ def create_order_in_classified_tables(conn, cursor, order_data: Dict) -> bool:
 
         if not _insert_order_to_main_table(cursor, order_data, created_at, updated_at):
             return False
+        mark_order_changed(order_data["chat_id"])
 
         _insert_order_to_classified_tables(cursor, order_data, created_at, updated_at)
         return True
@@ -4,6 +4,7 @@
 """
 
 # 本地模块
+from db.active_orders import mark_order_changed
 from db.base import db_transaction
 from db.module3_order.orders_basic import (_ensure_classified_table_exists,
                                            _get_classified_table_names)
@@ -38,6 +39,7 @@ def delete_order_by_chat_id(conn, cursor, chat_id: int) -> bool:
 
     # 4. 删除主表订单
     cursor.execute("DELETE FROM orders WHERE chat_id = ?", (chat_id,))
+    mark_order_changed(chat_id)
     return cursor.rowcount > 0
 
 
@@ -69,4 +71,5 @@ def delete_order_by_order_id(conn, cursor, order_id: str) -> bool:
 
     # 4. 删除主表订单
     cursor.execute("DELETE FROM orders WHERE order_id = ?", (order_id,))
+    mark_order_changed(order["chat_id"])
     return cursor.rowcount > 0
@@ -6,13 +6,25 @@
 from typing import Dict, Optional
 
 # 本地模块
-from db.base import db_query
+from db.active_orders import get_active_order_index
+from db.base import db_query, db_timed
 from utils.query_builder import QueryBuilder
 
 
+@db_timed
+async def get_order_by_chat_id(chat_id: int) -> Optional[Dict]:
+    """根据chat_id获取订单（排除end和breach_end状态）
+
+    活跃订单索引已加载时从内存读取（见 db.active_orders）。
+    """
+    index = get_active_order_index()
+    if index is not None:
+        return index.get_order(chat_id)
+    return await _get_order_by_chat_id_from_db(chat_id)
+
+
 @db_query
-def get_order_by_chat_id(conn, cursor, chat_id: int) -> Optional[Dict]:
-    """根据chat_id获取订单（排除end和breach_end状态）"""
+def _get_order_by_chat_id_from_db(conn, cursor, chat_id: int) -> Optional[Dict]:
     query, params = (
         QueryBuilder("orders")
         .where("chat_id = ?", chat_id)
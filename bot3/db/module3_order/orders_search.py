@@ -6,7 +6,11 @@
 from typing import Dict, List, Optional
 
 # 本地模块
+from db.archive import archive_union
 from db.base import db_query
+from db.records import fetch_records
+from db.search_index import (SEARCH_PAGE_SIZE, hit_query, match_tier,
+                             search_params)
 
 
 @db_query
@@ -28,8 +32,7 @@ def search_orders_by_group_id(
             ),
             (group_id,),
         )
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(cursor)
 
 
 @db_query
@@ -45,8 +48,7 @@ def search_orders_by_date_range(
     """,
         (start_date, end_date),
     )
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(cursor)
 
 
 @db_query
@@ -56,24 +58,21 @@ def search_orders_by_customer(conn, cursor, customer: str) -> List[Dict]:
         "SELECT * FROM orders WHERE customer = ? ORDER BY date DESC",
         (customer.upper(),),
     )
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(cursor)
 
 
 @db_query
 def search_orders_by_state(conn, cursor, state: str) -> List[Dict]:
     """根据状态查找订单"""
     cursor.execute("SELECT * FROM orders WHERE state = ? ORDER BY date DESC", (state,))
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(cursor)
 
 
 @db_query
 def search_orders_all(conn, cursor) -> List[Dict]:
     """查找所有订单"""
     cursor.execute("SELECT * FROM orders ORDER BY date DESC")
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(cursor)
 
 
 @db_query
@@ -115,17 +114,16 @@ def search_orders_advanced(conn, cursor, criteria: Dict) -> List[Dict]:
     query += " ORDER BY date DESC"
 
     cursor.execute(query, params)
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(cursor)
 
 
 @db_query
 def search_orders_advanced_all_states(conn, cursor, criteria: Dict) -> List[Dict]:
     """
     高级查找订单（支持混合条件，包含所有状态的订单）
-    用于报表查找功能
+    用于报表查找功能（包含归档的订单）
     """
-    query = "SELECT * FROM orders WHERE 1=1"
+    query = f"SELECT * FROM {archive_union(cursor, 'orders')} WHERE 1=1"
     params = []
 
     if "group_id" in criteria and criteria["group_id"]:
@@ -156,5 +154,52 @@ def search_orders_advanced_all_states(conn, cursor, criteria: Dict) -> List[Dict
     query += " ORDER BY date DESC"
 
     cursor.execute(query, params)
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return fetch_records(cursor)
+
+
+@db_query
+def search_orders_fuzzy(
+    conn, cursor, text: str, limit: int = SEARCH_PAGE_SIZE, offset: int = 0
+) -> Dict:
+    """模糊查找订单：订单号、归属ID或所在群的群名包含 text（见 db.search_index）
+
+    按匹配程度排序（完全 > 前缀 > 子串），分页返回。
+
+    Returns:
+        {"total": 命中订单数, "items": 本页订单（附 chat_title、match_tier）}
+    """
+    text = text.strip()
+    if not text:
+        return {"total": 0, "items": []}
+
+    params = search_params(text)
+    # 群名命中的群 -> 该群的订单
+    hits = (
+        f"{hit_query(cursor, 'orders', text)} "
+        f"UNION ALL SELECT o.id, t.score "
+        f"FROM ({hit_query(cursor, 'group_titles', text)}) AS t "
+        "JOIN group_message_config g ON g.id = t.id "
+        "JOIN orders o ON o.chat_id = g.chat_id"
+    )
+    cursor.execute(
+        f"WITH hits(id, score) AS ({hits}) SELECT COUNT(DISTINCT id) FROM hits",
+        params,
+    )
+    total = cursor.fetchone()[0]
+    if not total:
+        return {"total": 0, "items": []}
+
+    tier = match_tier(["o.order_id", "o.group_id", "g.chat_title"])
+    cursor.execute(
+        f"""
+        WITH hits(id, score) AS ({hits})
+        SELECT o.*, g.chat_title AS chat_title, {tier} AS match_tier
+        FROM (SELECT id, MIN(score) AS score FROM hits GROUP BY id) AS h
+        JOIN orders o ON o.id = h.id
+        LEFT JOIN group_message_config g ON g.chat_id = o.chat_id
+        ORDER BY match_tier, h.score, o.date DESC, o.id DESC
+        LIMIT :limit OFFSET :offset
+        """,
+        {**params, "limit": limit, "offset": offset},
+    )
+    return {"total": total, "items": fetch_records(cursor)}
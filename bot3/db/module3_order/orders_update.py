@@ -5,16 +5,18 @@
 
 # 标准库
 import logging
-from datetime import datetime
 from typing import Dict, Optional, Tuple
 
 # 本地模块
+from db.active_orders import mark_order_changed
 from db.base import db_transaction
 from db.module3_order.orders_basic import (
     _ensure_classified_table_exists, _get_classified_table_names,
     _insert_order_to_classified_table_sync)
 from utils.cache import invalidate_cache
 from utils.chat_helpers import get_weekday_group_from_date
+from utils.date_helpers import get_now_beijing_str
+from utils.money import to_cents
 
 # 日志
 logger = logging.getLogger(__name__)
@@ -26,15 +28,15 @@ def update_order_amount(conn, cursor, chat_id: int, new_amount: float) -> bool:
     cursor.execute(
         """
     UPDATE orders
-    SET amount = ?, updated_at = CURRENT_TIMESTAMP
+    SET amount_cents = ?, updated_at = ?
     WHERE chat_id = ? AND state NOT IN (?, ?)
     """,
-        (new_amount, chat_id, "end", "breach_end"),
+        (to_cents(new_amount), get_now_beijing_str(), chat_id, "end", "breach_end"),
     )
+    mark_order_changed(chat_id)
     return cursor.rowcount > 0
 
 
-@db_transaction
 def _get_order_and_state(cursor, chat_id: int) -> tuple[Optional[dict], Optional[str]]:
     """获取订单信息和当前状态
 
@@ -68,10 +70,10 @@ def _update_main_table_state(cursor, chat_id: int, new_state: str) -> bool:
     cursor.execute(
         """
     UPDATE orders
-    SET state = ?, updated_at = CURRENT_TIMESTAMP
+    SET state = ?, updated_at = ?
     WHERE chat_id = ?
     """,
-        (new_state, chat_id),
+        (new_state, get_now_beijing_str(), chat_id),
     )
     return cursor.rowcount > 0
 
@@ -106,7 +108,7 @@ def _sync_classified_tables(
 
     if new_state_table:
         _ensure_classified_table_exists(cursor, new_state_table)
-        updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        updated_at = get_now_beijing_str()
         _insert_order_to_classified_table_sync(
             cursor,
             new_state_table,
@@ -116,6 +118,7 @@ def _sync_classified_tables(
         )
 
 
+@db_transaction
 def update_order_state(conn, cursor, chat_id: int, new_state: str) -> bool:
     """更新订单状态，并同步更新分类表
 
@@ -133,6 +136,7 @@ def update_order_state(conn, cursor, chat_id: int, new_state: str) -> bool:
 
     if not _update_main_table_state(cursor, chat_id, new_state):
         return False
+    mark_order_changed(chat_id)
 
     _sync_classified_tables(cursor, order, old_state, new_state)
 
@@ -151,11 +155,12 @@ def update_order_group_id(conn, cursor, chat_id: int, new_group_id: str) -> bool
     cursor.execute(
         """
     UPDATE orders
-    SET group_id = ?, updated_at = CURRENT_TIMESTAMP
+    SET group_id = ?, updated_at = ?
     WHERE chat_id = ?
     """,
-        (new_group_id, chat_id),
+        (new_group_id, get_now_beijing_str(), chat_id),
     )
+    mark_order_changed(chat_id)
     return cursor.rowcount > 0
 
 
@@ -167,12 +172,13 @@ def update_order_weekday_group(
     cursor.execute(
         """
     UPDATE orders
-    SET weekday_group = ?, updated_at = CURRENT_TIMESTAMP
+    SET weekday_group = ?, updated_at = ?
     WHERE chat_id = ?
     """,
-        (new_weekday_group, chat_id),
+        (new_weekday_group, get_now_beijing_str(), chat_id),
     )
     rowcount = cursor.rowcount
+    mark_order_changed(chat_id)
     if rowcount > 0:
         logger.debug(
             f"更新订单星期分组: chat_id={chat_id}, weekday_group={new_weekday_group}, rowcount={rowcount}"
@@ -186,11 +192,12 @@ def update_order_date(conn, cursor, chat_id: int, new_date: str) -> bool:
     cursor.execute(
         """
     UPDATE orders
-    SET date = ?, updated_at = CURRENT_TIMESTAMP
+    SET date = ?, updated_at = ?
     WHERE chat_id = ?
     """,
-        (new_date, chat_id),
+        (new_date, get_now_beijing_str(), chat_id),
     )
+    mark_order_changed(chat_id)
     return cursor.rowcount > 0
 
 
@@ -217,12 +224,13 @@ def update_order_chat_id(conn, cursor, order_id: str, new_chat_id: int) -> bool:
 
         # 2. 更新主表
         cursor.execute(
-            "UPDATE orders SET chat_id = ?, updated_at = CURRENT_TIMESTAMP WHERE order_id = ?",
-            (new_chat_id, order_id),
+            "UPDATE orders SET chat_id = ?, updated_at = ? WHERE order_id = ?",
+            (new_chat_id, get_now_beijing_str(), order_id),
         )
 
         if cursor.rowcount == 0:
             return False
+        mark_order_changed(old_chat_id, new_chat_id)
 
         # 3. 更新分类表
         state_table_map = {
@@ -278,6 +286,7 @@ def update_order_from_parsed_info(
         # 3. 更新主表
         if not update_main_table(cursor, chat_id, new_order_data):
             return False
+        mark_order_changed(chat_id)
 
         # 4. 处理分类表更新
         update_classified_tables(cursor, old_order, new_order_data, updated_at)
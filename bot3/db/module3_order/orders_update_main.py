@@ -5,6 +5,8 @@
 
 from typing import Any, Dict
 
+from utils.money import to_cents
+
 
 def update_main_table(cursor, chat_id: int, new_order_data: Dict[str, Any]) -> bool:
     """更新主表
@@ -21,7 +23,7 @@ def update_main_table(cursor, chat_id: int, new_order_data: Dict[str, Any]) -> b
         """
         UPDATE orders
         SET order_id = ?, date = ?, weekday_group = ?,
-            customer = ?, amount = ?, state = ?, updated_at = ?
+            customer = ?, amount_cents = ?, state = ?, updated_at = ?
         WHERE chat_id = ? AND state NOT IN (?, ?)
         """,
         (
@@ -29,7 +31,7 @@ def update_main_table(cursor, chat_id: int, new_order_data: Dict[str, Any]) -> b
             new_order_data["date"],
             new_order_data["weekday_group"],
             new_order_data["customer"],
-            new_order_data["amount"],
+            to_cents(new_order_data["amount"]),
             new_order_data["state"],
             new_order_data["updated_at"],
             chat_id,
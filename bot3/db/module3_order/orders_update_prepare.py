@@ -3,10 +3,10 @@
 包含准备新订单数据的逻辑。
 """
 
-from datetime import datetime
 from typing import Any, Dict
 
 from utils.chat_helpers import get_weekday_group_from_date
+from utils.date_helpers import get_now_beijing_str
 
 
 def prepare_new_order_data(
@@ -32,7 +32,7 @@ def prepare_new_order_data(
 
     # 日期字符串格式
     new_date_str = f"{new_date.strftime('%Y-%m-%d')} 12:00:00"
-    updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    updated_at = get_now_beijing_str()
 
     return {
         "order_id": new_order_id,
@@ -0,0 +1,290 @@
+"""订单星期分组批量操作模块
+
+在 SQL 中根据订单日期（无效时回退到订单ID中的 YYMMDD）计算正确的星期分组，
+检查只需一条查询，修复在一个事务内用集合语句完成：
+
+1. 把需要修正的订单写入临时表
+2. 一条 UPDATE 修正主表 orders
+3. 每个星期分类表一条 DELETE + 一条 INSERT ... SELECT 完成迁移
+4. 其余分类表（状态/客户/归属ID表）同步 weekday_group 字段
+5. 一条查询校验主表结果
+
+日期解析规则与 handlers.module5_data.date_parse_helpers 一致：
+date 字段取第一个空格前的部分，须为 YYYY-MM-DD；否则从订单ID解析
+（A + YYMMDD 或 YYMMDD）；两者都无效的订单跳过。
+"""
+
+# 标准库
+import logging
+from typing import Dict
+
+# 本地模块
+from constants import WEEKDAY_GROUP
+from db.active_orders import mark_all_orders_changed
+from db.base import db_query, db_transaction
+from db.module3_order.orders_basic import (_ensure_classified_table_exists,
+                                           _validate_table_name)
+from db.records import fetch_records
+from utils.cache import invalidate_cache
+from utils.date_helpers import get_now_beijing_str
+
+# 日志
+logger = logging.getLogger(__name__)
+
+# 星期分组 -> 星期分类表
+WEEKDAY_TABLES = {
+    "一": "orders_monday",
+    "二": "orders_tuesday",
+    "三": "orders_wednesday",
+    "四": "orders_thursday",
+    "五": "orders_friday",
+    "六": "orders_saturday",
+    "日": "orders_sunday",
+}
+
+# 分类表中与主表对应的列
+_CLASSIFIED_COLUMNS = (
+    "order_id, group_id, chat_id, date, weekday_group, "
+    "customer, amount, state, created_at, updated_at"
+)
+
+# strftime('%w') 为 0=周日，Python weekday() 为 0=周一
+_WEEKDAY_CASE = "CASE strftime('%w', order_date) {} END".format(
+    " ".join(
+        f"WHEN '{(weekday + 1) % 7}' THEN '{group}'"
+        for weekday, group in sorted(WEEKDAY_GROUP.items())
+    )
+)
+
+# 每个订单的当前分组和正确分组（correct_group 为 NULL 表示无法解析日期）
+# date(x, '+0 days') 会把 2025-02-30 这类无效日期规范化为其他日期，
+# 与原值比较即可排除无效日期（不带修饰符的 date() 不会校验月份天数）
+_RESOLVED_ORDERS_SQL = f"""
+    SELECT order_id, chat_id, date, weekday_group,
+           {_WEEKDAY_CASE} AS correct_group
+    FROM (
+        SELECT order_id, chat_id, date, weekday_group,
+               CASE
+                   WHEN date(date_token, '+0 days') = date_token THEN date_token
+                   WHEN id_token GLOB '[0-9][0-9][0-9][0-9][0-9][0-9]'
+                        AND date(id_date, '+0 days') = id_date THEN id_date
+               END AS order_date
+        FROM (
+            SELECT order_id, chat_id, date, weekday_group, date_token, id_token,
+                   '20' || substr(id_token, 1, 2) || '-' || substr(id_token, 3, 2)
+                        || '-' || substr(id_token, 5, 2) AS id_date
+            FROM (
+                SELECT order_id, chat_id, date, weekday_group,
+                       CASE WHEN instr(date, ' ') > 0
+                            THEN substr(date, 1, instr(date, ' ') - 1)
+                            ELSE date END AS date_token,
+                       CASE WHEN substr(order_id, 1, 1) = 'A'
+                            THEN substr(order_id, 2, 6)
+                            ELSE substr(order_id, 1, 6) END AS id_token
+                FROM orders
+            )
+        )
+    )
+"""
+
+_MISMATCH_CONDITION = (
+    "correct_group IS NOT NULL AND IFNULL(weekday_group, '') != correct_group"
+)
+
+
+@db_query
+def check_order_weekday_groups(conn, cursor, limit: int = 20) -> Dict:
+    """检查所有订单的星期分组（单条查询）
+
+    Args:
+        limit: 返回的不正确订单明细数量上限
+
+    Returns:
+        {total_count, skipped_count, incorrect_count, incorrect_orders}
+    """
+    cursor.execute(
+        f"""
+        SELECT order_id, chat_id, date, weekday_group, correct_group,
+               is_incorrect, total_count, skipped_count, incorrect_count
+        FROM (
+            SELECT *,
+                   COUNT(*) OVER () AS total_count,
+                   SUM(correct_group IS NULL) OVER () AS skipped_count,
+                   SUM(is_incorrect) OVER () AS incorrect_count
+            FROM (
+                SELECT *, ({_MISMATCH_CONDITION}) AS is_incorrect
+                FROM ({_RESOLVED_ORDERS_SQL})
+            )
+        )
+        ORDER BY is_incorrect DESC, date DESC
+        LIMIT ?
+        """,
+        (max(limit, 1),),
+    )
+    rows = fetch_records(cursor)
+    if not rows:
+        return {
+            "total_count": 0,
+            "skipped_count": 0,
+            "incorrect_count": 0,
+            "incorrect_orders": [],
+        }
+
+    first = rows[0]
+    return {
+        "total_count": first["total_count"],
+        "skipped_count": first["skipped_count"] or 0,
+        "incorrect_count": first["incorrect_count"] or 0,
+        "incorrect_orders": [
+            {
+                "order_id": row["order_id"],
+                "chat_id": row["chat_id"],
+                "date": row["date"],
+                "current": row["weekday_group"] or "未设置",
+                "correct": row["correct_group"],
+            }
+            for row in rows
+            if row["is_incorrect"]
+        ][:limit],
+    }
+
+
+def _get_other_classified_tables(cursor) -> list:
+    """获取星期分类表以外、带 weekday_group 字段的分类表"""
+    cursor.execute(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'table' AND name LIKE 'orders\\_%' ESCAPE '\\'"
+    )
+    weekday_tables = set(WEEKDAY_TABLES.values())
+    tables = []
+    for row in cursor.fetchall():
+        name = row[0]
+        if name in weekday_tables or not _validate_table_name(name):
+            continue
+        cursor.execute(f"PRAGMA table_info({name})")  # nosec B608
+        columns = {col[1] for col in cursor.fetchall()}
+        if {"order_id", "weekday_group"} <= columns:
+            tables.append(name)
+    return tables
+
+
+def _move_between_weekday_tables(cursor) -> None:
+    """将待修正订单迁移到正确的星期分类表"""
+    for group, table_name in WEEKDAY_TABLES.items():
+        _ensure_classified_table_exists(cursor, table_name)
+        # 表名来自固定映射
+        cursor.execute(
+            f"""
+            DELETE FROM {table_name}
+            WHERE order_id IN (
+                SELECT order_id FROM temp.weekday_regroup WHERE new_group != ?
+            )
+            """,  # nosec B608
+            (group,),
+        )
+        cursor.execute(
+            f"""
+            INSERT OR REPLACE INTO {table_name} ({_CLASSIFIED_COLUMNS})
+            SELECT {_CLASSIFIED_COLUMNS} FROM orders
+            WHERE order_id IN (
+                SELECT order_id FROM temp.weekday_regroup WHERE new_group = ?
+            )
+            """,  # nosec B608
+            (group,),
+        )
+
+
+@db_transaction
+def regroup_orders_by_weekday(conn, cursor) -> Dict[str, int]:
+    """批量修正所有订单的星期分组（单个事务）
+
+    Returns:
+        {total_count, updated_count, no_change_count, skipped_count,
+         verification_failed_count, error_count}
+    """
+    cursor.execute(
+        f"""
+        SELECT COUNT(*) AS total_count,
+               IFNULL(SUM(correct_group IS NULL), 0) AS skipped_count,
+               IFNULL(SUM(correct_group = IFNULL(weekday_group, '')), 0)
+                   AS no_change_count
+        FROM ({_RESOLVED_ORDERS_SQL})
+        """
+    )
+    summary = cursor.fetchone()
+
+    cursor.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS weekday_regroup ("
+        "order_id TEXT PRIMARY KEY, new_group TEXT NOT NULL)"
+    )
+    cursor.execute("DELETE FROM temp.weekday_regroup")
+    try:
+        cursor.execute(
+            f"""
+            INSERT INTO temp.weekday_regroup (order_id, new_group)
+            SELECT order_id, correct_group FROM ({_RESOLVED_ORDERS_SQL})
+            WHERE {_MISMATCH_CONDITION}
+            """
+        )
+        pending_count = cursor.rowcount
+
+        updated_count = 0
+        verification_failed_count = 0
+        if pending_count > 0:
+            cursor.execute(
+                """
+                UPDATE orders
+                SET weekday_group = (
+                        SELECT new_group FROM temp.weekday_regroup r
+                        WHERE r.order_id = orders.order_id
+                    ),
+                    updated_at = ?
+                WHERE order_id IN (SELECT order_id FROM temp.weekday_regroup)
+                """,
+                (get_now_beijing_str(),),
+            )
+            updated_count = cursor.rowcount
+
+            _move_between_weekday_tables(cursor)
+
+            for table_name in _get_other_classified_tables(cursor):
+                cursor.execute(
+                    f"""
+                    UPDATE {table_name}
+                    SET weekday_group = (
+                        SELECT new_group FROM temp.weekday_regroup r
+                        WHERE r.order_id = {table_name}.order_id
+                    )
+                    WHERE order_id IN (SELECT order_id FROM temp.weekday_regroup)
+                    """  # nosec B608
+                )
+
+            # 校验主表
+            cursor.execute(
+                """
+                SELECT COUNT(*) FROM temp.weekday_regroup r
+                LEFT JOIN orders o ON o.order_id = r.order_id
+                WHERE o.weekday_group IS NOT r.new_group
+                """
+            )
+            verification_failed_count = cursor.fetchone()[0]
+            updated_count -= verification_failed_count
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS temp.weekday_regroup")
+
+    if updated_count:
+        mark_all_orders_changed()
+        try:
+            invalidate_cache("order_")
+        except Exception:
+            pass
+        logger.info(f"批量修正订单星期分组: {updated_count} 个订单")
+
+    return {
+        "total_count": summary["total_count"],
+        "updated_count": updated_count,
+        "no_change_count": summary["no_change_count"],
+        "skipped_count": summary["skipped_count"],
+        "verification_failed_count": verification_failed_count,
+        "error_count": 0,
+    }
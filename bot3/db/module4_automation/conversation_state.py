@@ -0,0 +1,74 @@
+"""会话状态持久化操作模块
+
+保存管理员多步操作的 user_data（JSON），机器人重启后恢复进行中的操作。
+写入由 utils.conversation_persistence 按周期批量提交。
+"""
+
+# 标准库
+import logging
+import time
+from typing import Dict, Optional
+
+# 本地模块
+from db.base import db_query, db_transaction
+
+# 日志
+logger = logging.getLogger(__name__)
+
+
+@db_query
+def load_conversation_states(conn, cursor, max_age: float = 0) -> Dict[int, str]:
+    """读取所有会话状态
+
+    Args:
+        max_age: 最长保留时间（秒），超过的记录不再恢复；为0时不限制
+
+    Returns:
+        {user_id: data_json}
+    """
+    if max_age > 0:
+        cursor.execute(
+            "SELECT user_id, data FROM conversation_state WHERE updated_at >= ?",
+            (time.time() - max_age,),
+        )
+    else:
+        cursor.execute("SELECT user_id, data FROM conversation_state")
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+@db_transaction
+def save_conversation_states(conn, cursor, changes: Dict[int, Optional[str]]) -> bool:
+    """批量写入会话状态（单个事务）
+
+    Args:
+        changes: {user_id: data_json}，值为None表示删除该用户的记录
+    """
+    now = time.time()
+    upserts = [
+        (user_id, data, now) for user_id, data in changes.items() if data is not None
+    ]
+    deletes = [(user_id,) for user_id, data in changes.items() if data is None]
+    if upserts:
+        cursor.executemany(
+            """
+            INSERT INTO conversation_state (user_id, data, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                data = excluded.data,
+                updated_at = excluded.updated_at
+            """,
+            upserts,
+        )
+    if deletes:
+        cursor.executemany("DELETE FROM conversation_state WHERE user_id = ?", deletes)
+    return True
+
+
+@db_transaction
+def purge_conversation_states(conn, cursor, max_age: float) -> int:
+    """删除超过保留时间的会话状态，返回删除数量"""
+    cursor.execute(
+        "DELETE FROM conversation_state WHERE updated_at < ?",
+        (time.time() - max_age,),
+    )
+    return cursor.rowcount
@@ -0,0 +1,91 @@
+"""定时任务运行记录操作模块
+
+记录每次定时任务的开始时间、耗时和结果（含错过执行的记录），用于容量规划。
+"""
+
+# 标准库
+import logging
+import time
+from typing import Dict, List, Optional
+
+# 本地模块
+from db.base import db_query, db_transaction
+from db.records import fetch_dicts
+
+# 日志
+logger = logging.getLogger(__name__)
+
+# 运行状态
+JOB_STATUS_SUCCESS = "success"
+JOB_STATUS_ERROR = "error"
+JOB_STATUS_MISSED = "missed"
+
+
+@db_transaction
+def record_job_run(
+    conn,
+    cursor,
+    job_id: str,
+    job_name: str,
+    started_at: float,
+    duration: Optional[float],
+    status: str,
+    error: Optional[str] = None,
+) -> bool:
+    """记录一次任务运行
+
+    Args:
+        job_id: 调度器中的任务ID（如 broadcast_1）
+        job_name: 任务类型（注册表中的名称）
+        started_at: 开始时间（Unix 时间戳）；错过的任务为计划执行时间
+        duration: 耗时（秒），错过的任务为None
+        status: success / error / missed
+        error: 错误信息
+    """
+    cursor.execute(
+        """
+        INSERT INTO scheduler_job_runs
+            (job_id, job_name, started_at, duration, status, error)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (job_id, job_name, started_at, duration, status, error),
+    )
+    return True
+
+
+@db_query
+def get_job_run_stats(conn, cursor, days: int = 7) -> List[Dict]:
+    """按任务类型统计最近的运行情况
+
+    Returns:
+        [{job_name, runs, errors, missed, avg_duration, max_duration,
+          total_duration, last_started_at}]，按总耗时降序
+    """
+    cursor.execute(
+        """
+        SELECT job_name,
+               SUM(status != 'missed') AS runs,
+               SUM(status = 'error') AS errors,
+               SUM(status = 'missed') AS missed,
+               AVG(duration) AS avg_duration,
+               MAX(duration) AS max_duration,
+               IFNULL(SUM(duration), 0) AS total_duration,
+               MAX(started_at) AS last_started_at
+        FROM scheduler_job_runs
+        WHERE started_at >= ?
+        GROUP BY job_name
+        ORDER BY total_duration DESC
+        """,
+        (time.time() - days * 86400,),
+    )
+    return fetch_dicts(cursor)
+
+
+@db_transaction
+def purge_job_runs(conn, cursor, keep_days: int = 90) -> int:
+    """删除超过保留天数的运行记录，返回删除数量"""
+    cursor.execute(
+        "DELETE FROM scheduler_job_runs WHERE started_at < ?",
+        (time.time() - keep_days * 86400,),
+    )
+    return cursor.rowcount
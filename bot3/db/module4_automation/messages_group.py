@@ -85,7 +85,7 @@ def _create_new_config_with_fields(cursor, chat_id: int, field_updates: Dict) ->
 
 
 @db_transaction
-def save_group_message_config(
+def _save_group_message_config(
     conn=None,
     cursor=None,
     chat_id: Optional[int] = None,
@@ -182,8 +182,31 @@ def save_group_message_config(
         )
 
 
+async def save_group_message_config(*args, **kwargs) -> bool:
+    """保存或更新群组消息配置，提交后使群组配置缓存失效
+
+    参数同 _save_group_message_config。
+    """
+    from utils.chat_metadata_cache import invalidate_group_message_configs
+
+    try:
+        return await _save_group_message_config(*args, **kwargs)
+    finally:
+        invalidate_group_message_configs()
+
+
 @db_transaction
-def delete_group_message_config(conn, cursor, chat_id: int) -> bool:
+def _delete_group_message_config(conn, cursor, chat_id: int) -> bool:
     """删除群组消息配置"""
     cursor.execute("DELETE FROM group_message_config WHERE chat_id = ?", (chat_id,))
     return cursor.rowcount > 0
+
+
+async def delete_group_message_config(chat_id: int) -> bool:
+    """删除群组消息配置，提交后使群组配置缓存失效"""
+    from utils.chat_metadata_cache import invalidate_group_message_configs
+
+    try:
+        return await _delete_group_message_config(chat_id)
+    finally:
+        invalidate_group_message_configs()
@@ -8,7 +8,7 @@
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 # 第三方库
 import pytz
@@ -19,6 +19,9 @@ from db.base import db_query, db_transaction
 # 日志
 logger = logging.getLogger(__name__)
 
+# 逐页读取操作历史时每页的条数
+OPERATIONS_PAGE_SIZE = 500
+
 
 # ========== 操作历史（撤销功能） ==========
 
@@ -75,7 +78,7 @@ def get_last_operation(
         """
     SELECT * FROM operation_history
     WHERE user_id = ? AND chat_id = ? AND is_undone = 0 
-        AND DATE(created_at) = ? AND operation_type != 'operation_undo'
+        AND period_date = ? AND operation_type != 'operation_undo'
     ORDER BY created_at DESC, id DESC
     LIMIT 1
     """,
@@ -153,10 +156,10 @@ def get_recent_operations(conn, cursor, user_id: int, limit: int = 10) -> List[D
 def get_operations_by_date(
     conn, cursor, date: str, user_id: Optional[int] = None
 ) -> List[Dict]:
-    """获取指定日期的操作历史
+    """获取指定日结周期的操作历史
 
     Args:
-        date: 日期字符串，格式 'YYYY-MM-DD'
+        date: 日结周期日期，格式 'YYYY-MM-DD'（23:00 及之后的操作属于次日）
         user_id: 可选的用户ID，如果提供则只返回该用户的操作
 
     Returns:
@@ -166,7 +169,7 @@ def get_operations_by_date(
         cursor.execute(
             """
         SELECT * FROM operation_history
-        WHERE DATE(created_at) = ? AND user_id = ?
+        WHERE period_date = ? AND user_id = ?
         ORDER BY created_at ASC, id ASC
         """,
             (date, user_id),
@@ -175,25 +178,82 @@ def get_operations_by_date(
         cursor.execute(
             """
         SELECT * FROM operation_history
-        WHERE DATE(created_at) = ?
+        WHERE period_date = ?
         ORDER BY created_at ASC, id ASC
         """,
             (date,),
         )
 
-    rows = cursor.fetchall()
-    result = []
-    for row in rows:
-        op = dict(row)
-        try:
-            op["operation_data"] = json.loads(op["operation_data"])
-        except (json.JSONDecodeError, TypeError):
-            op["operation_data"] = {}
-        result.append(op)
-    return result
+    return [_parse_operation(row) for row in cursor.fetchall()]
+
+
+def _parse_operation(row) -> Dict:
+    op = dict(row)
+    try:
+        op["operation_data"] = json.loads(op["operation_data"])
+    except (json.JSONDecodeError, TypeError):
+        op["operation_data"] = {}
+    return op
+
+
+@db_query
+def get_operations_page_by_date(
+    conn,
+    cursor,
+    date: str,
+    after: Optional[Tuple[str, int]] = None,
+    limit: int = OPERATIONS_PAGE_SIZE,
+) -> List[Dict]:
+    """分页获取指定日结周期的操作历史（顺序与 get_operations_by_date 相同）
+
+    Args:
+        date: 日结周期日期，格式 'YYYY-MM-DD'
+        after: 上一页最后一条的 (created_at, id)，None 表示第一页
+        limit: 每页条数
+    """
+    if after is None:
+        cursor.execute(
+            """
+        SELECT * FROM operation_history
+        WHERE period_date = ?
+        ORDER BY created_at ASC, id ASC
+        LIMIT ?
+        """,
+            (date, limit),
+        )
+    else:
+        cursor.execute(
+            """
+        SELECT * FROM operation_history
+        WHERE period_date = ? AND (created_at, id) > (?, ?)
+        ORDER BY created_at ASC, id ASC
+        LIMIT ?
+        """,
+            (date, after[0], after[1], limit),
+        )
+    return [_parse_operation(row) for row in cursor.fetchall()]
+
+
+async def iter_operations_by_date(
+    date: str, page_size: int = OPERATIONS_PAGE_SIZE
+) -> AsyncIterator[Dict]:
+    """逐页读取指定日结周期的操作历史（流式生成报表用，不一次读入全部记录）"""
+    after = None
+    while True:
+        page = await get_operations_page_by_date(date, after, page_size)
+        for op in page:
+            yield op
+        if len(page) < page_size:
+            return
+        after = (page[-1]["created_at"], page[-1]["id"])
 
 
 @db_query
+def count_operations_by_date(conn, cursor, date: str) -> int:
+    """指定日结周期的操作数"""
+    return _get_total_operations_count(cursor, date)
+
+
 def _get_total_operations_count(cursor, date: str) -> int:
     """获取总操作数
 
@@ -207,7 +267,7 @@ def _get_total_operations_count(cursor, date: str) -> int:
     cursor.execute(
         """
     SELECT COUNT(*) FROM operation_history
-    WHERE DATE(created_at) = ?
+    WHERE period_date = ?
     """,
         (date,),
     )
@@ -228,7 +288,7 @@ def _get_operations_by_type(cursor, date: str) -> Dict:
         """
     SELECT operation_type, COUNT(*) as count
     FROM operation_history
-    WHERE DATE(created_at) = ?
+    WHERE period_date = ?
     GROUP BY operation_type
     ORDER BY count DESC
     """,
@@ -251,7 +311,7 @@ def _get_operations_by_user(cursor, date: str) -> Dict:
         """
     SELECT user_id, COUNT(*) as count
     FROM operation_history
-    WHERE DATE(created_at) = ?
+    WHERE period_date = ?
     GROUP BY user_id
     ORDER BY count DESC
     """,
@@ -273,13 +333,14 @@ def _get_undone_operations_count(cursor, date: str) -> int:
     cursor.execute(
         """
     SELECT COUNT(*) FROM operation_history
-    WHERE DATE(created_at) = ? AND is_undone = 1
+    WHERE period_date = ? AND is_undone = 1
     """,
         (date,),
     )
     return cursor.fetchone()[0] or 0
 
 
+@db_query
 def get_daily_operations_summary(conn, cursor, date: str) -> Dict:
     """获取指定日期的操作汇总统计
 
@@ -9,76 +9,64 @@ import logging
 from typing import Dict, List
 
 # 本地模块
+from db.archive import archive_union
 from db.base import db_query
+from db.batch_loader import iter_rows_by_keys, load_grouped_rows
+from db.records import fetch_records
 
 # 日志
 logger = logging.getLogger(__name__)
 
 
-@db_query
 def _fetch_incremental_orders(cursor, baseline_date: str) -> List[Dict]:
-    """获取增量订单"""
+    """获取增量订单（包含归档的订单）"""
     cursor.execute(
-        """
-    SELECT * FROM orders
+        f"""
+    SELECT * FROM {archive_union(cursor, "orders")}
     WHERE date >= ? OR updated_at >= ?
     ORDER BY date ASC, order_id ASC
     """,
         (baseline_date, f"{baseline_date} 00:00:00"),
     )
-    order_rows = cursor.fetchall()
-    return [dict(row) for row in order_rows]
+    return fetch_records(cursor)
 
 
-def _fetch_interest_records(cursor, order_ids: List[str], baseline_date: str):
-    """批量获取利息记录"""
-    if not order_ids:
-        return []
-    placeholders = ",".join(["?"] * len(order_ids))
-    cursor.execute(
+def _load_interests_map(
+    cursor, order_ids: List[str], baseline_date: str
+) -> Dict[str, List[Dict]]:
+    """批量获取利息记录，按订单分组"""
+    return load_grouped_rows(
+        cursor,
         f"""
-    SELECT * FROM income_records
-    WHERE order_id IN ({placeholders}) AND type = 'interest' AND date >= ?
+    SELECT * FROM {archive_union(cursor, "income_records")}
+    WHERE order_id IN ({{keys}}) AND type = 'interest' AND date >= ?
     AND (is_undone IS NULL OR is_undone = 0)
     ORDER BY order_id, date ASC, created_at ASC
     """,
-        order_ids + [baseline_date],
+        order_ids,
+        (baseline_date,),
     )
-    return cursor.fetchall()
 
 
-def _fetch_principal_records(cursor, order_ids: List[str], baseline_date: str):
-    """批量获取本金归还记录"""
-    if not order_ids:
-        return []
-    placeholders = ",".join(["?"] * len(order_ids))
-    cursor.execute(
+def _load_principal_map(
+    cursor, order_ids: List[str], baseline_date: str
+) -> Dict[str, float]:
+    """批量获取本金归还合计"""
+    rows = iter_rows_by_keys(
+        cursor,
         f"""
-    SELECT order_id, SUM(amount) as total_principal_reduction
-    FROM income_records
-    WHERE order_id IN ({placeholders}) AND type = 'principal_reduction' AND date >= ?
+    SELECT order_id, SUM(amount_cents) / 100.0 as total_principal_reduction
+    FROM {archive_union(cursor, "income_records")}
+    WHERE order_id IN ({{keys}}) AND type = 'principal_reduction' AND date >= ?
     AND (is_undone IS NULL OR is_undone = 0)
     GROUP BY order_id
     """,
-        order_ids + [baseline_date],
+        order_ids,
+        (baseline_date,),
     )
-    return cursor.fetchall()
-
-
-def _build_interests_map(interest_rows) -> Dict[str, List[Dict]]:
-    """构建利息映射表"""
-    interests_map = {}
-    for row in interest_rows:
-        order_id = row["order_id"]
-        if order_id not in interests_map:
-            interests_map[order_id] = []
-        interests_map[order_id].append(dict(row))
-    return interests_map
-
-
-def _build_principal_map(principal_rows) -> Dict[str, float]:
-    """构建本金归还映射表"""
-    return {row[0]: (row[1] if row[1] else 0.0) for row in principal_rows}
+    return {
+        row["order_id"]: row["total_principal_reduction"] or 0.0 for row in rows
+    }
 
 
 def _generate_order_note(
@@ -124,17 +112,15 @@ def _assemble_order_details(
     return result
 
 
+@db_query
 def get_incremental_orders_with_details(conn, cursor, baseline_date: str) -> List[Dict]:
-    """获取增量订单及其详细信息（优化批量查询）"""
+    """获取增量订单及其详细信息（利息和本金按订单批量加载）"""
     orders = _fetch_incremental_orders(cursor, baseline_date)
     if not orders:
         return []
 
     order_ids = [order["order_id"] for order in orders]
-    interest_rows = _fetch_interest_records(cursor, order_ids, baseline_date)
-    principal_rows = _fetch_principal_records(cursor, order_ids, baseline_date)
-
-    interests_map = _build_interests_map(interest_rows)
-    principal_map = _build_principal_map(principal_rows)
+    interests_map = _load_interests_map(cursor, order_ids, baseline_date)
+    principal_map = _load_principal_map(cursor, order_ids, baseline_date)
 
     return _assemble_order_details(orders, interests_map, principal_map, baseline_date)
@@ -35,7 +35,7 @@ def _build_filter_conditions(
     params = []
 
     if date:
-        conditions.append("DATE(created_at) = ?")
+        conditions.append("period_date = ?")
         params.append(date)
 
     if user_id:
@@ -5,6 +5,8 @@ from hashlib import md5
 from typing import Optional
 
 from db.base import db_query, db_transaction
+from db.search_index import (SEARCH_PAGE_SIZE, hit_query, match_tier,
+                             search_params)
 
 logger = logging.getLogger(__name__)
 
@@ -108,3 +110,37 @@ def list_customers(conn, cursor, limit: int = 100) -> list:
     )
     rows = cursor.fetchall()
     return [dict(row) for row in rows]
+
+
+@db_query
+def search_customer_profiles(
+    conn, cursor, text: str, limit: int = SEARCH_PAGE_SIZE, offset: int = 0
+) -> dict:
+    """模糊查找客户档案：客户ID、姓名或电话包含 text（见 db.search_index）
+
+    Returns:
+        {"total": 命中档案数, "items": 本页档案（按匹配程度排序）}
+    """
+    text = text.strip()
+    if not text:
+        return {"total": 0, "items": []}
+
+    params = search_params(text)
+    hits = hit_query(cursor, "customer_profiles", text)
+    cursor.execute(f"SELECT COUNT(*) FROM ({hits})", params)
+    total = cursor.fetchone()[0]
+    if not total:
+        return {"total": 0, "items": []}
+
+    tier = match_tier(["p.customer_id", "p.name", "p.phone"])
+    cursor.execute(
+        f"""
+        SELECT p.*, {tier} AS match_tier
+        FROM ({hits}) AS h
+        JOIN customer_profiles p ON p.id = h.id
+        ORDER BY match_tier, h.score, p.created_at DESC
+        LIMIT :limit OFFSET :offset
+        """,
+        {**params, "limit": limit, "offset": offset},
+    )
+    return {"total": total, "items": [dict(row) for row in cursor.fetchall()]}
@@ -0,0 +1,229 @@
+"""金额列整数分存储
+
+订单、收支明细和统计表的金额以整数"分"存储在 ``<列>_cents`` 中，
+原列名保留为只读的生成列（``<列>_cents / 100.0``），位置不变：
+- 读取：SELECT * / dict(row) / row["amount"] 与原来一样得到金额（元）
+- 写入：只能写 ``<列>_cents``，误写原列会直接报错，不会静默存成 100 倍
+- 汇总：SUM(<列>_cents) 为精确整数，避免浮点累加误差
+
+分类订单表（orders_*）是 orders 的冗余副本，仍为 REAL。
+"""
+
+# 标准库
+import logging
+import re
+import sqlite3
+from typing import Any, Dict, List, Tuple
+
+# 本地模块
+from utils.money import to_cents
+
+# 日志
+logger = logging.getLogger(__name__)
+
+# 统计表共有的金额列
+_STATS_AMOUNT_COLUMNS = (
+    "valid_amount",
+    "liquid_funds",
+    "new_clients_amount",
+    "old_clients_amount",
+    "interest",
+    "completed_amount",
+    "breach_amount",
+    "breach_end_amount",
+    "overdue_amount",
+)
+
+# 表 -> 以整数分存储的金额列
+MONEY_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "orders": ("amount",),
+    "income_records": ("amount",),
+    "expense_records": ("amount",),
+    "financial_data": _STATS_AMOUNT_COLUMNS,
+    "grouped_data": _STATS_AMOUNT_COLUMNS,
+    "daily_data": (
+        "new_clients_amount",
+        "old_clients_amount",
+        "interest",
+        "completed_amount",
+        "breach_amount",
+        "breach_end_amount",
+        "liquid_flow",
+        "company_expenses",
+        "other_expenses",
+    ),
+    "daily_summary": (
+        "new_clients_amount",
+        "old_clients_amount",
+        "completed_amount",
+        "breach_amount",
+        "breach_end_amount",
+        "daily_interest",
+        "company_expenses",
+        "other_expenses",
+    ),
+}
+
+# 表约束的起始关键字（其余定义为列定义）
+_CONSTRAINT_KEYWORDS = ("CONSTRAINT", "PRIMARY", "UNIQUE", "CHECK", "FOREIGN")
+
+
+def cents_column(column: str) -> str:
+    """金额列对应的整数分存储列"""
+    return f"{column}_cents"
+
+
+def is_money_column(table: str, column: str) -> bool:
+    """是否为以整数分存储的金额列"""
+    return column in MONEY_COLUMNS.get(table, ())
+
+
+def storage_column(table: str, column: str, value: Any) -> Tuple[str, Any]:
+    """字段实际写入的列和值：金额列写入 <列>_cents（整数分），其余原样"""
+    if is_money_column(table, column):
+        return cents_column(column), to_cents(value)
+    return column, value
+
+
+# ========== 迁移 ==========
+
+
+def _split_definitions(body: str) -> List[str]:
+    """按顶层逗号拆分 CREATE TABLE 括号内的定义"""
+    parts, depth, start = [], 0, 0
+    for index, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(body[start:index].strip())
+            start = index + 1
+    parts.append(body[start:].strip())
+    return [part for part in parts if part]
+
+
+def _definition_name(definition: str) -> str:
+    return re.split(r"[\s(]", definition, maxsplit=1)[0].strip('"`[]')
+
+
+def _converted_table_sql(create_sql: str, new_name: str, columns: List[str]) -> str:
+    """生成金额列改为生成列、末尾追加 <列>_cents 的建表语句"""
+    open_index = create_sql.index("(")
+    close_index = create_sql.rindex(")")
+    column_defs, constraints = [], []
+    for definition in _split_definitions(create_sql[open_index + 1 : close_index]):
+        name = _definition_name(definition)
+        if name.upper() in _CONSTRAINT_KEYWORDS:
+            constraints.append(definition)
+        elif name in columns:
+            column_defs.append(
+                f"{name} REAL GENERATED ALWAYS AS ({cents_column(name)} / 100.0) "
+                "VIRTUAL"
+            )
+        else:
+            column_defs.append(definition)
+    column_defs.extend(
+        f"{cents_column(name)} INTEGER NOT NULL DEFAULT 0" for name in columns
+    )
+    definitions = ",\n    ".join(column_defs + constraints)
+    return (
+        f"CREATE TABLE {new_name} (\n    {definitions}\n)"
+        f"{create_sql[close_index + 1:]}"
+    )
+
+
+def _table_columns(
+    cursor: sqlite3.Cursor, table: str, generated: bool = True
+) -> List[str]:
+    # table_xinfo 包含生成列（table_info 不包含），hidden 为 2 / 3 时是生成列
+    cursor.execute(f"PRAGMA table_xinfo({table})")
+    return [row[1] for row in cursor.fetchall() if generated or row[6] not in (2, 3)]
+
+
+def _pending_columns(cursor: sqlite3.Cursor, table: str) -> List[str]:
+    """表中尚未转换为整数分存储的金额列"""
+    existing = _table_columns(cursor, table)
+    return [
+        column
+        for column in MONEY_COLUMNS[table]
+        if column in existing and cents_column(column) not in existing
+    ]
+
+
+def _money_to_cents(value: Any) -> int:
+    """迁移时使用的 SQL 函数：REAL 金额 -> 整数分"""
+    try:
+        return to_cents(value)
+    except ValueError:
+        logger.error(f"无法转换的金额: {value!r}")
+        raise
+
+
+def _rebuild_table(cursor: sqlite3.Cursor, table: str, columns: List[str]) -> None:
+    """重建表：复制数据并把金额转换为整数分，保留索引"""
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    )
+    create_sql = cursor.fetchone()[0]
+    cursor.execute(
+        "SELECT sql FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,),
+    )
+    index_sqls = [row[0] for row in cursor.fetchall()]
+
+    new_table = f"{table}__money_cents"
+    # 生成列（如周期日期列）由新表按定义计算，不复制
+    copied = [
+        c for c in _table_columns(cursor, table, generated=False) if c not in columns
+    ]
+    targets = copied + [cents_column(column) for column in columns]
+    sources = copied + [f"money_to_cents({column})" for column in columns]
+
+    # 表名和列名来自 MONEY_COLUMNS 及现有表结构
+    cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+    cursor.execute(_converted_table_sql(create_sql, new_table, columns))
+    cursor.execute(  # nosec B608
+        f"INSERT INTO {new_table} ({', '.join(targets)}) "
+        f"SELECT {', '.join(sources)} FROM {table}"
+    )
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+    for sql in index_sqls:
+        cursor.execute(sql)
+
+
+def convert_money_columns(cursor: sqlite3.Cursor) -> List[str]:
+    """把金额列转换为整数分存储（已转换的表跳过）
+
+    被重建的表上的触发器随旧表一起删除，由调用方按新结构重建。
+
+    Returns:
+        本次转换的表名列表
+    """
+    pending = {}
+    for table in MONEY_COLUMNS:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        )
+        if cursor.fetchone():
+            columns = _pending_columns(cursor, table)
+            if columns:
+                pending[table] = columns
+    if not pending:
+        return []
+
+    cursor.connection.create_function(
+        "money_to_cents", 1, _money_to_cents, deterministic=True
+    )
+    # 旧表删除后，其他表触发器中对它的引用暂时失效；
+    # 关闭重命名时的全库触发器校验，改名完成后引用重新有效
+    cursor.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        for table, columns in pending.items():
+            _rebuild_table(cursor, table, columns)
+            logger.info(f"金额列已转换为整数分存储: {table} ({', '.join(columns)})")
+    finally:
+        cursor.execute("PRAGMA legacy_alter_table = OFF")
+    return list(pending)
@@ -0,0 +1,144 @@
+"""日结周期日期列
+
+"某个日结周期发生了什么"（当天的操作、当天完成/违约/新增的订单）原来按时间戳
+在查询时计算：DATE(created_at) = ? 或北京时间 00:00:00～23:59:59 的范围，
+既用不上普通索引，也没有按 23:00 日切归属（23:00 之后的操作和订单记在当天，
+而同一时间记录的收入明细、撤销和日切报表都记在次日）。
+
+现在日结周期日期（北京时间，DAILY_CUTOFF_HOUR 及之后算作次日，与
+utils.date_helpers.get_period_date 一致）保存为表上的生成列并建索引，
+按周期的查询都是索引上的等值查找：
+- 生成列由 SQLite 在写入时按时间戳列计算，写入路径不需要修改，已有数据在加列时
+  即具备；ALTER TABLE 只能添加 VIRTUAL 生成列，列值保存在其索引中
+- income_records / expense_records 的 date 列在写入时就是日结周期日期
+  （调用方传入 get_daily_period_date()），只补齐按日期查询的索引
+- 归档库中的表按同样的表达式补列（见 db.archive）
+- 时间戳列须写入北京时间（utils.date_helpers.get_now_beijing_str），
+  不能使用 SQLite 的 CURRENT_TIMESTAMP（UTC）
+"""
+
+# 标准库
+import sqlite3
+from typing import Dict, Optional, Tuple
+
+# 本地模块
+from constants import DAILY_CUTOFF_HOUR
+
+# 表 -> {周期日期列: 所依据的时间戳列}
+PERIOD_COLUMNS: Dict[str, Dict[str, str]] = {
+    "operation_history": {"period_date": "created_at"},
+    "orders": {
+        "created_period_date": "created_at",
+        "updated_period_date": "updated_at",
+    },
+}
+
+# SQLite CURRENT_TIMESTAMP（UTC）与北京时间的时差
+_UTC_OFFSET = "+8 hours"
+# 修改订单后记录操作历史的最长间隔（秒），用于识别按 UTC 写入的 updated_at
+_OPERATION_LAG_SECONDS = 300
+
+# 索引名 -> (表, 列)
+PERIOD_INDEXES: Dict[str, Tuple[str, str]] = {
+    "idx_operation_period": ("operation_history", "period_date"),
+    "idx_orders_created_period": ("orders", "created_period_date"),
+    "idx_orders_state_updated_period": ("orders", "state, updated_period_date"),
+    "idx_expense_date_type": ("expense_records", "date, type"),
+}
+
+
+def period_date_expr(column: str) -> str:
+    """时间戳列（北京时间 YYYY-MM-DD HH:MM:SS）所属日结周期日期的 SQL 表达式
+
+    时间戳无法解析时为 NULL。
+    """
+    shift = (24 - DAILY_CUTOFF_HOUR) % 24
+    if not shift:
+        return f"date(substr({column}, 1, 19))"
+    return f"date(substr({column}, 1, 19), '+{shift} hours')"
+
+
+def period_column_expr(table: str, column: str) -> Optional[str]:
+    """周期日期列的计算表达式（不是周期日期列时为 None）"""
+    source = PERIOD_COLUMNS.get(table, {}).get(column)
+    return period_date_expr(source) if source else None
+
+
+def period_column_definition(table: str, column: str) -> str:
+    """ALTER TABLE ADD COLUMN 用的列定义"""
+    return (
+        f"{column} TEXT GENERATED ALWAYS AS "
+        f"({period_column_expr(table, column)}) VIRTUAL"
+    )
+
+
+def add_period_columns(cursor: sqlite3.Cursor) -> None:
+    """为主库的表添加周期日期列（已存在的跳过）并创建索引"""
+    for table, columns in PERIOD_COLUMNS.items():
+        cursor.execute(f"PRAGMA main.table_xinfo({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        if not existing:
+            continue
+        for column in columns:
+            if column not in existing:
+                cursor.execute(
+                    f"ALTER TABLE main.{table} "
+                    f"ADD COLUMN {period_column_definition(table, column)}"
+                )
+
+    for name, (table, columns) in PERIOD_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+
+
+def fix_utc_updated_at(cursor: sqlite3.Cursor) -> int:
+    """把按 UTC 写入的 orders.updated_at 改为北京时间（主库和归档库）
+
+    修改订单的语句曾写入 CURRENT_TIMESTAMP（UTC），表中无法直接区分 UTC 和北京
+    时间。修改订单后会在同一请求中记录操作历史（北京时间）：updated_at 加 8 小时
+    后落在同一群组某条操作历史之前 _OPERATION_LAG_SECONDS 秒内的，判定为 UTC
+    写入。没有对应操作历史的修改无法判定，保持不变。
+
+    归档库须已附加（见 db.archive.attach_archive）。
+
+    Returns:
+        修改的订单数
+    """
+    from db.archive import ARCHIVE_SCHEMA
+
+    cursor.execute("PRAGMA database_list")
+    schemas = [
+        row[1] for row in cursor.fetchall() if row[1] in ("main", ARCHIVE_SCHEMA)
+    ]
+    histories = []
+    for schema in schemas:
+        cursor.execute(
+            f"SELECT 1 FROM {schema}.sqlite_master "
+            "WHERE type = 'table' AND name = 'operation_history'"
+        )
+        if cursor.fetchone():
+            histories.append(f"{schema}.operation_history")
+
+    shifted = f"datetime(orders.updated_at, '{_UTC_OFFSET}')"
+    matches = " OR ".join(
+        f"EXISTS (SELECT 1 FROM {history} h WHERE h.chat_id = orders.chat_id "
+        f"AND h.created_at BETWEEN {shifted} "
+        f"AND datetime({shifted}, '+{_OPERATION_LAG_SECONDS} seconds'))"
+        for history in histories
+    )
+    if not matches:
+        return 0
+
+    fixed = 0
+    for schema in schemas:
+        cursor.execute(
+            f"SELECT 1 FROM {schema}.sqlite_master "
+            "WHERE type = 'table' AND name = 'orders'"
+        )
+        if not cursor.fetchone():
+            continue
+        # 表名和表达式均为本模块内的常量
+        cursor.execute(  # nosec B608
+            f"UPDATE {schema}.orders SET updated_at = {shifted} WHERE {matches}"
+        )
+        fixed += cursor.rowcount
+    return fixed
@@ -0,0 +1,252 @@
+"""
+紧凑行记录模块
+
+为大批量查询提供轻量的行对象，替代 ``[dict(row) for row in rows]``。
+
+- 列名元组按 ``cursor.description`` 缓存，同一结构的所有行共享一个表头
+- 每行只保存表头引用和值元组（``__slots__``），不再为每行构建字典
+- 对外提供与字典一致的访问方式（``row["amount"]``、``row.get()``、
+  ``dict(row)``、``{**row}``、``row.copy()``），现有调用方无需修改
+
+用法：
+    @db_query
+    def search_orders_all(conn, cursor):
+        cursor.execute("SELECT * FROM orders")
+        return fetch_records(cursor)
+"""
+
+# 标准库
+import sqlite3
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 表头缓存上限（不同列结构的查询数量有限，超出时直接清空）
+_HEADER_CACHE_LIMIT = 256
+
+# 已删除字段的占位符
+_MISSING = object()
+
+
+class RecordHeader:
+    """共享表头：列名元组 + 列名到下标的映射"""
+
+    __slots__ = ("names", "index")
+
+    def __init__(self, names: Tuple[str, ...]):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"RecordHeader({self.names!r})"
+
+
+_header_cache: Dict[Tuple[str, ...], RecordHeader] = {}
+
+
+def get_header(description) -> RecordHeader:
+    """根据 cursor.description 获取（缓存的）表头
+
+    Args:
+        description: cursor.description 或列名序列
+
+    Returns:
+        共享的 RecordHeader 实例
+    """
+    names = tuple(col[0] if isinstance(col, tuple) else col for col in description)
+    header = _header_cache.get(names)
+    if header is None:
+        if len(_header_cache) >= _HEADER_CACHE_LIMIT:
+            _header_cache.clear()
+        header = RecordHeader(names)
+        _header_cache[names] = header
+    return header
+
+
+class Record(MutableMapping):
+    """紧凑的行记录，行为与字典一致
+
+    只读访问直接走共享表头的下标映射；写入时才把值元组复制为列表
+    （写时复制），新增的键保存在 ``_extra`` 中。
+    """
+
+    __slots__ = ("_header", "_values", "_extra")
+
+    def __init__(self, header: RecordHeader, values):
+        self._header = header
+        self._values = values
+        self._extra: Optional[Dict[str, Any]] = None
+
+    # ----- 读取 -----
+
+    def __getitem__(self, key):
+        i = self._header.index.get(key)
+        if i is not None:
+            value = self._values[i]
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        i = self._header.index.get(key)
+        if i is not None:
+            value = self._values[i]
+            return default if value is _MISSING else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key) -> bool:
+        i = self._header.index.get(key)
+        if i is not None:
+            return self._values[i] is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        values = self._values
+        for i, name in enumerate(self._header.names):
+            if values[i] is not _MISSING:
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        count = len(self._header.names)
+        if isinstance(self._values, list):
+            count -= sum(1 for v in self._values if v is _MISSING)
+        if self._extra:
+            count += len(self._extra)
+        return count
+
+    # ----- 写入（写时复制） -----
+
+    def __setitem__(self, key, value) -> None:
+        i = self._header.index.get(key)
+        if i is not None:
+            if not isinstance(self._values, list):
+                self._values = list(self._values)
+            self._values[i] = value
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key) -> None:
+        i = self._header.index.get(key)
+        if i is not None and self._values[i] is not _MISSING:
+            if not isinstance(self._values, list):
+                self._values = list(self._values)
+            self._values[i] = _MISSING
+            return
+        if self._extra is not None and key in self._extra:
+            del self._extra[key]
+            return
+        raise KeyError(key)
+
+    # ----- 字典兼容 -----
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典"""
+        values = self._values
+        if isinstance(values, list):
+            result = {
+                name: values[i]
+                for i, name in enumerate(self._header.names)
+                if values[i] is not _MISSING
+            }
+        else:
+            result = dict(zip(self._header.names, values))
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    def copy(self) -> Dict[str, Any]:
+        """与 dict.copy() 一致，返回普通字典副本"""
+        return self.to_dict()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Record):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self):
+        # 序列化（pickle / 持久化 user_data）时退化为普通字典
+        return (dict, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+def _fetch_raw(cursor: sqlite3.Cursor, size: Optional[int] = None) -> List[tuple]:
+    """以原始元组形式取行（临时关闭 row_factory，避免每行构建 sqlite3.Row）"""
+    original_factory = cursor.row_factory
+    cursor.row_factory = None
+    try:
+        return cursor.fetchall() if size is None else cursor.fetchmany(size)
+    finally:
+        cursor.row_factory = original_factory
+
+
+def fetch_records(cursor: sqlite3.Cursor) -> List[Record]:
+    """获取当前查询的所有行，返回紧凑记录列表
+
+    Args:
+        cursor: 已执行查询的游标
+
+    Returns:
+        Record 列表（所有行共享同一个表头）
+    """
+    if cursor.description is None:
+        return []
+    header = get_header(cursor.description)
+    return [Record(header, row) for row in _fetch_raw(cursor)]
+
+
+def fetch_record(cursor: sqlite3.Cursor) -> Optional[Record]:
+    """获取当前查询的一行，返回紧凑记录或 None"""
+    if cursor.description is None:
+        return None
+    rows = _fetch_raw(cursor, 1)
+    if not rows:
+        return None
+    return Record(get_header(cursor.description), rows[0])
+
+
+def iter_records(cursor: sqlite3.Cursor, chunk_size: int = 500) -> Iterator[Record]:
+    """按块流式读取查询结果，逐行产出紧凑记录
+
+    Args:
+        cursor: 已执行查询的游标
+        chunk_size: 每次 fetchmany 的行数
+
+    Yields:
+        Record
+    """
+    if cursor.description is None:
+        return
+    header = get_header(cursor.description)
+    while True:
+        rows = _fetch_raw(cursor, chunk_size)
+        if not rows:
+            break
+        for row in rows:
+            yield Record(header, row)
+
+
+def fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """获取所有行并转换为普通字典（列名只计算一次）
+
+    用于需要真正 dict 实例的调用方（如 isinstance(result, dict) 检查）。
+    """
+    if cursor.description is None:
+        return []
+    names = get_header(cursor.description).names
+    return [dict(zip(names, row)) for row in _fetch_raw(cursor)]
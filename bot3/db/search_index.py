@@ -0,0 +1,170 @@
+"""模糊搜索索引（SQLite FTS5 trigram）
+
+订单号、归属ID、群名和客户档案（客户ID、姓名、电话）的部分匹配查询走全文索引，
+不再全表扫描或逐页翻找：
+- 每个源表一个外部内容 FTS5 表 fts_*（只存索引，不重复存数据），由源表上的
+  触发器随写入同步维护，写入路径无需修改（表名不以 orders_ 开头，不会被当作分类表）
+- trigram 分词：3 个及以上字符的任意子串都走索引（不区分大小写）；
+  1～2 个字符的查询在索引表上 LIKE 匹配
+- 结果排序：完全匹配 > 前缀匹配 > 子串匹配，同级按 bm25 相关度
+- SQLite 未编译 FTS5（或版本不支持 trigram）时不建索引，搜索改为在源表上 LIKE
+
+已归档的订单（见 db.archive）随 DELETE 从索引移除，恢复后重新加入。
+"""
+
+# 标准库
+import logging
+import sqlite3
+from typing import Dict, List, NamedTuple, Tuple
+
+# 日志
+logger = logging.getLogger(__name__)
+
+# 搜索结果每页条数
+SEARCH_PAGE_SIZE = 20
+
+
+class IndexSource(NamedTuple):
+    """一个被索引的源表"""
+
+    table: str
+    index_table: str
+    columns: Tuple[str, ...]
+
+
+SEARCH_SOURCES: Dict[str, IndexSource] = {
+    "orders": IndexSource("orders", "fts_orders", ("order_id", "group_id")),
+    "group_titles": IndexSource(
+        "group_message_config", "fts_group_titles", ("chat_title",)
+    ),
+    "customer_profiles": IndexSource(
+        "customer_profiles", "fts_customer_profiles", ("customer_id", "name", "phone")
+    ),
+}
+
+
+# ========== 建立和维护索引 ==========
+
+
+def _trigger_statements(source: IndexSource) -> Dict[str, str]:
+    """源表的 INSERT / UPDATE / DELETE 触发器（外部内容表的标准维护方式）"""
+    prefix = f"trg_{source.index_table}"
+    columns = ", ".join(source.columns)
+    new_values = ", ".join(f"NEW.{column}" for column in source.columns)
+    old_values = ", ".join(f"OLD.{column}" for column in source.columns)
+    insert = (
+        f"INSERT INTO {source.index_table} (rowid, {columns}) "
+        f"VALUES (NEW.id, {new_values});"
+    )
+    delete = (
+        f"INSERT INTO {source.index_table} ({source.index_table}, rowid, {columns}) "
+        f"VALUES ('delete', OLD.id, {old_values});"
+    )
+    return {
+        f"{prefix}_insert": (
+            f"CREATE TRIGGER {prefix}_insert AFTER INSERT ON {source.table} "
+            f"BEGIN {insert} END"
+        ),
+        f"{prefix}_update": (
+            f"CREATE TRIGGER {prefix}_update "
+            f"AFTER UPDATE OF {columns} ON {source.table} "
+            f"BEGIN {delete} {insert} END"
+        ),
+        f"{prefix}_delete": (
+            f"CREATE TRIGGER {prefix}_delete AFTER DELETE ON {source.table} "
+            f"BEGIN {delete} END"
+        ),
+    }
+
+
+def create_search_index(cursor: sqlite3.Cursor) -> bool:
+    """创建（或重建）索引表和触发器，并用现有数据填充索引
+
+    Returns:
+        是否已建立索引（SQLite 不支持 FTS5 trigram 时为 False）
+    """
+    for source in SEARCH_SOURCES.values():
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {source.index_table} USING fts5("
+                f"{', '.join(source.columns)}, content='{source.table}', "
+                f"content_rowid='id', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"当前 SQLite 不支持 FTS5 trigram，模糊搜索使用 LIKE: {e}")
+            drop_search_index(cursor)
+            return False
+        for name, sql in _trigger_statements(source).items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {source.index_table} ({source.index_table}) "
+            f"VALUES ('rebuild')"
+        )
+    return True
+
+
+def drop_search_index(cursor: sqlite3.Cursor) -> None:
+    """移除索引表和触发器"""
+    for source in SEARCH_SOURCES.values():
+        for name in _trigger_statements(source):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {source.index_table}")
+
+
+def has_search_index(cursor: sqlite3.Cursor, source: IndexSource) -> bool:
+    """源表的索引表是否存在"""
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (source.index_table,),
+    )
+    return cursor.fetchone() is not None
+
+
+# ========== 查询 ==========
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_params(text: str) -> Dict[str, str]:
+    """匹配用的命名参数：:text（完全匹配）、:prefix、:pattern（LIKE）、:match（FTS）"""
+    escaped = _escape_like(text)
+    return {
+        "text": text,
+        "prefix": f"{escaped}%",
+        "pattern": f"%{escaped}%",
+        # 整个查询作为一个短语：trigram 下即子串匹配
+        "match": '"' + text.replace('"', '""') + '"',
+    }
+
+
+def hit_query(cursor: sqlite3.Cursor, name: str, text: str) -> str:
+    """命中子查询：SELECT 源表 id, 相关度得分（越小越相关）
+
+    参数使用 search_params(text) 中的 :match / :pattern。
+    """
+    source = SEARCH_SOURCES[name]
+    like = " OR ".join(
+        f"{column} LIKE :pattern ESCAPE '\\'" for column in source.columns
+    )
+    if not has_search_index(cursor, source):
+        return f"SELECT id, 0.0 AS score FROM {source.table} WHERE {like}"
+    if len(text) < 3:
+        # trigram 索引不覆盖 3 个字符以下的子串，在索引表上 LIKE
+        return (
+            f"SELECT rowid AS id, 0.0 AS score FROM {source.index_table} "
+            f"WHERE {like}"
+        )
+    return (
+        f"SELECT rowid AS id, bm25({source.index_table}) AS score "
+        f"FROM {source.index_table} WHERE {source.index_table} MATCH :match"
+    )
+
+
+def match_tier(columns: List[str]) -> str:
+    """匹配等级表达式：0 完全匹配，1 前缀匹配，2 子串匹配"""
+    exact = " OR ".join(f"{column} = :text COLLATE NOCASE" for column in columns)
+    prefix = " OR ".join(f"{column} LIKE :prefix ESCAPE '\\'" for column in columns)
+    return f"CASE WHEN {exact} THEN 0 WHEN {prefix} THEN 1 ELSE 2 END"
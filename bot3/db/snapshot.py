@@ -0,0 +1,295 @@
+"""分析快照库
+
+Excel 导出、客户贡献、数据诊断、统计修复等重查询读取主库的只读副本，
+长时间的全表扫描不再占用主库的读锁，不影响日常写入（+金额 等消息）：
+- 副本用 SQLite 在线备份 API 生成，主库和归档库在同一个读事务中复制（二者一致），
+  先写入临时文件再原子替换；正在读取旧副本的连接不受影响。主库使用 WAL 日志模式
+  （见 utils.db_pool.enable_wal），复制期间的读事务不阻塞写入
+- 副本通过只读连接（mode=ro + query_only）访问，连接按副本缓存复用
+- 定时任务每 SNAPSHOT_REFRESH_MINUTES 分钟刷新；使用时数据超过 max_age 秒会先刷新
+- ``async with analytics_snapshot() as snapshot:`` 范围内的 @db_query 读取副本，
+  写入（@db_transaction）始终写主库；format_freshness(snapshot) 用于在输出中标明数据时间
+
+环境变量：
+    ANALYTICS_SNAPSHOT        是否启用（默认 1；0 时重查询直接读取主库）
+    SNAPSHOT_DB_PATH          副本路径（默认与主库同目录的 loan_bot_snapshot.db）
+    SNAPSHOT_MAX_AGE          使用时允许的最大数据年龄（秒，默认 600）
+    SNAPSHOT_REFRESH_MINUTES  定时刷新间隔（分钟，默认 10；0 不定时刷新）
+    SNAPSHOT_POOL_SIZE        每个副本缓存的只读连接数（默认 4）
+"""
+
+# 标准库
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional
+
+# 第三方库
+import pytz
+
+# 日志
+logger = logging.getLogger(__name__)
+
+# 北京时区
+BEIJING_TZ = pytz.timezone("Asia/Shanghai")
+
+ANALYTICS_SNAPSHOT = os.getenv("ANALYTICS_SNAPSHOT", "1") != "0"
+SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE", "600"))
+SNAPSHOT_REFRESH_MINUTES = int(os.getenv("SNAPSHOT_REFRESH_MINUTES", "10"))
+POOL_SIZE = int(os.getenv("SNAPSHOT_POOL_SIZE", "4"))
+
+# 副本中记录生成时间的表
+_INFO_TABLE = "snapshot_info"
+
+# 同一时间只生成一个副本
+_refresh_lock = threading.Lock()
+# 替换副本文件和打开副本连接互斥（主库副本和归档副本成对使用）
+_files_lock = threading.Lock()
+
+_current: Optional["Snapshot"] = None
+_active: ContextVar[Optional["Snapshot"]] = ContextVar(
+    "analytics_snapshot", default=None
+)
+
+
+class Snapshot:
+    """一个已生成的副本及其只读连接"""
+
+    def __init__(self, path: str, archive_path: str, taken_at: float):
+        self.path = path
+        self.archive_path = archive_path
+        self.taken_at = taken_at
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._retired = False
+
+    @property
+    def age_seconds(self) -> float:
+        return max(time.time() - self.taken_at, 0.0)
+
+    @property
+    def taken_at_text(self) -> str:
+        """生成时间（北京时间）"""
+        taken = datetime.fromtimestamp(self.taken_at, BEIJING_TZ)
+        return taken.strftime("%Y-%m-%d %H:%M:%S")
+
+    def acquire(self) -> sqlite3.Connection:
+        """取出一个只读连接（归档副本已附加）"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+
+        from db.archive import ARCHIVE_SCHEMA
+        from utils.db_pool import get_readonly_connection
+
+        with _files_lock:
+            return get_readonly_connection(
+                self.path, attach={ARCHIVE_SCHEMA: self.archive_path}
+            )
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """归还连接（副本已被替换、SQL 性能分析开关变化时关闭）"""
+        from utils.sql_profiler import get_connection_factory
+
+        if conn.in_transaction:
+            conn.rollback()
+        reusable = type(conn) is get_connection_factory()
+        with self._lock:
+            if reusable and not self._retired and len(self._idle) < POOL_SIZE:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def retire(self) -> None:
+        """副本即将被替换：关闭空闲连接，之后归还的连接也直接关闭"""
+        with self._lock:
+            self._retired = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def get_snapshot_path() -> str:
+    """副本文件路径"""
+    path = os.getenv("SNAPSHOT_DB_PATH")
+    if path:
+        return path
+    import init_db
+
+    root, ext = os.path.splitext(init_db.DB_NAME)
+    return f"{root}_snapshot{ext or '.db'}"
+
+
+def _archive_snapshot_path(path: str) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def _read_taken_at(path: str) -> Optional[float]:
+    """读取已有副本的生成时间（进程重启后沿用）"""
+    from utils.db_pool import get_readonly_connection
+
+    try:
+        conn = get_readonly_connection(path)
+    except sqlite3.Error:
+        return None
+    try:
+        row = conn.execute(f"SELECT taken_at FROM {_INFO_TABLE}").fetchone()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def get_current_snapshot() -> Optional[Snapshot]:
+    """当前副本（没有可用副本时返回 None）"""
+    global _current
+    if _current is not None:
+        return _current
+
+    path = get_snapshot_path()
+    archive_path = _archive_snapshot_path(path)
+    if not (os.path.exists(path) and os.path.exists(archive_path)):
+        return None
+    taken_at = _read_taken_at(path)
+    if taken_at is None:
+        return None
+    with _refresh_lock:
+        if _current is None:
+            _current = Snapshot(path, archive_path, taken_at)
+    return _current
+
+
+def _backup_to(
+    source: sqlite3.Connection, schema: Optional[str], path: str, taken_at: float
+) -> str:
+    """把 source 上的一个库复制到 path 的临时文件，返回临时文件路径"""
+    temp_path = f"{path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    target = sqlite3.connect(temp_path)
+    try:
+        if schema:
+            source.backup(target, name=schema)
+        # 只读连接打开 DELETE 模式的库不需要 -wal / -shm 文件
+        target.execute("PRAGMA journal_mode = DELETE")
+        target.execute(
+            f"CREATE TABLE IF NOT EXISTS {_INFO_TABLE} (taken_at REAL NOT NULL)"
+        )
+        target.execute(f"DELETE FROM {_INFO_TABLE}")
+        target.execute(f"INSERT INTO {_INFO_TABLE} VALUES (?)", (taken_at,))
+        target.commit()
+    finally:
+        target.close()
+    return temp_path
+
+
+def refresh_snapshot() -> Snapshot:
+    """生成新的副本并替换当前副本"""
+    global _current
+    from db.archive import ARCHIVE_SCHEMA, attach_archive, move_lock
+    from utils.db_pool import get_sync_connection
+
+    path = get_snapshot_path()
+    archive_path = _archive_snapshot_path(path)
+    with _refresh_lock:
+        start = time.perf_counter()
+        source = get_sync_connection()
+        try:
+            cursor = source.cursor()
+            has_archive = attach_archive(cursor)
+            # 在同一个读事务中复制主库和归档库，并与归档批次互斥，
+            # 副本中的订单不会同时出现在两边或两边都没有
+            with move_lock:
+                cursor.execute("BEGIN")
+                cursor.execute("SELECT COUNT(*) FROM main.sqlite_master")
+                if has_archive:
+                    cursor.execute(
+                        f"SELECT COUNT(*) FROM {ARCHIVE_SCHEMA}.sqlite_master"
+                    )
+                taken_at = time.time()
+                temp_path = _backup_to(source, "main", path, taken_at)
+                # 没有归档库时生成空的归档副本，避免读取副本时附加实时归档库
+                temp_archive = _backup_to(
+                    source,
+                    ARCHIVE_SCHEMA if has_archive else None,
+                    archive_path,
+                    taken_at,
+                )
+                source.rollback()
+        finally:
+            source.close()
+
+        previous = _current
+        if previous is not None:
+            previous.retire()
+        with _files_lock:
+            os.replace(temp_path, path)
+            os.replace(temp_archive, archive_path)
+        _current = Snapshot(path, archive_path, taken_at)
+
+    logger.info(f"分析快照已刷新，耗时 {time.perf_counter() - start:.2f}s")
+    return _current
+
+
+def ensure_snapshot(max_age: Optional[float] = None) -> Snapshot:
+    """返回数据年龄不超过 max_age 秒的副本（必要时先刷新）
+
+    Args:
+        max_age: 允许的最大数据年龄（秒），默认 SNAPSHOT_MAX_AGE；0 表示总是刷新
+    """
+    max_age = SNAPSHOT_MAX_AGE if max_age is None else max_age
+    snapshot = get_current_snapshot()
+    if snapshot is None or snapshot.age_seconds > max_age:
+        snapshot = refresh_snapshot()
+    return snapshot
+
+
+def get_active_snapshot() -> Optional[Snapshot]:
+    """当前上下文使用的副本（不在 analytics_snapshot 中时为 None，读取主库）"""
+    return _active.get()
+
+
+@asynccontextmanager
+async def analytics_snapshot(max_age: Optional[float] = None):
+    """在此范围内的 @db_query 读取分析快照
+
+    未启用或生成副本失败时读取主库，返回值为 None。
+
+    Args:
+        max_age: 允许的最大数据年龄（秒），默认 SNAPSHOT_MAX_AGE；
+            读取结果用于写回主库时传 0
+
+    Usage:
+        async with analytics_snapshot() as snapshot:
+            orders = await db_operations.search_orders_advanced_all_states({})
+        text += format_freshness(snapshot)
+    """
+    snapshot = None
+    if ANALYTICS_SNAPSHOT:
+        try:
+            snapshot = await asyncio.to_thread(ensure_snapshot, max_age)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"生成分析快照失败，读取主库: {e}", exc_info=True)
+
+    token = _active.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _active.reset(token)
+
+
+def format_freshness(snapshot: Optional[Snapshot]) -> str:
+    """输出中标明数据时间的一行（读取主库时为空字符串）"""
+    if snapshot is None:
+        return ""
+    minutes = int(snapshot.age_seconds // 60)
+    age = "刚刚" if minutes < 1 else f"{minutes} 分钟前"
+    return f"📸 数据快照: {snapshot.taken_at_text}（{age}）"
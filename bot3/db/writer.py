@@ -0,0 +1,307 @@
+"""单写入线程（@db_transaction 的执行者）
+
+写操作不再各自在线程池中开连接、抢写锁、单独提交，而是放入队列，
+由一个持有唯一写连接的后台线程按入队顺序执行：
+- 同时排队的写操作合并为一个事务提交（组提交：多个操作只刷一次盘）
+- 每个写操作在自己的 SAVEPOINT 中执行，失败或返回 False 只回滚这一个操作，
+  调用方拿到的结果和异常与单独执行时相同
+- 按入队顺序执行，同一聊天（以及所有调用方）的写入顺序不变
+- 合并提交失败时逐个重新执行本批操作，不让一个操作拖累其他操作
+- 写操作内部调用的 conn.commit() / conn.rollback() 作用于本操作的 SAVEPOINT
+
+读取（@db_query）仍使用各自的连接，不经过写入线程。
+
+环境变量：
+    DB_WRITER                 是否启用（默认 1；0 时每个写操作单独开连接提交）
+    DB_WRITER_MAX_BATCH       每次组提交最多合并的写操作数（默认 64）
+    DB_WRITER_GROUP_WAIT_MS   凑批的最长等待（毫秒，默认 0：只合并已在排队的操作）
+    DB_WRITER_QUEUE_SIZE      排队的写操作上限（默认 10000，满时调用方等待）
+"""
+
+# 标准库
+import asyncio
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+# 日志
+logger = logging.getLogger(__name__)
+
+WRITER_ENABLED = os.getenv("DB_WRITER", "1") != "0"
+MAX_BATCH = max(int(os.getenv("DB_WRITER_MAX_BATCH", "64")), 1)
+GROUP_WAIT = float(os.getenv("DB_WRITER_GROUP_WAIT_MS", "0")) / 1000
+QUEUE_SIZE = int(os.getenv("DB_WRITER_QUEUE_SIZE", "10000"))
+
+_SAVEPOINT = "db_write_job"
+
+
+class _WriteJob:
+    """一个排队的写操作"""
+
+    __slots__ = ("func", "args", "kwargs", "future")
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+
+
+class _JobConnection:
+    """传给写操作的连接代理
+
+    组提交由写入线程统一完成：commit() 只确认到目前为止的修改（之后的回滚不再
+    撤销它们，随本批一起提交），rollback() 回滚到本操作开始或上次 commit() 时。
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def commit(self) -> None:
+        self._conn.execute(f"RELEASE {_SAVEPOINT}")
+        self._conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+
+    def rollback(self) -> None:
+        self._conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+
+    def close(self) -> None:
+        """写连接由写入线程持有"""
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class DbWriter:
+    """持有唯一写连接的后台写入线程"""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        # 统计：提交次数、执行的写操作数
+        self.commits = 0
+        self.jobs = 0
+
+    # ----- 提交写操作 -----
+
+    async def submit(self, func: Callable, *args, **kwargs) -> Any:
+        """排队执行 func(conn, cursor, *args, **kwargs)，返回其结果"""
+        self._ensure_started()
+        job = _WriteJob(func, args, kwargs)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            # 积压过多时在线程中等待空位，不阻塞事件循环
+            await asyncio.to_thread(self._queue.put, job)
+        # 调用方取消时，尚未开始执行的操作不再执行
+        return await asyncio.wrap_future(job.future)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """执行完排队的写操作后停止写入线程"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("写操作队列已满，关闭时未能执行完全部写操作")
+            return
+        thread.join(timeout=timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="db-writer", daemon=True
+            )
+            self._thread.start()
+
+    # ----- 写入线程 -----
+
+    def _connection(self) -> sqlite3.Connection:
+        """写连接（数据库路径变化、SQL 性能分析开关变化时重新打开）"""
+        import init_db
+        from utils.db_pool import get_sync_connection
+        from utils.sql_profiler import get_connection_factory
+
+        if self._conn is not None and (
+            self._db_path != init_db.DB_NAME
+            or type(self._conn) is not get_connection_factory()
+        ):
+            self._close_connection()
+        if self._conn is None:
+            conn = get_sync_connection()
+            # 事务边界由写入线程显式控制
+            conn.isolation_level = None
+            self._conn = conn
+            self._db_path = init_db.DB_NAME
+        return self._conn
+
+    def _close_connection(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+    def _run(self) -> None:
+        try:
+            running = True
+            while running:
+                batch, running = self._next_batch()
+                if batch:
+                    self._execute_safely(batch)
+        finally:
+            self._close_connection()
+
+    def _execute_safely(self, batch: List[_WriteJob]) -> None:
+        try:
+            self._execute_batch(batch)
+        except Exception as e:
+            # 写入线程不能退出：本批未完成的操作按失败返回，下一批重新打开连接
+            logger.error(f"执行写操作批次出错: {e}", exc_info=True)
+            self._close_connection()
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_result(False)
+
+    def _next_batch(self) -> Tuple[List[_WriteJob], bool]:
+        """阻塞到有写操作，再取出已在排队的操作（最多 MAX_BATCH 个）"""
+        batch: List[_WriteJob] = []
+        item = self._queue.get()
+        deadline = time.monotonic() + GROUP_WAIT
+        while True:
+            if item is None:
+                return batch, False
+            # 已被调用方取消的操作直接跳过
+            if item.future.set_running_or_notify_cancel():
+                batch.append(item)
+            if len(batch) >= MAX_BATCH:
+                return batch, True
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, True
+
+    def _execute_batch(self, batch: List[_WriteJob]) -> None:
+        """在一个事务中执行一批写操作并统一提交"""
+        try:
+            conn = self._connection()
+            cursor = conn.cursor()
+            # 归档库须在事务开始前附加（写操作中的 archive_union 需要）
+            from db.archive import attach_archive
+
+            attach_archive(cursor)
+            cursor.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            logger.error(f"写连接开始事务失败: {e}", exc_info=True)
+            self._close_connection()
+            for job in batch:
+                job.future.set_result(False)
+            return
+
+        outcomes = []
+        for index, job in enumerate(batch):
+            outcome = self._execute_job(conn, cursor, job)
+            if not conn.in_transaction:
+                # 磁盘已满等错误会回滚整个事务：之前的操作逐个重新执行，其余另起一批
+                logger.warning(f"写操作 {job.func.__name__} 出错导致事务被回滚")
+                for earlier in batch[:index]:
+                    self._execute_batch([earlier])
+                self._deliver(job, outcome)
+                if batch[index + 1 :]:
+                    self._execute_batch(batch[index + 1 :])
+                return
+            outcomes.append(outcome)
+
+        try:
+            cursor.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            if len(batch) > 1:
+                logger.warning(f"组提交失败（{len(batch)} 个写操作），逐个重新执行: {e}")
+                for job in batch:
+                    self._execute_batch([job])
+                return
+            logger.error(f"提交写操作失败: {e}", exc_info=True)
+            outcomes = [(False, None)]
+
+        self.commits += 1
+        self.jobs += len(batch)
+        # 已提交的订单变化写入活跃订单索引，调用方拿到结果时索引已是最新
+        from db.active_orders import apply_pending_order_changes
+
+        apply_pending_order_changes(cursor)
+        for job, outcome in zip(batch, outcomes):
+            self._deliver(job, outcome)
+
+    @staticmethod
+    def _deliver(
+        job: _WriteJob, outcome: Tuple[Any, Optional[BaseException]]
+    ) -> None:
+        result, error = outcome
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    def _execute_job(
+        self, conn: sqlite3.Connection, cursor: sqlite3.Cursor, job: _WriteJob
+    ) -> Tuple[Any, Optional[BaseException]]:
+        """在 SAVEPOINT 中执行一个写操作，返回 (结果, 需要抛给调用方的异常)"""
+        name = job.func.__name__
+        cursor.execute(f"SAVEPOINT {_SAVEPOINT}")
+        try:
+            result = job.func(
+                _JobConnection(conn), conn.cursor(), *job.args, **job.kwargs
+            )
+        except ValueError as e:
+            # ValueError是验证错误，应该向上传播，让调用者处理
+            self._rollback_job(cursor)
+            logger.error(f"Validation error in {name}: {e}")
+            return False, e
+        except Exception as e:
+            self._rollback_job(cursor)
+            logger.error(f"Database error in {name}: {e}", exc_info=True)
+            return False, None
+
+        if result is False:
+            self._rollback_job(cursor)
+        else:
+            cursor.execute(f"RELEASE {_SAVEPOINT}")
+        return result, None
+
+    @staticmethod
+    def _rollback_job(cursor: sqlite3.Cursor) -> None:
+        try:
+            cursor.execute(f"ROLLBACK TO {_SAVEPOINT}")
+            cursor.execute(f"RELEASE {_SAVEPOINT}")
+        except sqlite3.Error as e:
+            # 整个事务已被回滚（由 _execute_batch 处理）
+            logger.debug(f"回滚写操作失败: {e}")
+
+
+_writer = DbWriter()
+
+
+def get_db_writer() -> DbWriter:
+    """获取全局写入线程"""
+    return _writer
+
+
+def close_db_writer() -> None:
+    """执行完排队的写操作并停止写入线程（应用关闭时调用）"""
+    _writer.close()
@@ -1,7 +1,7 @@
 """
 数据库操作模块（统一入口 - 向后兼容层）
 
-此文件作为向后兼容的统一入口，导入所有拆分后的数据库操作模块。
+此文件作为向后兼容的统一入口，按需导入所有拆分后的数据库操作模块。
 
 所有函数都从以下模块导入：
 - db.module1_user.users - 用户权限操作
@@ -9,39 +9,274 @@
 - db.module2_finance.income - 收入明细操作
 - db.module2_finance.payments - 支付账号操作
 - db.module2_finance.daily - 日结数据操作
+- db.module2_finance.daily_summary - 日切数据增量维护
 - db.module3_order.orders - 订单操作
+- db.module4_automation.conversation_state - 会话状态持久化
+- db.module4_automation.job_runs - 定时任务运行记录
 - db.module4_automation.messages - 消息配置操作
 - db.module5_data.reports - 报表操作
 - db.module5_data.history - 操作历史
 
 注意：
-    - 此文件保持向后兼容，所有现有代码无需修改
+    - 此文件保持向后兼容，所有现有代码无需修改（db_operations.xxx 照常使用）
+    - 子模块采用延迟导入：首次访问某个函数时才导入其所在模块，
+      之后缓存到本模块命名空间，启动时不再加载整个数据库层
     - 新代码应该直接从 db.moduleX_xxx 模块导入
 """
 
-# 模块1：用户权限管理
-from db.module1_user.users import add_authorized_user  # noqa: F401, F403
-from db.module1_user.users import (get_all_user_group_mappings,
-                                   get_authorized_users, get_user_group_id,
-                                   is_user_authorized, remove_authorized_user,
-                                   remove_user_group_id, set_user_group_id)
-# 模块2：财务管理
-from db.module2_finance.daily import *  # noqa: F401, F403
-from db.module2_finance.finance import *  # noqa: F401, F403
-from db.module2_finance.income import *  # noqa: F401, F403
-from db.module2_finance.payments import *  # noqa: F401, F403
-# 模块3：订单管理
-from db.module3_order.orders import *  # noqa: F401, F403
-# 模块4：自动化任务
-from db.module4_automation.messages import *  # noqa: F401, F403
-# 模块5：数据管理
-from db.module5_data.history import *  # noqa: F401, F403
-from db.module5_data.reports import *  # noqa: F401, F403
-from db.module6_credit.credit_history import *  # noqa: F401, F403
-from db.module6_credit.customer_credit import *  # noqa: F401, F403
-# 模块6：客户信用系统
-from db.module6_credit.customer_profiles import (  # noqa: F401, F403
-    create_customer_profile, get_customer_by_id, get_customer_by_phone,
-    list_customers, set_customer_type, update_customer_profile)
-from db.module6_credit.customer_value import *  # noqa: F401, F403
-from db.module6_credit.device_profiles import *  # noqa: F401, F403
+# 标准库
+import importlib
+from typing import Dict, List, Tuple
+
+# 导出表：模块路径 -> 该模块提供的函数名
+_LAZY_EXPORTS: Dict[str, Tuple[str, ...]] = {
+    # 模块1：用户权限管理
+    "db.module1_user.users": (
+        "add_authorized_user",
+        "get_all_user_group_mappings",
+        "get_authorized_users",
+        "get_user_group_id",
+        "is_user_authorized",
+        "remove_authorized_user",
+        "remove_user_group_id",
+        "set_user_group_id",
+    ),
+    # 模块2：财务管理
+    "db.module2_finance.daily": (
+        "get_daily_data",
+        "get_stats_by_date_range",
+        "update_daily_data",
+    ),
+    "db.module2_finance.daily_summary": ("rebuild_daily_summary",),
+    "db.module2_finance.finance": (
+        "get_all_group_ids",
+        "get_financial_data",
+        "get_grouped_data",
+        "update_financial_data",
+        "update_grouped_data",
+    ),
+    "db.module2_finance.income": (
+        "get_all_interest_by_order_id",
+        "get_all_valid_orders",
+        "get_breach_end_orders_by_date",
+        "get_breach_orders_by_date",
+        "get_completed_orders_by_date",
+        "get_customer_orders_summary",
+        "get_customer_total_contribution",
+        "get_daily_expenses",
+        "get_daily_interest_total",
+        "get_daily_summary",
+        "get_income_records",
+        "get_income_summary_by_group",
+        "get_income_summary_by_type",
+        "get_interest_by_order_id",
+        "get_interests_by_order_ids",
+        "get_new_orders_by_date",
+        "record_income",
+    ),
+    "db.module2_finance.payments": (
+        "create_payment_account",
+        "delete_expense_record",
+        "delete_income_record",
+        "delete_payment_account",
+        "get_all_payment_accounts",
+        "get_expense_records",
+        "get_payment_account",
+        "get_payment_account_by_id",
+        "get_payment_accounts_by_type",
+        "mark_income_undone",
+        "record_expense",
+        "update_payment_account",
+        "update_payment_account_by_id",
+    ),
+    # 模块3：订单管理
+    "db.module3_order.orders": (
+        "_batch_insert_to_classified_tables",
+        "_ensure_classified_table_exists",
+        "_get_classified_table_names",
+        "_insert_order_to_classified_table_sync",
+        "_validate_table_name",
+        "check_order_weekday_groups",
+        "create_order",
+        "create_order_in_classified_tables",
+        "delete_order_by_chat_id",
+        "delete_order_by_order_id",
+        "get_order_by_chat_id",
+        "get_order_by_chat_id_including_archived",
+        "get_order_by_order_id",
+        "insert_order_to_classified_table",
+        "regroup_orders_by_weekday",
+        "search_orders_advanced",
+        "search_orders_advanced_all_states",
+        "search_orders_all",
+        "search_orders_by_customer",
+        "search_orders_by_date_range",
+        "search_orders_by_group_id",
+        "search_orders_by_state",
+        "search_orders_fuzzy",
+        "update_order_amount",
+        "update_order_chat_id",
+        "update_order_date",
+        "update_order_from_parsed_info",
+        "update_order_group_id",
+        "update_order_state",
+        "update_order_weekday_group",
+    ),
+    # 模块4：自动化任务
+    "db.module4_automation.conversation_state": (
+        "load_conversation_states",
+        "purge_conversation_states",
+        "save_conversation_states",
+    ),
+    "db.module4_automation.job_runs": (
+        "get_job_run_stats",
+        "purge_job_runs",
+        "record_job_run",
+    ),
+    "db.module4_automation.messages": (
+        "create_or_update_scheduled_broadcast",
+        "delete_anti_fraud_message",
+        "delete_company_announcement",
+        "delete_end_work_message",
+        "delete_group_message_config",
+        "delete_promotion_message",
+        "delete_scheduled_broadcast",
+        "delete_start_work_message",
+        "get_active_anti_fraud_messages",
+        "get_active_end_work_messages",
+        "get_active_promotion_messages",
+        "get_active_scheduled_broadcasts",
+        "get_active_start_work_messages",
+        "get_all_anti_fraud_messages",
+        "get_all_company_announcements",
+        "get_all_end_work_messages",
+        "get_all_promotion_messages",
+        "get_all_scheduled_broadcasts",
+        "get_all_start_work_messages",
+        "get_announcement_schedule",
+        "get_company_announcements",
+        "get_end_work_message_by_weekday",
+        "get_group_message_config_by_chat_id",
+        "get_group_message_configs",
+        "get_promotion_schedule",
+        "get_scheduled_broadcast",
+        "get_start_work_message_by_weekday",
+        "save_announcement_schedule",
+        "save_anti_fraud_message",
+        "save_company_announcement",
+        "save_end_work_message",
+        "save_group_message_config",
+        "save_promotion_message",
+        "save_start_work_message",
+        "toggle_anti_fraud_message",
+        "toggle_company_announcement",
+        "toggle_end_work_message",
+        "toggle_promotion_message",
+        "toggle_scheduled_broadcast",
+        "toggle_start_work_message",
+        "update_announcement_last_sent",
+    ),
+    # 模块5：数据管理
+    "db.module5_data.history": (
+        "count_operations_by_date",
+        "delete_operation",
+        "get_daily_operations_summary",
+        "get_last_operation",
+        "get_operation_by_id",
+        "get_operations_by_date",
+        "get_operations_page_by_date",
+        "get_recent_operations",
+        "iter_operations_by_date",
+        "mark_operation_as_undone",
+        "mark_operation_undone",
+        "record_operation",
+    ),
+    "db.module5_data.reports": (
+        "check_baseline_exists",
+        "check_merge_record_exists",
+        "get_all_merge_records",
+        "get_balance_history_by_date",
+        "get_balance_summary_by_date",
+        "get_baseline_date",
+        "get_incremental_orders",
+        "get_incremental_orders_with_details",
+        "get_merge_record",
+        "get_operations_by_filters",
+        "record_payment_balance_history",
+        "save_baseline_date",
+        "save_merge_record",
+        "update_operation_data",
+    ),
+    # 模块6：客户信用系统
+    "db.module6_credit.credit_history": (
+        "record_credit_change",
+    ),
+    "db.module6_credit.customer_credit": (
+        "create_credit_record",
+        "get_credit_benefits",
+        "get_credit_by_customer_id",
+        "update_credit_on_breach",
+        "update_credit_on_payment",
+    ),
+    "db.module6_credit.customer_profiles": (
+        "create_customer_profile",
+        "get_customer_by_id",
+        "get_customer_by_phone",
+        "list_customers",
+        "set_customer_type",
+        "update_customer_profile",
+    ),
+    "db.module6_credit.customer_value": (
+        "calculate_customer_value",
+        "create_value_record",
+        "get_top_customers",
+        "get_value_by_customer_id",
+        "update_value_on_order",
+        "update_value_on_payment",
+    ),
+    "db.module6_credit.device_profiles": (
+        "create_device_profile",
+        "get_device_by_id",
+        "get_device_by_imei",
+        "is_device_blacklisted",
+        "is_device_whitelisted",
+        "link_device_to_customer",
+        "set_device_blacklist",
+        "set_device_whitelist",
+    ),
+    # 基础数据库操作
+    "db.base": (
+        "execute_query",
+        "execute_transaction",
+    ),
+}
+
+# 函数名 -> 模块路径
+_NAME_TO_MODULE: Dict[str, str] = {
+    name: module_name
+    for module_name, names in _LAZY_EXPORTS.items()
+    for name in names
+}
+
+
+def __getattr__(name: str):
+    """首次访问时导入函数所在模块，并缓存到本模块命名空间"""
+    module_name = _NAME_TO_MODULE.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_NAME_TO_MODULE))
+
+
+def preload_all() -> None:
+    """立即导入所有数据库模块（用于启动后预热或测试）"""
+    for name in _NAME_TO_MODULE:
+        __getattr__(name)
+
+
+__all__ = sorted(_NAME_TO_MODULE)
@@ -19,6 +19,7 @@ from telegram.ext import ContextTypes
 
 import db_operations
 from config import ADMIN_IDS
+from utils.log_pipeline import log_kv
 
 logger = logging.getLogger(__name__)
 
@@ -161,56 +162,23 @@ def admin_required(func):
     async def wrapped(
         update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs
     ):
-        # 添加日志追踪
-        logger.info(f"admin_required: 检查函数 {func.__name__} 的权限")
-
         # 检查是否有消息对象
         if not update.message and not update.callback_query:
             logger.warning(f"admin_required: {func.__name__} - 没有消息对象，提前返回")
             return
 
-        # 获取用户ID和用户信息
+        # 获取用户ID和用户名
         user_id = update.effective_user.id if update.effective_user else None
         user_username = (
             update.effective_user.username if update.effective_user else None
         )
-        user_first_name = (
-            update.effective_user.first_name if update.effective_user else None
-        )
-        user_full_name = (
-            update.effective_user.full_name if update.effective_user else None
-        )
 
         # 确保类型一致（都是int）
         if user_id:
             user_id = int(user_id)
 
-        # 记录用户信息（包括用户名，便于识别）
-        user_info = f"ID: {user_id}"
-        if user_username:
-            user_info += f", @{user_username}"
-        if user_first_name:
-            user_info += f", {user_first_name}"
-        if user_full_name and user_full_name != user_first_name:
-            user_info += f" ({user_full_name})"
-
-        logger.info(
-            f"admin_required: {func.__name__} - 用户信息: {user_info}, 管理员列表: {ADMIN_IDS}"
-        )
-
-        # 调试日志（仅在DEBUG模式下）
-        if os.getenv("DEBUG", "0") == "1":
-            logger.debug(
-                f"权限检查 - 用户ID: {user_id}, 类型: {type(user_id)}, 管理员列表: {ADMIN_IDS}"
-            )
-
         # 检查权限
         has_permission = user_id and user_id in ADMIN_IDS
-        in_admin_list = user_id in ADMIN_IDS if user_id and ADMIN_IDS else False
-        logger.info(
-            f"admin_required: {func.__name__} - 权限检查结果: {has_permission} "
-            f"(用户ID: {user_id}, 在管理员列表中: {in_admin_list})"
-        )
 
         if not has_permission:
             # 提供更详细的错误信息，帮助用户排查问题
@@ -249,7 +217,15 @@ def admin_required(func):
                 )
             return
 
-        logger.info(f"admin_required: {func.__name__} - 权限检查通过，执行函数")
+        # 每次调用都会经过，按调用位置限流（见 utils.log_pipeline）
+        log_kv(
+            logger,
+            logging.INFO,
+            "admin_required.allowed",
+            func=func.__name__,
+            user_id=user_id,
+            username=user_username,
+        )
         return await func(update, context, *args, **kwargs)
 
     return wrapped
@@ -298,7 +274,6 @@ def private_chat_only(func):
         update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs
     ):
         chat_type = update.effective_chat.type if update.effective_chat else "unknown"
-        logger.info(f"private_chat_only: {func.__name__} - 聊天类型: {chat_type}")
 
         if chat_type != "private":
             logger.warning(f"private_chat_only: {func.__name__} - 不在私聊中，拒绝执行")
@@ -312,7 +287,7 @@ def private_chat_only(func):
                 )
             return
 
-        logger.info(f"private_chat_only: {func.__name__} - 在私聊中，允许执行")
+        log_kv(logger, logging.DEBUG, "private_chat_only.allowed", func=func.__name__)
         return await func(update, context, *args, **kwargs)
 
     return wrapped
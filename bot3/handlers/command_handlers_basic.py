@@ -7,8 +7,9 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
 import db_operations  # 使用向后兼容的包装层
-from decorators import (admin_required, authorized_required, error_handler,
-                        private_chat_only)
+from db.active_orders import get_active_order_index
+from decorators import admin_required, error_handler
+from utils.money import money_diff, sum_money
 
 logger = logging.getLogger(__name__)
 
@@ -82,25 +83,6 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         await handle_start_private(update, context, financial_data, user_id)
 
 
-@error_handler
-@authorized_required
-@private_chat_only
-def _calculate_valid_amount_statistics(
-    all_orders: List[Dict],
-) -> Tuple[List[Dict], float]:
-    """计算有效金额统计
-
-    Args:
-        all_orders: 所有订单列表
-
-    Returns:
-        (有效订单列表, 实际有效金额)
-    """
-    valid_orders = [o for o in all_orders if o.get("state") in ["normal", "overdue"]]
-    actual_valid_amount = sum(order.get("amount", 0) for order in valid_orders)
-    return valid_orders, actual_valid_amount
-
-
 def _build_group_statistics(valid_orders: List[Dict]) -> Dict[str, Dict[str, Any]]:
     """构建按归属ID分组的统计
 
@@ -120,8 +102,36 @@ def _build_group_statistics(valid_orders: List[Dict]) -> Dict[str, Dict[str, Any
     return group_stats
 
 
+async def _get_valid_amount_statistics() -> Tuple[
+    int, float, Dict[str, Dict[str, Any]]
+]:
+    """有效订单数、实际有效金额和按归属ID分组的统计
+
+    活跃订单索引已加载时直接读取其合计（见 db.active_orders），否则查询有效订单。
+    """
+    index = get_active_order_index()
+    if index is not None:
+        valid_count, actual_valid_amount = index.valid_totals()
+        group_stats: Dict[str, Dict[str, Any]] = {}
+        for group_id, (count, amount) in index.group_totals().items():
+            stats = group_stats.setdefault(
+                group_id or "未分配", {"count": 0, "amount": 0.0}
+            )
+            stats["count"] += count
+            stats["amount"] += amount
+        return valid_count, actual_valid_amount, group_stats
+
+    valid_orders = await db_operations.search_orders_advanced({})
+    actual_valid_amount = sum_money(order.get("amount", 0) for order in valid_orders)
+    return (
+        len(valid_orders),
+        actual_valid_amount,
+        _build_group_statistics(valid_orders),
+    )
+
+
 def _build_valid_amount_message(
-    valid_orders: List[Dict],
+    valid_count: int,
     actual_valid_amount: float,
     stats_valid_amount: float,
     group_stats: Dict[str, Dict[str, Any]],
@@ -129,7 +139,7 @@ def _build_valid_amount_message(
     """构建有效金额统计消息
 
     Args:
-        valid_orders: 有效订单列表
+        valid_count: 有效订单数
         actual_valid_amount: 实际有效金额
         stats_valid_amount: 统计有效金额
         group_stats: 分组统计
@@ -139,12 +149,12 @@ def _build_valid_amount_message(
     """
     msg = "💰 有效金额统计\n\n"
     msg += f"📊 总体统计：\n"
-    msg += f"有效订单数: {len(valid_orders)}\n"
+    msg += f"有效订单数: {valid_count}\n"
     msg += f"实际有效金额: {actual_valid_amount:,.2f}\n"
     msg += f"统计有效金额: {stats_valid_amount:,.2f}\n"
 
-    diff = stats_valid_amount - actual_valid_amount
-    if abs(diff) > 0.01:
+    diff = money_diff(stats_valid_amount, actual_valid_amount)
+    if diff:
         msg += f"⚠️ 差异: {diff:+,.2f}\n"
     else:
         msg += f"✅ 数据一致\n"
@@ -163,17 +173,15 @@ def _build_valid_amount_message(
 async def show_valid_amount(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """显示有效金额统计"""
     try:
-        all_orders = await db_operations.search_orders_advanced_all_states({})
-        valid_orders, actual_valid_amount = _calculate_valid_amount_statistics(
-            all_orders
+        valid_count, actual_valid_amount, group_stats = (
+            await _get_valid_amount_statistics()
         )
 
         financial_data = await db_operations.get_financial_data()
         stats_valid_amount = financial_data.get("valid_amount", 0.0)
 
-        group_stats = _build_group_statistics(valid_orders)
         msg = _build_valid_amount_message(
-            valid_orders, actual_valid_amount, stats_valid_amount, group_stats
+            valid_count, actual_valid_amount, stats_valid_amount, group_stats
         )
 
         await update.message.reply_text(msg)
@@ -36,10 +36,12 @@ async def get_user_group_id(user_id: int) -> Optional[str]:
 # ========== 订单相关 ==========
 
 
-@cached(ttl=300, key_prefix="order_")  # 缓存5分钟
 @monitor_performance("get_order_by_chat_id")
 async def get_order_by_chat_id_for_callback(chat_id: int) -> Optional[Dict]:
-    """为callbacks获取订单信息（带缓存和性能监控）"""
+    """为callbacks获取订单信息（带性能监控）
+
+    不再缓存：订单由活跃订单索引写穿维护（见 db.active_orders），缓存反而可能过期。
+    """
     return await db_operations.get_order_by_chat_id(chat_id)
 
 
@@ -97,6 +99,11 @@ async def get_operations_by_date_for_callback(date: str) -> List[Dict]:
     return await db_operations.get_operations_by_date(date)
 
 
+async def count_operations_by_date_for_callback(date: str) -> int:
+    """为callbacks获取指定日期的操作数"""
+    return await db_operations.count_operations_by_date(date)
+
+
 async def record_operation_for_callback(
     user_id: int,
     operation_type: str,
@@ -9,7 +9,7 @@ from telegram.ext import ContextTypes
 
 import db_operations
 from config import ADMIN_IDS
-from decorators import error_handler, private_chat_only
+from decorators import error_handler
 from utils.date_helpers import (datetime_str_to_beijing_str,
                                 get_daily_period_date)
 from utils.error_messages import ErrorMessages
@@ -172,80 +172,24 @@ async def generate_income_report(
     return (report, has_more_pages, total_pages, current_type)
 
 
-@error_handler
-@private_chat_only
-def _build_income_detail_keyboard(
-    total_pages: int, current_type: Optional[str], date: str
-) -> List[List[InlineKeyboardButton]]:
+def _build_income_detail_keyboard() -> List[List[InlineKeyboardButton]]:
     """构建收入明细键盘
 
-    Args:
-        total_pages: 总页数
-        current_type: 当前类型
-        date: 日期
-
     Returns:
         键盘按钮列表
     """
-    keyboard = []
-
-    if total_pages > 1:
-        page_buttons = []
-        if 1 < total_pages:
-            page_buttons.append(
-                InlineKeyboardButton(
-                    "下一页 ▶️",
-                    callback_data=f"income_page_{current_type}|2|{date}|{date}",
-                )
-            )
-        if page_buttons:
-            keyboard.append(page_buttons)
-
-    keyboard.extend(
-        [
-            [InlineKeyboardButton("📆 日期查询", callback_data="income_view_query")],
-            [
-                InlineKeyboardButton(
-                    "🔙 返回报表", callback_data="report_view_today_ALL"
-                )
-            ],
-        ]
-    )
-
-    return keyboard
-
-
-async def _send_income_detail_message(
-    update: Update, report: str, keyboard: List[List[InlineKeyboardButton]]
-) -> None:
-    """发送收入明细消息
-
-    Args:
-        update: Telegram更新对象
-        report: 报表文本
-        keyboard: 键盘按钮列表
-    """
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    try:
-        if update.callback_query:
-            await update.callback_query.edit_message_text(
-                report, reply_markup=reply_markup
-            )
-        else:
-            await update.message.reply_text(report, reply_markup=reply_markup)
-    except Exception as e:
-        logger.error(f"显示收入明细失败: {e}", exc_info=True)
-        if update.callback_query:
-            await update.callback_query.message.reply_text(
-                report, reply_markup=reply_markup
-            )
-        else:
-            await update.message.reply_text(report, reply_markup=reply_markup)
+    return [
+        [InlineKeyboardButton("📆 日期查询", callback_data="income_view_query")],
+        [InlineKeyboardButton("🔙 返回报表", callback_data="report_view_today_ALL")],
+    ]
 
 
 async def show_income_detail(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """显示今日收入明细（仅管理员）"""
+    from handlers.module2_finance.income_report_stream import \
+        send_income_report
+    from utils.report_stream import message_senders, query_senders
+
     user_id = update.effective_user.id if update.effective_user else None
 
     if not _is_admin(user_id):
@@ -255,12 +199,12 @@ async def show_income_detail(update: Update, context: ContextTypes.DEFAULT_TYPE)
     date = get_daily_period_date()
     records = await db_operations.get_income_records(date, date)
 
-    report, has_more, total_pages, current_type = await generate_income_report(
-        records, date, date, f"今日收入明细 ({date})", page=1, items_per_page=0
-    )
-
-    keyboard = _build_income_detail_keyboard(total_pages, current_type, date)
-    await _send_income_detail_message(update, report, keyboard)
+    reply_markup = InlineKeyboardMarkup(_build_income_detail_keyboard())
+    if update.callback_query:
+        senders = query_senders(update.callback_query, reply_markup)
+    else:
+        senders = message_senders(update.message, reply_markup)
+    await send_income_report(senders, records, date, date, f"今日收入明细 ({date})")
 
 
 @error_handler
@@ -297,24 +241,18 @@ async def handle_income_query_input(
         context.user_data["state"] = None
         return
 
+    from handlers.module2_finance.income_report_stream import \
+        send_income_report
+    from utils.report_stream import message_senders
+
     records = await db_operations.get_income_records(start_date, end_date)
 
-    report, has_more, total_pages, current_type = await generate_income_report(
+    keyboard = [[InlineKeyboardButton("🔙 返回", callback_data="income_view_today")]]
+    await send_income_report(
+        message_senders(update.message, InlineKeyboardMarkup(keyboard)),
         records,
         start_date,
         end_date,
         f"收入明细 ({start_date} 至 {end_date})",
-        page=1,
-        items_per_page=0,
-    )
-
-    keyboard = []
-
-    # 由于 items_per_page=0，不会分页，所以不显示分页按钮
-    # 当前默认显示全部
-
-    keyboard.append(
-        [InlineKeyboardButton("🔙 返回", callback_data="income_view_today")]
     )
-    await update.message.reply_text(report, reply_markup=InlineKeyboardMarkup(keyboard))
     context.user_data["state"] = None
@@ -0,0 +1,103 @@
+"""收入报表生成 - 流式发送模块
+
+"显示全部"的收入明细按行生成，由 utils.report_stream 边生成边分段发送，
+超出段数时发送 Excel 文件。
+"""
+
+from typing import AsyncIterator, List, Optional
+
+from handlers.module2_finance.income_handlers import (format_income_detail,
+                                                      get_income_type_name,
+                                                      get_income_type_order)
+from utils.report_stream import ReportSenders, stream_report
+
+
+async def iter_income_report_lines(
+    records: List,
+    start_date: str,
+    end_date: str,
+    title: str = "收入明细",
+    income_type: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """逐行生成收入明细报表（内容与 generate_income_report 显示全部时相同）
+
+    Args:
+        records: 收入记录列表
+        start_date: 开始日期
+        end_date: 结束日期
+        title: 标题
+        income_type: 只显示该类型（None 表示全部类型）
+
+    Yields:
+        报表行
+    """
+    from handlers.module2_finance.income_report_prepare import \
+        prepare_income_records
+
+    if not records:
+        yield f"💰 {title}"
+        yield ""
+        yield f"{start_date} 至 {end_date}"
+        yield ""
+        yield "❌ 无记录"
+        return
+
+    _, by_type, total_amount = prepare_income_records(records, income_type)
+
+    yield f"💰 {title}"
+    yield "═" * 30
+    yield f"📅 {start_date} 至 {end_date}"
+    yield "═" * 30
+    yield ""
+
+    type_order = get_income_type_order()
+    if income_type:
+        type_order = [income_type] if income_type in type_order else []
+
+    for type_key in type_order:
+        type_records = by_type.get(type_key)
+        if not type_records:
+            continue
+
+        # 按录入时间正序排序
+        type_records.sort(key=lambda x: x.get("created_at", "") or "")
+        type_total = sum(r.get("amount", 0) or 0 for r in type_records)
+
+        type_name = get_income_type_name(type_key)
+        yield f"【{type_name}】总计: {type_total:,.2f} ({len(type_records)}笔)"
+        yield "─" * 50
+        yield f"{'时间':<8}  {'订单号':<25}  {'金额':>15}"
+        yield "─" * 50
+        for i, record in enumerate(type_records, 1):
+            yield f"{i}. {await format_income_detail(record)}"
+        yield ""
+
+    yield "═" * 30
+    yield f"💰 总收入: {total_amount:,.2f}"
+
+
+async def send_income_report(
+    senders: ReportSenders,
+    records: List,
+    start_date: str,
+    end_date: str,
+    title: str = "收入明细",
+    income_type: Optional[str] = None,
+) -> None:
+    """分段发送收入明细报表（第一段带 senders 的按钮）
+
+    Args:
+        senders: 发送方式（见 utils.report_stream）
+        records: 收入记录列表
+        start_date: 开始日期
+        end_date: 结束日期
+        title: 标题
+        income_type: 只显示该类型（None 表示全部类型）
+    """
+    lines = iter_income_report_lines(
+        records, start_date, end_date, title, income_type
+    )
+    name = f"收入明细_{start_date}"
+    if end_date != start_date:
+        name += f"_{end_date}"
+    await stream_report(lines, senders, name=name)
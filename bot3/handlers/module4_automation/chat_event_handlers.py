@@ -10,6 +10,8 @@ from telegram.ext import ContextTypes
 # 本地模块
 import db_operations
 from decorators import error_handler
+from utils.chat_metadata_cache import (get_cached_group_message_config,
+                                       handle_chat_member_change)
 from utils.order_helpers import (try_create_order_from_title,
                                  update_order_state_from_title)
 from utils.schedule_executor import (_combine_fixed_message_with_anti_fraud,
@@ -99,7 +101,8 @@ async def _handle_new_members_joined(
     if not new_members:
         return
 
-    config = await db_operations.get_group_message_config_by_chat_id(chat.id)
+    # 入群高峰时同一群组的配置只读取一次
+    config = await get_cached_group_message_config(chat.id)
     if config and config.get("is_active"):
         await _send_welcome_messages_to_new_members(context, chat, new_members, config)
 
@@ -161,3 +164,10 @@ async def handle_new_chat_title(update: Update, context: ContextTypes.DEFAULT_TY
     else:
         # 处理新订单创建
         await handle_new_order_creation(update, context, chat, new_title)
+
+
+async def handle_chat_member_update(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    """处理群成员身份变更（管理员任免时刷新管理员缓存）"""
+    handle_chat_member_change(update.chat_member or update.my_chat_member)
@@ -10,6 +10,7 @@ from telegram import Message, Update
 from telegram.ext import ContextTypes
 
 import db_operations
+from db.active_orders import get_active_order_index
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +32,14 @@ async def fetch_and_validate_orders(
     Returns:
         tuple: (订单列表, 总有效金额) 或 None（如果验证失败）
     """
-    # 获取所有有效订单（normal和overdue状态）
-    criteria = {}
-    all_valid_orders = await db_operations.search_orders_advanced(criteria)
+    # 获取所有有效订单（normal和overdue状态），活跃订单索引已加载时从内存读取
+    index = get_active_order_index()
+    if index is not None:
+        all_valid_orders = sorted(
+            index.valid_orders(), key=lambda order: order["date"], reverse=True
+        )
+    else:
+        all_valid_orders = await db_operations.search_orders_advanced({})
 
     if not all_valid_orders:
         await _delete_processing_msg(processing_msg)
@@ -42,7 +48,10 @@ async def fetch_and_validate_orders(
         return None
 
     # 计算总有效金额
-    total_valid_amount = sum(order.get("amount", 0) for order in all_valid_orders)
+    if index is not None:
+        _, total_valid_amount = index.valid_totals()
+    else:
+        total_valid_amount = sum(order.get("amount", 0) for order in all_valid_orders)
 
     if total_valid_amount < target_amount:
         await _delete_processing_msg(processing_msg)
@@ -58,6 +58,13 @@ def _parse_weekday_group_criteria(context: ContextTypes.DEFAULT_TYPE) -> Optiona
     return {"weekday_group": val}
 
 
+def _parse_text_criteria(context: ContextTypes.DEFAULT_TYPE) -> Optional[Dict]:
+    """解析文本片段搜索条件（订单号、归属ID或群名的一部分）"""
+    if len(context.args) < 2:
+        return None
+    return {"text": " ".join(context.args[1:])}
+
+
 # 注册解析策略
 SEARCH_CRITERIA_PARSERS = {
     "order_id": _parse_order_id_criteria,
@@ -66,6 +73,7 @@ SEARCH_CRITERIA_PARSERS = {
     "state": _parse_state_criteria,
     "date": _parse_date_criteria,
     "group": _parse_weekday_group_criteria,
+    "text": _parse_text_criteria,
 }
 
 
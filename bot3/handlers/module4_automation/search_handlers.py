@@ -85,6 +85,10 @@ async def search_orders(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             await update.message.reply_text("Please provide Customer Type (A or B)")
         elif search_type == "state":
             await update.message.reply_text("Please provide State")
+        elif search_type == "text":
+            await update.message.reply_text(
+                "Please provide part of an Order ID, Group ID or group title"
+            )
         else:
             await update.message.reply_text(f"Unknown search type: {search_type}")
         return
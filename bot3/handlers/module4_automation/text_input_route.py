@@ -1,11 +1,60 @@
 """文本输入处理 - 路由模块
 
-包含路由不同状态文本输入的逻辑。
+根据 text_input_routers 中的状态表分派文本输入：
+固定状态直接按状态名查找，带参数的状态（"<族名>_<参数>"）按族名查找，
+两次字典查找即可定位处理函数，与登记的状态数量无关。
+处理完成后校验状态转换是否在声明范围内。
 """
 
+# 标准库
+import logging
+from typing import Optional
+
+# 第三方库
 from telegram import Update
 from telegram.ext import ContextTypes
 
+# 本地模块
+from handlers.module4_automation.text_input_routers import (
+    STATE_FAMILY_HANDLERS, STATE_HANDLERS, StateSpec)
+
+logger = logging.getLogger(__name__)
+
+
+def get_state_family(user_state: str) -> str:
+    """获取状态族名（"SCHEDULE_TIME_1" -> "SCHEDULE_TIME"）"""
+    return user_state.rsplit("_", 1)[0]
+
+
+def resolve_state(user_state: Optional[str]) -> Optional[StateSpec]:
+    """查找状态声明
+
+    Args:
+        user_state: 用户状态
+
+    Returns:
+        状态声明，未登记的状态返回None
+    """
+    if not user_state:
+        return None
+    spec = STATE_HANDLERS.get(user_state)
+    if spec is None and "_" in user_state:
+        spec = STATE_FAMILY_HANDLERS.get(get_state_family(user_state))
+    return spec
+
+
+def _check_transition(
+    user_state: str, new_state: Optional[str], spec: StateSpec
+) -> None:
+    """校验处理后的状态转换是否已声明（未声明时只记录警告）"""
+    if new_state is None or new_state == user_state:
+        return
+    if new_state in spec.next_states:
+        return
+    if get_state_family(new_state) in spec.next_states:
+        return
+    logger.warning(f"未声明的状态转换: {user_state} -> {new_state}")
+
 
 async def route_text_input_by_state(
     update: Update, context: ContextTypes.DEFAULT_TYPE, user_state: str, text: str
@@ -21,27 +70,10 @@ async def route_text_input_by_state(
     Returns:
         bool: 是否已处理
     """
-    # 按功能分组路由
-    from handlers.module4_automation.text_input_routers import (
-        route_config_states, route_finance_states, route_group_message_states,
-        route_payment_states, route_schedule_states, route_search_states)
-
-    if await route_group_message_states(update, context, user_state, text):
-        return True
-
-    if await route_finance_states(update, context, user_state, text):
-        return True
-
-    if await route_search_states(update, context, user_state, text):
-        return True
-
-    if await route_payment_states(update, context, user_state, text):
-        return True
-
-    if await route_schedule_states(update, context, user_state):
-        return True
-
-    if await route_config_states(update, context, user_state, text):
-        return True
+    spec = resolve_state(user_state)
+    if spec is None:
+        return False
 
-    return False
+    await spec.handler(update, context, text, user_state)
+    _check_transition(user_state, context.user_data.get("state"), spec)
+    return True
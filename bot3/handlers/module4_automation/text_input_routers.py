@@ -1,16 +1,25 @@
-"""文本输入路由辅助函数
+"""文本输入状态表
 
-包含根据用户状态路由到不同处理函数的辅助函数。
+声明每个输入状态对应的处理函数、是否允许在群组中输入、以及处理后允许进入的状态。
+text_input_route 根据此表按字典查找分派，新增状态只需在表中登记。
+
+状态分两类：
+- STATE_HANDLERS：固定状态名，如 "SEARCHING"
+- STATE_FAMILY_HANDLERS：带参数的状态族，状态名为 "<族名>_<参数>"，
+  如 "SCHEDULE_TIME_1"、"UPDATING_BALANCE_BY_ID_5"
 """
 
 # 标准库
 import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Tuple
 
 # 第三方库
 from telegram import Update
 from telegram.ext import ContextTypes
 
 # 本地模块
+from constants import USER_STATES
 from handlers.module4_automation.finance_input_helpers import (
     _handle_expense_input, _handle_expense_query, _handle_income_query_date)
 from handlers.module4_automation.group_message_input_helpers import (
@@ -27,120 +36,66 @@ from handlers.module4_automation.search_input_helpers import (
 
 logger = logging.getLogger(__name__)
 
-
-async def route_finance_states(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, user_state: str, text: str
-) -> bool:
-    """路由财务相关状态"""
-    if user_state in ["QUERY_EXPENSE_COMPANY", "QUERY_EXPENSE_OTHER"]:
-        await _handle_expense_query(update, context, text, user_state)
-        return True
-
-    if user_state in ["WAITING_EXPENSE_COMPANY", "WAITING_EXPENSE_OTHER"]:
-        await _handle_expense_input(update, context, text, user_state)
-        return True
-
-    if user_state == "QUERY_INCOME":
-        from handlers.module2_finance.income_handlers import \
-            handle_income_query_input
-
-        await handle_income_query_input(update, context, text)
-        return True
-
-    if user_state == "INCOME_QUERY_DATE":
-        await _handle_income_query_date(update, context, text)
-        return True
-
-    return False
+# 状态处理函数：(update, context, text, user_state)
+StateHandler = Callable[[Update, ContextTypes.DEFAULT_TYPE, str, str], Awaitable[None]]
 
 
-async def route_search_states(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, user_state: str, text: str
-) -> bool:
-    """路由搜索相关状态"""
-    if user_state == "SEARCHING":
-        await _handle_search_input(update, context, text)
-        return True
+@dataclass(frozen=True)
+class StateSpec:
+    """输入状态声明
 
-    if user_state == "SEARCHING_AMOUNT":
-        await _handle_search_amount_input(update, context, text)
-        return True
+    Attributes:
+        handler: 处理函数
+        allow_group: 是否允许在群组中输入（默认仅私聊）
+        next_states: 处理后允许进入的其他状态（或状态族），
+            保持当前状态和清空状态（None）总是允许的
+    """
 
-    if user_state == "REPORT_QUERY":
-        await _handle_report_query(update, context, text)
-        return True
+    handler: StateHandler
+    allow_group: bool = False
+    next_states: Tuple[str, ...] = ()
 
-    if user_state == "REPORT_SEARCHING":
-        await _handle_report_search(update, context, text)
-        return True
 
-    return False
+def _text_only(func) -> StateHandler:
+    """适配签名为 (update, context, text) 的处理函数"""
 
+    async def handler(update, context, text, user_state):
+        await func(update, context, text)
 
-async def route_payment_states(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, user_state: str, text: str
-) -> bool:
-    """路由支付账户相关状态"""
-    if user_state == "UPDATING_BALANCE_GCASH":
-        await _handle_update_balance(update, context, text, "gcash")
-        return True
+    return handler
 
-    if user_state == "UPDATING_BALANCE_PAYMAYA":
-        await _handle_update_balance(update, context, text, "paymaya")
-        return True
 
-    if user_state == "EDITING_ACCOUNT_GCASH":
-        await _handle_edit_account(update, context, text, "gcash")
-        return True
+def _with_account_type(func, account_type: str) -> StateHandler:
+    """适配签名为 (update, context, text, account_type) 的支付账户处理函数"""
 
-    if user_state == "EDITING_ACCOUNT_PAYMAYA":
-        await _handle_edit_account(update, context, text, "paymaya")
-        return True
+    async def handler(update, context, text, user_state):
+        await func(update, context, text, account_type)
 
-    if user_state == "ADDING_ACCOUNT_GCASH":
-        await _handle_add_account(update, context, text, "gcash")
-        return True
+    return handler
 
-    if user_state == "ADDING_ACCOUNT_PAYMAYA":
-        await _handle_add_account(update, context, text, "paymaya")
-        return True
 
-    if user_state == "EDITING_ACCOUNT_BY_ID_GCASH":
-        await _handle_edit_account_by_id(update, context, text, "gcash")
-        return True
+async def _handle_broadcast_payment(update, context, text, user_state) -> None:
+    """处理群组内播报付款提醒输入"""
+    from handlers.module4_automation.broadcast_handlers import \
+        handle_broadcast_payment_input
 
-    if user_state == "EDITING_ACCOUNT_BY_ID_PAYMAYA":
-        await _handle_edit_account_by_id(update, context, text, "paymaya")
-        return True
+    await handle_broadcast_payment_input(update, context, text)
 
-    if user_state and user_state.startswith("UPDATING_BALANCE_BY_ID_"):
-        await _handle_update_balance_by_id(update, context, text)
-        return True
 
-    return False
+async def _handle_income_query(update, context, text, user_state) -> None:
+    """处理收入明细查询输入"""
+    from handlers.module2_finance.income_handlers import \
+        handle_income_query_input
 
+    await handle_income_query_input(update, context, text)
 
-async def route_group_message_states(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, user_state: str, text: str
-) -> bool:
-    """路由群组消息相关状态"""
-    if user_state == "BROADCASTING":
-        await _handle_broadcast(update, context, text)
-        return True
 
-    from constants import USER_STATES
+async def _handle_schedule_input(update, context, text, user_state) -> None:
+    """处理定时播报输入（SCHEDULE_TIME/CHAT/MESSAGE_<槽位>）"""
+    from handlers.module4_automation.schedule_handlers import \
+        handle_schedule_input
 
-    setting_bot_links_prefix = f"{USER_STATES['SETTING_BOT_LINKS']}_"
-    if user_state and user_state.startswith(setting_bot_links_prefix):
-        await _handle_set_bot_links(update, context, text)
-        return True
-
-    setting_worker_links_prefix = f"{USER_STATES['SETTING_WORKER_LINKS']}_"
-    if user_state and user_state.startswith(setting_worker_links_prefix):
-        await _handle_set_worker_links(update, context, text)
-        return True
-
-    return False
+    await handle_schedule_input(update, context)
 
 
 async def _handle_adding_group_config(
@@ -257,38 +212,109 @@ async def _handle_adding_promotion_message(
     context.user_data["state"] = None
 
 
-async def route_config_states(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, user_state: str, text: str
-) -> bool:
-    """路由配置相关状态"""
-    if user_state == "ADDING_GROUP_CONFIG":
-        await _handle_adding_group_config(update, context, text)
-        return True
-
-    if user_state == "ADDING_ANNOUNCEMENT":
-        await _handle_adding_announcement(update, context, text)
-        return True
+async def _handle_announcement_interval_setting(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, text: str
+) -> None:
+    """处理公告间隔设置"""
+    import db_operations
 
-    if user_state == "ADDING_ANTIFRAUD_MESSAGE":
-        await _handle_adding_antifraud_message(update, context, text)
-        return True
+    if text.strip().lower() == "cancel":
+        context.user_data["state"] = None
+        await update.message.reply_text("✅ 操作已取消")
+        return
 
-    if user_state == "ADDING_PROMOTION_MESSAGE":
-        await _handle_adding_promotion_message(update, context, text)
-        return True
+    try:
+        interval_hours = int(text.strip())
+        if interval_hours < 1:
+            await update.message.reply_text("❌ 间隔必须大于0，输入 'cancel' 取消")
+            return
 
-    return False
+        success = await db_operations.save_announcement_schedule(
+            interval_hours=interval_hours, is_active=1
+        )
 
+        if success:
+            await update.message.reply_text(
+                f"✅ 发送间隔已设置为 {interval_hours} 小时\n\n"
+                f"注意：需要重启机器人才能生效"
+            )
+        else:
+            await update.message.reply_text("❌ 设置失败")
+    except ValueError:
+        await update.message.reply_text("❌ 请输入有效的数字，输入 'cancel' 取消")
+    except Exception as e:
+        logger.error(f"设置公告间隔失败: {e}", exc_info=True)
+        await update.message.reply_text(f"❌ 设置失败: {e}")
 
-async def route_schedule_states(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, user_state: str
-) -> bool:
-    """路由定时播报相关状态"""
-    if user_state and user_state.startswith("SCHEDULE_"):
-        from handlers.module4_automation.schedule_handlers import \
-            handle_schedule_input
+    context.user_data["state"] = None
 
-        handled = await handle_schedule_input(update, context)
-        return handled
 
-    return False
+# ========== 状态表 ==========
+
+STATE_HANDLERS: Dict[str, StateSpec] = {
+    # 订单（允许群组）
+    "WAITING_BREACH_END_AMOUNT": StateSpec(
+        _text_only(_handle_breach_end_amount), allow_group=True
+    ),
+    "BROADCAST_PAYMENT": StateSpec(_handle_broadcast_payment, allow_group=True),
+    # 群组消息
+    "BROADCASTING": StateSpec(_text_only(_handle_broadcast)),
+    # 财务
+    "QUERY_EXPENSE_COMPANY": StateSpec(_handle_expense_query),
+    "QUERY_EXPENSE_OTHER": StateSpec(_handle_expense_query),
+    "WAITING_EXPENSE_COMPANY": StateSpec(_handle_expense_input),
+    "WAITING_EXPENSE_OTHER": StateSpec(_handle_expense_input),
+    "QUERY_INCOME": StateSpec(_handle_income_query),
+    "INCOME_QUERY_DATE": StateSpec(_text_only(_handle_income_query_date)),
+    # 搜索/报表
+    "SEARCHING": StateSpec(_text_only(_handle_search_input)),
+    "SEARCHING_AMOUNT": StateSpec(_text_only(_handle_search_amount_input)),
+    "REPORT_QUERY": StateSpec(_text_only(_handle_report_query)),
+    "REPORT_SEARCHING": StateSpec(_text_only(_handle_report_search)),
+    # 支付账户
+    "UPDATING_BALANCE_GCASH": StateSpec(
+        _with_account_type(_handle_update_balance, "gcash")
+    ),
+    "UPDATING_BALANCE_PAYMAYA": StateSpec(
+        _with_account_type(_handle_update_balance, "paymaya")
+    ),
+    "EDITING_ACCOUNT_GCASH": StateSpec(
+        _with_account_type(_handle_edit_account, "gcash")
+    ),
+    "EDITING_ACCOUNT_PAYMAYA": StateSpec(
+        _with_account_type(_handle_edit_account, "paymaya")
+    ),
+    "ADDING_ACCOUNT_GCASH": StateSpec(_with_account_type(_handle_add_account, "gcash")),
+    "ADDING_ACCOUNT_PAYMAYA": StateSpec(
+        _with_account_type(_handle_add_account, "paymaya")
+    ),
+    "EDITING_ACCOUNT_BY_ID_GCASH": StateSpec(
+        _with_account_type(_handle_edit_account_by_id, "gcash")
+    ),
+    "EDITING_ACCOUNT_BY_ID_PAYMAYA": StateSpec(
+        _with_account_type(_handle_edit_account_by_id, "paymaya")
+    ),
+    # 配置
+    "ADDING_GROUP_CONFIG": StateSpec(_text_only(_handle_adding_group_config)),
+    "ADDING_ANNOUNCEMENT": StateSpec(_text_only(_handle_adding_announcement)),
+    "ADDING_ANTIFRAUD_MESSAGE": StateSpec(_text_only(_handle_adding_antifraud_message)),
+    "ADDING_PROMOTION_MESSAGE": StateSpec(_text_only(_handle_adding_promotion_message)),
+    "SETTING_ANNOUNCEMENT_INTERVAL": StateSpec(
+        _text_only(_handle_announcement_interval_setting)
+    ),
+}
+
+STATE_FAMILY_HANDLERS: Dict[str, StateSpec] = {
+    "UPDATING_BALANCE_BY_ID": StateSpec(_text_only(_handle_update_balance_by_id)),
+    # 群组链接设置（族名为 USER_STATES 中的显示名）
+    USER_STATES["SETTING_BOT_LINKS"]: StateSpec(_text_only(_handle_set_bot_links)),
+    USER_STATES["SETTING_WORKER_LINKS"]: StateSpec(
+        _text_only(_handle_set_worker_links)
+    ),
+    # 定时播报：时间 -> 群组 -> 消息
+    "SCHEDULE_TIME": StateSpec(_handle_schedule_input, next_states=("SCHEDULE_CHAT",)),
+    "SCHEDULE_CHAT": StateSpec(
+        _handle_schedule_input, next_states=("SCHEDULE_MESSAGE",)
+    ),
+    "SCHEDULE_MESSAGE": StateSpec(_handle_schedule_input),
+}
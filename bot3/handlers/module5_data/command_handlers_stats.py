@@ -7,15 +7,12 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 import db_operations
-from decorators import admin_required, error_handler, private_chat_only
 from services.module5_data.stats_service import StatsService
+from utils.money import money_diff, sum_money
 
 logger = logging.getLogger(__name__)
 
 
-@error_handler
-@admin_required
-@private_chat_only
 async def _fix_group_statistics(all_orders: List[Dict]) -> Tuple[int, List[str]]:
     """修复归属ID统计数据
 
@@ -39,19 +36,21 @@ async def _fix_group_statistics(all_orders: List[Dict]) -> Tuple[int, List[str]]
         ]
 
         actual_valid_count = len(valid_orders)
-        actual_valid_amount = sum(o.get("amount", 0) for o in valid_orders)
+        actual_valid_amount = sum_money(o.get("amount", 0) for o in valid_orders)
 
         grouped_data = await db_operations.get_grouped_data(group_id)
 
         valid_count_diff = actual_valid_count - grouped_data["valid_orders"]
-        valid_amount_diff = actual_valid_amount - grouped_data["valid_amount"]
+        valid_amount_diff = money_diff(
+            actual_valid_amount, grouped_data["valid_amount"]
+        )
 
-        if abs(valid_count_diff) > 0 or abs(valid_amount_diff) > 0.01:
+        if valid_count_diff or valid_amount_diff:
             if valid_count_diff != 0:
                 await db_operations.update_grouped_data(
                     group_id, "valid_orders", valid_count_diff
                 )
-            if abs(valid_amount_diff) > 0.01:
+            if valid_amount_diff:
                 await db_operations.update_grouped_data(
                     group_id, "valid_amount", valid_amount_diff
                 )
@@ -76,18 +75,20 @@ async def _fix_global_statistics(all_orders: List[Dict]) -> int:
         o for o in all_orders if o.get("state") in ["normal", "overdue"]
     ]
     global_valid_count = len(all_valid_orders)
-    global_valid_amount = sum(o.get("amount", 0) for o in all_valid_orders)
+    global_valid_amount = sum_money(o.get("amount", 0) for o in all_valid_orders)
 
     financial_data = await db_operations.get_financial_data()
     global_valid_count_diff = global_valid_count - financial_data["valid_orders"]
-    global_valid_amount_diff = global_valid_amount - financial_data["valid_amount"]
+    global_valid_amount_diff = money_diff(
+        global_valid_amount, financial_data["valid_amount"]
+    )
 
-    if abs(global_valid_count_diff) > 0 or abs(global_valid_amount_diff) > 0.01:
+    if global_valid_count_diff or global_valid_amount_diff:
         if global_valid_count_diff != 0:
             await db_operations.update_financial_data(
                 "valid_orders", global_valid_count_diff
             )
-        if abs(global_valid_amount_diff) > 0.01:
+        if global_valid_amount_diff:
             await db_operations.update_financial_data(
                 "valid_amount", global_valid_amount_diff
             )
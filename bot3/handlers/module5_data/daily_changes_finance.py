@@ -3,14 +3,19 @@
 包含获取财务相关变更的逻辑。
 """
 
+from typing import Dict
+
 import db_operations
 
 
-async def get_finance_changes(date: str) -> dict:
+async def get_finance_changes(date: str, summary: Dict) -> dict:
     """获取财务相关变更
 
+    利息和开销合计取自日切数据，明细记录用于列表展示。
+
     Args:
         date: 日期字符串
+        summary: 当日日切数据（get_daily_summary_data 的结果）
 
     Returns:
         dict: 财务变更数据
@@ -28,27 +33,15 @@ async def get_finance_changes(date: str) -> dict:
     # 获取当日开销
     expense_records = await db_operations.get_expense_records(date, date)
 
-    total_interest = sum(
-        float(record.get("amount", 0) or 0) for record in interest_records
-    )
     total_principal = sum(
         float(record.get("amount", 0) or 0) for record in principal_records
     )
-
-    company_expenses = sum(
-        float(record.get("amount", 0) or 0)
-        for record in expense_records
-        if record.get("type") == "company"
-    )
-    other_expenses = sum(
-        float(record.get("amount", 0) or 0)
-        for record in expense_records
-        if record.get("type") == "other"
-    )
+    company_expenses = summary["company_expenses"]
+    other_expenses = summary["other_expenses"]
 
     return {
         "interest_records": interest_records,
-        "total_interest": total_interest,
+        "total_interest": summary["daily_interest"],
         "principal_records": principal_records,
         "total_principal": total_principal,
         "expense_records": expense_records,
@@ -59,13 +59,17 @@ async def get_daily_changes(date: str) -> dict:
     """获取指定日期的数据变更"""
     from handlers.module5_data.daily_changes_finance import get_finance_changes
     from handlers.module5_data.daily_changes_orders import get_order_changes
+    from utils.daily_report_generator import get_daily_summary_data
 
     try:
+        # 汇总数字直接读取增量维护的日切数据
+        summary = await get_daily_summary_data(date)
+
         # 获取订单变更
-        order_changes = await get_order_changes(date)
+        order_changes = await get_order_changes(date, summary)
 
         # 获取财务变更
-        finance_changes = await get_finance_changes(date)
+        finance_changes = await get_finance_changes(date, summary)
 
         # 合并结果
         return {
@@ -85,7 +89,6 @@ async def get_daily_changes(date: str) -> dict:
             "completed_orders": [],
             "completed_orders_count": 0,
             "completed_orders_amount": 0.0,
-            "breach_orders": [],
             "breach_orders_count": 0,
             "breach_orders_amount": 0.0,
             "breach_end_orders": [],
@@ -3,91 +3,39 @@
 包含获取订单相关变更的逻辑。
 """
 
-from typing import Any, Dict, List
+from typing import Dict
 
 import db_operations
 
 
-def _calculate_new_orders_statistics(new_orders: List[Dict]) -> Dict[str, Any]:
-    """计算新增订单统计信息
-
-    Args:
-        new_orders: 新增订单列表
-
-    Returns:
-        统计信息字典
-    """
-    new_clients_count = 0
-    new_clients_amount = 0.0
-    old_clients_count = 0
-    old_clients_amount = 0.0
-
-    for order in new_orders:
-        customer = order.get("customer", "")
-        amount = float(order.get("amount", 0) or 0)
-        if customer == "A":
-            new_clients_count += 1
-            new_clients_amount += amount
-        elif customer == "B":
-            old_clients_count += 1
-            old_clients_amount += amount
-
-    return {
-        "new_clients_count": new_clients_count,
-        "new_clients_amount": new_clients_amount,
-        "old_clients_count": old_clients_count,
-        "old_clients_amount": old_clients_amount,
-    }
-
-
-def _calculate_orders_summary(orders: List[Dict]) -> Dict[str, Any]:
-    """计算订单汇总信息
-
-    Args:
-        orders: 订单列表
-
-    Returns:
-        汇总信息字典
-    """
-    count = len(orders)
-    amount = sum(float(order.get("amount", 0) or 0) for order in orders)
-    return {"count": count, "amount": amount}
-
-
-async def get_order_changes(date: str) -> dict:
+async def get_order_changes(date: str, summary: Dict) -> dict:
     """获取订单相关变更
 
+    数量和金额取自日切数据，只查询明细中需要列出的订单。
+
     Args:
         date: 日期字符串
+        summary: 当日日切数据（get_daily_summary_data 的结果）
 
     Returns:
         dict: 订单变更数据
     """
     new_orders = await db_operations.get_new_orders_by_date(date)
-    new_stats = _calculate_new_orders_statistics(new_orders)
-
     completed_orders = await db_operations.get_completed_orders_by_date(date)
-    completed_summary = _calculate_orders_summary(completed_orders)
-
-    breach_orders = await db_operations.get_breach_orders_by_date(date)
-    breach_summary = _calculate_orders_summary(breach_orders)
-
     breach_end_orders = await db_operations.get_breach_end_orders_by_date(date)
-    breach_end_summary = _calculate_orders_summary(breach_end_orders)
 
     return {
         "new_orders": new_orders,
-        "new_clients_count": new_stats["new_clients_count"],
-        "new_clients_amount": new_stats["new_clients_amount"],
-        "old_clients_count": new_stats["old_clients_count"],
-        "old_clients_amount": new_stats["old_clients_amount"],
+        "new_clients_count": summary["new_clients_count"],
+        "new_clients_amount": summary["new_clients_amount"],
+        "old_clients_count": summary["old_clients_count"],
+        "old_clients_amount": summary["old_clients_amount"],
         "completed_orders": completed_orders,
-        "completed_orders_count": completed_summary["count"],
-        "completed_orders_amount": completed_summary["amount"],
-        "breach_orders": breach_orders,
-        "breach_orders_count": breach_summary["count"],
-        "breach_orders_amount": breach_summary["amount"],
+        "completed_orders_count": summary["completed_orders_count"],
+        "completed_orders_amount": summary["completed_amount"],
+        "breach_orders_count": summary["breach_orders_count"],
+        "breach_orders_amount": summary["breach_amount"],
         "breach_end_orders": breach_end_orders,
-        "breach_end_orders_count": breach_end_summary["count"],
-        "breach_end_orders_amount": breach_end_summary["amount"],
+        "breach_end_orders_count": summary["breach_end_orders_count"],
+        "breach_end_orders_amount": summary["breach_end_amount"],
     }
@@ -93,11 +93,13 @@ async def show_daily_operations(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
     """查看指定日期的操作历史（仅管理员）"""
-    from handlers.module5_data.daily_ops_message import (
-        build_full_operations_message, build_summary_operations_message)
+    from handlers.module5_data.daily_ops_message import \
+        build_summary_operations_message
     from handlers.module5_data.daily_ops_parse import parse_date_args
-    from handlers.module5_data.daily_ops_send import (send_full_operations,
-                                                      send_summary_operations)
+    from handlers.module5_data.daily_ops_send import (
+        build_full_operations_keyboard, send_full_operations,
+        send_summary_operations)
+    from utils.report_stream import message_senders
 
     try:
         # 解析日期参数
@@ -112,19 +114,23 @@ async def show_daily_operations(
             )
             return
 
-        # 获取操作历史
-        operations = await db_operations.get_operations_by_date(date)
+        total = await db_operations.count_operations_by_date(date)
 
-        if not operations:
+        if not total:
             await update.message.reply_text(f"📋 操作记录 ({date})\n\n" "暂无操作记录")
             return
 
         # 如果请求显示全部，或者操作数少于50条，显示完整列表
-        if show_all or len(operations) <= 50:
-            message_parts = build_full_operations_message(operations, date)
-            await send_full_operations(update, message_parts, date)
+        if show_all or total <= 50:
+            senders = message_senders(
+                update.message, build_full_operations_keyboard(date)
+            )
+            await send_full_operations(senders, date, total)
         else:
-            message = build_summary_operations_message(operations, date)
+            operations = await db_operations.get_operations_page_by_date(
+                date, limit=50
+            )
+            message = build_summary_operations_message(operations, date, total)
             await send_summary_operations(update, message, date)
 
     except Exception as e:
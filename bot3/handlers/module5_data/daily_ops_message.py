@@ -3,63 +3,57 @@
 包含构建操作记录消息的逻辑。
 """
 
-from typing import List
+from typing import AsyncIterator, List
 
-from constants import TELEGRAM_MESSAGE_SAFE_LENGTH
+import db_operations
 from handlers.module5_data.daily_operations_handlers import \
     format_operation_detail
 
 
-def build_full_operations_message(operations: List[dict], date: str) -> List[str]:
-    """构建完整操作记录消息（分段）
+async def iter_full_operations_lines(date: str, total: int) -> AsyncIterator[str]:
+    """逐行生成完整操作记录（边读取数据库边生成，由 stream_report 分段发送）
 
     Args:
-        operations: 操作记录列表
         date: 日期字符串
+        total: 总操作数
 
-    Returns:
-        List[str]: 消息分段列表
+    Yields:
+        消息行
     """
-    max_length = TELEGRAM_MESSAGE_SAFE_LENGTH
-    current_message = f"📋 完整操作记录 ({date})\n"
-    current_message += "═══════════════════════════════════════\n"
-    current_message += f"总操作数: {len(operations)}\n\n"
-
-    message_parts = [current_message]
-    current_part = ""
-
-    for i, op in enumerate(operations, 1):
-        op_detail = f"{i}. {format_operation_detail(op)}\n"
-
-        if len(current_part + op_detail) > max_length:
-            message_parts.append(current_part)
-            current_part = op_detail
-        else:
-            current_part += op_detail
+    yield f"📋 完整操作记录 ({date})"
+    yield "═══════════════════════════════════════"
+    yield f"总操作数: {total}"
+    yield ""
 
-    if current_part:
-        message_parts.append(current_part)
+    index = 0
+    async for op in db_operations.iter_operations_by_date(date):
+        index += 1
+        yield f"{index}. {format_operation_detail(op)}"
 
-    return message_parts
 
-
-def build_summary_operations_message(operations: List[dict], date: str) -> str:
+def build_summary_operations_message(
+    operations: List[dict], date: str, total: int
+) -> str:
     """构建摘要操作记录消息（前50条）
 
     Args:
-        operations: 操作记录列表
+        operations: 前50条操作记录
         date: 日期字符串
+        total: 总操作数
 
     Returns:
         str: 消息文本
     """
-    message = f"📋 操作记录 ({date})\n"
-    message += "═══════════════════════════════════════\n"
-    message += f"总操作数: {len(operations)}\n"
-    message += f"显示前 50 条（共 {len(operations)} 条）\n\n"
-
-    for i, op in enumerate(operations[:50], 1):
-        message += f"{i}. {format_operation_detail(op)}\n"
-
-    message += f"\n... 还有 {len(operations) - 50} 条操作未显示"
-    return message
+    lines = [
+        f"📋 操作记录 ({date})",
+        "═══════════════════════════════════════",
+        f"总操作数: {total}",
+        f"显示前 50 条（共 {total} 条）",
+        "",
+    ]
+    lines.extend(
+        f"{i}. {format_operation_detail(op)}" for i, op in enumerate(operations, 1)
+    )
+    lines.append("")
+    lines.append(f"... 还有 {total - len(operations)} 条操作未显示")
+    return "\n".join(lines)
@@ -3,41 +3,46 @@
 包含发送操作记录消息的逻辑。
 """
 
-from typing import List
-
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
-from telegram.ext import ContextTypes
+
+from utils.report_stream import ReportSenders, stream_report
 
 
-async def send_full_operations(
-    update: Update, message_parts: List[str], date: str
-) -> None:
-    """发送完整操作记录（分段）
+def build_full_operations_keyboard(date: str) -> InlineKeyboardMarkup:
+    """完整操作记录第一段消息的按钮
 
     Args:
-        update: Telegram更新对象
-        message_parts: 消息分段列表
         date: 日期字符串
     """
-    for i, part in enumerate(message_parts, 1):
-        if i == 1:
-            # 第一段添加按钮
-            keyboard = [
-                [
-                    InlineKeyboardButton(
-                        "🔄 还原当天数据", callback_data=f"restore_daily_data_{date}"
-                    )
-                ],
-                [
-                    InlineKeyboardButton(
-                        "📊 查看汇总", callback_data=f"daily_ops_summary_{date}"
-                    )
-                ],
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await update.message.reply_text(part, reply_markup=reply_markup)
-        else:
-            await update.message.reply_text(part)
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                "🔄 还原当天数据", callback_data=f"restore_daily_data_{date}"
+            )
+        ],
+        [
+            InlineKeyboardButton(
+                "📊 查看汇总", callback_data=f"daily_ops_summary_{date}"
+            )
+        ],
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
+
+async def send_full_operations(senders: ReportSenders, date: str, total: int) -> None:
+    """发送完整操作记录（边读取边分段发送，超出段数时发送 Excel）
+
+    Args:
+        senders: 发送方式（第一段带 build_full_operations_keyboard 的按钮）
+        date: 日期字符串
+        total: 总操作数
+    """
+    from handlers.module5_data.daily_ops_message import \
+        iter_full_operations_lines
+
+    await stream_report(
+        iter_full_operations_lines(date, total), senders, name=f"操作记录_{date}"
+    )
 
 
 async def send_summary_operations(update: Update, message: str, date: str) -> None:
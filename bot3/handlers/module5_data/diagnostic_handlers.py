@@ -6,6 +6,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 import db_operations
+from db.snapshot import analytics_snapshot, format_freshness
 from decorators import admin_required, error_handler, private_chat_only
 from handlers.module5_data.diagnostic_helpers_consistency import \
     check_all_consistencies
@@ -30,16 +31,17 @@ async def check_mismatch(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # 发送开始消息
     msg = await update.message.reply_text("🔍 正在检查数据不一致问题，请稍候...")
 
-    # 获取所有收入明细统计
-    income_records = await db_operations.get_income_records(start_date, end_date)
+    async with analytics_snapshot() as snapshot:
+        # 获取所有收入明细统计
+        income_records = await db_operations.get_income_records(start_date, end_date)
+
+        # 获取统计数据
+        stats = await db_operations.get_stats_by_date_range(start_date, end_date, None)
+        financial_data = await db_operations.get_financial_data()
 
     # 计算收入明细汇总
     income_summary = calculate_income_summary(income_records)
 
-    # 获取统计数据
-    stats = await db_operations.get_stats_by_date_range(start_date, end_date, None)
-    financial_data = await db_operations.get_financial_data()
-
     # 生成报告头部
     output_lines = generate_report_header(
         start_date, end_date, income_summary, stats, financial_data
@@ -52,6 +54,9 @@ async def check_mismatch(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     # 生成报告尾部
     output_lines.extend(generate_report_footer(mismatches))
+    freshness = format_freshness(snapshot)
+    if freshness:
+        output_lines.append(freshness)
 
     # 发送报告
     output = "\n".join(output_lines)
@@ -160,14 +165,15 @@ async def diagnose_data_inconsistency(
     output_lines.append("=" * 60)
     output_lines.append("")
 
-    analysis_data = await _analyze_income_records_section(output_lines)
+    async with analytics_snapshot() as snapshot:
+        analysis_data = await _analyze_income_records_section(output_lines)
 
-    min_date, max_date = get_date_range(analysis_data["all_records"])
-    output_lines.extend(generate_date_range_section(min_date, max_date))
+        min_date, max_date = get_date_range(analysis_data["all_records"])
+        output_lines.extend(generate_date_range_section(min_date, max_date))
 
-    differences = await _analyze_statistics_comparison(
-        output_lines, analysis_data["valid_by_type"]
-    )
+        differences = await _analyze_statistics_comparison(
+            output_lines, analysis_data["valid_by_type"]
+        )
 
     reasons = analyze_possible_reasons(
         differences["interest_diff"],
@@ -178,6 +184,9 @@ async def diagnose_data_inconsistency(
     )
     output_lines.extend(generate_reasons_section(reasons))
     output_lines.extend(generate_fix_suggestions_section())
+    freshness = format_freshness(snapshot)
+    if freshness:
+        output_lines.append(freshness)
 
     report = "\n".join(output_lines)
     await msg.edit_text(report)
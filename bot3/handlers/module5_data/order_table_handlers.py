@@ -10,6 +10,7 @@ from telegram.ext import ContextTypes
 
 # 本地模块
 import db_operations
+from db.snapshot import analytics_snapshot, format_freshness
 from decorators import authorized_required, error_handler, private_chat_only
 from utils.date_helpers import get_daily_period_date
 
@@ -60,13 +61,16 @@ async def _fetch_order_table_data(
     )
 
 
-async def _send_order_table_excel(update: Update, file_path: str, date: str) -> None:
+async def _send_order_table_excel(
+    update: Update, file_path: str, date: str, freshness: str = ""
+) -> None:
     """发送订单总表Excel文件
 
     Args:
         update: Telegram更新对象
         file_path: Excel文件路径
         date: 日期字符串
+        freshness: 数据快照时间说明（见 db.snapshot.format_freshness）
     """
     keyboard = [
         [InlineKeyboardButton("🔙 返回报表", callback_data="report_view_today_ALL")]
@@ -81,6 +85,7 @@ async def _send_order_table_excel(update: Update, file_path: str, date: str) ->
                 f"• 有效订单总表\n• 当日完成订单\n• 当日违约订单\n"
                 f"• 当日违约完成订单\n• 日切数据汇总\n"
                 f"• 订单chat_id对应表（所有订单）"
+                + (f"\n\n{freshness}" if freshness else "")
             ),
             reply_markup=InlineKeyboardMarkup(keyboard),
         )
@@ -116,28 +121,32 @@ async def show_order_table(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             "⏳ 正在生成订单报表Excel文件，请稍候..."
         )
 
-        date = get_daily_period_date()
-        (
-            valid_orders,
-            daily_interest,
-            completed_orders,
-            breach_orders,
-            breach_end_orders,
-            daily_summary,
-        ) = await _fetch_order_table_data(date)
-
         from utils.excel_export import export_orders_to_excel
 
-        file_path = await export_orders_to_excel(
-            valid_orders,
-            completed_orders,
-            breach_orders,
-            breach_end_orders,
-            daily_interest,
-            daily_summary,
+        date = get_daily_period_date()
+        # 全表读取走分析快照，不占用主库的读锁
+        async with analytics_snapshot() as snapshot:
+            (
+                valid_orders,
+                daily_interest,
+                completed_orders,
+                breach_orders,
+                breach_end_orders,
+                daily_summary,
+            ) = await _fetch_order_table_data(date)
+
+            file_path = await export_orders_to_excel(
+                valid_orders,
+                completed_orders,
+                breach_orders,
+                breach_end_orders,
+                daily_interest,
+                daily_summary,
+            )
+
+        await _send_order_table_excel(
+            update, file_path, date, format_freshness(snapshot)
         )
-
-        await _send_order_table_excel(update, file_path, date)
         _cleanup_temp_files(file_path, processing_msg)
 
     except Exception as e:
@@ -0,0 +1,204 @@
+"""性能统计命令处理器"""
+
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from utils.performance_monitor import (get_chat_performance_stats,
+                                       get_performance_stats,
+                                       reset_performance_stats)
+from utils.sql_profiler import (disable_sql_profiler, enable_sql_profiler,
+                                format_sql_profile_report,
+                                get_sql_profile_report,
+                                is_sql_profiler_enabled, reset_sql_profile)
+from utils.trace_spans import clear_traces, format_trace, get_slow_traces
+
+logger = logging.getLogger(__name__)
+
+# 每类最多显示的条目数
+_TOP_N = 15
+# Telegram 单条消息长度上限
+_MESSAGE_LIMIT = 4000
+
+_USAGE = (
+    "用法: /perf_stats [类型]\n\n"
+    "类型:\n"
+    "  (空)     所有操作，按总耗时排序\n"
+    "  handler  命令/回调处理器\n"
+    "  db       数据库函数\n"
+    "  chats    按群组统计\n"
+    "  jobs     定时任务运行记录（最近7天）\n"
+    "  slow     最近的慢更新追踪\n"
+    "  reset    清空统计"
+)
+
+_SQL_USAGE = (
+    "用法: /sql_profile [操作]\n\n"
+    "操作:\n"
+    "  on / off          开启/关闭 SQL 统计\n"
+    "  (空) / report     按总耗时排序的语句指纹\n"
+    "  count / max / avg 按次数/最大耗时/平均耗时排序\n"
+    "  export            导出完整报告（JSON 文件）\n"
+    "  reset             清空统计"
+)
+
+_SQL_SORT_KEYS = {
+    "": "total_time",
+    "report": "total_time",
+    "count": "count",
+    "max": "max_time",
+    "avg": "avg_time",
+}
+
+
+def _format_ms(seconds: float) -> str:
+    """秒 → 毫秒文本"""
+    return f"{seconds * 1000:.1f}"
+
+
+def _build_operation_lines(
+    stats: Dict[str, Dict], prefix: Optional[str]
+) -> List[str]:
+    """构建操作统计行（按总耗时排序）"""
+    items = [
+        (op, data)
+        for op, data in stats.items()
+        if data["count"] > 0 and (prefix is None or op.startswith(prefix))
+    ]
+    items.sort(key=lambda x: -x[1]["total_time"])
+
+    lines = []
+    for op, data in items[:_TOP_N]:
+        lines.append(
+            f"{op}\n"
+            f"  次数 {data['count']} | 错误 {data['errors']} | "
+            f"总计 {data['total_time']:.1f}s\n"
+            f"  p50 {_format_ms(data['p50'])} | p95 {_format_ms(data['p95'])} | "
+            f"p99 {_format_ms(data['p99'])} | 最大 {_format_ms(data['max_time'])} ms"
+        )
+    return lines
+
+
+def _build_chat_lines(stats: Dict[int, Dict]) -> List[str]:
+    """构建群组统计行（按总耗时排序）"""
+    items = sorted(stats.items(), key=lambda x: -x[1]["total_time"])
+    lines = []
+    for chat_id, data in items[:_TOP_N]:
+        lines.append(
+            f"{chat_id}\n"
+            f"  更新 {data['count']} | 总计 {data['total_time']:.1f}s | "
+            f"p95 {_format_ms(data['p95'])} | p99 {_format_ms(data['p99'])} ms"
+        )
+    return lines
+
+
+def _build_job_lines(stats: List[Dict]) -> List[str]:
+    """构建定时任务统计行"""
+    lines = []
+    for data in stats[:_TOP_N]:
+        last = datetime.fromtimestamp(data["last_started_at"]).strftime("%m-%d %H:%M")
+        lines.append(
+            f"{data['job_name']}\n"
+            f"  运行 {data['runs']} | 失败 {data['errors']} | 错过 {data['missed']}\n"
+            f"  平均 {data['avg_duration'] or 0:.1f}s | "
+            f"最大 {data['max_duration'] or 0:.1f}s | 最近 {last}"
+        )
+    return lines
+
+
+def _join_limited(title: str, lines: List[str]) -> str:
+    """拼接消息，超出长度上限时截断"""
+    message = title
+    for line in lines:
+        if len(message) + len(line) + 2 > _MESSAGE_LIMIT:
+            message += "\n\n..."
+            break
+        message += "\n\n" + line
+    return message
+
+
+async def perf_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """查看处理器/数据库耗时分布和慢更新追踪（管理员命令）"""
+    mode = context.args[0].lower() if context.args else ""
+
+    if mode == "reset":
+        reset_performance_stats()
+        clear_traces()
+        await update.message.reply_text("✅ 性能统计已清空")
+        return
+
+    if mode == "slow":
+        traces = get_slow_traces()[:3]
+        if not traces:
+            await update.message.reply_text("暂无慢更新追踪")
+            return
+        lines = [format_trace(trace) for trace in traces]
+        await update.message.reply_text(_join_limited("🐢 最近的慢更新", lines))
+        return
+
+    if mode == "chats":
+        lines = _build_chat_lines(get_chat_performance_stats())
+        title = "📊 按群组统计的处理耗时"
+    elif mode == "jobs":
+        from db.module4_automation.job_runs import get_job_run_stats
+
+        lines = _build_job_lines(await get_job_run_stats(days=7))
+        title = "⏰ 定时任务运行统计（最近7天）"
+    elif mode in ("", "handler", "db"):
+        prefix = f"{mode}:" if mode else None
+        lines = _build_operation_lines(get_performance_stats(), prefix)
+        title = f"📊 操作耗时统计{f' ({mode})' if mode else ''}"
+    else:
+        await update.message.reply_text(_USAGE)
+        return
+
+    if not lines:
+        await update.message.reply_text("暂无统计数据")
+        return
+    await update.message.reply_text(_join_limited(title, lines))
+
+
+async def sql_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """开关 SQL 统计并查看/导出语句指纹报告（管理员命令）"""
+    action = context.args[0].lower() if context.args else ""
+
+    if action == "on":
+        enable_sql_profiler()
+        await update.message.reply_text("✅ SQL 统计已开启（之后新建的数据库连接生效）")
+        return
+
+    if action == "off":
+        disable_sql_profiler()
+        await update.message.reply_text("✅ SQL 统计已关闭，已有数据保留")
+        return
+
+    if action == "reset":
+        reset_sql_profile()
+        await update.message.reply_text("✅ SQL 统计已清空")
+        return
+
+    if action == "export":
+        report = get_sql_profile_report(limit=500)
+        payload = json.dumps(report, ensure_ascii=False, indent=2).encode("utf-8")
+        filename = f"sql_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        await update.message.reply_document(
+            document=io.BytesIO(payload),
+            filename=filename,
+            caption=f"SQL 统计报告（{report['fingerprint_count']} 个指纹）",
+        )
+        return
+
+    sort_by = _SQL_SORT_KEYS.get(action)
+    if sort_by is None:
+        await update.message.reply_text(_SQL_USAGE)
+        return
+
+    message = format_sql_profile_report(sort_by)
+    if not is_sql_profiler_enabled():
+        message = "ℹ️ SQL 统计未开启（/sql_profile on）\n\n" + message
+    await update.message.reply_text(message)
@@ -6,6 +6,7 @@
 from typing import Any, Dict
 
 import db_operations
+from utils.money import money_diff
 
 
 async def fix_daily_statistics(
@@ -30,10 +31,10 @@ async def fix_daily_statistics(
 
             # 修复利息收入
             if "interest" in income_data:
-                interest_diff = income_data["interest"] - current_daily.get(
-                    "interest", 0.0
+                interest_diff = money_diff(
+                    income_data["interest"], current_daily.get("interest", 0.0)
                 )
-                if abs(interest_diff) > 0.01:
+                if interest_diff:
                     await db_operations.update_daily_data(
                         date, "interest", interest_diff, group_id
                     )
@@ -66,10 +67,10 @@ async def _fix_daily_completed(
     fixed_count = 0
 
     if "completed_amount" in income_data:
-        completed_amount_diff = income_data["completed_amount"] - current_daily.get(
-            "completed_amount", 0.0
+        completed_amount_diff = money_diff(
+            income_data["completed_amount"], current_daily.get("completed_amount", 0.0)
         )
-        if abs(completed_amount_diff) > 0.01:
+        if completed_amount_diff:
             await db_operations.update_daily_data(
                 date, "completed_amount", completed_amount_diff, group_id
             )
@@ -102,10 +103,11 @@ async def _fix_daily_breach_end(
     fixed_count = 0
 
     if "breach_end_amount" in income_data:
-        breach_end_amount_diff = income_data["breach_end_amount"] - current_daily.get(
-            "breach_end_amount", 0.0
+        breach_end_amount_diff = money_diff(
+            income_data["breach_end_amount"],
+            current_daily.get("breach_end_amount", 0.0),
         )
-        if abs(breach_end_amount_diff) > 0.01:
+        if breach_end_amount_diff:
             await db_operations.update_daily_data(
                 date, "breach_end_amount", breach_end_amount_diff, group_id
             )
@@ -6,6 +6,7 @@
 from typing import Any, Dict, List
 
 import db_operations
+from utils.money import money_diff
 
 
 async def _fix_interest_statistics(
@@ -20,8 +21,10 @@ async def _fix_interest_statistics(
         financial_data: 当前财务数据
         fixed_items: 修复项列表
     """
-    interest_diff = income_summary["interest"] - financial_data.get("interest", 0.0)
-    if abs(interest_diff) > 0.01:
+    interest_diff = money_diff(
+        income_summary["interest"], financial_data.get("interest", 0.0)
+    )
+    if interest_diff:
         await db_operations.update_financial_data("interest", interest_diff)
         fixed_items.append(f"全局利息收入: {interest_diff:+,.2f}")
 
@@ -38,10 +41,10 @@ async def _fix_completed_statistics(
         financial_data: 当前财务数据
         fixed_items: 修复项列表
     """
-    completed_amount_diff = income_summary["completed_amount"] - financial_data.get(
-        "completed_amount", 0.0
+    completed_amount_diff = money_diff(
+        income_summary["completed_amount"], financial_data.get("completed_amount", 0.0)
     )
-    if abs(completed_amount_diff) > 0.01:
+    if completed_amount_diff:
         await db_operations.update_financial_data(
             "completed_amount", completed_amount_diff
         )
@@ -69,10 +72,11 @@ async def _fix_breach_end_statistics(
         financial_data: 当前财务数据
         fixed_items: 修复项列表
     """
-    breach_end_amount_diff = income_summary["breach_end_amount"] - financial_data.get(
-        "breach_end_amount", 0.0
+    breach_end_amount_diff = money_diff(
+        income_summary["breach_end_amount"],
+        financial_data.get("breach_end_amount", 0.0),
     )
-    if abs(breach_end_amount_diff) > 0.01:
+    if breach_end_amount_diff:
         await db_operations.update_financial_data(
             "breach_end_amount", breach_end_amount_diff
         )
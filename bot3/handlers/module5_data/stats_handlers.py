@@ -7,15 +7,13 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 import db_operations
+from db.snapshot import analytics_snapshot, format_freshness
 from decorators import admin_required, error_handler, private_chat_only
 from services.module5_data.stats_service import StatsService
 
 logger = logging.getLogger(__name__)
 
 
-@error_handler
-@admin_required
-@private_chat_only
 async def _fix_group_statistics(all_orders: List[Dict]) -> Tuple[int, List[str]]:
     """修复归属ID统计数据
 
@@ -62,16 +60,24 @@ def _build_fix_result_message(fixed_count: int, fixed_groups: List[str]) -> str:
     return _build_fix_result_message(fixed_count, fixed_groups)
 
 
+@error_handler
+@admin_required
+@private_chat_only
 async def fix_statistics(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """修复统计数据：根据实际订单数据重新计算所有统计数据（管理员命令）"""
     msg = await update.message.reply_text("🔄 开始修复统计数据...")
 
-    all_orders = await db_operations.search_orders_advanced_all_states({})
+    # 全量订单从刚生成的分析快照读取；读取当前统计和写回仍使用主库
+    async with analytics_snapshot(max_age=0) as snapshot:
+        all_orders = await db_operations.search_orders_advanced_all_states({})
 
     fixed_count, fixed_groups = await _fix_group_statistics(all_orders)
     fixed_count += await _fix_global_statistics(all_orders)
 
     result_msg = _build_fix_result_message(fixed_count, fixed_groups)
+    freshness = format_freshness(snapshot)
+    if freshness:
+        result_msg += f"\n\n{freshness}"
     await msg.edit_text(result_msg)
 
 
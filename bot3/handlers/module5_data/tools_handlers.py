@@ -7,6 +7,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 import db_operations
+from db.snapshot import analytics_snapshot, format_freshness
 from decorators import admin_required, error_handler, private_chat_only
 
 logger = logging.getLogger(__name__)
@@ -237,10 +238,14 @@ async def customer_contribution(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     msg = await update.message.reply_text("🔍 正在查询客户总贡献，请稍候...")
-    total_contribution, orders_summary = await _query_customer_data(
-        customer, start_date, end_date
-    )
+    async with analytics_snapshot() as snapshot:
+        total_contribution, orders_summary = await _query_customer_data(
+            customer, start_date, end_date
+        )
     report = _build_customer_report(
         customer, start_date, end_date, total_contribution, orders_summary
     )
+    freshness = format_freshness(snapshot)
+    if freshness:
+        report += f"\n{freshness}"
     await msg.edit_text(report)
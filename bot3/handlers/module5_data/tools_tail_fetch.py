@@ -6,19 +6,31 @@
 from typing import Any, Dict, List, Tuple
 
 import db_operations
+from db.active_orders import get_active_order_index
+from utils.money import sum_money
 
 
 async def fetch_orders_and_stats() -> Tuple[List[Dict[str, Any]], float, float]:
     """获取所有有效订单和统计数据
 
+    活跃订单索引已加载时从内存读取有效订单和合计（见 db.active_orders）。
+
     Returns:
         Tuple[List[Dict], float, float]: (订单列表, 实际有效金额, 统计有效金额)
     """
-    # 获取所有有效订单（包含所有状态，用于完整分析）
-    all_valid_orders = await db_operations.search_orders_advanced_all_states({})
-
-    # 计算实际有效金额（从订单表）
-    actual_valid_amount = sum(order.get("amount", 0) for order in all_valid_orders)
+    index = get_active_order_index()
+    if index is not None:
+        # 与 search_orders_advanced 的顺序一致
+        all_valid_orders = sorted(
+            index.valid_orders(), key=lambda order: order["date"], reverse=True
+        )
+        _, actual_valid_amount = index.valid_totals()
+    else:
+        # 获取所有有效订单（normal和overdue状态）
+        all_valid_orders = await db_operations.search_orders_advanced({})
+        actual_valid_amount = sum_money(
+            order.get("amount", 0) for order in all_valid_orders
+        )
 
     # 获取统计表中的有效金额
     financial_data = await db_operations.get_financial_data()
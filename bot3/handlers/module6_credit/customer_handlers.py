@@ -8,8 +8,8 @@ from telegram.ext import ContextTypes
 from decorators import (admin_required, authorized_required, error_handler,
                         private_chat_only)
 from services.module6_credit import (create_customer, get_customer,
-                                     list_customers, set_customer_type_func,
-                                     update_customer)
+                                     list_customers, search_customers,
+                                     set_customer_type_func, update_customer)
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +88,18 @@ async def view_customer_handler(
     phone = context.args[0]
     customer = await get_customer(phone)
 
+    if not customer:
+        # 电话不完整或输入的是姓名：列出模糊匹配的档案
+        matches = await search_customers(phone)
+        if matches["items"]:
+            lines = [f"🔍 未找到电话为 {phone} 的客户，相近的档案（共 {matches['total']} 个）:"]
+            lines.extend(
+                f"{index}. {item['name']} ({item['phone']})"
+                for index, item in enumerate(matches["items"], 1)
+            )
+            await update.message.reply_text("\n".join(lines))
+            return
+
     if await check_and_send_not_found(update, customer, "❌ 客户不存在"):
         return
 
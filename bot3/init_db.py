@@ -1,16 +1,7 @@
 import logging
 import os
-import sqlite3
-
-from db.init_tables_customer import create_customer_tables
-from db.init_tables_finance import create_finance_tables
-from db.init_tables_messages import create_message_tables
-from db.init_tables_orders import (create_classified_tables,
-                                   create_orders_tables)
-from db.init_tables_payment import create_payment_tables
-from db.init_tables_records import create_record_tables
-from db.init_tables_reports import create_report_tables
-from db.init_tables_users import create_user_tables
+
+from db.migrations import CURRENT_SCHEMA_VERSION, run_migrations
 
 logger = logging.getLogger(__name__)
 
@@ -23,38 +14,15 @@ DB_NAME = os.path.join(DATA_DIR, "loan_bot.db")
 
 
 def init_database():
-    """初始化数据库，创建所有必要的表"""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-
-    # 创建订单相关表
-    create_orders_tables(cursor)
-    create_classified_tables(cursor)
-
-    # 创建财务数据表
-    create_finance_tables(cursor, conn)
-
-    # 创建用户和权限表
-    create_user_tables(cursor)
-
-    # 创建支付相关表
-    create_payment_tables(cursor, conn)
-
-    # 创建消息和自动化表
-    create_message_tables(cursor)
-
-    # 创建财务记录表
-    create_record_tables(cursor)
-
-    # 创建报表相关表
-    create_report_tables(cursor, conn)
-
-    # 创建客户信用系统表
-    create_customer_tables(cursor)
-
-    conn.commit()
-    conn.close()
-    logger.info("数据库初始化完成")
+    """初始化数据库，只执行尚未应用的结构迁移
+
+    结构版本记录在 PRAGMA user_version 中，数据库已是最新时不执行任何建表语句。
+    """
+    applied = run_migrations(DB_NAME)
+    if applied:
+        logger.info(f"数据库初始化完成（应用 {applied} 个迁移）")
+    else:
+        logger.info(f"数据库结构已是最新 (v{CURRENT_SCHEMA_VERSION})")
 
 
 if __name__ == "__main__":
@@ -1,75 +1,21 @@
 """Telegram订单管理机器人主入口 - bot3 重组版本"""
 
 # 标准库导入
+import asyncio
 import logging
 import os
 import sys
 from pathlib import Path
 
 # 第三方库导入
+from telegram import Update
 from telegram import error as telegram_error
-from telegram.ext import (Application, CallbackQueryHandler, CommandHandler,
-                          MessageHandler, filters)
+from telegram.ext import Application
 
 # 本地模块导入
+# 处理器模块通过 utils.lazy_handlers 按导入路径注册，首次使用时才加载
 import init_db
 from config import ADMIN_IDS, BOT_TOKEN
-# 基础命令
-from handlers.command_handlers_basic import (check_permission,
-                                             show_valid_amount, start)
-from handlers.module1_user.attribution_handlers import (
-    change_orders_attribution, create_attribution, list_attributions)
-# 模块1：用户权限管理
-from handlers.module1_user.employee_handlers import (add_employee,
-                                                     list_employees,
-                                                     remove_employee)
-from handlers.module1_user.user_mapping_handlers import (
-    list_user_group_mappings, remove_user_group_id_handler,
-    set_user_group_id_handler)
-# 模块2：财务管理
-from handlers.module2_finance.adjustment_handlers import adjust_funds
-from handlers.module2_finance.income_handlers import *  # noqa: F401, F403
-from handlers.module2_finance.payment_handlers import (balance_history,
-                                                       show_all_accounts,
-                                                       show_gcash,
-                                                       show_paymaya)
-# 模块3：订单管理
-from handlers.module3_order.amount_handlers import handle_amount_operation
-from handlers.module3_order.basic_handlers import (create_order,
-                                                   show_current_order)
-from handlers.module3_order.state_handlers import (set_breach, set_breach_end,
-                                                   set_end, set_normal,
-                                                   set_overdue)
-# 模块4：自动化任务
-from handlers.module4_automation.broadcast_handlers import broadcast_payment
-from handlers.module4_automation.chat_event_handlers import (
-    handle_new_chat_members, handle_new_chat_title)
-from handlers.module4_automation.group_message_handlers import (
-    get_group_id, list_group_message_configs, send_start_work_messages_command,
-    setup_group_auto, test_group_message, test_weekday_message)
-from handlers.module4_automation.schedule_handlers import show_schedule_menu
-from handlers.module4_automation.search_handlers import search_orders
-from handlers.module4_automation.text_input_handlers import handle_text_input
-# 模块5：数据管理
-from handlers.module5_data.admin_correction_handlers import admin_correct
-from handlers.module5_data.daily_changes_handlers import \
-    show_daily_changes_table
-from handlers.module5_data.daily_operations_handlers import (
-    show_daily_operations, show_daily_operations_summary)
-from handlers.module5_data.diagnostic_handlers import (
-    check_mismatch, diagnose_data_inconsistency)
-from handlers.module5_data.import_handlers import (import_orders_command,
-                                                   import_orders_from_excel)
-from handlers.module5_data.order_table_handlers import show_order_table
-from handlers.module5_data.report_handlers import show_my_report, show_report
-from handlers.module5_data.restore_handlers import restore_daily_data
-from handlers.module5_data.stats_handlers import (fix_income_statistics,
-                                                  fix_statistics)
-from handlers.module5_data.tools_handlers import (customer_contribution,
-                                                  find_tail_orders)
-from handlers.module5_data.undo_handlers import undo_last_operation
-from handlers.module5_data.weekday_handlers import (check_weekday_groups,
-                                                    update_weekday_groups)
 from main_handlers_automation import register_automation_handlers
 from main_handlers_basic import register_basic_handlers
 from main_handlers_callbacks import register_callback_handlers
@@ -77,6 +23,11 @@ from main_handlers_data import register_data_handlers
 from main_handlers_finance import register_finance_handlers
 from main_handlers_order import register_order_handlers
 from main_handlers_user import register_user_handlers
+from utils.conversation_persistence import (
+    ConversationStatePersistence, is_conversation_persistence_enabled)
+from utils.lazy_handlers import preload_handlers_in_background
+from utils.log_pipeline import setup_logging, shutdown_logging
+from utils.metrics_server import start_metrics_server, stop_metrics_server
 
 # 确保项目根目录在 Python 路径中
 project_root = Path(__file__).parent.absolute()
@@ -85,11 +36,8 @@ project_root_str = str(project_root)
 if project_root_str not in sys.path:
     sys.path.insert(0, project_root_str)
 
-# 配置日志
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO if os.getenv("DEBUG", "0") != "1" else logging.DEBUG,
-)
+# 配置日志（队列 + 后台线程写出，见 utils.log_pipeline）
+setup_logging(logging.INFO if os.getenv("DEBUG", "0") != "1" else logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # 降低日志级别
@@ -99,6 +47,86 @@ logging.getLogger("telegram").setLevel(logging.WARNING)
 logging.getLogger("telegram.ext").setLevel(logging.WARNING)
 
 
+# 后台任务引用（防止被垃圾回收）
+_background_tasks = set()
+
+
+async def _post_init(application: Application) -> None:
+    """应用初始化完成后，加载活跃订单索引并启动其定期核对，启动本地指标接口和
+    定时任务（可选），并在后台预热常用处理器（重量级模块仍在首次使用时加载）"""
+    try:
+        from db.active_orders import (load_active_orders,
+                                      start_active_order_verify)
+
+        await load_active_orders()
+        start_active_order_verify()
+    except Exception as e:
+        # 未加载时订单查询读取数据库
+        logger.error(f"加载活跃订单索引失败: {e}", exc_info=True)
+
+    try:
+        await start_metrics_server()
+    except Exception as e:
+        logger.error(f"启动性能指标接口失败: {e}", exc_info=True)
+
+    # 定时任务默认不启动（SCHEDULER_ENABLED=1 时启动，首次启动会补跑
+    # misfire_grace_time 内错过的任务）
+    if os.getenv("SCHEDULER_ENABLED", "0") == "1":
+        try:
+            from utils.schedule_executor import setup_all_schedules
+
+            await setup_all_schedules(application.bot)
+            logger.info("定时任务已初始化")
+        except Exception as e:
+            logger.error(f"初始化定时任务失败: {e}", exc_info=True)
+
+    if os.getenv("HANDLER_PRELOAD", "1") != "1":
+        return
+
+    task = asyncio.get_running_loop().create_task(preload_handlers_in_background())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _post_shutdown(application: Application) -> None:
+    """应用关闭时停止本地指标接口、活跃订单索引核对和定时任务调度器，写完待写入的
+    审计日志和排队的数据库写操作，结束 Excel 渲染进程，并写完队列中的日志"""
+    await stop_metrics_server()
+
+    from db.active_orders import stop_active_order_verify
+
+    await stop_active_order_verify()
+
+    from utils.schedule_jobs import shutdown_scheduler
+
+    shutdown_scheduler()
+
+    from utils.audit_log import close_audit_log
+
+    close_audit_log()
+
+    from db.writer import close_db_writer
+
+    close_db_writer()
+
+    from utils.excel_render_pool import close_render_pool
+
+    close_render_pool()
+
+    shutdown_logging()
+
+
+def register_all_handlers(application: Application) -> None:
+    """注册所有处理器（顺序决定同一分组内的匹配优先级）"""
+    register_basic_handlers(application)
+    register_order_handlers(application)
+    register_user_handlers(application)
+    register_finance_handlers(application)
+    register_automation_handlers(application)
+    register_data_handlers(application)
+    register_callback_handlers(application)
+
+
 def main() -> None:
     """启动机器人"""
     # 验证配置
@@ -133,20 +161,24 @@ def main() -> None:
             pool_timeout=30,
         )
 
-        application = Application.builder().token(BOT_TOKEN).request(request).build()
+        builder = (
+            Application.builder()
+            .token(BOT_TOKEN)
+            .request(request)
+            .post_init(_post_init)
+            .post_shutdown(_post_shutdown)
+        )
+        # 保存进行中的多步操作状态，重启后恢复
+        if is_conversation_persistence_enabled():
+            builder = builder.persistence(ConversationStatePersistence())
+        application = builder.build()
         logger.info("应用创建成功")
     except Exception as e:
         logger.error(f"创建应用时出错: {e}", exc_info=True)
         return
 
     # 注册所有处理器
-    register_basic_handlers(application)
-    register_order_handlers(application)
-    register_user_handlers(application)
-    register_finance_handlers(application)
-    register_automation_handlers(application)
-    register_data_handlers(application)
-    register_callback_handlers(application)
+    register_all_handlers(application)
 
     # 启动机器人
     logger.info("机器人启动成功，等待消息...")
@@ -3,19 +3,41 @@
 包含自动化任务相关命令处理器的注册逻辑。
 """
 
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from telegram.ext import (Application, ChatMemberHandler, CommandHandler,
+                          MessageHandler, filters)
 
 from decorators import admin_required, error_handler, private_chat_only
-from handlers.module4_automation.chat_event_handlers import (
-    handle_new_chat_members, handle_new_chat_title)
-from handlers.module4_automation.group_message_handlers import (
-    get_group_id, list_group_message_configs, send_start_work_messages_command,
-    setup_group_auto, test_group_message, test_weekday_message)
-from handlers.module4_automation.text_input_handlers import handle_text_input
+from utils.lazy_handlers import lazy_handler
 
 
 def register_automation_handlers(application: Application) -> None:
     """注册自动化任务相关命令处理器"""
+    group_message_handlers = "handlers.module4_automation.group_message_handlers"
+    get_group_id = lazy_handler(f"{group_message_handlers}:get_group_id")
+    setup_group_auto = lazy_handler(f"{group_message_handlers}:setup_group_auto")
+    test_group_message = lazy_handler(f"{group_message_handlers}:test_group_message")
+    test_weekday_message = lazy_handler(
+        f"{group_message_handlers}:test_weekday_message"
+    )
+    list_group_message_configs = lazy_handler(
+        f"{group_message_handlers}:list_group_message_configs"
+    )
+    send_start_work_messages_command = lazy_handler(
+        f"{group_message_handlers}:send_start_work_messages_command"
+    )
+    handle_text_input = lazy_handler(
+        "handlers.module4_automation.text_input_handlers:handle_text_input"
+    )
+    handle_new_chat_members = lazy_handler(
+        "handlers.module4_automation.chat_event_handlers:handle_new_chat_members"
+    )
+    handle_new_chat_title = lazy_handler(
+        "handlers.module4_automation.chat_event_handlers:handle_new_chat_title"
+    )
+    handle_chat_member_update = lazy_handler(
+        "handlers.module4_automation.chat_event_handlers:handle_chat_member_update"
+    )
+
     # 群组消息管理
     application.add_handler(CommandHandler("groupmsg_getid", get_group_id))
     application.add_handler(CommandHandler("groupmsg_setup", setup_group_auto))
@@ -50,3 +72,6 @@ def register_automation_handlers(application: Application) -> None:
     application.add_handler(
         MessageHandler(filters.StatusUpdate.NEW_CHAT_TITLE, handle_new_chat_title)
     )
+    application.add_handler(
+        ChatMemberHandler(handle_chat_member_update, ChatMemberHandler.ANY_CHAT_MEMBER)
+    )
@@ -6,19 +6,36 @@
 from telegram.ext import Application, CommandHandler
 
 from decorators import authorized_required, error_handler, private_chat_only
-from handlers.module2_finance.payment_handlers import (show_all_accounts,
-                                                       show_gcash,
-                                                       show_paymaya)
-from handlers.module4_automation.schedule_handlers import show_schedule_menu
-from handlers.module4_automation.search_handlers import search_orders
-from handlers.module5_data.order_table_handlers import show_order_table
-from handlers.module5_data.report_handlers import show_my_report, show_report
-from handlers.command_handlers_basic import show_valid_amount
-from handlers.command_handlers_basic import start
+from utils.lazy_handlers import lazy_handler
 
 
 def register_basic_handlers(application: Application) -> None:
     """注册基础命令处理器"""
+    start = lazy_handler("handlers.command_handlers_basic:start")
+    show_report = lazy_handler("handlers.module5_data.report_handlers:show_report")
+    show_my_report = lazy_handler(
+        "handlers.module5_data.report_handlers:show_my_report"
+    )
+    show_valid_amount = lazy_handler(
+        "handlers.command_handlers_basic:show_valid_amount"
+    )
+    search_orders = lazy_handler(
+        "handlers.module4_automation.search_handlers:search_orders"
+    )
+    show_all_accounts = lazy_handler(
+        "handlers.module2_finance.payment_handlers:show_all_accounts"
+    )
+    show_gcash = lazy_handler("handlers.module2_finance.payment_handlers:show_gcash")
+    show_paymaya = lazy_handler(
+        "handlers.module2_finance.payment_handlers:show_paymaya"
+    )
+    show_schedule_menu = lazy_handler(
+        "handlers.module4_automation.schedule_handlers:show_schedule_menu"
+    )
+    show_order_table = lazy_handler(
+        "handlers.module5_data.order_table_handlers:show_order_table"
+    )
+
     # 基础命令
     application.add_handler(
         CommandHandler(
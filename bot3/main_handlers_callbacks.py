@@ -5,14 +5,32 @@
 
 from telegram.ext import Application, CallbackQueryHandler
 
-from callbacks import (button_callback, handle_order_action_callback,
-                       handle_schedule_callback)
-from callbacks.group_message_callbacks import handle_group_message_callback
+from utils.lazy_handlers import lazy_handler
 
 
 def register_callback_handlers(application: Application) -> None:
     """注册回调处理器"""
-    application.add_handler(CallbackQueryHandler(handle_order_action_callback))
-    application.add_handler(CallbackQueryHandler(handle_schedule_callback))
-    application.add_handler(CallbackQueryHandler(handle_group_message_callback))
-    application.add_handler(CallbackQueryHandler(button_callback))
+    application.add_handler(
+        CallbackQueryHandler(
+            lazy_handler("callbacks.order_callbacks:handle_order_action_callback"),
+            pattern="^(order_action_|order_change_to_)",
+        )
+    )
+    application.add_handler(
+        CallbackQueryHandler(
+            lazy_handler("callbacks.schedule_callbacks:handle_schedule_callback"),
+            pattern="^schedule_",
+        )
+    )
+    application.add_handler(
+        CallbackQueryHandler(
+            lazy_handler(
+                "callbacks.group_message_callbacks:handle_group_message_callback"
+            ),
+            pattern="^(groupmsg_|announcement_|antifraud_|promotion_|batch_set_|test_)",
+        )
+    )
+    # 其他回调（报表、搜索、支付等）
+    application.add_handler(
+        CallbackQueryHandler(lazy_handler("callbacks.main_callback:button_callback"))
+    )
@@ -6,23 +6,50 @@
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
 from decorators import admin_required, error_handler, private_chat_only
-from handlers.module5_data.admin_correction_handlers import admin_correct
-from handlers.module5_data.daily_changes_handlers import \
-    show_daily_changes_table
-from handlers.module5_data.daily_operations_handlers import (
-    show_daily_operations, show_daily_operations_summary)
-from handlers.module5_data.diagnostic_handlers import (
-    check_mismatch, diagnose_data_inconsistency)
-from handlers.module5_data.import_handlers import (import_orders_command,
-                                                   import_orders_from_excel)
-from handlers.module5_data.restore_handlers import restore_daily_data
-from handlers.module5_data.weekday_handlers import (check_weekday_groups,
-                                                    update_weekday_groups)
-from handlers.module5_data.undo_handlers import undo_last_operation
+from utils.lazy_handlers import lazy_handler
 
 
 def register_data_handlers(application: Application) -> None:
     """注册数据管理相关命令处理器"""
+    # Excel 导入、诊断等重量级模块在首次使用时才加载
+    import_handlers = "handlers.module5_data.import_handlers"
+    import_orders_command = lazy_handler(f"{import_handlers}:import_orders_command")
+    import_orders_from_excel = lazy_handler(
+        f"{import_handlers}:import_orders_from_excel"
+    )
+    show_daily_changes_table = lazy_handler(
+        "handlers.module5_data.daily_changes_handlers:show_daily_changes_table"
+    )
+    show_daily_operations = lazy_handler(
+        "handlers.module5_data.daily_operations_handlers:show_daily_operations"
+    )
+    show_daily_operations_summary = lazy_handler(
+        "handlers.module5_data.daily_operations_handlers:show_daily_operations_summary"
+    )
+    restore_daily_data = lazy_handler(
+        "handlers.module5_data.restore_handlers:restore_daily_data"
+    )
+    undo_last_operation = lazy_handler(
+        "handlers.module5_data.undo_handlers:undo_last_operation"
+    )
+    check_weekday_groups = lazy_handler(
+        "handlers.module5_data.weekday_handlers:check_weekday_groups"
+    )
+    update_weekday_groups = lazy_handler(
+        "handlers.module5_data.weekday_handlers:update_weekday_groups"
+    )
+    check_mismatch = lazy_handler(
+        "handlers.module5_data.diagnostic_handlers:check_mismatch"
+    )
+    diagnose_data_inconsistency = lazy_handler(
+        "handlers.module5_data.diagnostic_handlers:diagnose_data_inconsistency"
+    )
+    admin_correct = lazy_handler(
+        "handlers.module5_data.admin_correction_handlers:admin_correct"
+    )
+    perf_stats = lazy_handler("handlers.module5_data.perf_handlers:perf_stats")
+    sql_profile = lazy_handler("handlers.module5_data.perf_handlers:sql_profile")
+
     # 订单导入
     application.add_handler(CommandHandler("import_orders", import_orders_command))
     application.add_handler(
@@ -87,3 +114,17 @@ def register_data_handlers(application: Application) -> None:
             private_chat_only(admin_required(error_handler(admin_correct))),
         )
     )
+
+    # 性能统计命令
+    application.add_handler(
+        CommandHandler(
+            "perf_stats",
+            private_chat_only(admin_required(error_handler(perf_stats))),
+        )
+    )
+    application.add_handler(
+        CommandHandler(
+            "sql_profile",
+            private_chat_only(admin_required(error_handler(sql_profile))),
+        )
+    )
@@ -6,12 +6,18 @@
 from telegram.ext import Application, CommandHandler
 
 from decorators import admin_required, error_handler, private_chat_only
-from handlers.module2_finance.adjustment_handlers import adjust_funds
-from handlers.module2_finance.payment_handlers import balance_history
+from utils.lazy_handlers import lazy_handler
 
 
 def register_finance_handlers(application: Application) -> None:
     """注册财务管理相关命令处理器"""
+    adjust_funds = lazy_handler(
+        "handlers.module2_finance.adjustment_handlers:adjust_funds"
+    )
+    balance_history = lazy_handler(
+        "handlers.module2_finance.payment_handlers:balance_history"
+    )
+
     # 资金管理
     application.add_handler(
         CommandHandler(
@@ -6,17 +6,29 @@
 from telegram.ext import Application, CommandHandler
 
 from decorators import authorized_required, error_handler, group_chat_only
-from handlers.module3_order.amount_handlers import handle_amount_operation
-from handlers.module3_order.basic_handlers import (create_order,
-                                                   show_current_order)
-from handlers.module3_order.state_handlers import (set_breach, set_breach_end,
-                                                   set_end, set_normal,
-                                                   set_overdue)
-from handlers.module4_automation.broadcast_handlers import broadcast_payment
+from utils.lazy_handlers import lazy_handler
 
 
 def register_order_handlers(application: Application) -> None:
     """注册订单相关命令处理器"""
+    create_order = lazy_handler("handlers.module3_order.basic_handlers:create_order")
+    show_current_order = lazy_handler(
+        "handlers.module3_order.basic_handlers:show_current_order"
+    )
+    set_normal = lazy_handler("handlers.module3_order.state_handlers:set_normal")
+    set_overdue = lazy_handler("handlers.module3_order.state_handlers:set_overdue")
+    set_end = lazy_handler("handlers.module3_order.state_handlers:set_end")
+    set_breach = lazy_handler("handlers.module3_order.state_handlers:set_breach")
+    set_breach_end = lazy_handler(
+        "handlers.module3_order.state_handlers:set_breach_end"
+    )
+    broadcast_payment = lazy_handler(
+        "handlers.module4_automation.broadcast_handlers:broadcast_payment"
+    )
+    handle_amount_operation = lazy_handler(
+        "handlers.module3_order.amount_handlers:handle_amount_operation"
+    )
+
     # 订单操作命令
     application.add_handler(
         CommandHandler(
@@ -6,18 +6,36 @@
 from telegram.ext import Application, CommandHandler
 
 from decorators import admin_required, private_chat_only
-from handlers.module1_user.attribution_handlers import (
-    change_orders_attribution, create_attribution, list_attributions)
-from handlers.module1_user.employee_handlers import (add_employee,
-                                                     list_employees,
-                                                     remove_employee)
-from handlers.module1_user.user_mapping_handlers import (
-    list_user_group_mappings, remove_user_group_id_handler,
-    set_user_group_id_handler)
+from utils.lazy_handlers import lazy_handler
 
 
 def register_user_handlers(application: Application) -> None:
     """注册用户管理相关命令处理器"""
+    add_employee = lazy_handler(
+        "handlers.module1_user.employee_handlers:add_employee"
+    )
+    remove_employee = lazy_handler(
+        "handlers.module1_user.employee_handlers:remove_employee"
+    )
+    list_employees = lazy_handler(
+        "handlers.module1_user.employee_handlers:list_employees"
+    )
+    create_attribution = lazy_handler(
+        "handlers.module1_user.attribution_handlers:create_attribution"
+    )
+    list_attributions = lazy_handler(
+        "handlers.module1_user.attribution_handlers:list_attributions"
+    )
+    set_user_group_id_handler = lazy_handler(
+        "handlers.module1_user.user_mapping_handlers:set_user_group_id_handler"
+    )
+    remove_user_group_id_handler = lazy_handler(
+        "handlers.module1_user.user_mapping_handlers:remove_user_group_id_handler"
+    )
+    list_user_group_mappings = lazy_handler(
+        "handlers.module1_user.user_mapping_handlers:list_user_group_mappings"
+    )
+
     # 员工管理
     application.add_handler(
         CommandHandler("add_employee", private_chat_only(admin_required(add_employee)))
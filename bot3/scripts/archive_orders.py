@@ -0,0 +1,98 @@
+"""冷热数据归档脚本
+
+把完成较早的订单移到归档库，或从归档库移回主库（见 db.archive）。
+
+用法：
+    python scripts/archive_orders.py status                      # 各表行数
+    python scripts/archive_orders.py archive --days 180          # 归档完成超过180天的订单
+    python scripts/archive_orders.py archive --before 2025-01-01
+    python scripts/archive_orders.py restore --order-id A001 A002
+    python scripts/archive_orders.py restore --all --history     # 全部移回主库
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def _date_arg(value: str) -> str:
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式应为 YYYY-MM-DD: {value}")
+
+
+def _print_stats() -> None:
+    from db.archive import get_archive_path, get_archive_stats
+
+    print(f"归档库: {get_archive_path()}")
+    for table, counts in get_archive_stats().items():
+        print(f"  {table}: 主库 {counts['hot']}，归档库 {counts['archived']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="冷热数据归档")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="显示主库和归档库的行数")
+
+    archive_parser = subparsers.add_parser("archive", help="归档已完成的订单")
+    cutoff = archive_parser.add_mutually_exclusive_group(required=True)
+    cutoff.add_argument("--days", type=int, help="归档完成超过多少天的订单")
+    cutoff.add_argument("--before", type=_date_arg, help="归档此日期之前完成的订单")
+    archive_parser.add_argument(
+        "--no-history", action="store_true", help="不归档操作历史"
+    )
+
+    restore_parser = subparsers.add_parser("restore", help="把归档数据移回主库")
+    target = restore_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--order-id", nargs="+", help="要恢复的订单ID")
+    target.add_argument("--all", action="store_true", help="恢复全部订单")
+    restore_parser.add_argument(
+        "--history", action="store_true", help="同时恢复全部操作历史"
+    )
+
+    for sub in (archive_parser, restore_parser):
+        sub.add_argument("--batch-size", type=int, help="每个事务移动的订单数")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    import init_db
+    from db.archive import (BATCH_SIZE, archive_cutoff,
+                            archive_finished_orders, restore_from_archive)
+
+    # 确保表结构为最新版本（归档表按主库结构创建）
+    init_db.init_database()
+
+    if args.command == "archive":
+        before = args.before or archive_cutoff(args.days)
+        totals = archive_finished_orders(
+            before,
+            batch_size=args.batch_size or BATCH_SIZE,
+            include_history=not args.no_history,
+        )
+        print(f"已归档 {before} 之前完成的订单: {totals}")
+    elif args.command == "restore":
+        totals = restore_from_archive(
+            order_ids=None if args.all else args.order_id,
+            include_history=args.history,
+            batch_size=args.batch_size or BATCH_SIZE,
+        )
+        print(f"已恢复: {totals}")
+
+    _print_stats()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""日切数据历史回填脚本
+
+按明细重算 daily_summary（每类明细一条 GROUP BY 查询），在一个事务中写入，
+并输出与已有行的差异报告。替代逐日调用 calculate_daily_summary 的初始化方式。
+
+用法：
+    python scripts/backfill_daily_summary.py                    # 重算全部历史
+    python scripts/backfill_daily_summary.py --dry-run          # 只输出差异报告
+    python scripts/backfill_daily_summary.py --start 2025-01-01 --end 2025-12-31
+    python scripts/backfill_daily_summary.py --workers 4 --json report.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def _date_arg(value: str) -> str:
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式应为 YYYY-MM-DD: {value}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="按明细重算并回填日切数据")
+    parser.add_argument("--start", type=_date_arg, help="开始日期（含）")
+    parser.add_argument("--end", type=_date_arg, help="结束日期（含）")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="并行汇总的连接数（默认 1）"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="只对比，不写入")
+    parser.add_argument("--json", metavar="PATH", help="把报告写入 JSON 文件")
+    parser.add_argument(
+        "--max-diffs", type=int, default=50, help="报告中最多列出的字段差异数"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    import init_db
+    from db.module2_finance.daily_summary_backfill import backfill_daily_summary
+
+    # 确保表结构为最新版本（新库直接回填时）
+    init_db.init_database()
+
+    report = backfill_daily_summary(
+        start_date=args.start,
+        end_date=args.end,
+        workers=args.workers,
+        dry_run=args.dry_run,
+    )
+    print(report.format(max_diffs=args.max_diffs))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"报告已写入: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
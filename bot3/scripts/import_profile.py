@@ -0,0 +1,199 @@
+"""启动导入耗时分析脚本
+
+使用 ``python -X importtime`` 在子进程中导入入口模块，汇总各模块的导入耗时，
+用于确认处理器延迟加载后启动阶段实际加载了哪些模块。
+
+用法：
+    python scripts/import_profile.py              # 分析 main（默认）
+    python scripts/import_profile.py main --top 40
+    python scripts/import_profile.py main --preload   # 同时预热所有处理器
+    python scripts/import_profile.py main --json      # 输出JSON
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# 颜色输出
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+BLUE = "\033[94m"
+RESET = "\033[0m"
+
+# 项目内的顶级包/模块（用于区分第三方库）
+PROJECT_PACKAGES = (
+    "callbacks",
+    "config",
+    "constants",
+    "db",
+    "db_operations",
+    "decorators",
+    "handlers",
+    "init_db",
+    "main",
+    "services",
+    "utils",
+)
+
+
+def _build_probe_code(module: str, preload: bool) -> str:
+    """构建子进程中执行的导入代码"""
+    code = f"import {module}"
+    if preload:
+        code += (
+            "; import main_handlers_basic, main_handlers_order, main_handlers_user,"
+            " main_handlers_finance, main_handlers_automation, main_handlers_data,"
+            " main_handlers_callbacks"
+            "; from telegram.ext import Application"
+            "; app = Application.builder().token('0:profile').build()"
+            "; [getattr(m, n)(app) for m, n in ["
+            "(main_handlers_basic, 'register_basic_handlers'),"
+            "(main_handlers_order, 'register_order_handlers'),"
+            "(main_handlers_user, 'register_user_handlers'),"
+            "(main_handlers_finance, 'register_finance_handlers'),"
+            "(main_handlers_automation, 'register_automation_handlers'),"
+            "(main_handlers_data, 'register_data_handlers'),"
+            "(main_handlers_callbacks, 'register_callback_handlers')]]"
+            "; from utils.lazy_handlers import preload_handlers"
+            "; preload_handlers(include_heavy=True)"
+        )
+    return code
+
+
+def run_importtime(module: str, preload: bool = False) -> List[Dict]:
+    """在子进程中执行 -X importtime 并解析输出
+
+    Returns:
+        [{module, self_us, cumulative_us, depth}]
+    """
+    env = dict(os.environ)
+    env.setdefault("BOT_TOKEN", "0:profile")
+    env.setdefault("ADMIN_USER_IDS", "1")
+    env.setdefault("DATA_DIR", str(project_root / ".profile_data"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _build_probe_code(module, preload)],
+        capture_output=True,
+        text=True,
+        cwd=project_root,
+        env=env,
+        timeout=300,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.splitlines()[-10:])
+        raise RuntimeError(f"导入 {module} 失败:\n{tail}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        raw_name = parts[2]
+        depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+        entries.append(
+            {
+                "module": raw_name.strip(),
+                "self_us": int(parts[0].strip()),
+                "cumulative_us": int(parts[1].strip()),
+                "depth": depth,
+            }
+        )
+    return entries
+
+
+def _is_project_module(module: str) -> bool:
+    """判断是否为项目内模块"""
+    root = module.split(".")[0]
+    return root in PROJECT_PACKAGES or root.startswith("main_handlers_")
+
+
+def summarize(entries: List[Dict], top: int) -> Dict:
+    """汇总导入耗时"""
+    total_us = sum(e["self_us"] for e in entries)
+    project_modules = [e for e in entries if _is_project_module(e["module"])]
+    project_us = sum(e["self_us"] for e in project_modules)
+    third_party: Dict[str, int] = {}
+    for e in entries:
+        if _is_project_module(e["module"]):
+            continue
+        root = e["module"].split(".")[0]
+        third_party[root] = third_party.get(root, 0) + e["self_us"]
+
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "project_ms": round(project_us / 1000, 1),
+        "module_count": len(entries),
+        "project_module_count": len(project_modules),
+        "slowest_cumulative": [
+            {"module": e["module"], "cumulative_ms": round(e["cumulative_us"] / 1000, 1)}
+            for e in sorted(entries, key=lambda x: -x["cumulative_us"])[:top]
+        ],
+        "slowest_project_self": [
+            {"module": e["module"], "self_ms": round(e["self_us"] / 1000, 1)}
+            for e in sorted(project_modules, key=lambda x: -x["self_us"])[:top]
+        ],
+        "third_party_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(third_party.items(), key=lambda x: -x[1])[:top]
+        },
+        "heavy_loaded": sorted(
+            e["module"]
+            for e in entries
+            if e["module"] == "openpyxl"
+            or e["module"].startswith(("utils.excel_", "utils.command_check"))
+        ),
+    }
+
+
+def print_report(module: str, summary: Dict) -> None:
+    """打印导入耗时报告"""
+    print(f"{BLUE}导入耗时分析: {module}{RESET}")
+    print(
+        f"  总计: {summary['total_ms']}ms, {summary['module_count']} 个模块 "
+        f"(项目模块 {summary['project_module_count']} 个, {summary['project_ms']}ms)"
+    )
+    print(f"\n{BLUE}累计耗时最高的模块{RESET}")
+    for item in summary["slowest_cumulative"]:
+        print(f"  {item['cumulative_ms']:>8.1f}ms  {item['module']}")
+    print(f"\n{BLUE}项目模块自身耗时{RESET}")
+    for item in summary["slowest_project_self"]:
+        print(f"  {item['self_ms']:>8.1f}ms  {item['module']}")
+    print(f"\n{BLUE}第三方库{RESET}")
+    for name, ms in summary["third_party_ms"].items():
+        print(f"  {ms:>8.1f}ms  {name}")
+    if summary["heavy_loaded"]:
+        print(f"\n{YELLOW}⚠ 启动阶段加载了重量级模块:{RESET}")
+        for name in summary["heavy_loaded"]:
+            print(f"  - {name}")
+    else:
+        print(f"\n{GREEN}✓ 启动阶段未加载重量级模块（Excel/代码检查）{RESET}")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="启动导入耗时分析")
+    parser.add_argument("module", nargs="?", default="main", help="入口模块")
+    parser.add_argument("--top", type=int, default=20, help="显示前N项")
+    parser.add_argument("--preload", action="store_true", help="同时预热所有处理器")
+    parser.add_argument("--json", action="store_true", help="输出JSON")
+    args = parser.parse_args()
+
+    entries = run_importtime(args.module, preload=args.preload)
+    summary = summarize(entries, args.top)
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print_report(args.module, summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -436,7 +436,7 @@ class AmountService:
             return False, f"❌ Statistics update failed. Error: {str(e)}"
 
     @staticmethod
-    def _build_interest_operation_data(
+    def _build_interest_without_order_operation_data(
         amount_validated: float, date: str
     ) -> Dict[str, Any]:
         """构建利息操作数据
@@ -492,7 +492,7 @@ class AmountService:
             if not success:
                 return False, error_msg, None
 
-            operation_data = AmountService._build_interest_operation_data(
+            operation_data = AmountService._build_interest_without_order_operation_data(
                 amount_validated, date
             )
             return True, None, operation_data
@@ -4,9 +4,13 @@ import logging
 from typing import Dict, List
 
 import db_operations
+from db.search_index import SEARCH_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
+# 按文本模糊查找订单时最多返回的订单数
+TEXT_SEARCH_MAX_RESULTS = 500
+
 
 class SearchService:
     """搜索业务服务"""
@@ -23,8 +27,50 @@ class SearchService:
                 - group_id: 归属ID（可选）
                 - start_date: 开始日期（可选）
                 - end_date: 结束日期（可选）
+                - text: 订单号、归属ID或群名的片段（可选，模糊查找，忽略其他条件）
 
         Returns:
             订单列表
         """
+        if criteria.get("text"):
+            page = await db_operations.search_orders_fuzzy(
+                criteria["text"], limit=TEXT_SEARCH_MAX_RESULTS
+            )
+            if page["total"] > TEXT_SEARCH_MAX_RESULTS:
+                logger.info(
+                    f"模糊查找 {criteria['text']!r} 命中 {page['total']} 个订单，"
+                    f"只返回前 {TEXT_SEARCH_MAX_RESULTS} 个"
+                )
+            return page["items"]
         return await db_operations.search_orders_advanced(criteria)
+
+    @staticmethod
+    async def fuzzy_search(
+        text: str, page: int = 1, page_size: int = SEARCH_PAGE_SIZE
+    ) -> Dict:
+        """按文本片段模糊查找订单和客户档案（分页）
+
+        Args:
+            text: 订单号、归属ID、群名、客户姓名或电话的片段
+            page: 页码（从 1 开始）
+            page_size: 每页条数
+
+        Returns:
+            {"orders": {"total", "items"}, "profiles": {"total", "items"},
+             "page": 页码, "page_size": 每页条数}
+        """
+        from db.module6_credit.customer_profiles import \
+            search_customer_profiles
+
+        page = max(page, 1)
+        offset = (page - 1) * page_size
+        return {
+            "orders": await db_operations.search_orders_fuzzy(
+                text, limit=page_size, offset=offset
+            ),
+            "profiles": await search_customer_profiles(
+                text, limit=page_size, offset=offset
+            ),
+            "page": page,
+            "page_size": page_size,
+        }
@@ -9,7 +9,8 @@ from services.module6_credit.customer_service import (create_customer,
                                                       get_customer)
 from services.module6_credit.customer_service import \
     list_customers as list_customers_func
-from services.module6_credit.customer_service import (set_customer_type_func,
+from services.module6_credit.customer_service import (search_customers,
+                                                      set_customer_type_func,
                                                       update_customer)
 from services.module6_credit.value_service import (get_top_customers,
                                                    get_value_info,
@@ -22,6 +23,7 @@ __all__ = [
     "create_customer",
     "get_customer",
     "list_customers",
+    "search_customers",
     "update_customer",
     "set_customer_type_func",
     # 信用服务
@@ -7,6 +7,7 @@ from db.module6_credit.customer_profiles import (create_customer_profile,
                                                  get_customer_by_id,
                                                  get_customer_by_phone,
                                                  list_customers,
+                                                 search_customer_profiles,
                                                  set_customer_type,
                                                  update_customer_profile)
 
@@ -29,6 +30,11 @@ async def get_customer(phone: str) -> Optional[dict]:
     return await get_customer_by_phone(phone)
 
 
+async def search_customers(text: str, limit: int = 10) -> dict:
+    """按客户ID、姓名或电话的片段模糊查找客户档案"""
+    return await search_customer_profiles(text, limit=limit)
+
+
 async def list_customers_func(limit: int = 100) -> list:
     """列出所有客户档案"""
     return await list_customers(limit)
@@ -9,16 +9,40 @@ project_root = Path(__file__).parent.parent.absolute()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from .chat_helpers import (get_current_group, get_weekday_group_from_date,
-                           is_group_chat, reply_in_group)
-from .date_helpers import get_daily_period_date
-from .handler_helpers import (get_and_validate_order, get_chat_info,
-                              get_user_id, require_chat_info,
-                              send_error_message, send_success_message)
-from .order_helpers import (get_state_from_title, parse_order_from_title,
-                            try_create_order_from_title,
-                            update_order_state_from_title)
-from .stats_helpers import update_all_stats, update_liquid_capital
+# 子模块按需导入：访问 utils.xxx 时才加载对应模块，
+# 避免导入任意 utils 子模块时连带加载数据库层和 Telegram 处理辅助函数
+_LAZY_EXPORTS = {
+    "is_group_chat": ".chat_helpers",
+    "get_current_group": ".chat_helpers",
+    "get_weekday_group_from_date": ".chat_helpers",
+    "reply_in_group": ".chat_helpers",
+    "get_daily_period_date": ".date_helpers",
+    "get_chat_info": ".handler_helpers",
+    "get_user_id": ".handler_helpers",
+    "require_chat_info": ".handler_helpers",
+    "get_and_validate_order": ".handler_helpers",
+    "send_error_message": ".handler_helpers",
+    "send_success_message": ".handler_helpers",
+    "parse_order_from_title": ".order_helpers",
+    "get_state_from_title": ".order_helpers",
+    "update_order_state_from_title": ".order_helpers",
+    "try_create_order_from_title": ".order_helpers",
+    "update_all_stats": ".stats_helpers",
+    "update_liquid_capital": ".stats_helpers",
+}
+
+
+def __getattr__(name: str):
+    """首次访问时导入对应子模块"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "is_group_chat",
@@ -1,25 +1,29 @@
 """金额处理相关工具函数"""
 
 import re
+from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
+from utils.money import round_money
+
 
 def parse_amount(text: str) -> Optional[float]:
     """
     解析金额文本，支持多种格式
     例如: "20万" -> 200000, "20.5万" -> 205000, "200000" -> 200000
+    按十进制计算并四舍五入到分（"1.005" -> 1.01），不引入浮点误差
     """
     text = text.strip().replace(",", "")
 
     # 匹配"万"单位
     match = re.match(r"^(\d+(?:\.\d+)?)\s*万$", text)
     if match:
-        return float(match.group(1)) * 10000
+        return round_money(Decimal(match.group(1)) * 10000)
 
     # 匹配纯数字
     match = re.match(r"^(\d+(?:\.\d+)?)$", text)
     if match:
-        return float(match.group(1))
+        return round_money(match.group(1))
 
     return None
 
@@ -1,19 +1,311 @@
 """审计日志系统
 
 提供操作审计日志记录和查询功能。
+
+审计事件持久化在独立的 SQLite 文件（默认 DATA_DIR/audit.db，只追加）中：
+- 记录时只把事件放入内存队列，由后台线程批量写入（一个事务写入一批），
+  调用方不等待磁盘 I/O
+- 按 (user_id, timestamp)、(event_type, timestamp) 和 timestamp 建索引，
+  过滤查询和摘要统计只读取命中的行
+- 超过保留天数或最大行数的旧事件由写入线程定期清理
+- 队列满或审计数据库无法打开时丢弃事件并记录日志，不阻塞处理器，
+  也不向调用方抛出异常
+
+环境变量：
+    AUDIT_DB_PATH          审计数据库路径
+    AUDIT_RETENTION_DAYS   保留天数（默认 90，0 表示不按时间清理）
+    AUDIT_MAX_ROWS         最多保留行数（默认 1000000，0 表示不限）
+    AUDIT_QUEUE_SIZE       待写入队列长度上限（默认 10000）
 """
 
 import asyncio
+import atexit
+import json
 import logging
-from collections import deque
+import os
+import queue
+import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-# 审计日志存储
-_audit_logs: deque = deque(maxlen=10000)
-_audit_lock = asyncio.Lock()
+RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+MAX_ROWS = int(os.getenv("AUDIT_MAX_ROWS", "1000000"))
+QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+# 每批最多写入的事件数，以及凑批的最长等待（秒）
+BATCH_SIZE = 500
+BATCH_WAIT = 0.2
+# 清理旧事件的间隔（秒）
+PRUNE_INTERVAL = 3600
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS audit_logs (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        user_id INTEGER,
+        action TEXT,
+        resource TEXT,
+        details TEXT,
+        ip_address TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_audit_user_time "
+    "ON audit_logs(user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_event_time "
+    "ON audit_logs(event_type, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_logs(timestamp)",
+)
+
+_COLUMNS = (
+    "timestamp",
+    "event_type",
+    "user_id",
+    "action",
+    "resource",
+    "details",
+    "ip_address",
+)
+
+
+def _default_db_path() -> str:
+    path = os.getenv("AUDIT_DB_PATH")
+    if path:
+        return path
+    import init_db
+
+    return os.path.join(os.path.dirname(init_db.DB_NAME), "audit.db")
+
+
+def _to_row(record: Dict[str, Any]) -> Tuple:
+    details = json.dumps(record["details"], ensure_ascii=False, default=str)
+    return tuple(details if c == "details" else record[c] for c in _COLUMNS)
+
+
+def _from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    record = dict(row)
+    record.pop("id", None)
+    try:
+        record["details"] = json.loads(record["details"] or "{}")
+    except ValueError:
+        pass
+    return record
+
+
+class AuditLogStore:
+    """审计日志存储：后台线程批量写入，查询直接读 SQLite"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._last_prune = 0.0
+
+    # ----- 写入 -----
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """事件入队（不等待写入）"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(_to_row(record))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"审计日志队列已满，已丢弃 {self.dropped} 条事件")
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """等待已入队的事件全部写入"""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """写完队列中的事件后停止写入线程"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=10)
+        except queue.Full:
+            logger.warning("审计日志队列已满，关闭时未能写完全部事件")
+            return
+        thread.join(timeout=10)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            if self.db_path is None:
+                self.db_path = _default_db_path()
+            # 打开数据库和建表都在写入线程中完成，失败不影响调用方
+            self._thread = threading.Thread(
+                target=self._run, name="audit-log-writer", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                for sql in _SCHEMA:
+                    conn.execute(sql)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _run(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            running = True
+            while running:
+                batch, waiters, running = self._next_batch()
+                if conn is None and batch:
+                    # 打开失败时丢弃本批事件，下一批再重试
+                    conn = self._try_connect(len(batch))
+                if conn is not None:
+                    if batch:
+                        self._write(conn, batch)
+                    if time.monotonic() - self._last_prune >= PRUNE_INTERVAL:
+                        self._prune(conn)
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _try_connect(self, pending: int) -> Optional[sqlite3.Connection]:
+        try:
+            return self._connect()
+        except (sqlite3.Error, OSError) as e:
+            self.dropped += pending
+            logger.error(
+                f"打开审计数据库失败，丢弃 {pending} 条事件: {e}", exc_info=True
+            )
+            return None
+
+    def _next_batch(self) -> Tuple[List[Tuple], List[threading.Event], bool]:
+        """阻塞到有事件，再在 BATCH_WAIT 内凑满一批"""
+        batch: List[Tuple] = []
+        waiters: List[threading.Event] = []
+        item = self._queue.get()
+        deadline = time.monotonic() + BATCH_WAIT
+        while True:
+            if item is None:
+                return batch, waiters, False
+            if isinstance(item, threading.Event):
+                # flush 请求：把之前入队的事件写完即可应答
+                waiters.append(item)
+                return batch, waiters, True
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= BATCH_SIZE or remaining <= 0:
+                return batch, waiters, True
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return batch, waiters, True
+
+    def _write(self, conn: sqlite3.Connection, batch: List[Tuple]) -> None:
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO audit_logs ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({placeholders})",
+                    batch,
+                )
+        except sqlite3.Error as e:
+            logger.error(f"写入审计日志失败（{len(batch)} 条）: {e}", exc_info=True)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """按保留天数和最大行数清理旧事件"""
+        self._last_prune = time.monotonic()
+        try:
+            with conn:
+                deleted = 0
+                if RETENTION_DAYS > 0:
+                    cutoff = datetime.now() - timedelta(days=RETENTION_DAYS)
+                    deleted += conn.execute(
+                        "DELETE FROM audit_logs WHERE timestamp < ?",
+                        (cutoff.isoformat(timespec="microseconds"),),
+                    ).rowcount
+                if MAX_ROWS > 0:
+                    # id 单调递增，按 id 截断即保留最新的 MAX_ROWS 行
+                    deleted += conn.execute(
+                        "DELETE FROM audit_logs "
+                        "WHERE id <= (SELECT MAX(id) FROM audit_logs) - ?",
+                        (MAX_ROWS,),
+                    ).rowcount
+            if deleted:
+                logger.info(f"已清理 {deleted} 条过期审计日志")
+        except sqlite3.Error as e:
+            logger.error(f"清理审计日志失败: {e}", exc_info=True)
+
+    # ----- 查询 -----
+
+    def query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        """读取已写入的事件（先等待队列中的事件落盘）"""
+        self._ensure_started()
+        self.flush()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+
+_store = AuditLogStore()
+
+
+def get_audit_store() -> AuditLogStore:
+    """获取全局审计日志存储"""
+    return _store
+
+
+def record_audit_event(
+    event_type: str,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    resource: Optional[str] = None,
+    details: Optional[Dict[str, Any]] = None,
+    ip_address: Optional[str] = None,
+) -> Dict[str, Any]:
+    """记录审计事件（同步版本，只入队不等待写入）
+
+    参数和返回值同 log_audit_event。
+    """
+    audit_record = {
+        "event_type": event_type,
+        "user_id": user_id,
+        "action": action,
+        "resource": resource,
+        "details": details or {},
+        "ip_address": ip_address,
+        "timestamp": datetime.now().isoformat(timespec="microseconds"),
+    }
+    _store.append(audit_record)
+
+    logger.debug(f"审计日志: {event_type} - User: {user_id} - Action: {action}")
+
+    return audit_record
 
 
 async def log_audit_event(
@@ -37,22 +329,22 @@ async def log_audit_event(
     Returns:
         审计日志记录
     """
-    audit_record = {
-        "event_type": event_type,
-        "user_id": user_id,
-        "action": action,
-        "resource": resource,
-        "details": details or {},
-        "ip_address": ip_address,
-        "timestamp": datetime.now().isoformat(),
-    }
-
-    async with _audit_lock:
-        _audit_logs.append(audit_record)
+    return record_audit_event(
+        event_type, user_id, action, resource, details, ip_address
+    )
 
-    logger.info(f"审计日志: {event_type} - User: {user_id} - Action: {action}")
 
-    return audit_record
+def _time_filters(
+    start_time: Optional[datetime], end_time: Optional[datetime]
+) -> Tuple[List[str], List[Any]]:
+    conditions, params = [], []
+    if start_time:
+        conditions.append("timestamp >= ?")
+        params.append(start_time.isoformat(timespec="microseconds"))
+    if end_time:
+        conditions.append("timestamp <= ?")
+        params.append(end_time.isoformat(timespec="microseconds"))
+    return conditions, params
 
 
 async def get_audit_logs(
@@ -72,29 +364,25 @@ async def get_audit_logs(
         limit: 最大返回数量
 
     Returns:
-        审计日志列表
+        审计日志列表（按时间正序）
     """
-    async with _audit_lock:
-        logs = list(_audit_logs)
-
-    # 应用过滤
+    conditions, params = _time_filters(start_time, end_time)
     if user_id:
-        logs = [log for log in logs if log.get("user_id") == user_id]
+        conditions.insert(0, "user_id = ?")
+        params.insert(0, user_id)
     if event_type:
-        logs = [log for log in logs if log.get("event_type") == event_type]
-    if start_time:
-        logs = [
-            log
-            for log in logs
-            if datetime.fromisoformat(log["timestamp"]) >= start_time
-        ]
-    if end_time:
-        logs = [
-            log for log in logs if datetime.fromisoformat(log["timestamp"]) <= end_time
-        ]
+        conditions.insert(0, "event_type = ?")
+        params.insert(0, event_type)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
-    # 返回最近的日志
-    return logs[-limit:]
+    # 取最近的 limit 条（走索引倒序），再按时间正序返回
+    rows = await asyncio.to_thread(
+        _store.query,
+        f"SELECT * FROM audit_logs {where} "  # nosec B608 - 条件为固定片段
+        "ORDER BY timestamp DESC, id DESC LIMIT ?",
+        (*params, limit),
+    )
+    return [_from_row(row) for row in reversed(rows)]
 
 
 async def get_audit_summary(hours: int = 24) -> Dict[str, Any]:
@@ -106,67 +394,79 @@ async def get_audit_summary(hours: int = 24) -> Dict[str, Any]:
     Returns:
         审计摘要字典
     """
-    async with _audit_lock:
-        logs = list(_audit_logs)
-
-    cutoff_time = datetime.now() - timedelta(hours=hours)
-    recent_logs = [
-        log for log in logs if datetime.fromisoformat(log["timestamp"]) >= cutoff_time
-    ]
-
-    summary: dict[str, Any] = {
-        "total_events": len(recent_logs),
+    cutoff = (datetime.now() - timedelta(hours=hours)).isoformat(
+        timespec="microseconds"
+    )
+    rows = await asyncio.to_thread(
+        _store.query,
+        "SELECT event_type, user_id, COALESCE(action, 'unknown') AS action, "
+        "COUNT(*) AS count FROM audit_logs WHERE timestamp >= ? "
+        "GROUP BY event_type, user_id, action",
+        (cutoff,),
+    )
+
+    summary: Dict[str, Any] = {
+        "total_events": 0,
         "by_event_type": {},
         "by_user": {},
         "by_action": {},
     }
-
-    for log in recent_logs:
-        # 按事件类型统计
-        event_type = log.get("event_type", "unknown")
-        if isinstance(summary["by_event_type"], dict):
-            summary["by_event_type"][event_type] = (
-                summary["by_event_type"].get(event_type, 0) + 1
-            )
-
-        # 按用户统计
-        user_id = log.get("user_id")
-        if user_id and isinstance(summary["by_user"], dict):
-            summary["by_user"][user_id] = summary["by_user"].get(user_id, 0) + 1
-
-        # 按操作统计
-        action = log.get("action", "unknown")
-        if isinstance(summary["by_action"], dict):
-            summary["by_action"][action] = summary["by_action"].get(action, 0) + 1
+    for row in rows:
+        count = row["count"]
+        summary["total_events"] += count
+        event_type = row["event_type"]
+        by_event_type = summary["by_event_type"]
+        by_event_type[event_type] = by_event_type.get(event_type, 0) + count
+        if row["user_id"]:
+            by_user = summary["by_user"]
+            by_user[row["user_id"]] = by_user.get(row["user_id"], 0) + count
+        by_action = summary["by_action"]
+        by_action[row["action"]] = by_action.get(row["action"], 0) + count
 
     return summary
 
 
-async def export_audit_logs(format: str = "json") -> str:
+async def export_audit_logs(
+    format: str = "json",
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> str:
     """导出审计日志
 
     Args:
         format: 导出格式（json/csv）
+        start_time: 开始时间（可选）
+        end_time: 结束时间（可选）
 
     Returns:
         导出的日志字符串
     """
-    async with _audit_lock:
-        logs = list(_audit_logs)
+    if format not in ("json", "csv"):
+        raise ValueError(f"不支持的格式: {format}")
 
-    if format == "json":
-        import json
+    conditions, params = _time_filters(start_time, end_time)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = await asyncio.to_thread(
+        _store.query,
+        f"SELECT * FROM audit_logs {where} ORDER BY id",  # nosec B608
+        tuple(params),
+    )
+    logs = [_from_row(row) for row in rows]
 
+    if format == "json":
         return json.dumps(logs, indent=2, ensure_ascii=False)
-    elif format == "csv":
-        import csv
-        from io import StringIO
-
-        output = StringIO()
-        if logs:
-            writer = csv.DictWriter(output, fieldnames=logs[0].keys())
-            writer.writeheader()
-            writer.writerows(logs)
-        return output.getvalue()
-    else:
-        raise ValueError(f"不支持的格式: {format}")
+
+    import csv
+    from io import StringIO
+
+    output = StringIO()
+    if logs:
+        writer = csv.DictWriter(output, fieldnames=logs[0].keys())
+        writer.writeheader()
+        writer.writerows(logs)
+    return output.getvalue()
+
+
+def close_audit_log() -> None:
+    """写完待写入的审计事件并停止写入线程（应用关闭时调用）"""
+    _store.close()
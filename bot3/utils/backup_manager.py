@@ -5,7 +5,6 @@
 
 import logging
 import os
-import shutil
 import sqlite3
 from datetime import datetime
 from pathlib import Path
@@ -136,8 +135,14 @@ def restore_backup(backup_path: str, create_backup_before_restore: bool = True)
         # 关闭可能存在的数据库连接
         # 注意：在实际使用中，需要确保没有其他进程正在使用数据库
 
-        # 复制备份文件到数据库位置
-        shutil.copy2(backup_path, DB_NAME)
+        # 通过备份 API 写回数据库（主库为 WAL 模式，直接覆盖文件会与 -wal 文件不一致）
+        backup_conn = sqlite3.connect(backup_path)
+        target_conn = sqlite3.connect(DB_NAME)
+        try:
+            backup_conn.backup(target_conn)
+        finally:
+            target_conn.close()
+            backup_conn.close()
 
         # 验证恢复后的数据库
         if verify_backup(DB_NAME):
@@ -0,0 +1,220 @@
+"""群组元数据缓存模块
+
+缓存变化很少、但在定时任务和入群高峰中会被反复读取的数据：
+
+- 群组管理员列表（bot.get_chat_administrators）：按 TTL 过期，
+  收到 chat_member / my_chat_member 更新且涉及管理员变动时立即失效
+- 群组消息配置（group_message_config）：按 TTL 过期，
+  save_group_message_config / delete_group_message_config 提交后立即失效
+
+同一个键的并发请求只会触发一次 API/数据库调用（入群高峰时多条更新同时到达）。
+
+环境变量：
+    CHAT_ADMIN_CACHE_TTL: 管理员列表缓存时间（秒），默认 21600（6小时）
+    GROUP_CONFIG_CACHE_TTL: 群组消息配置缓存时间（秒），默认 600
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 缓存时间（秒）
+ADMIN_CACHE_TTL = float(os.getenv("CHAT_ADMIN_CACHE_TTL", "21600"))
+CONFIG_CACHE_TTL = float(os.getenv("GROUP_CONFIG_CACHE_TTL", "600"))
+
+# 所有激活配置列表的缓存键
+_ACTIVE_CONFIGS_KEY = "active"
+
+# 管理员身份（ChatMember.status）
+_ADMIN_STATUSES = ("administrator", "creator")
+
+
+class ChatMetadataCache:
+    """群组元数据缓存"""
+
+    def __init__(self):
+        # 键 -> (过期时间, 值)
+        self._admins: Dict[int, Tuple[float, Tuple[Any, ...]]] = {}
+        self._configs: Dict[Hashable, Tuple[float, Any]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # 失效计数：加载期间发生失效时不写入旧数据
+        self._config_generation = 0
+        self._admin_generation: Dict[int, int] = {}
+        self._admin_generation_all = 0
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _get_lock(self, key: Hashable) -> asyncio.Lock:
+        """获取（或创建）某个键的加载锁"""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    def _get_fresh(store: Dict, key: Hashable) -> Tuple[bool, Any]:
+        """读取未过期的缓存值"""
+        entry = store.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    async def _load(
+        self,
+        store: Dict,
+        key: Hashable,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]],
+        generation: Callable[[], int],
+    ) -> Any:
+        """读取缓存，未命中时加载（同一个键只加载一次）"""
+        found, value = self._get_fresh(store, key)
+        if found:
+            self.stats["hits"] += 1
+            return value
+
+        lock_key = (id(store), key)
+        async with self._get_lock(lock_key):
+            # 等锁期间可能已被其他请求加载
+            found, value = self._get_fresh(store, key)
+            if found:
+                self.stats["hits"] += 1
+                return value
+
+            self.stats["misses"] += 1
+            start_generation = generation()
+            value = await loader()
+            if generation() == start_generation:
+                store[key] = (time.monotonic() + ttl, value)
+            return value
+
+    # ----- 管理员列表 -----
+
+    async def get_chat_administrators(self, bot, chat_id: int) -> Tuple[Any, ...]:
+        """获取群组管理员（ChatMember 元组），失败时抛出异常且不缓存"""
+
+        async def loader():
+            return tuple(await bot.get_chat_administrators(chat_id))
+
+        return await self._load(
+            self._admins,
+            chat_id,
+            ADMIN_CACHE_TTL,
+            loader,
+            lambda: self._admin_generation_all
+            + self._admin_generation.get(chat_id, 0),
+        )
+
+    def invalidate_chat_admins(self, chat_id: Optional[int] = None) -> None:
+        """使管理员列表缓存失效
+
+        Args:
+            chat_id: 群组ID，为None时清空所有群组
+        """
+        if chat_id is None:
+            self._admin_generation_all += 1
+            self._admins.clear()
+        else:
+            self._admin_generation[chat_id] = self._admin_generation.get(chat_id, 0) + 1
+            self._admins.pop(chat_id, None)
+        self.stats["invalidations"] += 1
+
+    # ----- 群组消息配置 -----
+
+    async def get_group_message_config(self, chat_id: int) -> Optional[Dict]:
+        """获取单个群组的消息配置（未配置时返回 None，同样会被缓存）"""
+        import db_operations
+
+        config = await self._load(
+            self._configs,
+            chat_id,
+            CONFIG_CACHE_TTL,
+            lambda: db_operations.get_group_message_config_by_chat_id(chat_id),
+            lambda: self._config_generation,
+        )
+        return dict(config) if config is not None else None
+
+    async def get_group_message_configs(self) -> List[Dict]:
+        """获取所有激活的群组消息配置"""
+        import db_operations
+
+        configs = await self._load(
+            self._configs,
+            _ACTIVE_CONFIGS_KEY,
+            CONFIG_CACHE_TTL,
+            db_operations.get_group_message_configs,
+            lambda: self._config_generation,
+        )
+        return [dict(config) for config in configs or []]
+
+    def invalidate_group_message_configs(self) -> None:
+        """使所有群组消息配置缓存失效（配置写入/删除后调用）"""
+        self._config_generation += 1
+        self._configs.clear()
+        self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计"""
+        return {
+            **self.stats,
+            "cached_admin_chats": len(self._admins),
+            "cached_configs": len(self._configs),
+        }
+
+
+# 全局缓存实例
+_chat_metadata_cache = ChatMetadataCache()
+
+
+async def get_cached_chat_administrators(bot, chat_id: int) -> Tuple[Any, ...]:
+    """获取群组管理员（带缓存）"""
+    return await _chat_metadata_cache.get_chat_administrators(bot, chat_id)
+
+
+async def get_cached_group_message_config(chat_id: int) -> Optional[Dict]:
+    """获取单个群组的消息配置（带缓存）"""
+    return await _chat_metadata_cache.get_group_message_config(chat_id)
+
+
+async def get_cached_group_message_configs() -> List[Dict]:
+    """获取所有激活的群组消息配置（带缓存）"""
+    return await _chat_metadata_cache.get_group_message_configs()
+
+
+def invalidate_chat_admins(chat_id: Optional[int] = None) -> None:
+    """使管理员列表缓存失效"""
+    _chat_metadata_cache.invalidate_chat_admins(chat_id)
+
+
+def invalidate_group_message_configs() -> None:
+    """使群组消息配置缓存失效"""
+    _chat_metadata_cache.invalidate_group_message_configs()
+
+
+def handle_chat_member_change(chat_member_updated) -> bool:
+    """根据 ChatMemberUpdated 判断管理员是否变动，变动时使缓存失效
+
+    Args:
+        chat_member_updated: telegram.ChatMemberUpdated
+
+    Returns:
+        是否使缓存失效
+    """
+    if chat_member_updated is None:
+        return False
+    old_status = getattr(chat_member_updated.old_chat_member, "status", None)
+    new_status = getattr(chat_member_updated.new_chat_member, "status", None)
+    if old_status in _ADMIN_STATUSES or new_status in _ADMIN_STATUSES:
+        chat_id = chat_member_updated.chat.id
+        invalidate_chat_admins(chat_id)
+        logger.debug(f"群组 {chat_id} 管理员变动，已刷新管理员缓存")
+        return True
+    return False
+
+
+def get_chat_metadata_cache_stats() -> Dict[str, int]:
+    """获取缓存统计"""
+    return _chat_metadata_cache.get_stats()
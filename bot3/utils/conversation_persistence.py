@@ -0,0 +1,221 @@
+"""会话状态持久化模块
+
+基于 SQLite 的 python-telegram-bot 持久化实现，只保存 user_data
+（其中的 state 及多步操作的中间数据），机器人重启后恢复进行中的操作。
+
+写入合并：
+- PTB 每隔 update_interval 秒调用一次 update_user_data（只针对有更新的用户），
+  本模块把同一周期内的变更合并为一个事务写入
+- 内容与上次写入相同的用户跳过，不会每条消息都写库
+- Mapping（如 db.records.Record）按 dict 保存；键不全是 str 的 dict（如按 int
+  槽位保存的 schedule_data）和 tuple 带标记保存，恢复时还原原来的键和类型；
+  其他无法 JSON 序列化的值不保存（每个键记录一次警告）
+
+环境变量：
+    CONVERSATION_PERSISTENCE: 是否启用（默认 1）
+    CONVERSATION_FLUSH_INTERVAL: 写入周期（秒），默认 5
+    CONVERSATION_STATE_MAX_AGE: 超过该时间（秒）未更新的会话不再恢复，默认 86400
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Set
+
+from telegram.ext import BasePersistence, PersistenceInput
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = float(os.getenv("CONVERSATION_FLUSH_INTERVAL", "5"))
+STATE_MAX_AGE = float(os.getenv("CONVERSATION_STATE_MAX_AGE", "86400"))
+
+
+# 保留类型的标记：{"__tuple__": [...]}、{"__map__": [[键, 值], ...]}
+_TUPLE_TAG = "__tuple__"
+_MAP_TAG = "__map__"
+
+
+def _encode(value: Any) -> Any:
+    """转为可以 JSON 序列化、读取时能还原类型的结构（其余值原样返回）"""
+    if isinstance(value, Mapping):
+        if all(isinstance(k, str) for k in value) and not (
+            _TUPLE_TAG in value or _MAP_TAG in value
+        ):
+            return {k: _encode(v) for k, v in value.items()}
+        return {_MAP_TAG: [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_encode(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    """json.loads 的 object_hook：还原 _encode 标记的 tuple 和 dict"""
+    if len(obj) == 1:
+        if _TUPLE_TAG in obj:
+            return tuple(obj[_TUPLE_TAG])
+        if _MAP_TAG in obj:
+            return {key: value for key, value in obj[_MAP_TAG]}
+    return obj
+
+
+def is_conversation_persistence_enabled() -> bool:
+    """是否启用会话状态持久化"""
+    return os.getenv("CONVERSATION_PERSISTENCE", "1") == "1"
+
+
+class ConversationStatePersistence(BasePersistence):
+    """把 user_data 保存到 conversation_state 表"""
+
+    def __init__(
+        self, update_interval: float = FLUSH_INTERVAL, max_age: float = STATE_MAX_AGE
+    ):
+        super().__init__(
+            store_data=PersistenceInput(
+                bot_data=False, chat_data=False, user_data=True, callback_data=False
+            ),
+            update_interval=update_interval,
+        )
+        self.max_age = max_age
+        # 每个用户最近一次写入的内容，用于跳过未变化的写入
+        self._written: Dict[int, str] = {}
+        # 本周期待写入的变更（None 表示删除）
+        self._pending: Dict[int, Optional[str]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._skipped_keys: Set[str] = set()
+        self.stats = {"flushes": 0, "rows_written": 0, "unchanged": 0}
+
+    def _serialize(self, data: Dict[str, Any]) -> Optional[str]:
+        """序列化 user_data，跳过无法序列化的值；没有可保存的内容时返回None"""
+        serializable = {}
+        for key, value in data.items():
+            if value is None:
+                continue
+            try:
+                json.dumps(_encode(value))
+            except (TypeError, ValueError) as e:
+                if key not in self._skipped_keys:
+                    self._skipped_keys.add(key)
+                    logger.warning(f"user_data[{key!r}] 无法序列化，不做持久化: {e}")
+                continue
+            serializable[key] = value
+        if not serializable:
+            return None
+        return json.dumps(_encode(serializable), ensure_ascii=False, sort_keys=True)
+
+    def _queue(self, user_id: int, payload: Optional[str]) -> None:
+        """登记待写入的变更，本周期内只启动一次写入"""
+        if payload == self._written.get(user_id):
+            self.stats["unchanged"] += 1
+            self._pending.pop(user_id, None)
+            return
+        self._pending[user_id] = payload
+        if self._flush_task is None or self._flush_task.done():
+            # 在当前周期的所有 update_user_data 调用之后执行
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_pending()
+            )
+
+    async def _flush_pending(self) -> None:
+        """把待写入的变更合并为一个事务写入"""
+        from db.module4_automation.conversation_state import \
+            save_conversation_states
+
+        if not self._pending:
+            return
+        changes, self._pending = self._pending, {}
+        try:
+            if not await save_conversation_states(changes):
+                raise RuntimeError("save_conversation_states 返回失败")
+        except Exception as e:
+            logger.error(f"保存会话状态失败（{len(changes)} 个用户）: {e}")
+            # 放回队列，下个周期重试（不覆盖更新的变更）
+            for user_id, payload in changes.items():
+                self._pending.setdefault(user_id, payload)
+            return
+
+        for user_id, payload in changes.items():
+            if payload is None:
+                self._written.pop(user_id, None)
+            else:
+                self._written[user_id] = payload
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(changes)
+
+    # ----- user_data -----
+
+    async def get_user_data(self) -> Dict[int, Dict[Any, Any]]:
+        """启动时读取所有未过期的会话状态"""
+        from db.module4_automation.conversation_state import (
+            load_conversation_states, purge_conversation_states)
+
+        rows = await load_conversation_states(self.max_age)
+        user_data = {}
+        for user_id, payload in rows.items():
+            try:
+                user_data[user_id] = json.loads(payload, object_hook=_decode_object)
+            except ValueError:
+                logger.warning(f"用户 {user_id} 的会话状态已损坏，忽略")
+                continue
+            self._written[user_id] = payload
+
+        if self.max_age > 0:
+            await purge_conversation_states(self.max_age)
+        if user_data:
+            logger.info(f"已恢复 {len(user_data)} 个用户的会话状态")
+        return user_data
+
+    async def update_user_data(self, user_id: int, data: Dict[Any, Any]) -> None:
+        """登记用户数据变更（实际写入在周期内合并执行）"""
+        self._queue(user_id, self._serialize(data))
+
+    async def drop_user_data(self, user_id: int) -> None:
+        """删除用户数据"""
+        self._queue(user_id, None)
+
+    async def refresh_user_data(self, user_id: int, user_data: Dict[Any, Any]) -> None:
+        """不需要从数据库刷新（本进程是唯一写入者）"""
+
+    async def flush(self) -> None:
+        """关闭时写入剩余的变更"""
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        await self._flush_pending()
+
+    # ----- 不保存的数据 -----
+
+    async def get_chat_data(self) -> Dict[int, Any]:
+        return {}
+
+    async def get_bot_data(self) -> Dict[Any, Any]:
+        return {}
+
+    async def get_callback_data(self) -> None:
+        return None
+
+    async def get_conversations(self, name: str) -> Dict:
+        return {}
+
+    async def update_conversation(self, name: str, key, new_state) -> None:
+        pass
+
+    async def update_chat_data(self, chat_id: int, data) -> None:
+        pass
+
+    async def update_bot_data(self, data) -> None:
+        pass
+
+    async def update_callback_data(self, data) -> None:
+        pass
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data) -> None:
+        pass
+
+    async def refresh_bot_data(self, bot_data) -> None:
+        pass
@@ -1,11 +1,17 @@
-"""日切报表生成器"""
+"""日切报表生成器
+
+日切数据由数据库触发器增量维护（见 db.module2_finance.daily_summary），
+报表直接读取 daily_summary 中的一行；calculate_daily_summary 按明细全量重算，
+只用于 verify_daily_summary 核对。
+"""
 
 # 标准库
 import logging
-from typing import Dict
+from typing import Dict, Tuple
 
 # 本地模块
 import db_operations
+from utils.money import money_diff
 from utils.order_table_helpers import (generate_breach_end_orders_table,
                                        generate_completed_orders_table,
                                        generate_order_table)
@@ -132,7 +138,7 @@ def _get_empty_summary() -> Dict:
 
 
 async def calculate_daily_summary(date: str) -> Dict:
-    """计算指定日期的日切数据"""
+    """按明细全量计算指定日期的日切数据（用于核对增量维护的结果）"""
     try:
         orders_data = await _get_daily_orders_data(date)
         financial_data = await _get_daily_financial_data(date)
@@ -142,6 +148,48 @@ async def calculate_daily_summary(date: str) -> Dict:
         return _get_empty_summary()
 
 
+async def get_daily_summary_data(date: str) -> Dict:
+    """读取指定日期的日切数据（增量维护的 daily_summary 行）
+
+    Args:
+        date: 日期字符串
+
+    Returns:
+        汇总字典（键与 calculate_daily_summary 一致），当天没有数据时全为 0
+    """
+    summary = _get_empty_summary()
+    row = await db_operations.get_daily_summary(date)
+    if row:
+        for key, default in summary.items():
+            summary[key] = type(default)(row.get(key) or 0)
+    return summary
+
+
+async def verify_daily_summary(date: str, repair: bool = False) -> Dict:
+    """核对增量维护的日切数据与按明细全量重算的结果
+
+    Args:
+        date: 日期字符串
+        repair: 有差异时是否用全量重算结果修复 daily_summary
+
+    Returns:
+        有差异的字段：{字段: (增量值, 重算值)}，一致时为空字典
+    """
+    stored = await get_daily_summary_data(date)
+    expected = await calculate_daily_summary(date)
+
+    diffs = {
+        key: (stored[key], expected.get(key, 0))
+        for key in stored
+        if money_diff(stored[key], expected.get(key, 0))
+    }
+    if diffs:
+        logger.warning(f"日切数据与明细不一致 ({date}): {diffs}")
+        if repair:
+            await db_operations.rebuild_daily_summary(date)
+    return diffs
+
+
 async def _prepare_daily_report_data(date: str) -> Tuple[Dict, str]:
     """准备日切报表数据
 
@@ -151,8 +199,7 @@ async def _prepare_daily_report_data(date: str) -> Tuple[Dict, str]:
     Returns:
         (汇总数据, 订单总表文本)
     """
-    summary = await calculate_daily_summary(date)
-    await db_operations.save_daily_summary(date, summary)
+    summary = await get_daily_summary_data(date)
 
     valid_orders = await db_operations.get_all_valid_orders()
     daily_interest = summary.get("daily_interest", 0.0)
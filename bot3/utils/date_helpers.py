@@ -11,25 +11,20 @@ from constants import DAILY_CUTOFF_HOUR
 BEIJING_TZ = pytz.timezone("Asia/Shanghai")
 UTC_TZ = pytz.UTC
 
-# 时区修复基准日期：2024-12-02
-# 在此之前的数据可能是UTC时间，之后的数据是北京时间
-# 注意：这是一个保守的阈值，实际应用中可能需要根据具体情况调整
-TIMEZONE_FIX_DATE = datetime(2024, 12, 2, 0, 0, 0, tzinfo=BEIJING_TZ).date()
 
+def get_period_date(dt: datetime) -> str:
+    """北京时间 dt 所属的日结周期日期（每天23:00日切，23:00 及之后算作次日）
 
-def get_daily_period_date() -> str:
-    """获取当前日结周期对应的日期（每天23:00日切）"""
-    tz = pytz.timezone("Asia/Shanghai")
-    now = datetime.now(tz)
-    current_hour = now.hour
+    与数据库中的周期日期列（db.period_columns）口径一致。
+    """
+    if dt.hour >= DAILY_CUTOFF_HOUR:
+        dt += timedelta(days=1)
+    return dt.strftime("%Y-%m-%d")
 
-    # 如果当前时间 >= 23:00，算作明天
-    if current_hour >= DAILY_CUTOFF_HOUR:
-        period_date = (now + timedelta(days=1)).strftime("%Y-%m-%d")
-    else:
-        period_date = now.strftime("%Y-%m-%d")
 
-    return period_date
+def get_daily_period_date() -> str:
+    """获取当前日结周期对应的日期（每天23:00日切）"""
+    return get_period_date(datetime.now(BEIJING_TZ))
 
 
 def _parse_iso_datetime(datetime_str: str) -> Optional[datetime]:
@@ -67,7 +62,7 @@ def _parse_sqlite_datetime(datetime_str: str) -> Optional[datetime]:
 
 
 def _apply_timezone_if_needed(dt: datetime) -> datetime:
-    """如果需要，应用时区信息
+    """没有时区信息的时间按北京时间处理（数据库中的时间均为北京时间）
 
     Args:
         dt: datetime对象
@@ -76,11 +71,7 @@ def _apply_timezone_if_needed(dt: datetime) -> datetime:
         带时区信息的datetime对象
     """
     if dt.tzinfo is None:
-        record_date = dt.date()
-        if record_date >= TIMEZONE_FIX_DATE:
-            dt = BEIJING_TZ.localize(dt)
-        else:
-            dt = BEIJING_TZ.localize(dt)
+        dt = BEIJING_TZ.localize(dt)
     return dt
 
 
@@ -155,6 +146,18 @@ def datetime_str_to_beijing_str(datetime_str: str) -> str:
     return datetime_to_beijing_str(dt)
 
 
+def format_datetime_to_beijing(datetime_str: str) -> str:
+    """将时间字符串转换为北京时间显示（纯日期字符串原样返回，用于 Excel 导出）"""
+    if not datetime_str or datetime_str == "未知":
+        return datetime_str
+
+    # 如果是纯日期字符串（YYYY-MM-DD），直接返回
+    if len(datetime_str) == 10 and datetime_str.count("-") == 2:
+        return datetime_str
+
+    return datetime_str_to_beijing_str(datetime_str)
+
+
 def get_date_range_for_query(date: str) -> tuple[str, str]:
     """
     获取日期查询的起始和结束时间（北京时间）
@@ -190,6 +193,19 @@ def get_now_beijing() -> datetime:
     return datetime.now(BEIJING_TZ)
 
 
+def get_now_beijing_str() -> str:
+    """
+    获取当前北京时间字符串（写入数据库时间戳列使用）
+
+    SQLite 的 CURRENT_TIMESTAMP 是 UTC 时间，订单等表的时间戳按北京时间读取和
+    计算日结周期（见 db.period_columns），写入时须使用本函数。
+
+    Returns:
+        北京时间字符串 (YYYY-MM-DD HH:MM:SS)
+    """
+    return datetime.now(BEIJING_TZ).strftime("%Y-%m-%d %H:%M:%S")
+
+
 def get_today_beijing() -> str:
     """
     获取今天在北京时区下的日期字符串
@@ -9,7 +9,8 @@ import logging
 import os
 import sqlite3
 from contextlib import asynccontextmanager
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Optional, Set
 
 import aiosqlite
 
@@ -64,10 +65,13 @@ class ConnectionPool:
 
     async def _create_connection(self) -> aiosqlite.Connection:
         """创建新的数据库连接"""
+        from utils.sql_profiler import get_connection_factory
+
         conn = await aiosqlite.connect(
             self.db_path,
             check_same_thread=False,
             timeout=10.0,  # 10秒超时
+            factory=get_connection_factory(),  # 开启 SQL 性能分析时统计语句
         )
         # 设置 row_factory 为 Row，返回字典式结果
         conn.row_factory = aiosqlite.Row
@@ -264,9 +268,67 @@ def get_sync_connection():
     """
     # 动态导入 init_db 以获取最新的 DB_NAME（支持测试环境修改）
     import init_db
+    from utils.sql_profiler import get_connection_factory
 
     db_path = init_db.DB_NAME
 
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn = sqlite3.connect(
+        db_path, check_same_thread=False, factory=get_connection_factory()
+    )
+    if db_path not in _wal_paths and enable_wal(conn):
+        _wal_paths.add(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+# 本进程中已确认为 WAL 模式的数据库（WAL 模式写在数据库文件中，持久有效）
+_wal_paths: Set[str] = set()
+
+
+def enable_wal(conn: sqlite3.Connection) -> bool:
+    """主库使用 WAL 日志模式（已是 WAL 时为空操作）
+
+    WAL 模式下读事务不阻塞写入，分析快照复制主库期间写入照常提交。
+    切换需要独占访问，失败时保持原模式，下次建立连接时再试。
+
+    Returns:
+        是否为 WAL 模式
+    """
+    try:
+        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    except sqlite3.OperationalError as e:
+        logger.warning(f"切换 WAL 日志模式失败: {e}")
+        return False
+    return str(mode).lower() == "wal"
+
+
+def _readonly_uri(db_path: str) -> str:
+    return f"{Path(db_path).resolve().as_uri()}?mode=ro"
+
+
+def get_readonly_connection(
+    db_path: str, attach: Optional[Dict[str, str]] = None
+) -> sqlite3.Connection:
+    """获取只读数据库连接（mode=ro + query_only）
+
+    Args:
+        db_path: 数据库文件路径
+        attach: 同样以只读方式附加的数据库（库名 -> 文件路径）
+    """
+    from utils.sql_profiler import get_connection_factory
+
+    conn = sqlite3.connect(
+        _readonly_uri(db_path),
+        uri=True,
+        check_same_thread=False,
+        factory=get_connection_factory(),
+    )
+    try:
+        conn.execute("PRAGMA query_only = ON")
+        for schema, path in (attach or {}).items():
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (_readonly_uri(path),))
+    except BaseException:
+        conn.close()
+        raise
     conn.row_factory = sqlite3.Row
     return conn
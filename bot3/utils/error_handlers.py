@@ -98,11 +98,13 @@ def retry(
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
+            # 重试参数必须按位置传入，否则 *args 会与之冲突
             return await retry_with_backoff(
                 func,
-                max_retries=max_retries,
-                initial_delay=initial_delay,
-                backoff_factor=backoff_factor,
+                max_retries,
+                initial_delay,
+                backoff_factor,
+                (Exception,),
                 *args,
                 **kwargs,
             )
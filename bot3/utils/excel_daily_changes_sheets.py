@@ -14,7 +14,8 @@ from openpyxl.worksheet.worksheet import Worksheet
 
 # 本地模块
 import db_operations
-from utils.excel_export import format_datetime_to_beijing
+from utils.date_helpers import format_datetime_to_beijing
+from utils.money import round_money
 
 
 def _calculate_financial_totals(
@@ -361,6 +362,8 @@ def create_new_orders_sheet_for_changes(
         ws_new.cell(row=row_idx, column=4, value=state).border = styles["border"]
         row_idx += 1
 
+    total_amount = round_money(total_amount)
+
     # 添加汇总行
     summary_row = row_idx + 1
     ws_new.merge_cells(f"A{summary_row}:B{summary_row}")
@@ -434,6 +437,8 @@ def create_completed_orders_sheet_for_changes(
         ]
         row_idx += 1
 
+    total_amount = round_money(total_amount)
+
     # 添加汇总行
     summary_row = row_idx + 1
     ws_completed.merge_cells(f"A{summary_row}:B{summary_row}")
@@ -503,6 +508,8 @@ def create_breach_end_orders_sheet_for_changes(
         ]
         row_idx += 1
 
+    total_amount = round_money(total_amount)
+
     # 添加汇总行
     summary_row = row_idx + 1
     ws_breach.merge_cells(f"A{summary_row}:B{summary_row}")
@@ -19,23 +19,11 @@ from utils.excel_export_helpers import (
     create_expense_records_sheet, create_income_records_sheet,
     create_incremental_expense_sheet, create_incremental_orders_sheet,
     create_new_orders_sheet_for_changes, create_orders_sheet, get_excel_styles)
+from utils.excel_render_pool import render_workbook
 
 logger = logging.getLogger(__name__)
 
 
-def format_datetime_to_beijing(datetime_str: str) -> str:
-    """将时间字符串转换为北京时间显示（使用统一的时区处理函数）"""
-    if not datetime_str or datetime_str == "未知":
-        return datetime_str
-
-    # 如果是纯日期字符串（YYYY-MM-DD），直接返回
-    if len(datetime_str) == 10 and datetime_str.count("-") == 2:
-        return datetime_str
-
-    # 使用统一的时区处理函数
-    return datetime_str_to_beijing_str(datetime_str)
-
-
 def create_excel_file(params: "ExcelFileParams") -> str:
     """创建Excel文件
 
@@ -154,8 +142,6 @@ async def export_orders_to_excel(
     daily_summary: Dict = None,
 ) -> str:
     """导出订单到Excel文件（异步版本，优化批量查询）"""
-    import asyncio
-
     order_ids = [order.get("order_id") for order in orders if order.get("order_id")]
     interests_map = await _fetch_orders_interests(order_ids)
     orders_with_interests = _attach_interests_to_orders(orders, interests_map)
@@ -175,8 +161,8 @@ async def export_orders_to_excel(
         all_orders_for_chat_id=all_orders_for_chat_id,
     )
 
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, create_excel_file, excel_params)
+    # 在渲染进程中生成文件，不阻塞事件循环
+    await render_workbook("orders", excel_params)
 
     return file_path
 
@@ -228,8 +214,6 @@ def create_daily_changes_excel_file(params: "DailyChangesExcelParams") -> str:
 
 async def export_daily_changes_to_excel(date: str) -> str:
     """导出每日变化数据到Excel文件（异步版本）"""
-    import asyncio
-
     # 获取所有数据
     new_orders = await db_operations.get_new_orders_by_date(date)
     completed_orders = await db_operations.get_completed_orders_by_date(date)
@@ -237,10 +221,10 @@ async def export_daily_changes_to_excel(date: str) -> str:
     income_records = await db_operations.get_income_records(date, date)
     expense_records = await db_operations.get_expense_records(date, date)
 
-    # 计算汇总数据
-    from utils.daily_report_generator import calculate_daily_summary
+    # 读取汇总数据
+    from utils.daily_report_generator import get_daily_summary_data
 
-    daily_summary = await calculate_daily_summary(date)
+    daily_summary = await get_daily_summary_data(date)
 
     # 计算月度汇总数据
     from utils.excel_daily_changes_sheets import _calculate_monthly_summary
@@ -268,9 +252,47 @@ async def export_daily_changes_to_excel(date: str) -> str:
         monthly_data=monthly_data,
     )
 
-    # 在事件循环中运行同步函数
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, create_daily_changes_excel_file, changes_params)
+    # 在渲染进程中生成文件，不阻塞事件循环
+    await render_workbook("daily_changes", changes_params)
+
+    return file_path
+
+
+def create_report_lines_file(file_path: str, lines: List[str]) -> str:
+    """把文本报表按行写入Excel文件（超出消息段数的文本报表用，见 utils.report_stream）
+
+    每行一个单元格，使用等宽字体保持原有的列对齐。
+    """
+    from openpyxl.styles import Font
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "报表"
+    font = Font(name="Courier New", size=10)
+    for row, line in enumerate(lines, 1):
+        cell = ws.cell(row=row, column=1, value=line)
+        cell.font = font
+    ws.column_dimensions["A"].width = 100
+
+    wb.save(file_path)
+    return file_path
+
+
+async def export_report_lines_to_excel(name: str, lines: List[str]) -> str:
+    """导出文本报表到Excel文件（异步版本）
+
+    Args:
+        name: 文件名前缀
+        lines: 报表的行
+    """
+    temp_dir = os.path.join(os.path.dirname(__file__), "..", "temp")
+    os.makedirs(temp_dir, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    file_path = os.path.join(temp_dir, f"{name}_{timestamp}.xlsx")
+
+    # 在渲染进程中生成文件，不阻塞事件循环
+    await render_workbook("report_lines", file_path, lines)
 
     return file_path
 
@@ -310,8 +332,6 @@ async def export_incremental_orders_report_to_excel(
     expense_records: List[Dict] = None,
 ) -> str:
     """导出增量订单报表到Excel文件（异步版本）"""
-    import asyncio
-
     # 创建临时文件
     temp_dir = os.path.join(os.path.dirname(__file__), "..", "temp")
     os.makedirs(temp_dir, exist_ok=True)
@@ -319,11 +339,9 @@ async def export_incremental_orders_report_to_excel(
     file_name = f"增量订单报表_{current_date}.xlsx"
     file_path = os.path.join(temp_dir, file_name)
 
-    # 在事件循环中运行同步函数
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(
-        None,
-        create_incremental_orders_report_file,
+    # 在渲染进程中生成文件，不阻塞事件循环
+    await render_workbook(
+        "incremental_orders",
         file_path,
         baseline_date,
         current_date,
@@ -7,6 +7,8 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List
 
+from utils.money import round_money
+
 logger = logging.getLogger(__name__)
 
 # 状态映射（从中文状态到英文状态）
@@ -125,7 +127,7 @@ def extract_amount(row_values: List[Any], col_indices: Dict[str, int]) -> float:
     try:
         amount_value = row_values[col_indices["amount"]]
         if amount_value is not None:
-            return float(amount_value)
+            return round_money(amount_value)
     except (ValueError, TypeError):
         pass
     return 0.0
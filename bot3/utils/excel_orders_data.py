@@ -9,6 +9,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Font
 
 from utils.excel_orders_sheets import ORDER_STATES
+from utils.money import round_money, sum_money
 
 
 def _calculate_order_interest(interests: List[Dict]) -> float:
@@ -20,7 +21,7 @@ def _calculate_order_interest(interests: List[Dict]) -> float:
     Returns:
         总利息金额
     """
-    return sum(float(interest.get("amount", 0) or 0) for interest in interests)
+    return sum_money(interest.get("amount", 0) for interest in interests)
 
 
 def _format_interest_details(interests: List[Dict]) -> str:
@@ -116,4 +117,4 @@ def write_orders_data(
         total_amount += order_amount
         total_interest_all += order_interest
 
-    return row_idx, total_amount, total_interest_all
+    return row_idx, round_money(total_amount), round_money(total_interest_all)
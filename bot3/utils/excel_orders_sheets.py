@@ -12,7 +12,8 @@ from openpyxl.styles import Font
 
 # 本地模块
 from constants import ORDER_STATES
-from utils.excel_export import format_datetime_to_beijing
+from utils.date_helpers import format_datetime_to_beijing
+from utils.money import round_money
 
 
 def create_orders_sheet(wb: Workbook, orders: List[Dict], styles: Dict) -> None:
@@ -94,6 +95,8 @@ def create_completed_orders_sheet(
 
         row_idx += 1
 
+    total_amount = round_money(total_amount)
+
     # 添加汇总行
     from openpyxl.styles import Font
 
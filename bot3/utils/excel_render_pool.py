@@ -0,0 +1,290 @@
+"""Excel 渲染进程池
+
+openpyxl 逐个单元格写入和设置样式是纯 Python 的 CPU 计算，在线程池中执行时
+仍然持有 GIL，大报表渲染期间事件循环和所有聊天都会卡顿。渲染改为在独立的
+工作进程中执行：
+- 输入按列压缩（RowBatch：列名只传一次，每行一个值元组），避免为每行序列化字典
+- 同时渲染的任务数不超过工作进程数，其余任务在事件循环中等待（不占线程）
+- 超时或调用方取消时结束对应的工作进程，下次使用时重新启动
+- 工作进程执行 EXCEL_RENDER_MAX_TASKS 个任务后重启，释放 openpyxl 占用的内存
+
+环境变量：
+    EXCEL_RENDER_WORKERS       工作进程数（默认 2；0 时在线程池中渲染）
+    EXCEL_RENDER_TIMEOUT       单个任务超时秒数（默认 300）
+    EXCEL_RENDER_MAX_TASKS     工作进程重启前执行的任务数（默认 20）
+    EXCEL_RENDER_START_METHOD  进程启动方式（默认 spawn）
+"""
+
+# 标准库
+import asyncio
+import copy
+import dataclasses
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+from collections.abc import Mapping
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# 日志
+logger = logging.getLogger(__name__)
+
+RENDER_WORKERS = int(os.getenv("EXCEL_RENDER_WORKERS", "2"))
+RENDER_TIMEOUT = float(os.getenv("EXCEL_RENDER_TIMEOUT", "300"))
+MAX_TASKS_PER_WORKER = int(os.getenv("EXCEL_RENDER_MAX_TASKS", "20"))
+START_METHOD = os.getenv("EXCEL_RENDER_START_METHOD", "spawn")
+
+# 渲染任务名 -> 渲染函数（"模块:函数"，在工作进程中导入）
+RENDERERS: Dict[str, str] = {
+    "orders": "utils.excel_export:create_excel_file",
+    "daily_changes": "utils.excel_export:create_daily_changes_excel_file",
+    "incremental_orders": "utils.excel_export:create_incremental_orders_report_file",
+    "report_lines": "utils.excel_export:create_report_lines_file",
+}
+
+
+# ========== 列式输入 ==========
+
+
+class _Absent:
+    """行中不存在的键（按模块全局名序列化，反序列化后仍是同一个对象）"""
+
+    def __reduce__(self):
+        return "ABSENT"
+
+    def __repr__(self) -> str:
+        return "ABSENT"
+
+
+ABSENT = _Absent()
+
+
+class RowBatch(NamedTuple):
+    """列式的行列表：列名只传一次，每行一个值元组"""
+
+    columns: Tuple[str, ...]
+    rows: List[tuple]
+
+
+def _is_nested(value: Any) -> bool:
+    return isinstance(value, (list, tuple, Mapping))
+
+
+def pack_rows(rows: List[Mapping]) -> RowBatch:
+    """把字典（或 Record）列表转换为 RowBatch"""
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key)
+    names = tuple(columns)
+    packed = []
+    for row in rows:
+        values = (row.get(name, ABSENT) for name in names)
+        packed.append(tuple(pack(v) if _is_nested(v) else v for v in values))
+    return RowBatch(names, packed)
+
+
+def unpack_rows(batch: RowBatch) -> List[Dict[str, Any]]:
+    """把 RowBatch 还原为字典列表"""
+    names = batch.columns
+    return [
+        {
+            name: unpack(value) if _is_nested(value) else value
+            for name, value in zip(names, row)
+            if value is not ABSENT
+        }
+        for row in batch.rows
+    ]
+
+
+def pack(value: Any) -> Any:
+    """把渲染参数转换为紧凑的可序列化形式（行列表 -> RowBatch）"""
+    if isinstance(value, RowBatch):
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        packed = copy.copy(value)
+        for field in dataclasses.fields(value):
+            object.__setattr__(packed, field.name, pack(getattr(value, field.name)))
+        return packed
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, Mapping) for item in value):
+            return pack_rows(value)
+        return type(value)(pack(item) for item in value)
+    if isinstance(value, Mapping):
+        return {key: pack(item) for key, item in value.items()}
+    return value
+
+
+def unpack(value: Any) -> Any:
+    """pack 的逆操作"""
+    if isinstance(value, RowBatch):
+        return unpack_rows(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        for field in dataclasses.fields(value):
+            object.__setattr__(value, field.name, unpack(getattr(value, field.name)))
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(unpack(item) for item in value)
+    if isinstance(value, dict):
+        return {key: unpack(item) for key, item in value.items()}
+    return value
+
+
+# ========== 工作进程 ==========
+
+
+def _resolve_renderer(name: str):
+    module_name, func_name = RENDERERS[name].split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _worker_main(conn) -> None:
+    """工作进程主循环：接收 (任务名, 参数)，返回 ("ok", 结果) 或 ("error", 说明)"""
+    # Ctrl+C 由主进程处理，工作进程随主进程退出
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        name, args = task
+        try:
+            result = _resolve_renderer(name)(*unpack(args))
+            conn.send(("ok", result))
+        except Exception as e:
+            logger.error(f"Excel 渲染任务 {name} 失败: {e}", exc_info=True)
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _RenderWorker:
+    """一个工作进程及其管道"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn,), name="excel-render", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def run(self, name: str, args: tuple, timeout: float) -> Any:
+        """执行一个任务（阻塞，在线程中调用）"""
+        # 压缩和序列化也在线程中进行
+        self.conn.send((name, pack(args)))
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"Excel 渲染超时（{timeout:g}s）: {name}")
+        status, value = self.conn.recv()
+        self.tasks += 1
+        if status != "ok":
+            raise RuntimeError(f"Excel 渲染失败: {value}")
+        return value
+
+    def kill(self) -> None:
+        """结束进程（正在等待结果的线程会收到 EOFError）"""
+        if self.process.is_alive():
+            self.process.kill()
+
+    def stop(self) -> None:
+        """通知进程退出"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            self.kill()
+
+
+class RenderPool:
+    """Excel 渲染进程池"""
+
+    def __init__(self, workers: int, timeout: float, max_tasks: int):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks = max_tasks
+        self._context = multiprocessing.get_context(START_METHOD)
+        self._idle: List[_RenderWorker] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._closed = False
+
+    def _acquire_worker(self) -> _RenderWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.process.is_alive():
+                return worker
+        return _RenderWorker(self._context)
+
+    def _release_worker(self, worker: _RenderWorker) -> None:
+        if self._closed or worker.tasks >= self.max_tasks:
+            worker.stop()
+        else:
+            self._idle.append(worker)
+
+    async def render(self, name: str, *args, timeout: Optional[float] = None) -> Any:
+        """在工作进程中执行渲染函数，返回其结果（文件路径）"""
+        if self._closed:
+            raise RuntimeError("Excel 渲染进程池已关闭")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        async with self._semaphore:
+            try:
+                worker = self._acquire_worker()
+            except OSError as e:
+                # 运行环境不允许创建子进程
+                logger.warning(f"Excel 渲染进程启动失败，改为在线程中渲染: {e}")
+                return await _render_in_thread(name, *args)
+            try:
+                result = await asyncio.to_thread(
+                    worker.run, name, args, timeout or self.timeout
+                )
+            except BaseException:
+                # 超时、失败或被取消：进程状态未知，直接结束
+                worker.kill()
+                raise
+            self._release_worker(worker)
+            return result
+
+    def close(self) -> None:
+        """关闭空闲的工作进程"""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+            worker.process.join(timeout=2)
+            worker.kill()
+
+
+async def _render_in_thread(name: str, *args) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _resolve_renderer(name), *args)
+
+
+_pool: Optional[RenderPool] = None
+
+
+def get_render_pool() -> RenderPool:
+    """获取全局渲染进程池"""
+    global _pool
+    if _pool is None or _pool._closed:
+        _pool = RenderPool(RENDER_WORKERS, RENDER_TIMEOUT, MAX_TASKS_PER_WORKER)
+    return _pool
+
+
+async def render_workbook(name: str, *args, timeout: Optional[float] = None) -> Any:
+    """渲染 Excel 文件（RENDERERS 中的任务名 + 渲染函数参数）
+
+    EXCEL_RENDER_WORKERS 为 0 或无法启动工作进程时，在线程池中渲染。
+    """
+    if RENDER_WORKERS <= 0:
+        return await _render_in_thread(name, *args)
+    return await get_render_pool().render(name, *args, timeout=timeout)
+
+
+def close_render_pool() -> None:
+    """关闭全局渲染进程池（应用关闭时调用）"""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
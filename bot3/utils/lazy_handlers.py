@@ -0,0 +1,195 @@
+"""延迟加载处理器注册模块
+
+命令处理器和回调路由按导入路径（"模块路径:函数名"）注册，
+对应模块在第一次收到该命令/回调时才导入，启动时不再加载整个处理器依赖图。
+
+- 重量级模块（Excel 导入导出、诊断、代码检查等）只在首次使用时加载
+- 其余处理器可在机器人开始轮询后由后台线程预热（preload_handlers）
+- 每个处理器的加载耗时会被记录，可通过 get_lazy_handler_stats() 查看
+- 每次调用自动记录耗时直方图（handler:函数名、按群组统计）并开启链路追踪
+
+用法：
+    from utils.lazy_handlers import lazy_handler
+
+    application.add_handler(
+        CommandHandler(
+            "import_orders",
+            lazy_handler("handlers.module5_data.import_handlers:import_orders_command"),
+        )
+    )
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.performance_monitor import record_chat_timing, record_operation
+from utils.trace_spans import start_trace
+
+logger = logging.getLogger(__name__)
+
+# 首次使用前不预热的重量级模块（前缀匹配）
+HEAVY_MODULE_PREFIXES = (
+    "handlers.module5_data.import_handlers",
+    "handlers.module5_data.daily_changes_handlers",
+    "handlers.module5_data.diagnostic_handlers",
+    "handlers.module5_data.stats_handlers",
+    "handlers.module5_data.tools_handlers",
+    "utils.excel_",
+    "utils.command_check",
+)
+
+# 已注册的处理器：导入路径 -> 加载信息
+_registry: Dict[str, Dict[str, Any]] = {}
+_registry_lock = threading.Lock()
+
+
+def is_heavy_module(module_name: str) -> bool:
+    """判断模块是否属于首次使用才加载的重量级模块"""
+    return module_name.startswith(HEAVY_MODULE_PREFIXES)
+
+
+def _split_path(path: str):
+    """拆分 "模块路径:函数名" 格式的导入路径"""
+    module_name, sep, attr = path.partition(":")
+    if not sep or not module_name or not attr:
+        raise ValueError(f"处理器路径格式应为 '模块路径:函数名'，当前: {path}")
+    return module_name, attr
+
+
+def _resolve(path: str) -> Callable:
+    """导入并返回处理器函数，记录加载耗时"""
+    entry = _registry[path]
+    target = entry["target"]
+    if target is not None:
+        return target
+
+    with _registry_lock:
+        if entry["target"] is None:
+            module_name, attr = _split_path(path)
+            start_time = time.perf_counter()
+            module = importlib.import_module(module_name)
+            target = getattr(module, attr)
+            entry["load_ms"] = (time.perf_counter() - start_time) * 1000
+            entry["loaded_at"] = time.time()
+            entry["target"] = target
+            logger.debug(f"已加载处理器 {path} ({entry['load_ms']:.1f}ms)")
+    return entry["target"]
+
+
+def _get_chat_id(update: Any) -> Optional[int]:
+    """从更新中取聊天ID（非 Update 参数时返回 None）"""
+    chat = getattr(update, "effective_chat", None)
+    return getattr(chat, "id", None)
+
+
+def lazy_handler(path: str) -> Callable:
+    """按导入路径创建延迟加载的处理器
+
+    Args:
+        path: "模块路径:函数名"，如 "handlers.module3_order.basic_handlers:create_order"
+
+    Returns:
+        异步处理器函数，可直接传给 CommandHandler / MessageHandler /
+        CallbackQueryHandler，也可以继续套用 admin_required 等装饰器
+    """
+    module_name, attr = _split_path(path)
+    with _registry_lock:
+        _registry.setdefault(
+            path,
+            {
+                "module": module_name,
+                "heavy": is_heavy_module(module_name),
+                "target": None,
+                "load_ms": None,
+                "loaded_at": None,
+            },
+        )
+
+    op_name = f"handler:{attr}"
+
+    async def handler(*args, **kwargs):
+        target = _registry[path]["target"] or _resolve(path)
+        chat_id = _get_chat_id(args[0]) if args else None
+        start_time = time.perf_counter()
+        error = False
+        try:
+            with start_trace(op_name, chat_id=chat_id):
+                return await target(*args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            duration = time.perf_counter() - start_time
+            record_operation(op_name, duration, error=error, threshold_ms=3000.0)
+            record_chat_timing(chat_id, duration)
+
+    handler.__name__ = attr
+    handler.__qualname__ = attr
+    handler.__module__ = module_name
+    handler.__doc__ = f"延迟加载的处理器: {path}"
+    handler.lazy_path = path  # type: ignore[attr-defined]
+    return handler
+
+
+def preload_handlers(include_heavy: bool = False) -> int:
+    """导入所有已注册但尚未加载的处理器
+
+    Args:
+        include_heavy: 是否同时加载重量级模块
+
+    Returns:
+        本次加载的处理器数量
+    """
+    loaded = 0
+    for path, entry in list(_registry.items()):
+        if entry["target"] is not None:
+            continue
+        if entry["heavy"] and not include_heavy:
+            continue
+        try:
+            _resolve(path)
+            loaded += 1
+        except Exception as e:
+            logger.error(f"预加载处理器 {path} 失败: {e}", exc_info=True)
+    return loaded
+
+
+async def preload_handlers_in_background(include_heavy: bool = False) -> None:
+    """在线程池中预热处理器，不阻塞事件循环"""
+    loop = asyncio.get_running_loop()
+    start_time = time.perf_counter()
+    loaded = await loop.run_in_executor(None, preload_handlers, include_heavy)
+    logger.info(
+        f"处理器预热完成: 加载 {loaded} 个, "
+        f"耗时 {(time.perf_counter() - start_time) * 1000:.0f}ms"
+    )
+
+
+def get_lazy_handler_stats(path: Optional[str] = None) -> Dict[str, Any]:
+    """获取延迟加载处理器的状态
+
+    Args:
+        path: 处理器路径，如果为None则返回所有处理器
+
+    Returns:
+        {路径: {module, heavy, loaded, load_ms}}
+    """
+    items = [(path, _registry[path])] if path else sorted(_registry.items())
+    return {
+        p: {
+            "module": entry["module"],
+            "heavy": entry["heavy"],
+            "loaded": entry["target"] is not None,
+            "load_ms": entry["load_ms"],
+        }
+        for p, entry in items
+    }
+
+
+def get_loaded_handler_paths() -> List[str]:
+    """获取已加载的处理器路径列表"""
+    return [p for p, entry in _registry.items() if entry["target"] is not None]
@@ -0,0 +1,255 @@
+"""非阻塞日志管道
+
+日志记录只在调用线程中放入有界队列，格式化和写出都在后台线程中完成，
+消息突发时事件循环不会因为日志 I/O 而阻塞：
+- 队列满时丢弃新记录并计数（不等待），队列恢复后补记一条丢弃数量的警告
+- 消息延迟格式化：``logger.info("... %s", value)`` 和 log_kv 的参数在写出时才格式化
+- log_kv 记录结构化的键值（文本格式为 ``event key=value ...``，JSON 格式为独立字段）
+- 高频日志限流：LOG_HOT_PATH_LOGGERS 中的 logger 的 INFO/DEBUG 记录按调用位置
+  限速（每秒 LOG_HOT_PATH_RATE 条），超出后每 LOG_HOT_PATH_SAMPLE 条保留 1 条，
+  保留的记录注明此前省略的条数；WARNING 及以上不受影响
+
+环境变量：
+    LOG_FORMAT             text（默认）或 json
+    LOG_QUEUE_SIZE         队列容量（默认 10000）
+    LOG_HOT_PATH_LOGGERS   限流的 logger（逗号分隔，含子 logger）
+    LOG_HOT_PATH_RATE      每个调用位置每秒的记录数（默认 5）
+    LOG_HOT_PATH_SAMPLE    超出限速后的采样间隔（默认 100）
+"""
+
+# 标准库
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+HOT_PATH_LOGGERS: Tuple[str, ...] = tuple(
+    name.strip()
+    for name in os.getenv(
+        "LOG_HOT_PATH_LOGGERS",
+        "decorators,utils.schedule_message_helpers,utils.schedule_work_messages",
+    ).split(",")
+    if name.strip()
+)
+HOT_PATH_RATE = float(os.getenv("LOG_HOT_PATH_RATE", "5"))
+HOT_PATH_SAMPLE = max(int(os.getenv("LOG_HOT_PATH_SAMPLE", "100")), 1)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_setup_lock = threading.Lock()
+
+
+class KeyValueMessage:
+    """结构化日志消息（写出时才格式化）"""
+
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: Dict[str, Any]):
+        self.event = event
+        self.fields = fields
+
+    def __str__(self) -> str:
+        parts = [self.event]
+        parts.extend(f"{key}={value}" for key, value in self.fields.items())
+        return " ".join(parts)
+
+
+def log_kv(logger: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """记录结构化日志：事件名 + 键值字段
+
+    Usage:
+        log_kv(logger, logging.INFO, "group_message.sent", chat_id=chat_id, length=n)
+    """
+    if logger.isEnabledFor(level):
+        # stacklevel=2：调用位置（用于限流）记为 log_kv 的调用方
+        logger.log(level, KeyValueMessage(event, fields), stacklevel=2)
+
+
+class HotPathFilter(logging.Filter):
+    """按调用位置对高频 INFO/DEBUG 日志限速和采样"""
+
+    def __init__(self, prefixes: Tuple[str, ...], rate: float, sample: int):
+        super().__init__()
+        self.prefixes = prefixes
+        self.rate = rate
+        self.sample = sample
+        # (文件, 行号) -> [令牌数, 上次时间, 省略条数]
+        self._sites: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def _is_hot(self, name: str) -> bool:
+        return any(
+            name == prefix or name.startswith(f"{prefix}.") for prefix in self.prefixes
+        )
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self._is_hot(record.name):
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [self.rate, now, 0]
+            tokens = min(self.rate, site[0] + (now - site[1]) * self.rate)
+            site[1] = now
+            if tokens >= 1:
+                site[0] = tokens - 1
+            else:
+                site[0] = tokens
+                site[2] += 1
+                if site[2] % self.sample:
+                    return False
+                # 采样保留的这一条不计入省略数
+                site[2] -= 1
+            suppressed, site[2] = site[2], 0
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """放入有界队列、队列满时丢弃的 QueueHandler（不在调用线程中格式化）"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 异常的 traceback 引用调用栈，在调用线程中转换为文本；消息保持延迟格式化
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(
+                    record.exc_info
+                )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            warning = logging.makeLogRecord(
+                {
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": "日志队列已满，丢弃了 %d 条日志",
+                    "args": (dropped,),
+                }
+            )
+            try:
+                self.queue.put_nowait(warning)
+            except queue.Full:
+                self.dropped += dropped
+
+
+class _DrainingQueueListener(QueueListener):
+    """停止时等待队列中的记录写完（队列满时也能放入结束标记）"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel, timeout=5)
+
+
+class PipelineFormatter(logging.Formatter):
+    """文本格式：在被采样保留的记录后注明省略的条数"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f"（同一位置此前省略 {suppressed} 条）"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON 格式：每条记录一行，log_kv 的字段作为独立的键"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        if isinstance(record.msg, KeyValueMessage) and not record.args:
+            entry["event"] = record.msg.event
+            entry.update(record.msg.fields)
+        else:
+            entry["message"] = record.getMessage()
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """配置根 logger：记录进入队列，由后台线程写到 stderr（重复调用只生效一次）"""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(
+            JsonFormatter() if LOG_FORMAT == "json" else PipelineFormatter(TEXT_FORMAT)
+        )
+
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        if HOT_PATH_LOGGERS:
+            queue_handler.addFilter(
+                HotPathFilter(HOT_PATH_LOGGERS, HOT_PATH_RATE, HOT_PATH_SAMPLE)
+            )
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+        _queue_handler = queue_handler
+
+        _listener = _DrainingQueueListener(
+            log_queue, stream_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """写完队列中的日志并停止后台线程，之后的日志直接写出"""
+    global _listener, _queue_handler
+    with _setup_lock:
+        listener, _listener = _listener, None
+        queue_handler, _queue_handler = _queue_handler, None
+    if listener is None:
+        return
+
+    root = logging.getLogger()
+    for handler in listener.handlers:
+        root.addHandler(handler)
+    root.removeHandler(queue_handler)
+    listener.stop()
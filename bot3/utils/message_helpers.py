@@ -95,7 +95,8 @@ async def display_search_results_helper(
 
     order_count, total_amount, locked_groups = _calculate_search_statistics(orders)
     context.user_data["locked_groups"] = locked_groups
-    context.user_data["report_search_orders"] = orders
+    # 转为 dict 保存，会话状态持久化需要可 JSON 序列化的值
+    context.user_data["report_search_orders"] = [dict(order) for order in orders]
 
     result_msg = _build_search_result_message(
         order_count, total_amount, len(locked_groups)
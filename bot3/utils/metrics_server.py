@@ -0,0 +1,177 @@
+"""本地性能指标接口模块
+
+在本机端口上提供只读的 HTTP 接口，导出 performance_monitor 的直方图和慢追踪：
+
+    GET /metrics       Prometheus 文本格式
+    GET /metrics.json  JSON（操作统计、群组统计）
+    GET /traces        慢追踪和最近追踪（JSON）
+
+默认关闭，设置环境变量 METRICS_PORT 后在机器人启动时开启；
+只监听 METRICS_HOST（默认 127.0.0.1），不要暴露到公网。
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from utils.performance_monitor import (get_chat_performance_stats,
+                                       get_performance_stats)
+from utils.trace_spans import get_recent_traces, get_slow_traces
+
+logger = logging.getLogger(__name__)
+
+# 导出的分位数
+_QUANTILES = (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"))
+
+_server: Optional[asyncio.AbstractServer] = None
+
+
+def build_metrics_snapshot() -> Dict[str, Any]:
+    """构建指标快照（操作统计 + 群组统计）"""
+    return {
+        "operations": get_performance_stats(),
+        "chats": {
+            str(chat_id): stats
+            for chat_id, stats in get_chat_performance_stats().items()
+        },
+    }
+
+
+def build_traces_snapshot() -> Dict[str, List[Dict[str, Any]]]:
+    """构建追踪快照"""
+    return {
+        "slow": [trace.to_dict() for trace in get_slow_traces()],
+        "recent": [trace.to_dict() for trace in get_recent_traces()],
+    }
+
+
+def _escape_label(value: str) -> str:
+    """转义 Prometheus 标签值"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_summary(
+    lines: List[str], metric: str, label: str, value: str, stats: Dict[str, Any]
+) -> None:
+    """输出一组 summary 指标"""
+    labels = f'{label}="{_escape_label(value)}"'
+    for quantile, key in _QUANTILES:
+        lines.append(f'{metric}{{{labels},quantile="{quantile}"}} {stats[key]:.6f}')
+    lines.append(f"{metric}_sum{{{labels}}} {stats['total_time']:.6f}")
+    lines.append(f"{metric}_count{{{labels}}} {stats['count']}")
+
+
+def render_prometheus() -> str:
+    """将当前统计渲染为 Prometheus 文本格式"""
+    snapshot = build_metrics_snapshot()
+    lines = [
+        "# HELP bot_operation_seconds 处理器/服务/数据库操作耗时",
+        "# TYPE bot_operation_seconds summary",
+    ]
+    for op, stats in sorted(snapshot["operations"].items()):
+        _render_summary(lines, "bot_operation_seconds", "operation", op, stats)
+
+    lines.append("# HELP bot_operation_errors_total 操作失败次数")
+    lines.append("# TYPE bot_operation_errors_total counter")
+    for op, stats in sorted(snapshot["operations"].items()):
+        lines.append(
+            f'bot_operation_errors_total{{operation="{_escape_label(op)}"}} '
+            f"{stats['errors']}"
+        )
+
+    lines.append("# HELP bot_chat_update_seconds 按群组统计的更新处理耗时")
+    lines.append("# TYPE bot_chat_update_seconds summary")
+    for chat_id, stats in sorted(snapshot["chats"].items()):
+        _render_summary(lines, "bot_chat_update_seconds", "chat_id", chat_id, stats)
+    return "\n".join(lines) + "\n"
+
+
+def _route(path: str):
+    """根据路径返回 (状态码, Content-Type, 响应体)"""
+    if path == "/metrics":
+        return 200, "text/plain; version=0.0.4; charset=utf-8", render_prometheus()
+    if path == "/metrics.json":
+        body = json.dumps(build_metrics_snapshot(), ensure_ascii=False)
+        return 200, "application/json; charset=utf-8", body
+    if path == "/traces":
+        body = json.dumps(build_traces_snapshot(), ensure_ascii=False)
+        return 200, "application/json; charset=utf-8", body
+    return 404, "text/plain; charset=utf-8", "not found\n"
+
+
+async def _handle_connection(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """处理一个 HTTP 请求（只支持 GET）"""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        # 读完请求头，忽略内容
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout=5)
+            if not line or line in (b"\r\n", b"\n"):
+                break
+
+        parts = request_line.decode("latin-1").split()
+        if len(parts) < 2 or parts[0] != "GET":
+            status, content_type, body = 405, "text/plain", "method not allowed\n"
+        else:
+            status, content_type, body = _route(parts[1].split("?", 1)[0])
+
+        payload = body.encode("utf-8")
+        reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {reason}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + payload
+        )
+        await writer.drain()
+    except Exception as e:
+        logger.debug(f"指标接口请求处理失败: {e}")
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(
+    port: Optional[int] = None, host: Optional[str] = None
+) -> Optional[asyncio.AbstractServer]:
+    """启动本地指标接口
+
+    Args:
+        port: 端口，为None时读取 METRICS_PORT，未设置则不启动
+        host: 监听地址，为None时读取 METRICS_HOST（默认 127.0.0.1）
+
+    Returns:
+        服务器实例，未启动时返回 None
+    """
+    global _server
+
+    if _server is not None:
+        return _server
+
+    if port is None:
+        port_str = os.getenv("METRICS_PORT", "").strip()
+        if not port_str:
+            return None
+        port = int(port_str)
+    host = host or os.getenv("METRICS_HOST", "127.0.0.1")
+
+    _server = await asyncio.start_server(_handle_connection, host, port)
+    logger.info(f"性能指标接口已启动: http://{host}:{port}/metrics")
+    return _server
+
+
+async def stop_metrics_server() -> None:
+    """关闭本地指标接口"""
+    global _server
+
+    if _server is None:
+        return
+    _server.close()
+    await _server.wait_closed()
+    _server = None
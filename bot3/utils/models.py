@@ -6,6 +6,8 @@
 from datetime import date, datetime
 from typing import Literal, Optional
 
+from utils.money import round_money
+
 try:
     from pydantic import BaseModel, Field, field_validator
 
@@ -134,7 +136,7 @@ class OrderCreateModel(BaseModel):
         """验证金额"""
         if v <= 0:
             raise ValueError(f"订单金额必须大于0，当前值: {v}")
-        return round(v, 2)  # 保留2位小数
+        return round_money(v)  # 保留2位小数
 
     def to_dict(self) -> dict:
         """转换为字典（用于数据库操作）"""
@@ -145,7 +147,7 @@ class OrderCreateModel(BaseModel):
             "date": getattr(self, "date", ""),
             "weekday_group": getattr(self, "weekday_group", ""),
             "customer": getattr(self, "customer", "A"),
-            "amount": round(getattr(self, "amount", 0.0), 2),
+            "amount": round_money(getattr(self, "amount", 0.0)),
             "state": getattr(self, "state", "normal"),
         }
 
@@ -164,7 +166,7 @@ class AmountModel(BaseModel):
         """验证金额"""
         if v <= 0:
             raise ValueError(f"金额必须大于0，当前值: {v}")
-        return round(v, 2)  # 保留2位小数
+        return round_money(v)  # 保留2位小数
 
     def __float__(self) -> float:
         """转换为float"""
@@ -270,4 +272,4 @@ def validate_amount(amount: float, min_value: float = 0.01) -> float:
         raise ValueError(f"金额必须大于0，当前值: {amount}")
     if amount < min_value:
         raise ValueError(f"金额必须大于等于 {min_value}，当前值: {amount}")
-    return round(amount, 2)
+    return round_money(amount)
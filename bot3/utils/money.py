@@ -0,0 +1,79 @@
+"""金额定点运算工具
+
+金额在数据库中以整数"分"存储（见 db.money_columns），统计累加也按分进行，
+浮点数只出现在边界：用户输入解析、显示格式化和 Excel 导入导出。
+
+转换统一按十进制四舍五入（ROUND_HALF_UP）到分：
+    to_cents(1234.565) -> 123457
+    from_cents(123457) -> 1234.57
+"""
+
+# 标准库
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Iterable
+
+# 每个货币单位的分数
+CENTS_PER_UNIT = 100
+
+_ONE = Decimal(1)
+
+
+def to_decimal(value: Any) -> Decimal:
+    """把金额转换为 Decimal（None / 空字符串视为 0）
+
+    浮点数按其最短十进制表示转换（0.1 -> Decimal("0.1")），
+    不会把二进制误差带入结果。
+
+    Raises:
+        ValueError: 无法解析为金额
+    """
+    if value is None or value == "":
+        return Decimal(0)
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, bool):
+        raise ValueError(f"无效的金额: {value!r}")
+    if isinstance(value, int):
+        return Decimal(value)
+    try:
+        if isinstance(value, float):
+            result = Decimal(repr(value))
+        else:
+            result = Decimal(str(value).strip().replace(",", ""))
+    except InvalidOperation:
+        raise ValueError(f"无效的金额: {value!r}") from None
+    if not result.is_finite():
+        raise ValueError(f"无效的金额: {value!r}")
+    return result
+
+
+def to_cents(value: Any) -> int:
+    """金额 -> 整数分（四舍五入）"""
+    return int((to_decimal(value) * CENTS_PER_UNIT).quantize(_ONE, ROUND_HALF_UP))
+
+
+def from_cents(cents: Any) -> float:
+    """整数分 -> 金额（None 视为 0）"""
+    if cents is None:
+        return 0.0
+    return int(cents) / CENTS_PER_UNIT
+
+
+def round_money(value: Any) -> float:
+    """金额四舍五入到分"""
+    return from_cents(to_cents(value))
+
+
+def sum_cents(values: Iterable[Any]) -> int:
+    """按分累加金额，返回整数分"""
+    return sum(to_cents(value) for value in values)
+
+
+def sum_money(values: Iterable[Any]) -> float:
+    """按分累加金额，结果没有浮点累积误差"""
+    return from_cents(sum_cents(values))
+
+
+def money_diff(actual: Any, recorded: Any) -> float:
+    """两个金额的差（按分计算，不相等时至少相差 0.01）"""
+    return from_cents(to_cents(actual) - to_cents(recorded))
@@ -12,9 +12,9 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
 # 本地模块
-import db_operations
 from utils.broadcast_helpers import (calculate_next_payment_date,
                                      format_broadcast_message)
+from utils.chat_metadata_cache import get_cached_group_message_config
 
 logger = logging.getLogger(__name__)
 
@@ -98,7 +98,7 @@ async def send_auto_broadcast(
     try:
         message = await _prepare_broadcast_message(amount, order_date)
 
-        config = await db_operations.get_group_message_config_by_chat_id(chat_id)
+        config = await get_cached_group_message_config(chat_id)
         bot_links = config.get("bot_links") if config else None
         worker_links = config.get("worker_links") if config else None
 
@@ -1,10 +1,13 @@
 """订单表格生成工具"""
 
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List
 
 import db_operations
 from constants import ORDER_STATES
 
+# 每批读取利息记录的订单数（一批一次查询）
+ORDER_TABLE_BATCH_SIZE = 500
+
 
 async def format_order_table_row(order: Dict, interests: List[Dict]) -> str:
     """格式化订单表格行"""
@@ -34,31 +37,43 @@ async def format_order_table_row(order: Dict, interests: List[Dict]) -> str:
     return row
 
 
-async def generate_order_table(orders: List[Dict], daily_interest: float = 0) -> str:
-    """生成订单总表"""
-    if not orders:
-        return "订单总表（有效订单）\n═══════════════════════════════════════\n\n暂无有效订单"
-
-    table = "订单总表（有效订单）\n"
-    table += "═══════════════════════════════════════\n"
-    table += f"{'时间':<12}  {'订单号':<15}  {'金额':>12}  {'状态':<6}\n"
-    table += "─────────────────────────────────────────\n"
-
-    for order in orders:
-        order_id = order.get("order_id")
-        # 获取该订单的所有利息记录
-        if order_id:
-            interests = await db_operations.get_all_interest_by_order_id(order_id)
-        else:
-            interests = []
-        row = await format_order_table_row(order, interests)
-        table += row + "\n"
+async def iter_order_table_lines(
+    orders: List[Dict], daily_interest: float = 0
+) -> AsyncIterator[str]:
+    """逐行生成订单总表（可由 utils.report_stream.stream_report 边生成边发送）
 
-    table += "═══════════════════════════════════════\n"
+    利息记录按 ORDER_TABLE_BATCH_SIZE 个订单一批读取，不再每个订单查询一次。
+    """
+    yield "订单总表（有效订单）"
+    yield "═══════════════════════════════════════"
+    if not orders:
+        yield ""
+        yield "暂无有效订单"
+        return
+
+    yield f"{'时间':<12}  {'订单号':<15}  {'金额':>12}  {'状态':<6}"
+    yield "─────────────────────────────────────────"
+
+    for start in range(0, len(orders), ORDER_TABLE_BATCH_SIZE):
+        batch = orders[start : start + ORDER_TABLE_BATCH_SIZE]
+        # 一次查询读取这批订单的全部利息记录
+        order_ids = [order["order_id"] for order in batch if order.get("order_id")]
+        interests_map = await db_operations.get_interests_by_order_ids(order_ids)
+        for order in batch:
+            interests = interests_map.get(order.get("order_id"), [])
+            yield await format_order_table_row(order, interests)
+
+    yield "═══════════════════════════════════════"
     if daily_interest > 0:
-        table += f"当日利息汇总: {daily_interest:,.2f}\n"
+        yield f"当日利息汇总: {daily_interest:,.2f}"
 
-    return table
+
+async def generate_order_table(orders: List[Dict], daily_interest: float = 0) -> str:
+    """生成订单总表"""
+    lines = [line async for line in iter_order_table_lines(orders, daily_interest)]
+    if not orders:
+        return "\n".join(lines)
+    return "\n".join(lines) + "\n"
 
 
 async def _generate_orders_summary_table(orders: List[Dict], title: str) -> str:
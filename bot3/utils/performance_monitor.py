@@ -1,32 +1,138 @@
 """性能监控工具模块
 
 提供性能监控和统计功能。
+
+耗时使用固定内存的对数分桶直方图（HDR 风格）记录，不保存原始样本，
+可以给出 p50/p95/p99 等分位数，相对误差不超过约 6%。
 """
 
-import asyncio
 import logging
+import threading
 import time
 from collections import defaultdict
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from utils.trace_spans import span
 
 logger = logging.getLogger(__name__)
 
 # 类型变量
 T = TypeVar("T")
 
-# 性能统计存储
-_performance_stats: Dict[str, List[float]] = defaultdict(list)
-_performance_counters: Dict[str, int] = defaultdict(int)
+# 直方图精度：每个 2 的幂区间再细分为 2^(SUB_BUCKET_BITS-1) 个子桶
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKET_HALF = 1 << (_SUB_BUCKET_BITS - 1)
+# 可记录的最大耗时（微秒），约 71 分钟，超出部分计入最后一个桶
+_MAX_TRACKABLE_US = (1 << 32) - 1
+_BUCKET_COUNT = (
+    (_MAX_TRACKABLE_US.bit_length() - _SUB_BUCKET_BITS + 1) * _SUB_BUCKET_HALF
+    + _SUB_BUCKET_HALF
+)
+
+# 按群组统计的最大群组数量（超出后新群组不再单独统计）
+MAX_TRACKED_CHATS = 1000
+
+
+def _bucket_index(value_us: int) -> int:
+    """计算耗时（微秒）对应的桶下标"""
+    if value_us < (1 << _SUB_BUCKET_BITS):
+        return value_us
+    exponent = value_us.bit_length() - _SUB_BUCKET_BITS
+    return exponent * _SUB_BUCKET_HALF + (value_us >> exponent)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    """桶下标对应的耗时上界（微秒）"""
+    if index < (1 << _SUB_BUCKET_BITS):
+        return index
+    exponent = (index - _SUB_BUCKET_HALF) // _SUB_BUCKET_HALF
+    mantissa = index - exponent * _SUB_BUCKET_HALF
+    return ((mantissa + 1) << exponent) - 1
+
+
+class LatencyHistogram:
+    """固定内存的耗时直方图
+
+    每个操作只占用一个定长计数数组，记录为 O(1)，不会随调用次数增长。
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        """记录一次耗时（秒）"""
+        value_us = min(max(int(duration * 1_000_000), 0), _MAX_TRACKABLE_US)
+        self.counts[_bucket_index(value_us)] += 1
+        if self.count == 0 or duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        self.count += 1
+        self.total += duration
+
+    def percentile(self, percent: float) -> float:
+        """获取分位数耗时（秒）
+
+        Args:
+            percent: 百分位，如 50、95、99
+        """
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(self.count * percent / 100.0 + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            if seen >= target:
+                value = _bucket_upper_bound(index) / 1_000_000
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """合并另一个直方图"""
+        if other.count == 0:
+            return
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        if self.count == 0 or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def summary(self) -> Dict[str, float]:
+        """汇总统计（秒）"""
+        return {
+            "count": self.count,
+            "avg_time": self.total / self.count if self.count else 0.0,
+            "min_time": self.min,
+            "max_time": self.max,
+            "total_time": self.total,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
 
 
 class PerformanceMonitor:
     """性能监控器"""
 
     def __init__(self):
-        self.stats: Dict[str, List[float]] = defaultdict(list)
+        self.stats: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.chat_stats: Dict[int, LatencyHistogram] = {}
         self.counters: Dict[str, int] = defaultdict(int)
         self.errors: Dict[str, int] = defaultdict(int)
+        # 数据库函数在事件循环中记录，脚本/线程池中也可能调用，统一加锁
+        self._lock = threading.Lock()
 
     def record_timing(self, operation: str, duration: float) -> None:
         """
@@ -36,9 +142,24 @@ class PerformanceMonitor:
             operation: 操作名称
             duration: 耗时（秒）
         """
-        self.stats[operation].append(duration)
-        if len(self.stats[operation]) > 1000:  # 限制存储数量
-            self.stats[operation] = self.stats[operation][-1000:]
+        with self._lock:
+            self.stats[operation].record(duration)
+
+    def record_chat_timing(self, chat_id: int, duration: float) -> None:
+        """
+        按群组记录处理耗时
+
+        Args:
+            chat_id: 聊天ID
+            duration: 耗时（秒）
+        """
+        with self._lock:
+            histogram = self.chat_stats.get(chat_id)
+            if histogram is None:
+                if len(self.chat_stats) >= MAX_TRACKED_CHATS:
+                    return
+                histogram = self.chat_stats[chat_id] = LatencyHistogram()
+            histogram.record(duration)
 
     def increment_counter(self, operation: str, count: int = 1) -> None:
         """
@@ -48,7 +169,8 @@ class PerformanceMonitor:
             operation: 操作名称
             count: 增加数量
         """
-        self.counters[operation] += count
+        with self._lock:
+            self.counters[operation] += count
 
     def record_error(self, operation: str) -> None:
         """
@@ -57,7 +179,8 @@ class PerformanceMonitor:
         Args:
             operation: 操作名称
         """
-        self.errors[operation] += 1
+        with self._lock:
+            self.errors[operation] += 1
 
     def get_stats(self, operation: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -70,27 +193,15 @@ class PerformanceMonitor:
             统计信息字典
         """
         if operation:
-            timings = self.stats.get(operation, [])
-            if not timings:
-                return {
-                    "operation": operation,
-                    "count": 0,
-                    "avg_time": 0.0,
-                    "min_time": 0.0,
-                    "max_time": 0.0,
-                    "total_time": 0.0,
-                    "errors": self.errors.get(operation, 0),
-                }
-
-            return {
-                "operation": operation,
-                "count": len(timings),
-                "avg_time": sum(timings) / len(timings),
-                "min_time": min(timings),
-                "max_time": max(timings),
-                "total_time": sum(timings),
-                "errors": self.errors.get(operation, 0),
-            }
+            histogram = self.stats.get(operation)
+            result = {"operation": operation}
+            if histogram is None:
+                result.update(LatencyHistogram().summary())
+            else:
+                with self._lock:
+                    result.update(histogram.summary())
+            result["errors"] = self.errors.get(operation, 0)
+            return result
         else:
             # 返回所有操作的统计
             result = {}
@@ -98,6 +209,19 @@ class PerformanceMonitor:
                 result[op] = self.get_stats(op)
             return result
 
+    def get_chat_stats(self) -> Dict[int, Dict[str, float]]:
+        """
+        获取按群组统计的处理耗时
+
+        Returns:
+            {chat_id: 统计信息字典}
+        """
+        with self._lock:
+            return {
+                chat_id: histogram.summary()
+                for chat_id, histogram in self.chat_stats.items()
+            }
+
     def reset(self, operation: Optional[str] = None) -> None:
         """
         重置统计信息
@@ -111,6 +235,7 @@ class PerformanceMonitor:
             self.errors.pop(operation, None)
         else:
             self.stats.clear()
+            self.chat_stats.clear()
             self.counters.clear()
             self.errors.clear()
 
@@ -159,6 +284,30 @@ def _record_failed_operation(
         )
 
 
+def record_operation(
+    op_name: str, duration: float, error: bool = False, threshold_ms: float = 1000.0
+) -> None:
+    """记录一次操作耗时（供自动埋点的处理器/数据库装饰器使用）
+
+    Args:
+        op_name: 操作名称，如 "handler:create_order"、"db:get_order_by_chat_id"
+        duration: 持续时间（秒）
+        error: 是否失败
+        threshold_ms: 性能阈值（毫秒），超过此值会记录警告
+    """
+    duration_ms = duration * 1000
+    if error:
+        _record_failed_operation(op_name, duration, duration_ms, threshold_ms)
+    else:
+        _record_successful_operation(op_name, duration, duration_ms, threshold_ms)
+
+
+def record_chat_timing(chat_id: Optional[int], duration: float) -> None:
+    """按群组记录一次更新的处理耗时"""
+    if chat_id is not None:
+        _performance_monitor.record_chat_timing(chat_id, duration)
+
+
 def monitor_performance(
     operation_name: Optional[str] = None, threshold_ms: float = 1000.0
 ):
@@ -182,7 +331,8 @@ def monitor_performance(
         async def wrapper(*args, **kwargs) -> T:
             start_time = time.perf_counter()
             try:
-                result = await func(*args, **kwargs)
+                with span(op_name):
+                    result = await func(*args, **kwargs)
                 duration = time.perf_counter() - start_time
                 duration_ms = duration * 1000
 
@@ -190,7 +340,7 @@ def monitor_performance(
                     op_name, duration, duration_ms, threshold_ms
                 )
                 return result
-            except Exception as e:
+            except Exception:
                 duration = time.perf_counter() - start_time
                 duration_ms = duration * 1000
 
@@ -215,6 +365,16 @@ def get_performance_stats(operation: Optional[str] = None) -> Dict[str, Any]:
     return _performance_monitor.get_stats(operation)
 
 
+def get_chat_performance_stats() -> Dict[int, Dict[str, float]]:
+    """
+    获取按群组统计的处理耗时
+
+    Returns:
+        {chat_id: 统计信息字典}
+    """
+    return _performance_monitor.get_chat_stats()
+
+
 def reset_performance_stats(operation: Optional[str] = None) -> None:
     """
     重置性能统计信息
@@ -247,6 +407,8 @@ def log_performance_summary() -> None:
                 f"count={data['count']}, "
                 f"avg={avg_ms:.2f}ms, "
                 f"min={data['min_time']*1000:.2f}ms, "
+                f"p95={data['p95']*1000:.2f}ms, "
+                f"p99={data['p99']*1000:.2f}ms, "
                 f"max={max_ms:.2f}ms, "
                 f"errors={data['errors']}"
             )
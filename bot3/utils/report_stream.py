@@ -0,0 +1,330 @@
+"""长文本报表的流式分段发送
+
+收入明细、操作记录等文本报表原来在取完全部数据后用 += 拼出整个字符串，发送时再
+截断或分段，行数多时要等全部拼完才看到第一条消息。现在报表按行生成，边生成边
+分段发送：
+- ReportChunker 把行组装为不超过 REPORT_CHUNK_LENGTH 的消息分段（按 Telegram
+  计算长度的 UTF-16 单位），只在行边界断开；单行超长时按长度切开。HTML 模式下
+  不会切断实体（&amp; 等）和标签，跨分段的标签在分段末尾关闭、下一段开头重新打开
+- stream_report 在后台任务中生成分段，第一段凑满即发送，其余分段边生成边发送，
+  第一条消息的等待时间与报表大小无关
+- 超过 REPORT_MAX_MESSAGES 段时不再发送文本，改为发送包含完整报表的 Excel 文件
+
+环境变量：
+    REPORT_MAX_MESSAGES   文本报表最多发送的消息段数（默认 10；超出时发送 Excel）
+"""
+
+# 标准库
+import asyncio
+import logging
+import os
+import re
+from typing import (Any, AsyncIterable, Awaitable, Callable, Iterable, List,
+                    NamedTuple, Optional, Tuple, Union)
+
+# 本地模块
+from constants import TELEGRAM_MESSAGE_SAFE_LENGTH
+
+# 日志
+logger = logging.getLogger(__name__)
+
+REPORT_MAX_MESSAGES = int(os.getenv("REPORT_MAX_MESSAGES", "10"))
+REPORT_CHUNK_LENGTH = TELEGRAM_MESSAGE_SAFE_LENGTH
+
+# 生成领先发送的分段数（发送较慢时生成方等待，不积压整份报表）
+_PREFETCH_CHUNKS = 2
+
+_TAG_RE = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)[^>]*>")
+
+ReportLines = Union[Iterable[str], AsyncIterable[str]]
+
+
+def text_length(text: str) -> int:
+    """Telegram 计算的消息长度（UTF-16 单位，emoji 等占 2）"""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _safe_cut(line: str, cut: int, html: bool) -> int:
+    """调整切分位置：HTML 模式下不落在实体或标签内部"""
+    if not html:
+        return cut
+    for start, end in (("&", ";"), ("<", ">")):
+        opened = line.rfind(start, 0, cut)
+        if opened > line.rfind(end, 0, cut):
+            # 切点位于未结束的实体或标签中，退到它之前
+            if opened > 0:
+                cut = opened
+    return cut
+
+
+def split_long_line(line: str, limit: int, html: bool = False) -> List[str]:
+    """把超过 limit 的行按长度切开"""
+    pieces = []
+    while text_length(line) > limit:
+        cut = min(len(line), limit)
+        while cut > 1 and text_length(line[:cut]) > limit:
+            cut -= max((text_length(line[:cut]) - limit + 1) // 2, 1)
+        cut = _safe_cut(line, cut, html)
+        pieces.append(line[:cut])
+        line = line[cut:]
+    pieces.append(line)
+    return pieces
+
+
+class ReportChunker:
+    """把报表行组装为消息分段
+
+    Usage:
+        chunker = ReportChunker()
+        for line in lines:
+            for chunk in chunker.add(line):
+                send(chunk)
+        for chunk in chunker.finish():
+            send(chunk)
+    """
+
+    def __init__(self, limit: int = REPORT_CHUNK_LENGTH, html: bool = False):
+        self.limit = limit
+        self.html = html
+        self._parts: List[str] = []
+        self._length = 0
+        # 当前分段是否已有内容（不计重新打开的标签）
+        self._has_content = False
+        # HTML 模式下当前未关闭的标签：(标签名, 开始标签原文)
+        self._open_tags: List[Tuple[str, str]] = []
+
+    @staticmethod
+    def _closing(tags: List[Tuple[str, str]]) -> str:
+        return "".join(f"</{name}>" for name, _ in reversed(tags))
+
+    def _track_tags(self, line: str) -> List[Tuple[str, str]]:
+        tags = list(self._open_tags)
+        for match in _TAG_RE.finditer(line):
+            closing, name = match.group(1), match.group(2).lower()
+            if not closing:
+                tags.append((name, match.group(0)))
+                continue
+            for index in range(len(tags) - 1, -1, -1):
+                if tags[index][0] == name:
+                    del tags[index]
+                    break
+        return tags
+
+    def _emit(self) -> str:
+        chunk = "".join(self._parts).rstrip("\n") + self._closing(self._open_tags)
+        # 下一段以仍未关闭的标签开头
+        reopen = "".join(tag for _, tag in self._open_tags)
+        self._parts = [reopen] if reopen else []
+        self._length = text_length(reopen)
+        self._has_content = False
+        return chunk
+
+    def add(self, line: str) -> List[str]:
+        """加入一行，返回因此凑满的分段"""
+        chunks = []
+        limit = self.limit
+        if self.html:
+            # 单行切分时给分段开头重新打开、末尾关闭的标签留出余量
+            tags = self._open_tags + [
+                (match.group(2), match.group(0)) for match in _TAG_RE.finditer(line)
+            ]
+            limit -= sum(len(tag) for _, tag in tags) + len(self._closing(tags))
+        for piece in split_long_line(line, max(limit, 1) - 1, self.html):
+            tags = self._track_tags(piece) if self.html else self._open_tags
+            piece_length = text_length(piece) + 1
+            closing = len(self._closing(tags))
+            if (
+                self._has_content
+                and self._length + piece_length + closing > self.limit
+            ):
+                chunks.append(self._emit())
+            self._parts.append(piece + "\n")
+            self._length += piece_length
+            self._has_content = True
+            self._open_tags = tags
+        return chunks
+
+    def finish(self) -> List[str]:
+        """剩余内容作为最后一段"""
+        if not self._has_content:
+            return []
+        return [self._emit()]
+
+
+def chunk_report(
+    lines: Iterable[str], limit: int = REPORT_CHUNK_LENGTH, html: bool = False
+) -> List[str]:
+    """把报表行全部分段（不需要流式发送时使用）"""
+    chunker = ReportChunker(limit, html)
+    chunks = []
+    for line in lines:
+        chunks.extend(chunker.add(line))
+    chunks.extend(chunker.finish())
+    return chunks
+
+
+# ========== 发送 ==========
+
+
+class ReportSenders(NamedTuple):
+    """报表的发送方式
+
+    first: 发送第一段（通常带按钮）
+    next: 发送其余分段和提示
+    document: 发送 Excel 文件 (文件路径, 文件名)
+    """
+
+    first: Callable[[str], Awaitable[Any]]
+    next: Callable[[str], Awaitable[Any]]
+    document: Optional[Callable[[str, str], Awaitable[Any]]] = None
+
+
+def _document_sender(message):
+    async def send_document(file_path: str, filename: str) -> None:
+        with open(file_path, "rb") as f:
+            await message.reply_document(document=f, filename=filename)
+
+    return send_document
+
+
+def message_senders(
+    message, reply_markup=None, parse_mode: Optional[str] = None
+) -> ReportSenders:
+    """回复消息发送报表（第一段带 reply_markup）"""
+
+    async def send_first(text: str) -> None:
+        await message.reply_text(
+            text, reply_markup=reply_markup, parse_mode=parse_mode
+        )
+
+    async def send_next(text: str) -> None:
+        await message.reply_text(text, parse_mode=parse_mode)
+
+    return ReportSenders(send_first, send_next, _document_sender(message))
+
+
+def query_senders(
+    query, reply_markup=None, parse_mode: Optional[str] = None
+) -> ReportSenders:
+    """回调查询发送报表：第一段编辑原消息（带 reply_markup），其余分段回复"""
+    from utils.callback_helpers import safe_edit_message_text
+
+    async def send_first(text: str) -> None:
+        await safe_edit_message_text(
+            query, text, reply_markup=reply_markup, parse_mode=parse_mode
+        )
+
+    async def send_next(text: str) -> None:
+        if query.message:
+            await query.message.reply_text(text, parse_mode=parse_mode)
+
+    document = _document_sender(query.message) if query.message else None
+    return ReportSenders(send_first, send_next, document)
+
+
+async def _aiter_lines(lines: ReportLines):
+    if hasattr(lines, "__aiter__"):
+        async for line in lines:
+            yield line
+    else:
+        for line in lines:
+            yield line
+
+
+async def stream_report(
+    lines: ReportLines,
+    senders: ReportSenders,
+    name: str = "报表",
+    html: bool = False,
+    max_messages: Optional[int] = None,
+) -> int:
+    """边生成边分段发送文本报表
+
+    Args:
+        lines: 报表的行（可以是异步迭代器，如分页读取数据库）
+        senders: 发送方式（见 message_senders / query_senders）
+        name: 超出段数时 Excel 文件的文件名前缀
+        html: 行是否为 HTML（parse_mode="HTML"）
+        max_messages: 最多发送的消息段数（默认 REPORT_MAX_MESSAGES）
+
+    Returns:
+        发送的文本消息段数
+    """
+    if max_messages is None:
+        max_messages = REPORT_MAX_MESSAGES
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_PREFETCH_CHUNKS)
+    # 超出段数时发送 Excel 需要完整报表
+    collected: Optional[List[str]] = [] if senders.document else None
+
+    async def produce() -> Optional[str]:
+        """生成分段放入队列；超出段数时返回 Excel 文件路径（或空字符串）"""
+        chunker = ReportChunker(html=html)
+        produced = 0
+        overflow = False
+        try:
+            source = _aiter_lines(lines)
+            async for line in source:
+                if collected is not None:
+                    collected.append(line)
+                for chunk in chunker.add(line):
+                    if produced >= max_messages:
+                        overflow = True
+                        break
+                    await queue.put(chunk)
+                    produced += 1
+                    # 让发送方先发出已生成的分段
+                    await asyncio.sleep(0)
+                if overflow:
+                    break
+            if not overflow:
+                for chunk in chunker.finish():
+                    if produced >= max_messages:
+                        overflow = True
+                        break
+                    await queue.put(chunk)
+                    produced += 1
+        finally:
+            await queue.put(None)
+
+        if not overflow:
+            return None
+        if collected is None:
+            return ""
+        # 读完剩余的行，在渲染进程中生成 Excel（与发送文本并行）
+        async for line in source:
+            collected.append(line)
+        from utils.excel_export import export_report_lines_to_excel
+
+        return await export_report_lines_to_excel(name, collected)
+
+    producer = asyncio.create_task(produce())
+    sent = 0
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            await (senders.first if sent == 0 else senders.next)(chunk)
+            sent += 1
+    except BaseException:
+        producer.cancel()
+        raise
+
+    file_path = await producer
+    if file_path is None:
+        return sent
+
+    if not file_path:
+        await senders.next(f"⚠️ 报表过长，仅显示前 {max_messages} 段")
+        return sent
+    try:
+        await senders.next(f"⚠️ 报表超过 {max_messages} 段消息，完整内容见 Excel 文件")
+        await senders.document(file_path, f"{name}.xlsx")
+    finally:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+    return sent
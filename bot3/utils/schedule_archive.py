@@ -0,0 +1,77 @@
+"""数据归档任务
+
+每天把完成超过 ARCHIVE_AFTER_DAYS 天的订单移到归档库（见 db.archive）。
+ARCHIVE_AFTER_DAYS 为 0 时不注册任务。
+"""
+
+# 标准库
+import asyncio
+import logging
+
+# 本地模块
+from utils.schedule_jobs import (daily_trigger, ensure_job, get_job_options,
+                                 get_scheduler, remove_jobs_with_prefix,
+                                 set_job_bot)
+
+logger = logging.getLogger(__name__)
+
+# 全局调度器（从主模块导入）
+scheduler = None
+
+
+def set_scheduler(sched):
+    """设置全局调度器"""
+    global scheduler
+    scheduler = sched
+
+
+async def run_data_archive(bot):
+    """归档已完成的订单（定时任务）"""
+    try:
+        from db.archive import (ARCHIVE_AFTER_DAYS, archive_cutoff,
+                                archive_finished_orders)
+
+        if ARCHIVE_AFTER_DAYS <= 0:
+            return
+
+        cutoff = archive_cutoff(ARCHIVE_AFTER_DAYS)
+        logger.info(f"开始归档 {cutoff} 之前完成的订单...")
+        # 按批移动，在线程中执行以免阻塞事件循环
+        totals = await asyncio.to_thread(archive_finished_orders, cutoff)
+        logger.info(f"数据归档完成: {totals}")
+    except Exception as e:
+        logger.error(f"数据归档失败: {e}", exc_info=True)
+
+
+async def setup_data_archive_schedule(bot, sched=None):
+    """设置数据归档定时任务（每天凌晨4点执行）"""
+    global scheduler
+    if sched:
+        scheduler = sched
+
+    if scheduler is None:
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
+
+    try:
+        from db.archive import ARCHIVE_AFTER_DAYS
+
+        if ARCHIVE_AFTER_DAYS <= 0:
+            # 关闭归档时移除之前持久化的任务
+            remove_jobs_with_prefix("data_archive", scheduler=scheduler)
+            return
+
+        # 每天凌晨4点执行（避开 02:00 的备份）
+        options = get_job_options("data_archive")
+        ensure_job(
+            "data_archive",
+            "data_archive",
+            daily_trigger(4, 0, options),
+            options=options,
+            scheduler=scheduler,
+        )
+        logger.info(
+            f"已设置数据归档任务: 每天 04:00 归档完成超过 {ARCHIVE_AFTER_DAYS} 天的订单"
+        )
+    except Exception as e:
+        logger.error(f"设置数据归档任务失败: {e}", exc_info=True)
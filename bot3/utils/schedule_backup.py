@@ -8,8 +8,10 @@ import logging
 
 # 第三方库
 import pytz
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+
+# 本地模块
+from utils.schedule_jobs import (daily_trigger, ensure_job, get_job_options,
+                                 get_scheduler, set_job_bot)
 
 # 北京时区
 BEIJING_TZ = pytz.timezone("Asia/Shanghai")
@@ -59,24 +61,18 @@ async def setup_database_backup_schedule(bot, sched=None):
         scheduler = sched
 
     if scheduler is None:
-        scheduler = AsyncIOScheduler()
-        scheduler.start()
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
 
     try:
-        # 移除旧任务（如果存在）
-        try:
-            scheduler.remove_job("database_backup")
-            logger.info("已移除旧的数据库备份任务")
-        except Exception as e:
-            logger.debug(f"移除旧任务时出错（可忽略）: {e}")
-
-        # 添加定时任务（每天凌晨2点执行）
-        scheduler.add_job(
-            create_database_backup,
-            trigger=CronTrigger(hour=2, minute=0, timezone=BEIJING_TZ),
-            args=[bot],
-            id="database_backup",
-            replace_existing=True,
+        # 每天凌晨2点执行
+        options = get_job_options("database_backup")
+        ensure_job(
+            "database_backup",
+            "database_backup",
+            daily_trigger(2, 0, options),
+            options=options,
+            scheduler=scheduler,
         )
         logger.info("已设置数据库备份任务: 每天 02:00 自动备份")
     except Exception as e:
@@ -8,11 +8,12 @@ import logging
 
 # 第三方库
 import pytz
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 
 # 本地模块
 import db_operations
+from utils.schedule_jobs import (daily_trigger, ensure_job, get_job_options,
+                                 get_scheduler, remove_jobs_with_prefix,
+                                 set_job_bot)
 
 # 北京时区
 BEIJING_TZ = pytz.timezone("Asia/Shanghai")
@@ -52,17 +53,17 @@ async def setup_scheduled_broadcasts(bot, sched=None):
         scheduler = sched
 
     if scheduler is None:
-        scheduler = AsyncIOScheduler()
-        scheduler.start()
-
-    # 只清除播报任务（不清除日切报表任务）
-    for job in scheduler.get_jobs():
-        if job.id.startswith("broadcast_"):
-            scheduler.remove_job(job.id)
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
 
     # 获取所有激活的定时播报
     broadcasts = await db_operations.get_active_scheduled_broadcasts()
 
+    # 只清除已停用的播报任务（不影响其他任务；未变化的播报保留下次执行时间）
+    active_job_ids = [f"broadcast_{broadcast['slot']}" for broadcast in broadcasts]
+    remove_jobs_with_prefix("broadcast_", keep=active_job_ids, scheduler=scheduler)
+
+    options = get_job_options("scheduled_broadcast")
     for broadcast in broadcasts:
         try:
             time_str = broadcast["time"]
@@ -74,12 +75,13 @@ async def setup_scheduled_broadcasts(bot, sched=None):
             # 创建定时任务（每天执行）
             job_id = f"broadcast_{broadcast['slot']}"
 
-            scheduler.add_job(
-                send_scheduled_broadcast,
-                trigger=CronTrigger(hour=hour, minute=minute, timezone=BEIJING_TZ),
-                args=[bot, broadcast],
-                id=job_id,
-                replace_existing=True,
+            ensure_job(
+                job_id,
+                "scheduled_broadcast",
+                daily_trigger(hour, minute, options),
+                args=[dict(broadcast)],
+                options=options,
+                scheduler=scheduler,
             )
 
             logger.info(
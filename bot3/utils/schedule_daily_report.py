@@ -1,20 +1,24 @@
 """日切报表任务
 
 包含日切报表的生成和发送功能。
+
+环境变量：
+    DAILY_SUMMARY_VERIFY: 报表发送后是否按明细核对并修复日切数据（默认 1）
 """
 
 # 标准库
 import logging
+import os
 from datetime import datetime, timedelta
 
 # 第三方库
 import pytz
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 
 # 本地模块
 import db_operations
 from config import ADMIN_IDS
+from utils.schedule_jobs import (daily_trigger, ensure_job, get_job_options,
+                                 get_scheduler, set_job_bot)
 
 # 北京时区
 BEIJING_TZ = pytz.timezone("Asia/Shanghai")
@@ -62,6 +66,9 @@ async def send_daily_report(bot):
         # 清理临时文件
         cleanup_temp_files([orders_excel_path, changes_excel_path])
 
+        # 报表已发出，再按明细核对增量维护的日切数据
+        await _verify_daily_summary(report_date)
+
         logger.info(f"每日Excel报表发送完成: 成功 {success_count}, 失败 {fail_count}")
         logger.info("=" * 60)
         logger.info("每日报表生成任务执行完成")
@@ -74,6 +81,20 @@ async def send_daily_report(bot):
         await send_error_notification(bot, e)
 
 
+async def _verify_daily_summary(report_date: str) -> None:
+    """核对日切数据，有差异时用明细重算结果修复"""
+    if os.getenv("DAILY_SUMMARY_VERIFY", "1") != "1":
+        return
+    from utils.daily_report_generator import verify_daily_summary
+
+    try:
+        diffs = await verify_daily_summary(report_date, repair=True)
+        if not diffs:
+            logger.info(f"日切数据核对一致 ({report_date})")
+    except Exception as e:
+        logger.error(f"核对日切数据失败: {e}", exc_info=True)
+
+
 async def setup_daily_report(bot, sched=None):
     """设置日切报表自动发送任务（每天23:05执行）"""
     global scheduler
@@ -81,17 +102,18 @@ async def setup_daily_report(bot, sched=None):
         scheduler = sched
 
     if scheduler is None:
-        scheduler = AsyncIOScheduler()
-        scheduler.start()
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
 
     # 添加日切报表任务
     try:
-        scheduler.add_job(
-            send_daily_report,
-            trigger=CronTrigger(hour=23, minute=5, timezone=BEIJING_TZ),
-            args=[bot],
-            id="daily_report",
-            replace_existing=True,
+        options = get_job_options("daily_report")
+        ensure_job(
+            "daily_report",
+            "daily_report",
+            daily_trigger(23, 5, options),
+            options=options,
+            scheduler=scheduler,
         )
         logger.info("已设置日切报表任务: 每天 23:05 自动发送")
     except Exception as e:
@@ -7,6 +7,7 @@ import logging
 from typing import Optional, Tuple
 
 import db_operations
+from db.snapshot import analytics_snapshot
 from utils.excel_export import (export_daily_changes_to_excel,
                                 export_orders_to_excel)
 
@@ -22,8 +23,10 @@ async def generate_excel_files(report_date: str) -> Tuple[Optional[str], Optiona
     Returns:
         Tuple[Optional[str], Optional[str]]: (订单总表Excel路径, 每日变化数据Excel路径)
     """
-    orders_excel_path = await _generate_orders_excel(report_date)
-    changes_excel_path = await _generate_changes_excel(report_date)
+    # 读取日切时刻的分析快照（重新生成），导出期间不占用主库的读锁
+    async with analytics_snapshot(max_age=0):
+        orders_excel_path = await _generate_orders_excel(report_date)
+        changes_excel_path = await _generate_changes_excel(report_date)
 
     return orders_excel_path, changes_excel_path
 
@@ -8,8 +8,10 @@ import logging
 
 # 第三方库
 import pytz
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+
+# 本地模块
+from utils.schedule_jobs import (daily_trigger, ensure_job, get_job_options,
+                                 get_scheduler, set_job_bot)
 
 # 北京时区
 BEIJING_TZ = pytz.timezone("Asia/Shanghai")
@@ -67,24 +69,18 @@ async def setup_data_integrity_check_schedule(bot, sched=None):
         scheduler = sched
 
     if scheduler is None:
-        scheduler = AsyncIOScheduler()
-        scheduler.start()
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
 
     try:
-        # 移除旧任务（如果存在）
-        try:
-            scheduler.remove_job("data_integrity_check")
-            logger.info("已移除旧的数据完整性检查任务")
-        except Exception as e:
-            logger.debug(f"移除旧任务时出错（可忽略）: {e}")
-
-        # 添加定时任务（每天凌晨3点执行）
-        scheduler.add_job(
-            check_data_integrity,
-            trigger=CronTrigger(hour=3, minute=0, timezone=BEIJING_TZ),
-            args=[bot],
-            id="data_integrity_check",
-            replace_existing=True,
+        # 每天凌晨3点执行
+        options = get_job_options("data_integrity_check")
+        ensure_job(
+            "data_integrity_check",
+            "data_integrity_check",
+            daily_trigger(3, 0, options),
+            options=options,
+            scheduler=scheduler,
         )
         logger.info("已设置数据完整性检查任务: 每天 03:00 自动检查")
     except Exception as e:
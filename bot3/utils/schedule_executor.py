@@ -9,6 +9,9 @@
 - schedule_promotion.py - 公司宣传消息任务
 - schedule_data_integrity.py - 数据完整性检查任务
 - schedule_backup.py - 数据库备份任务
+- schedule_archive.py - 数据归档任务
+- schedule_snapshot.py - 分析快照刷新任务
+- schedule_jobs.py - 调度器、任务注册和执行（SQLite 持久化）
 """
 
 # 标准库
@@ -16,9 +19,11 @@ import logging
 
 # 第三方库
 import pytz
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 # 本地模块
+from utils.schedule_archive import run_data_archive
+from utils.schedule_archive import set_scheduler as set_archive_scheduler
+from utils.schedule_archive import setup_data_archive_schedule
 from utils.schedule_backup import create_database_backup
 from utils.schedule_backup import set_scheduler as set_backup_scheduler
 from utils.schedule_backup import setup_database_backup_schedule
@@ -33,6 +38,8 @@ from utils.schedule_data_integrity import check_data_integrity
 from utils.schedule_data_integrity import \
     set_scheduler as set_integrity_scheduler
 from utils.schedule_data_integrity import setup_data_integrity_check_schedule
+from utils.schedule_jobs import get_scheduler, set_job_bot
+from utils.schedule_jobs import shutdown_scheduler as _shutdown_scheduler
 from utils.schedule_message_helpers import (
     _combine_fixed_message_with_anti_fraud, _combine_message_with_anti_fraud,
     _send_group_message, create_message_keyboard, format_admin_mentions,
@@ -45,6 +52,9 @@ from utils.schedule_promotion import (send_company_promotion_messages,
                                       send_promotion_messages_internal)
 from utils.schedule_promotion import set_scheduler as set_promotion_scheduler
 from utils.schedule_promotion import setup_promotion_messages_schedule
+from utils.schedule_snapshot import refresh_analytics_snapshot
+from utils.schedule_snapshot import set_scheduler as set_snapshot_scheduler
+from utils.schedule_snapshot import setup_analytics_snapshot_schedule
 from utils.schedule_work_messages import (send_end_work_messages,
                                           send_start_work_messages)
 from utils.schedule_work_messages import set_scheduler as set_work_scheduler
@@ -60,12 +70,17 @@ logger = logging.getLogger(__name__)
 scheduler = None
 
 
-def _init_scheduler():
-    """初始化全局调度器并设置到各个模块"""
+def _init_scheduler(bot=None):
+    """初始化全局调度器并设置到各个模块
+
+    Args:
+        bot: 任务执行时使用的 Bot（调度器启动时补执行错过的任务需要）
+    """
     global scheduler
     if scheduler is None:
-        scheduler = AsyncIOScheduler()
-        scheduler.start()
+        scheduler = get_scheduler(bot)
+    elif bot is not None:
+        set_job_bot(bot)
 
     # 设置调度器到各个模块
     set_broadcast_scheduler(scheduler)
@@ -74,6 +89,38 @@ def _init_scheduler():
     set_promotion_scheduler(scheduler)
     set_integrity_scheduler(scheduler)
     set_backup_scheduler(scheduler)
+    set_archive_scheduler(scheduler)
+    set_snapshot_scheduler(scheduler)
+
+
+async def setup_all_schedules(bot):
+    """启动调度器并注册所有定时任务（重复调用是幂等的）"""
+    _init_scheduler(bot)
+
+    await setup_scheduled_broadcasts(bot, scheduler)
+    await setup_daily_report(bot, scheduler)
+    await setup_start_work_schedule(bot, scheduler)
+    await setup_end_work_schedule(bot, scheduler)
+    await setup_promotion_messages_schedule(bot, scheduler)
+    await setup_data_integrity_check_schedule(bot, scheduler)
+    await setup_database_backup_schedule(bot, scheduler)
+    await setup_data_archive_schedule(bot, scheduler)
+    await setup_analytics_snapshot_schedule(bot, scheduler)
+    await setup_daily_operations_summary(bot)
+
+    try:
+        from db.module4_automation.job_runs import purge_job_runs
+
+        await purge_job_runs()
+    except Exception as e:
+        logger.debug(f"清理定时任务运行记录失败: {e}")
+
+
+def shutdown_scheduler() -> None:
+    """关闭调度器（任务已持久化，下次启动继续）"""
+    global scheduler
+    _shutdown_scheduler()
+    scheduler = None
 
 
 # 导出所有函数以保持向后兼容
@@ -116,6 +163,15 @@ __all__ = [
     # 数据库备份
     "create_database_backup",
     "setup_database_backup_schedule",
+    # 数据归档
+    "run_data_archive",
+    "setup_data_archive_schedule",
+    # 分析快照
+    "refresh_analytics_snapshot",
+    "setup_analytics_snapshot_schedule",
+    # 调度器
+    "setup_all_schedules",
+    "shutdown_scheduler",
     # 常量和调度器
     "BEIJING_TZ",
     "scheduler",
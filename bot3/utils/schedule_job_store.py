@@ -0,0 +1,156 @@
+"""定时任务 SQLite 持久化存储
+
+APScheduler 的 SQLite 任务存储（与 SQLAlchemyJobStore 的表结构一致，不依赖 SQLAlchemy），
+任务及其下次执行时间保存在 scheduler_jobs 表中：
+- 重启后任务按保存的下次执行时间继续，停机期间错过的执行在 misfire_grace_time
+  内会被补执行（coalesce 时多次错过只补一次）
+- 任务参数会被 pickle，不能包含 Bot 等不可序列化对象（见 utils.schedule_jobs）
+"""
+
+import logging
+import pickle
+import sqlite3
+import threading
+from typing import List, Optional
+
+from apscheduler.job import Job
+from apscheduler.jobstores.base import (BaseJobStore, ConflictingIdError,
+                                        JobLookupError)
+from apscheduler.util import (datetime_to_utc_timestamp,
+                              utc_timestamp_to_datetime)
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteJobStore(BaseJobStore):
+    """基于 sqlite3 的任务存储"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        pickle_protocol: int = pickle.HIGHEST_PROTOCOL,
+    ):
+        super().__init__()
+        self.db_path = db_path
+        self.pickle_protocol = pickle_protocol
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        if self.db_path is None:
+            import init_db
+
+            self.db_path = init_db.DB_NAME
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, timeout=30
+        )
+        # 表由 db.migrations 创建，这里兜底（单独使用存储时）
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scheduler_jobs ("
+                "id TEXT PRIMARY KEY, next_run_time REAL, job_state BLOB NOT NULL)"
+            )
+
+    def _execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        """在一个事务中执行单条语句"""
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params)
+
+    def _reconstitute_job(self, job_state: bytes) -> Job:
+        state = pickle.loads(job_state)  # nosec B301 - 数据来自本地数据库
+        state["jobstore"] = self
+        job = Job.__new__(Job)
+        job.__setstate__(state)
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _serialize(self, job: Job) -> tuple:
+        return (
+            datetime_to_utc_timestamp(job.next_run_time),
+            pickle.dumps(job.__getstate__(), self.pickle_protocol),
+        )
+
+    def _get_jobs(self, where: str = "", params=()) -> List[Job]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, job_state FROM scheduler_jobs {where} "
+                "ORDER BY next_run_time",
+                params,
+            ).fetchall()
+
+        jobs = []
+        failed_ids = []
+        for job_id, job_state in rows:
+            try:
+                jobs.append(self._reconstitute_job(job_state))
+            except Exception:
+                logger.exception(f"无法恢复定时任务 {job_id}，已删除")
+                failed_ids.append((job_id,))
+
+        if failed_ids:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "DELETE FROM scheduler_jobs WHERE id = ?", failed_ids
+                )
+        return jobs
+
+    def lookup_job(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_state FROM scheduler_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._reconstitute_job(row[0]) if row else None
+
+    def get_due_jobs(self, now):
+        return self._get_jobs(
+            "WHERE next_run_time <= ?", (datetime_to_utc_timestamp(now),)
+        )
+
+    def get_next_run_time(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_run_time) FROM scheduler_jobs "
+                "WHERE next_run_time IS NOT NULL"
+            ).fetchone()
+        return utc_timestamp_to_datetime(row[0]) if row and row[0] else None
+
+    def get_all_jobs(self):
+        jobs = self._get_jobs()
+        self._fix_paused_jobs_sorting(jobs)
+        return jobs
+
+    def add_job(self, job):
+        try:
+            self._execute(
+                "INSERT INTO scheduler_jobs (id, next_run_time, job_state) "
+                "VALUES (?, ?, ?)",
+                (job.id, *self._serialize(job)),
+            )
+        except sqlite3.IntegrityError:
+            raise ConflictingIdError(job.id)
+
+    def update_job(self, job):
+        cursor = self._execute(
+            "UPDATE scheduler_jobs SET next_run_time = ?, job_state = ? WHERE id = ?",
+            (*self._serialize(job), job.id),
+        )
+        if cursor.rowcount == 0:
+            raise JobLookupError(job.id)
+
+    def remove_job(self, job_id):
+        cursor = self._execute("DELETE FROM scheduler_jobs WHERE id = ?", (job_id,))
+        if cursor.rowcount == 0:
+            raise JobLookupError(job_id)
+
+    def remove_all_jobs(self):
+        self._execute("DELETE FROM scheduler_jobs")
+
+    def shutdown(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (path={self.db_path})>"
@@ -0,0 +1,362 @@
+"""定时任务调度核心
+
+- 全局 AsyncIOScheduler，任务保存在 SQLite（utils.schedule_job_store），
+  默认 misfire_grace_time + coalesce：重启错过的执行会补一次，不会重复补多次
+- 任务统一通过 run_scheduled_job(任务名, *参数) 执行：持久化的任务参数里不能有 Bot，
+  运行时由这里注入；同时记录耗时和运行结果（scheduler_job_runs）
+- ensure_job 幂等注册：定义（触发器/参数/选项）未变化时保留已保存的任务和下次执行时间
+- 每个任务可配置固定错峰（stagger）和随机抖动（jitter），避免多个任务同一秒访问
+  Telegram 和数据库
+
+环境变量：
+    SCHEDULER_PERSISTENCE: 是否持久化任务（默认 1；0 时使用内存存储）
+    SCHEDULE_MISFIRE_GRACE: 默认补执行宽限时间（秒），默认 3600
+    SCHEDULE_JOB_OPTIONS: 按任务名覆盖选项（JSON），如
+        {"start_work_messages": {"stagger": 20, "jitter": 10}}
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence
+
+import pytz
+from apscheduler.events import (EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED,
+                                JobExecutionEvent)
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+logger = logging.getLogger(__name__)
+
+# 北京时区
+BEIJING_TZ = pytz.timezone("Asia/Shanghai")
+
+DEFAULT_MISFIRE_GRACE = int(os.getenv("SCHEDULE_MISFIRE_GRACE", "3600"))
+
+# 间隔任务的固定起点（保证每次启动生成的触发器一致）
+_INTERVAL_ANCHOR = BEIJING_TZ.localize(datetime(2024, 1, 1))
+
+# 任务名 -> 执行函数（"模块:函数"，首次执行时导入），函数签名为 (bot, *args)
+JOB_TARGETS: Dict[str, str] = {
+    "start_work_messages": "utils.schedule_work_messages:send_start_work_messages",
+    "end_work_messages": "utils.schedule_work_messages:send_end_work_messages",
+    "daily_report": "utils.schedule_daily_report:send_daily_report",
+    "promotion_messages": "utils.schedule_promotion:send_company_promotion_messages",
+    "data_integrity_check": "utils.schedule_data_integrity:check_data_integrity",
+    "database_backup": "utils.schedule_backup:create_database_backup",
+    "data_archive": "utils.schedule_archive:run_data_archive",
+    "analytics_snapshot": "utils.schedule_snapshot:refresh_analytics_snapshot",
+    "scheduled_broadcast": "utils.schedule_broadcast:send_scheduled_broadcast",
+}
+
+
+@dataclass(frozen=True)
+class JobOptions:
+    """任务选项
+
+    Attributes:
+        stagger: 固定错峰秒数（加在触发时间上）
+        jitter: 随机抖动上限秒数（0 ~ jitter）
+        misfire_grace_time: 错过执行后仍补执行的宽限时间（秒）
+    """
+
+    stagger: int = 0
+    jitter: int = 0
+    misfire_grace_time: int = DEFAULT_MISFIRE_GRACE
+
+
+# 默认选项：面向群组的任务错开，开工信息保持准点
+DEFAULT_JOB_OPTIONS: Dict[str, JobOptions] = {
+    "start_work_messages": JobOptions(),
+    "end_work_messages": JobOptions(),
+    "scheduled_broadcast": JobOptions(stagger=30, jitter=15),
+    "promotion_messages": JobOptions(stagger=90, jitter=30),
+    "daily_report": JobOptions(misfire_grace_time=6 * 3600),
+    "database_backup": JobOptions(jitter=60, misfire_grace_time=6 * 3600),
+    "data_archive": JobOptions(jitter=60, misfire_grace_time=6 * 3600),
+    # 错过的刷新不补执行（使用时会按需刷新）
+    "analytics_snapshot": JobOptions(stagger=45, misfire_grace_time=60),
+    "data_integrity_check": JobOptions(jitter=60, misfire_grace_time=6 * 3600),
+}
+
+_scheduler: Optional[AsyncIOScheduler] = None
+_job_bot = None
+_resolved_targets: Dict[str, Any] = {}
+_background_tasks = set()
+
+
+def _load_option_overrides() -> Dict[str, Dict[str, int]]:
+    """读取 SCHEDULE_JOB_OPTIONS"""
+    raw = os.getenv("SCHEDULE_JOB_OPTIONS", "").strip()
+    if not raw:
+        return {}
+    try:
+        overrides = json.loads(raw)
+    except ValueError as e:
+        logger.error(f"SCHEDULE_JOB_OPTIONS 不是有效的 JSON，已忽略: {e}")
+        return {}
+    return overrides if isinstance(overrides, dict) else {}
+
+
+def get_job_options(job_name: str) -> JobOptions:
+    """获取任务选项（默认值 + 环境变量覆盖）"""
+    options = DEFAULT_JOB_OPTIONS.get(job_name, JobOptions())
+    override = _load_option_overrides().get(job_name)
+    if override:
+        fields = {
+            key: int(value)
+            for key, value in override.items()
+            if key in ("stagger", "jitter", "misfire_grace_time")
+        }
+        options = replace(options, **fields)
+    return options
+
+
+def daily_trigger(hour: int, minute: int, options: JobOptions) -> CronTrigger:
+    """每天定时触发器（含错峰和抖动）"""
+    total = (hour * 3600 + minute * 60 + options.stagger) % 86400
+    return CronTrigger(
+        hour=total // 3600,
+        minute=total % 3600 // 60,
+        second=total % 60,
+        timezone=BEIJING_TZ,
+        jitter=options.jitter or None,
+    )
+
+
+def interval_trigger(
+    hours: int, options: JobOptions, minutes: int = 0
+) -> IntervalTrigger:
+    """固定间隔触发器（以固定起点对齐，含错峰和抖动）"""
+    return IntervalTrigger(
+        hours=hours,
+        minutes=minutes,
+        start_date=_INTERVAL_ANCHOR + timedelta(seconds=options.stagger),
+        timezone=BEIJING_TZ,
+        jitter=options.jitter or None,
+    )
+
+
+def _create_scheduler() -> AsyncIOScheduler:
+    """创建调度器（SQLite 持久化 + 补执行/合并默认值）"""
+    jobstores = {}
+    if os.getenv("SCHEDULER_PERSISTENCE", "1") == "1":
+        from utils.schedule_job_store import SQLiteJobStore
+
+        jobstores["default"] = SQLiteJobStore()
+
+    scheduler = AsyncIOScheduler(
+        jobstores=jobstores,
+        job_defaults={
+            "misfire_grace_time": DEFAULT_MISFIRE_GRACE,
+            "coalesce": True,
+            "max_instances": 1,
+        },
+        timezone=BEIJING_TZ,
+    )
+    scheduler.add_listener(_on_job_skipped, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
+    return scheduler
+
+
+def get_scheduler(bot=None) -> AsyncIOScheduler:
+    """获取（必要时创建并启动）全局调度器
+
+    Args:
+        bot: 任务执行时使用的 Bot，需在调度器启动前设置，
+            这样启动时补执行的任务也能拿到 Bot
+    """
+    global _scheduler
+
+    if bot is not None:
+        set_job_bot(bot)
+    if _scheduler is None:
+        _scheduler = _create_scheduler()
+        _scheduler.start()
+        logger.info("定时任务调度器已启动")
+    return _scheduler
+
+
+def shutdown_scheduler() -> None:
+    """关闭全局调度器（任务已持久化，下次启动继续）"""
+    global _scheduler
+    if _scheduler is not None and _scheduler.running:
+        _scheduler.shutdown(wait=False)
+    _scheduler = None
+
+
+def set_job_bot(bot) -> None:
+    """设置任务执行时使用的 Bot"""
+    global _job_bot
+    _job_bot = bot
+
+
+def _job_fingerprint(job) -> tuple:
+    """任务定义指纹（用于判断是否需要替换已保存的任务）"""
+    return (job.func_ref, tuple(job.args), repr(job.trigger), job.misfire_grace_time)
+
+
+def ensure_job(
+    job_id: str,
+    job_name: str,
+    trigger,
+    args: Sequence[Any] = (),
+    options: Optional[JobOptions] = None,
+    scheduler: Optional[AsyncIOScheduler] = None,
+):
+    """幂等注册任务
+
+    已保存的任务定义相同时保持不变（保留下次执行时间，停机期间错过的执行可以补上）；
+    定义变化或不存在时新建/替换。
+
+    Args:
+        job_id: 任务ID
+        job_name: JOB_TARGETS 中的任务名
+        trigger: 触发器（使用 daily_trigger / interval_trigger 构建）
+        args: 传给执行函数的额外参数（bot 之后），必须可 pickle
+        options: 任务选项，为None时按任务名读取
+        scheduler: 调度器，为None时使用全局调度器
+    """
+    if job_name not in JOB_TARGETS:
+        raise ValueError(f"未注册的定时任务: {job_name}")
+
+    scheduler = scheduler or get_scheduler()
+    options = options or get_job_options(job_name)
+    job_kwargs = dict(
+        trigger=trigger,
+        args=[job_name, job_id, *args],
+        id=job_id,
+        name=job_name,
+        misfire_grace_time=options.misfire_grace_time,
+        coalesce=True,
+        max_instances=1,
+    )
+
+    existing = scheduler.get_job(job_id)
+    if existing is not None:
+        desired = (
+            f"{__name__}:run_scheduled_job",
+            (job_name, job_id, *args),
+            repr(trigger),
+            options.misfire_grace_time,
+        )
+        if _job_fingerprint(existing) == desired:
+            logger.debug(f"定时任务 {job_id} 未变化，保留（下次 {existing.next_run_time}）")
+            return existing
+
+    return scheduler.add_job(run_scheduled_job, replace_existing=True, **job_kwargs)
+
+
+def remove_jobs_with_prefix(
+    prefix: str, keep: Sequence[str] = (), scheduler: Optional[AsyncIOScheduler] = None
+) -> int:
+    """删除ID以指定前缀开头、且不在 keep 中的任务，返回删除数量"""
+    scheduler = scheduler or get_scheduler()
+    removed = 0
+    for job in scheduler.get_jobs():
+        if job.id.startswith(prefix) and job.id not in keep:
+            scheduler.remove_job(job.id)
+            removed += 1
+    return removed
+
+
+def _resolve_target(job_name: str):
+    """导入任务执行函数（结果缓存）"""
+    target = _resolved_targets.get(job_name)
+    if target is None:
+        module_name, attr = JOB_TARGETS[job_name].split(":")
+        target = getattr(importlib.import_module(module_name), attr)
+        _resolved_targets[job_name] = target
+    return target
+
+
+def _record_run(
+    job_name: str,
+    started_at: float,
+    duration: Optional[float],
+    status: str,
+    error: Optional[str] = None,
+    job_id: Optional[str] = None,
+) -> None:
+    """后台写入运行记录（失败只记日志）"""
+    from db.module4_automation.job_runs import record_job_run
+
+    async def write():
+        try:
+            await record_job_run(
+                job_id or job_name, job_name, started_at, duration, status, error
+            )
+        except Exception as e:
+            logger.debug(f"记录定时任务运行失败: {e}")
+
+    task = asyncio.get_running_loop().create_task(write())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def run_scheduled_job(job_name: str, job_id: str, *args) -> None:
+    """执行已注册的定时任务（注入 Bot，记录耗时和结果）
+
+    Args:
+        job_name: JOB_TARGETS 中的任务名
+        job_id: 调度器中的任务ID（用于运行记录）
+        *args: 传给执行函数的额外参数
+    """
+    from db.module4_automation.job_runs import (JOB_STATUS_ERROR,
+                                                JOB_STATUS_SUCCESS)
+    from utils.performance_monitor import record_operation
+
+    if _job_bot is None:
+        logger.error(f"定时任务 {job_name} 触发时 Bot 未设置，跳过")
+        return
+
+    started_at = time.time()
+    start = time.perf_counter()
+    status, error = JOB_STATUS_SUCCESS, None
+    try:
+        await _resolve_target(job_name)(_job_bot, *args)
+    except Exception as e:
+        status, error = JOB_STATUS_ERROR, f"{type(e).__name__}: {e}"
+        logger.error(f"定时任务 {job_name} 执行失败: {e}", exc_info=True)
+    finally:
+        duration = time.perf_counter() - start
+        record_operation(
+            f"job:{job_name}",
+            duration,
+            error=status == JOB_STATUS_ERROR,
+            threshold_ms=60000,
+        )
+        _record_run(job_name, started_at, duration, status, error, job_id=job_id)
+        logger.info(f"定时任务 {job_name} 完成: {status}，耗时 {duration:.2f}s")
+
+
+def _on_job_skipped(event: JobExecutionEvent) -> None:
+    """记录错过（超出宽限时间）或因上一次仍在运行而跳过的执行"""
+    from db.module4_automation.job_runs import JOB_STATUS_MISSED
+
+    job_name = event.job_id
+    if _scheduler is not None:
+        job = _scheduler.get_job(event.job_id)
+        if job is not None:
+            job_name = job.name
+    reason = "missed" if event.code == EVENT_JOB_MISSED else "max_instances"
+    logger.warning(
+        f"定时任务 {event.job_id} 未执行（{reason}），计划时间 {event.scheduled_run_time}"
+    )
+    try:
+        _record_run(
+            job_name,
+            event.scheduled_run_time.timestamp(),
+            None,
+            JOB_STATUS_MISSED,
+            reason,
+            job_id=event.job_id,
+        )
+    except RuntimeError:
+        # 没有运行中的事件循环
+        pass
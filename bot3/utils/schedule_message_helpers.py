@@ -11,11 +11,13 @@ from typing import List, Optional
 # 第三方库
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
+# 本地模块
+from utils.log_pipeline import log_kv
+
 logger = logging.getLogger(__name__)
 
-# 缓存管理员用户名（只提取一次）
-_cached_admin_mentions = None
-_cached_group_chat_id = None
+# 按名称找到的目标群组ID（管理员列表本身由 chat_metadata_cache 缓存）
+_target_group_chat_id: Optional[int] = None
 
 
 def select_rotated_message(message: str) -> str:
@@ -147,24 +149,25 @@ async def _send_group_message(
             logger.warning(f"群组 {chat_id}: 消息内容为空，跳过发送")
             return False
 
-        logger.debug(
-            f"群组 {chat_id}: 准备发送消息，长度={len(message)}, "
-            f"bot_links={bool(bot_links)}, worker_links={bool(worker_links)}"
-        )
-
         # 创建内联键盘（如果有链接）
         reply_markup = create_message_keyboard(bot_links, worker_links)
-        logger.debug(f"群组 {chat_id}: 内联键盘已创建: {reply_markup is not None}")
 
         # 机器人直接在群组中发送消息
-        logger.info(f"机器人正在向群组 {chat_id} 发送消息（长度: {len(message)} 字符）")
         await bot.send_message(
             chat_id=chat_id,
             text=message,
             parse_mode="HTML",
             reply_markup=reply_markup,
         )
-        logger.info(f"✅ 消息已成功发送到群组 {chat_id}")
+        # 每次发送都会记录，按调用位置限流（见 utils.log_pipeline）
+        log_kv(
+            logger,
+            logging.INFO,
+            "group_message.sent",
+            chat_id=chat_id,
+            length=len(message),
+            keyboard=reply_markup is not None,
+        )
         return True
     except Exception as e:
         logger.error(
@@ -225,9 +228,11 @@ async def get_group_admins_from_chat(bot, chat_id: int) -> list:
     从指定群组获取所有管理员用户名
     返回用户名列表（不包含@符号）
     """
+    from utils.chat_metadata_cache import get_cached_chat_administrators
+
     try:
-        # 获取群组管理员列表
-        administrators = await bot.get_chat_administrators(chat_id)
+        # 获取群组管理员列表（缓存，管理员变动时自动刷新）
+        administrators = await get_cached_chat_administrators(bot, chat_id)
 
         usernames = []
         for admin in administrators:
@@ -242,26 +247,8 @@ async def get_group_admins_from_chat(bot, chat_id: int) -> list:
         return []
 
 
-async def _check_cached_admin_mentions(group_chat_id: Optional[int]) -> Optional[str]:
-    """检查缓存的管理员提及
-
-    Args:
-        group_chat_id: 群组ID
-
-    Returns:
-        缓存的提及字符串，如果不存在则返回None
-    """
-    global _cached_admin_mentions, _cached_group_chat_id
-
-    if _cached_admin_mentions is not None and _cached_group_chat_id is not None:
-        if group_chat_id is None or group_chat_id == _cached_group_chat_id:
-            logger.debug(f"使用缓存的管理员用户名（群组ID: {_cached_group_chat_id}）")
-            return _cached_admin_mentions
-    return None
-
-
 async def _find_target_group_by_name(bot) -> Optional[int]:
-    """查找目标群组ID（通过名称）
+    """查找目标群组ID（通过名称，找到后记住结果）
 
     Args:
         bot: Telegram Bot 实例
@@ -269,9 +256,18 @@ async def _find_target_group_by_name(bot) -> Optional[int]:
     Returns:
         群组ID，如果未找到则返回None
     """
-    import db_operations
+    global _target_group_chat_id
+
+    if _target_group_chat_id is None:
+        _target_group_chat_id = await _lookup_target_group_by_name(bot)
+    return _target_group_chat_id
+
 
-    configs = await db_operations.get_group_message_configs()
+async def _lookup_target_group_by_name(bot) -> Optional[int]:
+    """在群组配置中按名称查找目标群组（必要时调用 get_chat）"""
+    from utils.chat_metadata_cache import get_cached_group_message_configs
+
+    configs = await get_cached_group_message_configs()
     target_group_name = "📱iPhone loan Chat(2)"
 
     for config in configs:
@@ -308,8 +304,6 @@ async def _get_and_format_group_admins(bot, group_chat_id: int) -> str:
     Returns:
         格式化的管理员提及字符串
     """
-    global _cached_admin_mentions, _cached_group_chat_id
-
     admin_usernames = await get_group_admins_from_chat(bot, group_chat_id)
     if not admin_usernames:
         logger.warning(f"群组 {group_chat_id} 没有找到管理员用户名，使用默认")
@@ -318,27 +312,16 @@ async def _get_and_format_group_admins(bot, group_chat_id: int) -> str:
         return await format_admin_mentions(bot, ADMIN_IDS)
 
     mentions = [f"@{username}" for username in admin_usernames]
-    formatted_mentions = " ".join(mentions) if mentions else ""
-
-    _cached_admin_mentions = formatted_mentions
-    _cached_group_chat_id = group_chat_id
-    logger.info(
-        f"已缓存管理员用户名（群组ID: {group_chat_id}，共 {len(admin_usernames)} 个管理员）"
-    )
-
-    return formatted_mentions
+    return " ".join(mentions) if mentions else ""
 
 
 async def format_admin_mentions_from_group(bot, group_chat_id: int = None) -> str:
     """
-    从指定群组获取管理员用户名并格式化（使用缓存，只提取一次）
+    从指定群组获取管理员用户名并格式化
+    （管理员列表按 TTL 缓存，管理员变动时自动刷新）
     如果未指定群组ID，则查找名为 "📱iPhone loan Chat(2)" 的群组
     """
     try:
-        cached_mentions = await _check_cached_admin_mentions(group_chat_id)
-        if cached_mentions is not None:
-            return cached_mentions
-
         if group_chat_id is None:
             group_chat_id = await _find_target_group_by_name(bot)
 
@@ -9,7 +9,7 @@ import logging
 # 本地模块
 import db_operations
 from config import ADMIN_IDS
-from utils.date_helpers import get_daily_period_date
+from utils.schedule_daily_report_date import get_report_date
 
 logger = logging.getLogger(__name__)
 
@@ -110,7 +110,8 @@ async def _send_summary_to_admins(bot, message: str) -> None:
 async def send_daily_operations_summary(bot):
     """发送每日操作汇总报告（每天23:00执行）"""
     try:
-        date = get_daily_period_date()
+        # 23:00 执行时当前时间已属于下一个日结周期，汇总刚结束的周期
+        date = get_report_date()
         logger.info(f"开始生成每日操作汇总报告 ({date})")
 
         summary = await db_operations.get_daily_operations_summary(date)
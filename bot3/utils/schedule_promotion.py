@@ -8,12 +8,11 @@ import logging
 import random
 from typing import Optional, Tuple
 
-# 第三方库
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-
 # 本地模块
 import db_operations
+from utils.chat_metadata_cache import get_cached_group_message_configs
+from utils.schedule_jobs import (ensure_job, get_job_options, get_scheduler,
+                                 interval_trigger, set_job_bot)
 from utils.schedule_message_helpers import (
     _combine_fixed_message_with_anti_fraud, _send_group_message,
     get_current_weekday_index, get_weekday_message)
@@ -120,7 +119,7 @@ async def send_promotion_messages_internal(bot):
         if not selected_message:
             return
 
-        configs = await db_operations.get_group_message_configs()
+        configs = await get_cached_group_message_configs()
         if not configs:
             logger.info("没有配置的总群，跳过发送公司宣传语录")
             return
@@ -148,24 +147,18 @@ async def setup_promotion_messages_schedule(bot, sched=None):
         scheduler = sched
 
     if scheduler is None:
-        scheduler = AsyncIOScheduler()
-        scheduler.start()
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
 
     try:
-        # 移除旧任务（如果存在）
-        try:
-            scheduler.remove_job("company_promotion_messages")
-            logger.info("已移除旧的宣传语录任务")
-        except Exception as e:
-            logger.debug(f"移除旧任务时出错（可忽略）: {e}")
-
-        # 添加定时任务（每3小时执行一次）
-        scheduler.add_job(
-            send_company_promotion_messages,
-            trigger=IntervalTrigger(hours=3),
-            args=[bot],
-            id="promotion_messages_schedule",
-            replace_existing=True,
+        # 每3小时执行一次（以固定时刻对齐，重启不会重置间隔）
+        options = get_job_options("promotion_messages")
+        ensure_job(
+            "promotion_messages_schedule",
+            "promotion_messages",
+            interval_trigger(3, options),
+            options=options,
+            scheduler=scheduler,
         )
         logger.info("已设置公司宣传语录轮播任务: 每 3 小时自动发送")
     except Exception as e:
@@ -0,0 +1,65 @@
+"""分析快照刷新任务
+
+每 SNAPSHOT_REFRESH_MINUTES 分钟刷新一次重查询使用的只读副本（见 db.snapshot）。
+"""
+
+# 标准库
+import asyncio
+import logging
+
+# 本地模块
+from utils.schedule_jobs import (ensure_job, get_job_options, get_scheduler,
+                                 interval_trigger, remove_jobs_with_prefix,
+                                 set_job_bot)
+
+logger = logging.getLogger(__name__)
+
+# 全局调度器（从主模块导入）
+scheduler = None
+
+
+def set_scheduler(sched):
+    """设置全局调度器"""
+    global scheduler
+    scheduler = sched
+
+
+async def refresh_analytics_snapshot(bot):
+    """刷新分析快照（定时任务）"""
+    from db.snapshot import ANALYTICS_SNAPSHOT, refresh_snapshot
+
+    if not ANALYTICS_SNAPSHOT:
+        return
+    # 复制数据库文件，在线程中执行以免阻塞事件循环
+    await asyncio.to_thread(refresh_snapshot)
+
+
+async def setup_analytics_snapshot_schedule(bot, sched=None):
+    """设置分析快照刷新任务"""
+    global scheduler
+    if sched:
+        scheduler = sched
+
+    if scheduler is None:
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
+
+    try:
+        from db.snapshot import ANALYTICS_SNAPSHOT, SNAPSHOT_REFRESH_MINUTES
+
+        if not ANALYTICS_SNAPSHOT or SNAPSHOT_REFRESH_MINUTES <= 0:
+            # 关闭定时刷新时移除之前持久化的任务（使用时仍按需刷新）
+            remove_jobs_with_prefix("analytics_snapshot", scheduler=scheduler)
+            return
+
+        options = get_job_options("analytics_snapshot")
+        ensure_job(
+            "analytics_snapshot",
+            "analytics_snapshot",
+            interval_trigger(0, options, minutes=SNAPSHOT_REFRESH_MINUTES),
+            options=options,
+            scheduler=scheduler,
+        )
+        logger.info(f"已设置分析快照刷新任务: 每 {SNAPSHOT_REFRESH_MINUTES} 分钟")
+    except Exception as e:
+        logger.error(f"设置分析快照刷新任务失败: {e}", exc_info=True)
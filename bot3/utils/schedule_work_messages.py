@@ -9,11 +9,12 @@ from typing import Dict, Tuple
 
 # 第三方库
 import pytz
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 
 # 本地模块
-import db_operations
+from utils.chat_metadata_cache import get_cached_group_message_configs
+from utils.log_pipeline import log_kv
+from utils.schedule_jobs import (daily_trigger, ensure_job, get_job_options,
+                                 get_scheduler, set_job_bot)
 from utils.schedule_message_helpers import (
     _combine_fixed_message_with_anti_fraud, _send_group_message,
     get_current_weekday_index, get_weekday_message)
@@ -40,7 +41,7 @@ async def _get_group_configs() -> list:
         配置列表
     """
     logger.info("正在获取群组消息配置...")
-    configs = await db_operations.get_group_message_configs()
+    configs = await get_cached_group_message_configs()
     logger.info(f"获取到 {len(configs) if configs else 0} 个群组配置")
     return configs or []
 
@@ -83,7 +84,13 @@ async def _send_message_to_group(
             bot, chat_id, final_message, bot_links, worker_links
         ):
             success_count += 1
-            logger.info(f"✅ 开工信息已发送到群组 {chat_id} (星期{weekday_index})")
+            log_kv(
+                logger,
+                logging.INFO,
+                "start_work.sent",
+                chat_id=chat_id,
+                weekday=weekday_index,
+            )
         else:
             fail_count += 1
             logger.warning(
@@ -113,8 +120,7 @@ async def send_start_work_messages(bot):
         success_count = 0
         fail_count = 0
 
-        for i, config in enumerate(configs, 1):
-            logger.info(f"处理群组 {i}/{len(configs)}: chat_id={config.get('chat_id')}")
+        for config in configs:
             success_count, fail_count = await _send_message_to_group(
                 bot, config, weekday_index, success_count, fail_count
             )
@@ -137,16 +143,17 @@ async def setup_start_work_schedule(bot, sched=None):
         scheduler = sched
 
     if scheduler is None:
-        scheduler = AsyncIOScheduler()
-        scheduler.start()
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
 
     try:
-        scheduler.add_job(
-            send_start_work_messages,
-            trigger=CronTrigger(hour=11, minute=0, timezone=BEIJING_TZ),
-            args=[bot],
-            id="start_work_messages",
-            replace_existing=True,
+        options = get_job_options("start_work_messages")
+        ensure_job(
+            "start_work_messages",
+            "start_work_messages",
+            daily_trigger(11, 0, options),
+            options=options,
+            scheduler=scheduler,
         )
         logger.info("已设置开工信息任务: 每天 11:00 自动发送")
     except Exception as e:
@@ -188,7 +195,13 @@ async def _process_single_end_work_message(
         if await _send_group_message(
             bot, chat_id, final_message, bot_links, worker_links
         ):
-            logger.info(f"收工信息已发送到群组 {chat_id} (星期{weekday_index})")
+            log_kv(
+                logger,
+                logging.INFO,
+                "end_work.sent",
+                chat_id=chat_id,
+                weekday=weekday_index,
+            )
             return True, chat_id
         else:
             return False, chat_id
@@ -200,7 +213,7 @@ async def _process_single_end_work_message(
 async def send_end_work_messages(bot):
     """发送收工信息到所有配置的总群（按星期几选择固定文案）"""
     try:
-        configs = await db_operations.get_group_message_configs()
+        configs = await get_cached_group_message_configs()
 
         if not configs:
             logger.info("没有配置的总群，跳过发送收工信息")
@@ -233,16 +246,17 @@ async def setup_end_work_schedule(bot, sched=None):
         scheduler = sched
 
     if scheduler is None:
-        scheduler = AsyncIOScheduler()
-        scheduler.start()
+        scheduler = get_scheduler(bot)
+    set_job_bot(bot)
 
     try:
-        scheduler.add_job(
-            send_end_work_messages,
-            trigger=CronTrigger(hour=23, minute=0, timezone=BEIJING_TZ),
-            args=[bot],
-            id="end_work_messages",
-            replace_existing=True,
+        options = get_job_options("end_work_messages")
+        ensure_job(
+            "end_work_messages",
+            "end_work_messages",
+            daily_trigger(23, 0, options),
+            options=options,
+            scheduler=scheduler,
         )
         logger.info("已设置收工信息任务: 每天 23:00 自动发送")
     except Exception as e:
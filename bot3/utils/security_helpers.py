@@ -155,3 +155,13 @@ def audit_log(
         log_parts.append(f"details={safe_details}")
 
     audit_logger.info(" | ".join(log_parts))
+
+    # 同时写入持久化的审计日志（只入队，不等待写入）
+    from utils.audit_log import record_audit_event
+
+    record_audit_event(
+        "security",
+        user_id=user_id,
+        action=action,
+        details=safe_details if details else None,
+    )
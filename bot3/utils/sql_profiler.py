@@ -0,0 +1,468 @@
+"""SQL 语句性能分析模块（按需开启）
+
+在连接层统计每条 SQL 的执行次数和耗时：
+
+- 通过连接子类对 execute / executemany / executescript / commit 计时
+- 通过 set_trace_callback 捕获其他途径执行的语句（只计数，不计时）
+- 语句规范化为指纹：字面量替换为 ?，IN (?, ?, ...) 合并，按群组分表的表名合并
+- 按指纹和调用函数分别汇总 次数 / 总耗时 / 最大耗时
+- 对每个指纹抽样执行 EXPLAIN QUERY PLAN，标记全表扫描
+- 报告可以文本、字典或 JSON 文件导出
+
+开启方式：
+    1. 环境变量 SQL_PROFILE=1（启动即开启）
+    2. 运行时 enable_sql_profiler() 或管理员命令 /sql_profile on
+
+开启后新建的连接才会被统计（get_sync_connection / 异步连接池新连接）。
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 每个指纹前 N 次执行都采样查询计划，之后每隔 N 次采样一次
+EXPLAIN_SAMPLE_EVERY = int(os.getenv("SQL_PROFILE_EXPLAIN_EVERY", "100"))
+# 最多保留的指纹数量（超出后归入 "<other>"）
+MAX_FINGERPRINTS = 2000
+# 每个指纹最多保留的调用函数数量
+MAX_CALLERS_PER_FINGERPRINT = 50
+# 样例 SQL 保留长度
+_SAMPLE_SQL_LENGTH = 500
+
+# 调用栈中需要跳过的模块文件（取第一个业务调用方）
+_SKIP_FILES = (
+    os.path.normcase(os.path.abspath(__file__)),
+    os.path.normcase(os.path.join(os.path.dirname(__file__), "db_pool.py")),
+    os.path.normcase(
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "db", "base.py")
+    ),
+    os.path.normcase(
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "db", "records.py")
+    ),
+)
+_PROJECT_ROOT = os.path.normcase(os.path.dirname(os.path.dirname(__file__)))
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+# 归属ID分表（orders_S01、orders_S02 等）
+_GROUP_TABLE_RE = re.compile(r"\borders_[A-Z]\d{2}\b", re.I)
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_LIST_RE = re.compile(
+    r"\bVALUES\s*(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\1)+", re.I
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint_sql(sql: str) -> str:
+    """将 SQL 规范化为指纹
+
+    Examples:
+        >>> fingerprint_sql("SELECT * FROM orders WHERE chat_id = -100 AND id IN (1, 2)")
+        'SELECT * FROM orders WHERE chat_id = ? AND id IN (?+)'
+        >>> fingerprint_sql("SELECT * FROM orders_S01") == fingerprint_sql(
+        ...     "SELECT * FROM orders_S02"
+        ... )
+        True
+    """
+    text = _COMMENT_RE.sub(" ", sql)
+    text = _GROUP_TABLE_RE.sub("orders_{group}", text)
+    text = _STRING_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("IN (?+)", text)
+    text = _VALUES_LIST_RE.sub(r"VALUES \1, ...", text)
+    return _WHITESPACE_RE.sub(" ", text).strip().rstrip(";")
+
+
+def _find_caller() -> str:
+    """获取发起 SQL 的业务函数（模块:函数名）"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.normcase(frame.f_code.co_filename)
+        if filename not in _SKIP_FILES and filename.startswith(_PROJECT_ROOT):
+            module = os.path.relpath(filename, _PROJECT_ROOT)
+            module = module[:-3] if module.endswith(".py") else module
+            return f"{module.replace(os.sep, '.')}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+def _is_full_scan(plan_detail: str) -> bool:
+    """判断查询计划明细是否为全表扫描"""
+    detail = plan_detail.upper()
+    return detail.startswith("SCAN ") and " USING " not in detail
+
+
+class _FingerprintStats:
+    """单个指纹的统计"""
+
+    __slots__ = (
+        "count",
+        "untimed_count",
+        "total_time",
+        "max_time",
+        "rows",
+        "sample_sql",
+        "callers",
+        "plan",
+        "full_scan",
+        "explained",
+    )
+
+    def __init__(self, sample_sql: str):
+        self.count = 0
+        self.untimed_count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.sample_sql = sample_sql[:_SAMPLE_SQL_LENGTH]
+        self.callers: Dict[str, List[float]] = {}
+        self.plan: Optional[List[str]] = None
+        self.full_scan = False
+        self.explained = 0
+
+
+class SQLProfiler:
+    """SQL 统计汇总器"""
+
+    def __init__(self):
+        self.enabled = False
+        self.started_at: Optional[float] = None
+        self._stats: Dict[str, _FingerprintStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ----- 开关 -----
+
+    def enable(self) -> None:
+        """开启统计"""
+        if not self.enabled:
+            self.enabled = True
+            self.started_at = time.time()
+            logger.info("SQL 性能分析已开启")
+
+    def disable(self) -> None:
+        """关闭统计（已有数据保留）"""
+        if self.enabled:
+            self.enabled = False
+            logger.info("SQL 性能分析已关闭")
+
+    def reset(self) -> None:
+        """清空统计数据"""
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time() if self.enabled else None
+
+    # ----- 记录 -----
+
+    @property
+    def depth(self) -> int:
+        """当前线程中正在计时的语句嵌套深度"""
+        return getattr(self._local, "depth", 0)
+
+    @depth.setter
+    def depth(self, value: int) -> None:
+        self._local.depth = value
+
+    def _get_entry(self, sql: str) -> _FingerprintStats:
+        """获取（或创建）指纹统计，调用方持有锁"""
+        fingerprint = fingerprint_sql(sql)
+        entry = self._stats.get(fingerprint)
+        if entry is None:
+            if len(self._stats) >= MAX_FINGERPRINTS:
+                fingerprint = "<other>"
+                entry = self._stats.get(fingerprint)
+            if entry is None:
+                entry = self._stats[fingerprint] = _FingerprintStats(sql)
+        return entry
+
+    def record(self, sql: str, duration: float, rows: int, caller: str) -> bool:
+        """记录一次计时执行
+
+        Returns:
+            是否需要对该语句采样查询计划
+        """
+        with self._lock:
+            entry = self._get_entry(sql)
+            entry.count += 1
+            entry.total_time += duration
+            if duration > entry.max_time:
+                entry.max_time = duration
+            if rows > 0:
+                entry.rows += rows
+
+            caller_stats = entry.callers.get(caller)
+            if caller_stats is None:
+                if len(entry.callers) >= MAX_CALLERS_PER_FINGERPRINT:
+                    caller = "<other>"
+                    caller_stats = entry.callers.get(caller)
+                if caller_stats is None:
+                    caller_stats = entry.callers[caller] = [0, 0.0, 0.0]
+            caller_stats[0] += 1
+            caller_stats[1] += duration
+            caller_stats[2] = max(caller_stats[2], duration)
+
+            need_plan = entry.explained == 0 or entry.count % EXPLAIN_SAMPLE_EVERY == 0
+            if need_plan:
+                entry.explained += 1
+            return need_plan
+
+    def record_untimed(self, sql: str) -> None:
+        """记录通过 trace 回调捕获、未经过计时包装的语句"""
+        with self._lock:
+            self._get_entry(sql).untimed_count += 1
+
+    def record_plan(self, sql: str, plan: List[str]) -> None:
+        """记录查询计划采样结果"""
+        with self._lock:
+            entry = self._get_entry(sql)
+            entry.plan = plan
+            entry.full_scan = any(_is_full_scan(line) for line in plan)
+
+    # ----- 报告 -----
+
+    def get_report(
+        self, sort_by: str = "total_time", limit: int = 50
+    ) -> Dict[str, Any]:
+        """生成统计报告
+
+        Args:
+            sort_by: 排序字段：total_time / count / max_time / avg_time
+            limit: 最多返回的指纹数量
+
+        Returns:
+            报告字典
+        """
+        with self._lock:
+            statements = []
+            for fingerprint, entry in self._stats.items():
+                callers = sorted(entry.callers.items(), key=lambda x: -x[1][1])
+                statements.append(
+                    {
+                        "fingerprint": fingerprint,
+                        "count": entry.count,
+                        "untimed_count": entry.untimed_count,
+                        "total_time": entry.total_time,
+                        "avg_time": (
+                            entry.total_time / entry.count if entry.count else 0.0
+                        ),
+                        "max_time": entry.max_time,
+                        "rows": entry.rows,
+                        "full_scan": entry.full_scan,
+                        "plan": entry.plan,
+                        "sample_sql": entry.sample_sql,
+                        "callers": [
+                            {
+                                "caller": name,
+                                "count": values[0],
+                                "total_time": values[1],
+                                "max_time": values[2],
+                            }
+                            for name, values in callers
+                        ],
+                    }
+                )
+
+        statements.sort(key=lambda x: -x.get(sort_by, 0))
+        return {
+            "enabled": self.enabled,
+            "started_at": self.started_at,
+            "generated_at": time.time(),
+            "fingerprint_count": len(statements),
+            "total_time": sum(s["total_time"] for s in statements),
+            "total_count": sum(s["count"] for s in statements),
+            "full_scans": [s["fingerprint"] for s in statements if s["full_scan"]],
+            "statements": statements[:limit],
+        }
+
+
+_profiler = SQLProfiler()
+
+
+def _trace_statement(sql: str) -> None:
+    """set_trace_callback 回调：记录未经过计时包装的语句"""
+    if _profiler.enabled and _profiler.depth == 0:
+        _profiler.record_untimed(sql)
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """对 execute / executemany / executescript 计时的游标"""
+
+    def execute(self, sql, parameters=()):
+        return _timed_call(self, sql, parameters, super().execute)
+
+    def executemany(self, sql, seq_of_parameters):
+        return _timed_call(
+            self, sql, seq_of_parameters, super().executemany, many=True
+        )
+
+    def executescript(self, sql_script):
+        return _timed_call(self, sql_script, None, super().executescript, script=True)
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """统计 SQL 执行情况的连接"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(_trace_statement)
+
+    def cursor(self, factory=ProfilingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        if not _profiler.enabled or not self.in_transaction:
+            return super().commit()
+        _profiler.depth += 1
+        start_time = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            duration = time.perf_counter() - start_time
+            _profiler.depth -= 1
+            _profiler.record("COMMIT", duration, 0, _find_caller())
+
+
+def _timed_call(cursor, sql, parameters, call, many=False, script=False):
+    """计时执行语句并记录统计"""
+    if not _profiler.enabled or _profiler.depth > 0:
+        if script:
+            return call(sql)
+        return call(sql, parameters)
+
+    _profiler.depth += 1
+    start_time = time.perf_counter()
+    try:
+        return call(sql) if script else call(sql, parameters)
+    finally:
+        duration = time.perf_counter() - start_time
+        _profiler.depth -= 1
+        rows = cursor.rowcount if not script else 0
+        need_plan = _profiler.record(sql, duration, rows, _find_caller())
+        if need_plan and not many and not script:
+            _sample_query_plan(cursor.connection, sql, parameters)
+
+
+def _sample_query_plan(conn: sqlite3.Connection, sql: str, parameters) -> None:
+    """对语句执行 EXPLAIN QUERY PLAN 并记录（只处理读写数据的语句）"""
+    keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    if keyword not in ("SELECT", "UPDATE", "DELETE", "WITH", "INSERT", "REPLACE"):
+        return
+
+    _profiler.depth += 1
+    try:
+        # 使用普通游标，避免递归计时
+        plan_cursor = sqlite3.Connection.cursor(conn)
+        plan_cursor.row_factory = None
+        rows = sqlite3.Cursor.execute(
+            plan_cursor, f"EXPLAIN QUERY PLAN {sql}", parameters
+        ).fetchall()
+        # 结果列：id, parent, notused, detail
+        _profiler.record_plan(sql, [row[-1] for row in rows])
+    except Exception as e:
+        logger.debug(f"采样查询计划失败: {e}")
+    finally:
+        _profiler.depth -= 1
+
+
+# ========== 对外接口 ==========
+
+
+def is_sql_profiler_enabled() -> bool:
+    """SQL 性能分析是否开启"""
+    return _profiler.enabled
+
+
+def enable_sql_profiler() -> None:
+    """开启 SQL 性能分析（之后新建的连接生效）"""
+    _profiler.enable()
+
+
+def disable_sql_profiler() -> None:
+    """关闭 SQL 性能分析"""
+    _profiler.disable()
+
+
+def reset_sql_profile() -> None:
+    """清空 SQL 统计数据"""
+    _profiler.reset()
+
+
+def get_connection_factory():
+    """获取 sqlite3.connect 的 factory 参数（未开启时返回默认连接类）"""
+    return ProfilingConnection if _profiler.enabled else sqlite3.Connection
+
+
+def get_sql_profile_report(
+    sort_by: str = "total_time", limit: int = 50
+) -> Dict[str, Any]:
+    """获取 SQL 统计报告"""
+    return _profiler.get_report(sort_by, limit)
+
+
+def format_sql_profile_report(
+    sort_by: str = "total_time", limit: int = 10, max_length: int = 4000
+) -> str:
+    """将 SQL 统计报告格式化为文本"""
+    report = get_sql_profile_report(sort_by, limit)
+    if not report["statements"]:
+        return "暂无 SQL 统计数据"
+
+    header = (
+        f"🗄 SQL 统计（{report['fingerprint_count']} 个指纹, "
+        f"{report['total_count']} 次, {report['total_time']:.2f}s）"
+    )
+    if report["full_scans"]:
+        header += f"\n⚠️ 全表扫描: {len(report['full_scans'])} 个指纹"
+
+    message = header
+    for index, stmt in enumerate(report["statements"], 1):
+        top_caller = stmt["callers"][0]["caller"] if stmt["callers"] else "-"
+        block = (
+            f"{index}. {stmt['fingerprint'][:300]}\n"
+            f"   次数 {stmt['count']} | 总计 {stmt['total_time'] * 1000:.0f}ms | "
+            f"平均 {stmt['avg_time'] * 1000:.2f}ms | "
+            f"最大 {stmt['max_time'] * 1000:.1f}ms"
+            f"{' | 全表扫描' if stmt['full_scan'] else ''}\n"
+            f"   主要调用方: {top_caller}"
+        )
+        if len(message) + len(block) + 2 > max_length:
+            message += "\n\n..."
+            break
+        message += "\n\n" + block
+    return message
+
+
+def export_sql_profile(
+    path: str, sort_by: str = "total_time", limit: int = 500
+) -> str:
+    """将 SQL 统计报告导出为 JSON 文件
+
+    Returns:
+        文件路径
+    """
+    report = get_sql_profile_report(sort_by, limit)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+if os.getenv("SQL_PROFILE", "0") == "1":
+    enable_sql_profiler()
@@ -0,0 +1,197 @@
+"""更新处理链路追踪模块
+
+为每个 Telegram 更新记录一棵耗时树：处理器 → 服务 → 数据库调用。
+
+- 处理器入口（utils.lazy_handlers）开启一次追踪（start_trace）
+- monitor_performance 装饰的服务函数、db_query/db_transaction 函数自动记录子节点（span）
+- 当前节点保存在 contextvars 中，没有进行中的追踪时 span() 不做任何事
+- 超过阈值的慢追踪保存在固定长度的缓冲区中，可通过 /perf_stats slow 或指标接口查看
+
+环境变量：
+    SLOW_TRACE_MS: 慢追踪阈值（毫秒），默认 1000
+"""
+
+import contextvars
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 慢追踪阈值（毫秒）
+SLOW_TRACE_MS = float(os.getenv("SLOW_TRACE_MS", "1000"))
+
+# 单次追踪最多记录的子节点数量（防止循环查询时无限增长）
+MAX_SPANS_PER_TRACE = 200
+
+# 保留的追踪数量
+_RECENT_TRACE_LIMIT = 20
+_SLOW_TRACE_LIMIT = 50
+
+
+class Span:
+    """追踪节点"""
+
+    __slots__ = ("name", "start", "duration_ms", "error", "attrs", "children", "trace")
+
+    def __init__(self, name: str, trace: "Trace", attrs: Optional[Dict] = None):
+        self.name = name
+        self.start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.error = False
+        self.attrs = attrs or {}
+        self.children: List["Span"] = []
+        self.trace = trace
+
+    def finish(self, error: bool = False) -> None:
+        """结束节点并记录耗时"""
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（用于 JSON 输出）"""
+        result = {
+            "name": self.name,
+            "duration_ms": round(self.duration_ms or 0.0, 2),
+            "error": self.error,
+        }
+        if self.attrs:
+            result["attrs"] = self.attrs
+        if self.children:
+            result["children"] = [child.to_dict() for child in self.children]
+        return result
+
+
+class Trace:
+    """一次更新的完整追踪"""
+
+    __slots__ = ("root", "span_count", "dropped", "started_at")
+
+    def __init__(self, name: str, attrs: Optional[Dict] = None):
+        self.span_count = 1
+        self.dropped = 0
+        self.started_at = time.time()
+        self.root = Span(name, self, attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（用于 JSON 输出）"""
+        result = self.root.to_dict()
+        result["started_at"] = self.started_at
+        if self.dropped:
+            result["dropped_spans"] = self.dropped
+        return result
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+_recent_traces: Deque[Trace] = deque(maxlen=_RECENT_TRACE_LIMIT)
+_slow_traces: Deque[Trace] = deque(maxlen=_SLOW_TRACE_LIMIT)
+
+
+def get_current_span() -> Optional[Span]:
+    """获取当前进行中的追踪节点"""
+    return _current_span.get()
+
+
+@contextmanager
+def start_trace(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """开启一次追踪（处理器入口使用）
+
+    如果当前已处于追踪中（例如处理器内部调用了另一个处理器），
+    则退化为普通子节点。
+    """
+    if _current_span.get() is not None:
+        with span(name, **attrs) as child:
+            yield child
+        return
+
+    trace = Trace(name, attrs)
+    token = _current_span.set(trace.root)
+    error = False
+    try:
+        yield trace.root
+    except BaseException:
+        error = True
+        raise
+    finally:
+        _current_span.reset(token)
+        trace.root.finish(error)
+        _finish_trace(trace)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """在当前追踪下记录一个子节点，没有进行中的追踪时不做任何事"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    trace = parent.trace
+    if trace.span_count >= MAX_SPANS_PER_TRACE:
+        trace.dropped += 1
+        yield None
+        return
+
+    node = Span(name, trace, attrs)
+    trace.span_count += 1
+    parent.children.append(node)
+    token = _current_span.set(node)
+    error = False
+    try:
+        yield node
+    except BaseException:
+        error = True
+        raise
+    finally:
+        _current_span.reset(token)
+        node.finish(error)
+
+
+def _finish_trace(trace: Trace) -> None:
+    """保存已完成的追踪，慢追踪额外记录日志"""
+    _recent_traces.append(trace)
+    if trace.root.duration_ms is not None and trace.root.duration_ms >= SLOW_TRACE_MS:
+        _slow_traces.append(trace)
+        logger.warning(f"慢更新追踪:\n{format_trace(trace)}")
+
+
+def _format_span(node: Span, depth: int, lines: List[str]) -> None:
+    """递归格式化节点"""
+    attrs = " ".join(f"{k}={v}" for k, v in node.attrs.items())
+    marker = " ❌" if node.error else ""
+    lines.append(
+        f"{'  ' * depth}{node.name} {node.duration_ms or 0.0:.1f}ms"
+        f"{' ' + attrs if attrs else ''}{marker}"
+    )
+    for child in node.children:
+        _format_span(child, depth + 1, lines)
+
+
+def format_trace(trace: Trace) -> str:
+    """将追踪格式化为缩进文本"""
+    lines: List[str] = []
+    _format_span(trace.root, 0, lines)
+    if trace.dropped:
+        lines.append(f"  ... 省略 {trace.dropped} 个节点")
+    return "\n".join(lines)
+
+
+def get_recent_traces() -> List[Trace]:
+    """获取最近完成的追踪（从新到旧）"""
+    return list(reversed(_recent_traces))
+
+
+def get_slow_traces() -> List[Trace]:
+    """获取慢追踪（从新到旧）"""
+    return list(reversed(_slow_traces))
+
+
+def clear_traces() -> None:
+    """清空已保存的追踪"""
+    _recent_traces.clear()
+    _slow_traces.clear()
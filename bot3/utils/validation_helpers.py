@@ -9,6 +9,7 @@ from typing import Optional, Tuple
 
 from constants import (AMOUNT_TOLERANCE, DATE_FORMAT, MAX_ACCOUNT_NAME_LENGTH,
                        MAX_NOTE_LENGTH, ORDER_STATES)
+from utils.money import round_money
 
 
 def validate_integer(
@@ -88,7 +89,7 @@ def validate_amount(
         if error and "必须小于等于" in error:
             return False, None, f"金额不能超过 {max_amount:,.2f}"
         return False, None, "请输入有效的金额"
-    return True, amount, None
+    return True, round_money(amount), None
 
 
 def validate_date(